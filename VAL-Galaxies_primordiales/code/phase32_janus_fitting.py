@@ -14,11 +14,11 @@ Author: VAL-Galaxies_primordiales
 Date: 2026-01-06
 """
 
+import sys
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
-from scipy.integrate import quad
 from scipy.interpolate import interp1d
 from scipy.optimize import minimize
 import warnings
@@ -47,11 +47,22 @@ RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 FIG_DIR = BASE_DIR / 'results/figures'
 FIG_DIR.mkdir(parents=True, exist_ok=True)
 
+# Shared cosmology implementation (src/cosmology/models.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+from cosmology.models import BackgroundCosmology
+from statistics.likelihood import ObservedUVLF
+from statistics.autocorr import autocorrelation_diagnostics
+from utils.profiling import PROFILER, profiled
+
 # Constants
 C_LIGHT = 299792.458  # km/s
 MPC_TO_KM = 3.0857e19  # km per Mpc
 GYR_TO_S = 3.1536e16  # seconds per Gyr
 
+# UV LF bins of the fit
+FIT_Z_BINS = [(6.5, 8), (8, 10), (10, 12)]
+FIT_M_BINS = np.arange(-25, -14, 1.0)
+
 # Publication-quality figure settings
 plt.rcParams.update({
     'font.size': 11,
@@ -72,84 +83,25 @@ plt.rcParams.update({
 # COSMOLOGY CLASSES
 # ============================================================================
 
-class JANUSCosmology:
+class JANUSCosmology(BackgroundCosmology):
     """
-    JANUS Bimetric Cosmology Model
+    JANUS Bimetric Cosmology Model ('janus' variant of cosmology.models)
     """
+    name = 'JANUS'
+
     def __init__(self, H0=70.0, Omega_plus=0.30, Omega_minus=0.05, chi=1.0, kappa=-1):
-        self.H0 = H0
-        self.Omega_plus = Omega_plus
-        self.Omega_minus = Omega_minus
-        self.chi = chi
-        self.kappa = kappa
-        self.Omega_k = 1.0 - Omega_plus - abs(Omega_minus)
-        self.name = 'JANUS'
-
-    def hubble_parameter(self, z):
-        """H(z) [km/s/Mpc]"""
-        z = np.atleast_1d(z)
-        a = 1.0 / (1.0 + z)
-
-        H_squared = self.H0**2 * (
-            self.Omega_plus * a**(-3) +
-            self.Omega_k * a**(-2) +
-            self.chi * abs(self.Omega_minus) * a**(-3) *
-            (1.0 + self.kappa * np.sqrt(abs(self.Omega_minus) / self.Omega_plus))
-        )
-        return np.sqrt(np.maximum(H_squared, 1e-10))
-
-    def age_of_universe(self, z):
-        """Age at redshift z [Gyr]"""
-        z_max = 1000.0
-        # H is in km/s/Mpc, so dt/dz = 1/((1+z)*H) in units of Mpc*s/km
-        # Convert to Gyr: 1 Mpc = 3.0857e19 km, 1 Gyr = 3.1536e16 s
-        H0_inv_Gyr = 978.0 / self.H0  # 1/H0 in Gyr for H0 in km/s/Mpc
-        integrand = lambda zp: 1.0 / ((1.0 + zp) * (float(self.hubble_parameter(zp)) / self.H0))
-        t_H0, _ = quad(integrand, z, z_max, epsrel=1e-6)
-        return t_H0 * H0_inv_Gyr
-
-    def comoving_volume(self, z):
-        """Comoving volume [Mpc^3]"""
-        integrand = lambda zp: C_LIGHT / self.hubble_parameter(zp)
-        d_c, _ = quad(integrand, 0, z, epsrel=1e-6)
-        return (4.0 / 3.0) * np.pi * d_c**3
-
-
-class LCDMCosmology:
+        super().__init__('janus', H0=H0, Omega_plus=Omega_plus,
+                         Omega_minus=Omega_minus, chi=chi, kappa=kappa)
+
+
+class LCDMCosmology(BackgroundCosmology):
     """
-    Standard LCDM Cosmology (Planck 2018)
+    Standard LCDM Cosmology (Planck 2018, 'lcdm' variant of cosmology.models)
     """
+    name = 'LCDM'
+
     def __init__(self, H0=67.4, Omega_m=0.315, Omega_Lambda=0.685):
-        self.H0 = H0
-        self.Omega_m = Omega_m
-        self.Omega_Lambda = Omega_Lambda
-        self.Omega_k = 1.0 - Omega_m - Omega_Lambda
-        self.name = 'LCDM'
-
-    def hubble_parameter(self, z):
-        """H(z) [km/s/Mpc]"""
-        z = np.atleast_1d(z)
-        H_squared = self.H0**2 * (
-            self.Omega_m * (1 + z)**3 +
-            self.Omega_k * (1 + z)**2 +
-            self.Omega_Lambda
-        )
-        return np.sqrt(np.maximum(H_squared, 1e-10))
-
-    def age_of_universe(self, z):
-        """Age at redshift z [Gyr]"""
-        z_max = 1000.0
-        # H is in km/s/Mpc, convert to age in Gyr
-        H0_inv_Gyr = 978.0 / self.H0  # 1/H0 in Gyr
-        integrand = lambda zp: 1.0 / ((1.0 + zp) * (float(self.hubble_parameter(zp)) / self.H0))
-        t_H0, _ = quad(integrand, z, z_max, epsrel=1e-6)
-        return t_H0 * H0_inv_Gyr
-
-    def comoving_volume(self, z):
-        """Comoving volume [Mpc^3]"""
-        integrand = lambda zp: C_LIGHT / self.hubble_parameter(zp)
-        d_c, _ = quad(integrand, 0, z, epsrel=1e-6)
-        return (4.0 / 3.0) * np.pi * d_c**3
+        super().__init__('lcdm', H0=H0, Omega_m=Omega_m, Omega_Lambda=Omega_Lambda)
 
 
 # ============================================================================
@@ -180,6 +132,7 @@ def schechter_function(M, phi_star, M_star, alpha):
     return 0.4 * np.log(10) * phi_star * x**(alpha + 1) * np.exp(-x)
 
 
+@profiled('schechter')
 def uv_lf_model(M_UV, z, cosmo, params):
     """
     UV Luminosity Function prediction
@@ -291,88 +244,98 @@ def compute_observed_uv_lf(catalog, z_min, z_max, M_bins):
     return M_centers, phi, phi_err
 
 
-def log_likelihood_uv_lf(params, catalog, cosmo_class):
+def prepare_uv_lf_data(catalog):
     """
-    Log-likelihood for UV LF fitting
+    Observed UV LF of the fitted (z, M_UV) bins, computed once per run
+
+    The histograms do not depend on the model parameters: the catalog is
+    scanned here, before sampling, and never inside the likelihood.
     """
-    H0, Omega_plus, Omega_minus = params[:3]
-    phi_star_0, M_star_0, alpha_0 = params[3:6]
+    return ObservedUVLF(catalog, FIT_Z_BINS, FIT_M_BINS)
 
-    # Check bounds
-    if H0 < 60 or H0 > 80:
-        return -np.inf
-    if Omega_plus < 0.1 or Omega_plus > 0.5:
-        return -np.inf
-    if Omega_minus < 0.01 or Omega_minus > 0.2:
-        return -np.inf
-    if phi_star_0 < 1e-5 or phi_star_0 > 1e-1:
-        return -np.inf
-    if M_star_0 < -23 or M_star_0 > -18:
-        return -np.inf
-    if alpha_0 < -2.5 or alpha_0 > -1.0:
-        return -np.inf
-
-    # Create cosmology
-    cosmo = cosmo_class(H0=H0, Omega_plus=Omega_plus, Omega_minus=Omega_minus)
 
-    model_params = {
-        'phi_star_0': phi_star_0,
-        'M_star_0': M_star_0,
-        'alpha_0': alpha_0
-    }
+@profiled('likelihood')
+def log_likelihood_uv_lf_batch(params, uv_lf_data, cosmo_class):
+    """
+    Log-likelihood for UV LF fitting, one value per walker
 
-    # Compute chi-squared across redshift bins
-    z_bins = [(6.5, 8), (8, 10), (10, 12)]
-    M_bins = np.arange(-25, -14, 1.0)
+    The predictions of all walkers are evaluated as one
+    (nwalkers, n_z_bins, n_mag_bins) array. The Schechter evolution depends
+    on the cosmology only through its name, so no instance is built per walker.
+
+    Parameters
+    ----------
+    params : array (nwalkers, 6)
+        [H0, Omega_plus, Omega_minus, phi_star_0, M_star_0, alpha_0] per walker
+    uv_lf_data : ObservedUVLF
+        Observed UV LF from prepare_uv_lf_data
+    cosmo_class : class
+        JANUSCosmology or LCDMCosmology
+    """
+    params = np.atleast_2d(params)
+    H0, Omega_plus, Omega_minus, phi_star_0, M_star_0, alpha_0 = params.T
 
-    chi2_total = 0
-    n_points = 0
+    # Check bounds
+    inside = ((H0 >= 60) & (H0 <= 80) &
+              (Omega_plus >= 0.1) & (Omega_plus <= 0.5) &
+              (Omega_minus >= 0.01) & (Omega_minus <= 0.2) &
+              (phi_star_0 >= 1e-5) & (phi_star_0 <= 1e-1) &
+              (M_star_0 >= -23) & (M_star_0 <= -18) &
+              (alpha_0 >= -2.5) & (alpha_0 <= -1.0))
 
-    for z_min, z_max in z_bins:
-        M_centers, phi_obs, phi_err = compute_observed_uv_lf(catalog, z_min, z_max, M_bins)
+    model_params = {
+        'phi_star_0': phi_star_0[:, None, None],
+        'M_star_0': M_star_0[:, None, None],
+        'alpha_0': alpha_0[:, None, None]
+    }
 
-        if M_centers is None:
-            continue
+    # Chi-squared in log space across all redshift bins
+    with np.errstate(over='ignore', invalid='ignore'):
+        phi_model = uv_lf_model(uv_lf_data.M_centers, uv_lf_data.z_mid, cosmo_class,
+                                model_params)
 
-        z_mid = (z_min + z_max) / 2
-        phi_model = uv_lf_model(M_centers, z_mid, cosmo, model_params)
+    return np.where(inside, uv_lf_data.log_likelihood(phi_model), -np.inf)
 
-        # Avoid log of zero
-        valid = (phi_obs > 0) & (phi_model > 0)
-        if np.sum(valid) < 3:
-            continue
 
-        # Chi-squared in log space
-        log_obs = np.log10(phi_obs[valid] + 1e-10)
-        log_model = np.log10(phi_model[valid] + 1e-10)
-        log_err = 0.434 * phi_err[valid] / (phi_obs[valid] + 1e-10)
+def log_likelihood_uv_lf(params, uv_lf_data, cosmo_class):
+    """
+    Log-likelihood for UV LF fitting
+    """
+    return float(log_likelihood_uv_lf_batch(params, uv_lf_data, cosmo_class)[0])
 
-        chi2 = np.sum((log_obs - log_model)**2 / (log_err**2 + 0.1**2))
-        chi2_total += chi2
-        n_points += np.sum(valid)
 
-    if n_points < 5:
-        return -np.inf
+@profiled('prior')
+def log_prior_janus_batch(params):
+    """Flat priors for JANUS parameters, one value per walker of (nwalkers, 6)"""
+    H0, Omega_plus, Omega_minus, phi_star_0, M_star_0, alpha_0 = np.atleast_2d(params).T
 
-    return -0.5 * chi2_total
+    inside = ((60 < H0) & (H0 < 80) & (0.1 < Omega_plus) & (Omega_plus < 0.5) &
+              (0.01 < Omega_minus) & (Omega_minus < 0.2) &
+              (1e-5 < phi_star_0) & (phi_star_0 < 1e-1) &
+              (-23 < M_star_0) & (M_star_0 < -18) & (-2.5 < alpha_0) & (alpha_0 < -1.0))
+    return np.where(inside, 0.0, -np.inf)
 
 
 def log_prior_janus(params):
     """Flat priors for JANUS parameters"""
-    H0, Omega_plus, Omega_minus, phi_star_0, M_star_0, alpha_0 = params
+    return float(log_prior_janus_batch(params)[0])
 
-    if 60 < H0 < 80 and 0.1 < Omega_plus < 0.5 and 0.01 < Omega_minus < 0.2:
-        if 1e-5 < phi_star_0 < 1e-1 and -23 < M_star_0 < -18 and -2.5 < alpha_0 < -1.0:
-            return 0.0
-    return -np.inf
 
+@profiled('log_posterior_janus')
+def log_posterior_janus_batch(params, uv_lf_data):
+    """Posterior = prior + likelihood for a walker matrix (emcee vectorize=True)"""
+    params = np.atleast_2d(params)
+    log_post = log_prior_janus_batch(params)
+    inside = np.isfinite(log_post)
+    if np.any(inside):
+        log_post[inside] += log_likelihood_uv_lf_batch(params[inside], uv_lf_data,
+                                                       JANUSCosmology)
+    return log_post
 
-def log_posterior_janus(params, catalog):
+
+def log_posterior_janus(params, uv_lf_data):
     """Posterior = prior + likelihood"""
-    lp = log_prior_janus(params)
-    if not np.isfinite(lp):
-        return -np.inf
-    return lp + log_likelihood_uv_lf(params, catalog, JANUSCosmology)
+    return float(log_posterior_janus_batch(params, uv_lf_data)[0])
 
 
 # ============================================================================
@@ -422,9 +385,11 @@ def run_simple_fit(catalog):
     # Initial guess
     x0 = [70.0, 0.30, 0.05, 5e-4, -20.5, -1.8]
 
+    uv_lf_data = prepare_uv_lf_data(catalog)
+
     # Negative log-likelihood for minimization
     def neg_log_lik(params):
-        ll = log_likelihood_uv_lf(params, catalog, JANUSCosmology)
+        ll = log_likelihood_uv_lf(params, uv_lf_data, JANUSCosmology)
         return -ll if np.isfinite(ll) else 1e10
 
     result = minimize(neg_log_lik, x0, method='Nelder-Mead',
@@ -463,7 +428,9 @@ def run_mcmc_fit(catalog, nwalkers=32, nsteps=500):
     p0 = [70.0, 0.30, 0.05, 5e-4, -20.5, -1.8]
     pos = p0 + 0.01 * np.random.randn(nwalkers, ndim) * np.array([5, 0.05, 0.02, 1e-4, 0.5, 0.2])
 
-    sampler = emcee.EnsembleSampler(nwalkers, ndim, log_posterior_janus, args=(catalog,))
+    uv_lf_data = prepare_uv_lf_data(catalog)
+    sampler = emcee.EnsembleSampler(nwalkers, ndim, log_posterior_janus_batch,
+                                    args=(uv_lf_data,), vectorize=True)
 
     # Burn-in
     print("Running burn-in (100 steps)...")
@@ -472,11 +439,15 @@ def run_mcmc_fit(catalog, nwalkers=32, nsteps=500):
 
     # Production
     print(f"Running production ({nsteps} steps)...")
+    PROFILER.reset()
     sampler.run_mcmc(state, nsteps, progress=True)
+    if PROFILER.enabled:
+        print(f"Stage profile (JANUS_PROFILE): {PROFILER.dump(RESULTS_DIR, 'janus_profile')[0]}")
 
     # Get samples
     samples = sampler.get_chain(discard=50, thin=10, flat=True)
-    print(f"Effective samples: {len(samples)}")
+    ess = autocorrelation_diagnostics(sampler.get_chain(discard=50)).ess
+    print(f"Samples: {len(samples)} (thinned), effective: {np.min(ess):.0f} (min over parameters)")
 
     # Parameter estimates
     params_names = ['H0', 'Omega_plus', 'Omega_minus', 'phi_star_0', 'M_star_0', 'alpha_0']
@@ -15,11 +15,11 @@ Date: 2026-01-06
 """
 
 import os
+import sys
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
-from scipy.integrate import quad
 from scipy.optimize import minimize
 import json
 from datetime import datetime
@@ -56,9 +56,24 @@ MCMC_DIR.mkdir(parents=True, exist_ok=True)
 FIG_DIR = BASE_DIR / 'results/figures'
 FIG_DIR.mkdir(parents=True, exist_ok=True)
 
+# Shared cosmology implementation (src/cosmology/models.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+from cosmology.models import BackgroundCosmology
+from statistics.likelihood import ObservedUVLF
+from statistics.posterior import Posterior, PooledPosterior
+from statistics.convergence import ConvergenceCriteria, ConvergenceController
+from statistics.streaming import StreamingDiagnostics, iter_chunks
+from statistics.checkpoint import AsyncHDFBackend
+from statistics.autocorr import autocorrelation_diagnostics
+from utils.profiling import PROFILER, profiled
+
 # Constants
 C_LIGHT = 299792.458  # km/s
 
+# UV LF bins of the fit
+FIT_Z_BINS = [(6.5, 8), (8, 10), (10, 12)]
+FIT_M_BINS = np.arange(-25, -14, 1.0)
+
 # Publication-quality figure settings
 plt.rcParams.update({
     'font.size': 11,
@@ -79,34 +94,16 @@ plt.rcParams.update({
 # LCDM COSMOLOGY
 # ============================================================================
 
-class LCDMCosmology:
+class LCDMCosmology(BackgroundCosmology):
     """
-    Standard LCDM Cosmology (Planck 2018)
+    Standard LCDM Cosmology (Planck 2018, 'lcdm' variant of cosmology.models)
     """
-    def __init__(self, H0=67.4, Omega_m=0.315, Omega_Lambda=None):
-        self.H0 = H0
-        self.Omega_m = Omega_m
-        self.Omega_Lambda = Omega_Lambda if Omega_Lambda is not None else (1.0 - Omega_m)
-        self.Omega_k = 1.0 - Omega_m - self.Omega_Lambda
-        self.name = 'LCDM'
-
-    def hubble_parameter(self, z):
-        """H(z) [km/s/Mpc]"""
-        z = np.atleast_1d(z)
-        H_squared = self.H0**2 * (
-            self.Omega_m * (1 + z)**3 +
-            self.Omega_k * (1 + z)**2 +
-            self.Omega_Lambda
-        )
-        return np.sqrt(np.maximum(H_squared, 1e-10))
+    name = 'LCDM'
 
-    def age_of_universe(self, z):
-        """Age at redshift z [Gyr]"""
-        z_max = 1000.0
-        H0_inv_Gyr = 978.0 / self.H0  # 1/H0 in Gyr
-        integrand = lambda zp: 1.0 / ((1.0 + zp) * (float(self.hubble_parameter(zp)) / self.H0))
-        t_H0, _ = quad(integrand, z, z_max, epsrel=1e-6)
-        return t_H0 * H0_inv_Gyr
+    def __init__(self, H0=67.4, Omega_m=0.315, Omega_Lambda=None):
+        if Omega_Lambda is None:
+            Omega_Lambda = 1.0 - Omega_m
+        super().__init__('lcdm', H0=H0, Omega_m=Omega_m, Omega_Lambda=Omega_Lambda)
 
 
 # ============================================================================
@@ -119,6 +116,7 @@ def schechter_function(M, phi_star, M_star, alpha):
     return 0.4 * np.log(10) * phi_star * x**(alpha + 1) * np.exp(-x)
 
 
+@profiled('schechter')
 def uv_lf_lcdm(M_UV, z, params):
     """
     UV Luminosity Function prediction for LCDM
@@ -176,85 +174,92 @@ def compute_observed_uv_lf(catalog, z_min, z_max, M_bins):
 # LIKELIHOOD AND PRIORS
 # ============================================================================
 
-def log_prior_lcdm(params):
+@profiled('prior')
+def log_prior_lcdm_batch(params):
     """
-    Flat priors for LCDM parameters
+    Flat priors for LCDM parameters, one value per walker
 
-    Parameters: [H0, Omega_m, phi_star_0, M_star_0, alpha_0]
+    Parameters: (nwalkers, 5) matrix of [H0, Omega_m, phi_star_0, M_star_0, alpha_0]
     """
-    H0, Omega_m, phi_star_0, M_star_0, alpha_0 = params
+    H0, Omega_m, phi_star_0, M_star_0, alpha_0 = np.atleast_2d(params).T
 
     # Physical bounds
-    if not (60 < H0 < 80):
-        return -np.inf
-    if not (0.1 < Omega_m < 0.5):
-        return -np.inf
-    if not (1e-5 < phi_star_0 < 1e-1):
-        return -np.inf
-    if not (-24 < M_star_0 < -18):
-        return -np.inf
-    if not (-2.5 < alpha_0 < -1.0):
-        return -np.inf
+    inside = ((60 < H0) & (H0 < 80) &
+              (0.1 < Omega_m) & (Omega_m < 0.5) &
+              (1e-5 < phi_star_0) & (phi_star_0 < 1e-1) &
+              (-24 < M_star_0) & (M_star_0 < -18) &
+              (-2.5 < alpha_0) & (alpha_0 < -1.0))
 
-    return 0.0
+    return np.where(inside, 0.0, -np.inf)
 
 
-def log_likelihood_lcdm(params, catalog):
+def prepare_uv_lf_data(catalog):
     """
-    Log-likelihood for LCDM UV LF fitting
+    Observed UV LF of the fitted (z, M_UV) bins, computed once per run
 
-    Parameters: [H0, Omega_m, phi_star_0, M_star_0, alpha_0]
+    The histograms do not depend on the model parameters: the catalog is
+    scanned here, before sampling, and never inside the likelihood.
     """
-    H0, Omega_m, phi_star_0, M_star_0, alpha_0 = params
+    return ObservedUVLF(catalog, FIT_Z_BINS, FIT_M_BINS)
 
+
+@profiled('likelihood')
+def log_likelihood_lcdm_batch(params, uv_lf_data):
+    """
+    Log-likelihood for LCDM UV LF fitting, one value per walker
+
+    The Schechter predictions of all walkers are evaluated as one
+    (nwalkers, n_z_bins, n_mag_bins) array.
+
+    Parameters: (nwalkers, 5) matrix of [H0, Omega_m, phi_star_0, M_star_0, alpha_0]
+    and the ObservedUVLF from prepare_uv_lf_data
+    """
+    params = np.atleast_2d(params)
     model_params = {
-        'phi_star_0': phi_star_0,
-        'M_star_0': M_star_0,
-        'alpha_0': alpha_0
+        'phi_star_0': params[:, 2, None, None],
+        'M_star_0': params[:, 3, None, None],
+        'alpha_0': params[:, 4, None, None]
     }
 
-    # Compute chi-squared across redshift bins
-    z_bins = [(6.5, 8), (8, 10), (10, 12)]
-    M_bins = np.arange(-25, -14, 1.0)
+    # Chi-squared in log space across all redshift bins
+    with np.errstate(over='ignore', invalid='ignore'):
+        phi_model = uv_lf_lcdm(uv_lf_data.M_centers, uv_lf_data.z_mid, model_params)
 
-    chi2_total = 0
-    n_points = 0
+    return np.atleast_1d(uv_lf_data.log_likelihood(phi_model))
 
-    for z_min, z_max in z_bins:
-        M_centers, phi_obs, phi_err = compute_observed_uv_lf(catalog, z_min, z_max, M_bins)
 
-        if M_centers is None:
-            continue
+@profiled('log_posterior_lcdm')
+def log_posterior_lcdm_batch(params, uv_lf_data):
+    """Posterior = prior + likelihood for a walker matrix (emcee vectorize=True)"""
+    params = np.atleast_2d(params)
+    log_post = log_prior_lcdm_batch(params)
+    inside = np.isfinite(log_post)
+    if np.any(inside):
+        log_post[inside] += log_likelihood_lcdm_batch(params[inside], uv_lf_data)
+    return log_post
 
-        z_mid = (z_min + z_max) / 2
-        phi_model = uv_lf_lcdm(M_centers, z_mid, model_params)
 
-        # Avoid log of zero
-        valid = (phi_obs > 0) & (phi_model > 0)
-        if np.sum(valid) < 3:
-            continue
+def log_prior_lcdm(params):
+    """
+    Flat priors for LCDM parameters
 
-        # Chi-squared in log space
-        log_obs = np.log10(phi_obs[valid] + 1e-10)
-        log_model = np.log10(phi_model[valid] + 1e-10)
-        log_err = 0.434 * phi_err[valid] / (phi_obs[valid] + 1e-10)
+    Parameters: [H0, Omega_m, phi_star_0, M_star_0, alpha_0]
+    """
+    return float(log_prior_lcdm_batch(params)[0])
 
-        chi2 = np.sum((log_obs - log_model)**2 / (log_err**2 + 0.1**2))
-        chi2_total += chi2
-        n_points += np.sum(valid)
 
-    if n_points < 5:
-        return -np.inf
+def log_likelihood_lcdm(params, uv_lf_data):
+    """
+    Log-likelihood for LCDM UV LF fitting
 
-    return -0.5 * chi2_total
+    Parameters: [H0, Omega_m, phi_star_0, M_star_0, alpha_0]
+    """
+    return float(log_likelihood_lcdm_batch(params, uv_lf_data)[0])
 
 
-def log_posterior_lcdm(params, catalog):
+def log_posterior_lcdm(params, uv_lf_data):
     """Posterior = prior + likelihood"""
-    lp = log_prior_lcdm(params)
-    if not np.isfinite(lp):
-        return -np.inf
-    return lp + log_likelihood_lcdm(params, catalog)
+    return float(log_posterior_lcdm_batch(params, uv_lf_data)[0])
 
 
 # ============================================================================
@@ -309,18 +314,22 @@ def calculate_rhat(chain):
 def check_convergence(sampler, verbose=True):
     """
     Check MCMC convergence (per INS-Statistiques.md criteria)
+
+    The chain is read from the backend in chunks and reduced to running
+    sums (StreamingDiagnostics): τ from batch-means ESS, split R-hat over
+    the whole chain, acceptance from walker moves.
     """
     results = {
         "converged": False,
         "n_iterations": sampler.iteration,
         "checks": {}
     }
+    diagnostics = StreamingDiagnostics(sampler.backend, discard=0.0).update()
 
     # 1. Autocorrelation time
-    try:
-        tau = sampler.get_autocorr_time(tol=0)
-        tau_mean = tau.mean()
-        tau_max = tau.max()
+    if np.all(np.isfinite(diagnostics.tau)):
+        tau_mean = diagnostics.tau.mean()
+        tau_max = diagnostics.tau.max()
 
         # Criterion: N > 50 * tau
         tau_check = sampler.iteration > 50 * tau_max
@@ -337,13 +346,13 @@ def check_convergence(sampler, verbose=True):
             print(f"  N_eff = {sampler.iteration / tau_mean:.0f}")
             print(f"  Status: {'PASS' if tau_check else 'FAIL'}")
 
-    except:
+    else:
         results["checks"]["autocorr"] = {"passed": False, "error": "Not enough samples"}
         if verbose:
             print("Autocorrelation: FAIL - Not enough samples")
 
     # 2. Acceptance rate (target: 0.2-0.5)
-    acceptance = sampler.acceptance_fraction.mean()
+    acceptance = diagnostics.acceptance.mean()
     acceptance_check = 0.2 < acceptance < 0.5
 
     results["checks"]["acceptance"] = {
@@ -356,23 +365,18 @@ def check_convergence(sampler, verbose=True):
               f"{'PASS' if acceptance_check else 'WARN'}")
 
     # 3. R-hat (target: < 1.1)
-    try:
-        chain = sampler.get_chain()
-        rhat = calculate_rhat(chain)
-        rhat_check = np.all(rhat < 1.1) if not np.any(np.isnan(rhat)) else False
-
-        results["checks"]["rhat"] = {
-            "values": rhat.tolist(),
-            "max": float(np.nanmax(rhat)),
-            "passed": bool(rhat_check)
-        }
+    rhat = diagnostics.rhat
+    rhat_check = bool(np.all(rhat < 1.1)) if not np.any(np.isnan(rhat)) else False
 
-        if verbose:
-            print(f"R-hat max: {np.nanmax(rhat):.3f} (target < 1.1) "
-                  f"{'PASS' if rhat_check else 'FAIL'}")
+    results["checks"]["rhat"] = {
+        "values": rhat.tolist(),
+        "max": float(np.nanmax(rhat)) if not np.all(np.isnan(rhat)) else None,
+        "passed": rhat_check
+    }
 
-    except Exception as e:
-        results["checks"]["rhat"] = {"passed": False, "error": str(e)}
+    if verbose and not np.all(np.isnan(rhat)):
+        print(f"R-hat max: {np.nanmax(rhat):.3f} (target < 1.1) "
+              f"{'PASS' if rhat_check else 'FAIL'}")
 
     # Global convergence
     all_passed = all(
@@ -422,22 +426,40 @@ class RobustMCMCRunner:
             json.dump(metadata, f, indent=2)
 
     def run(self, log_prob_fn, nwalkers, ndim, nsteps, initial_pos,
-            catalog, checkpoint_interval=100):
-        """Run MCMC with checkpoints"""
+            data, checkpoint_interval=100, vectorize=True, processes=None,
+            convergence=None):
+        """
+        Run MCMC with checkpoints
+
+        log_prob_fn is called as log_prob_fn(params, data). With
+        vectorize=True (default), log_prob_fn(walkers, data) receives
+        the whole (nwalkers, ndim) walker matrix and returns one value per
+        walker (e.g. log_posterior_lcdm_batch).
+
+        With processes > 1, walkers are evaluated in a process pool; the
+        data are sent to each worker once, when the pool starts.
+
+        With convergence (ConvergenceCriteria), convergence is checked after
+        every checkpoint block and the run stops as soon as the criteria
+        pass; nsteps is then the maximum.
+        """
 
         config = {
             "nwalkers": nwalkers,
             "ndim": ndim,
             "nsteps": nsteps,
-            "checkpoint_interval": checkpoint_interval
+            "checkpoint_interval": checkpoint_interval,
+            "vectorize": vectorize,
+            "processes": processes,
+            "convergence": convergence._asdict() if convergence else None
         }
 
         self._log(f"Starting LCDM MCMC: {nwalkers} walkers, {nsteps} steps")
         self._save_metadata(config, status="running")
 
-        # Initialize backend
+        # Initialize backend (written from a thread, at most checkpoint_interval steps behind)
         if HAS_H5PY:
-            backend = emcee.backends.HDFBackend(self.chain_file)
+            backend = AsyncHDFBackend(self.chain_file, flush_interval=checkpoint_interval)
             # Check if file exists and has iterations
             try:
                 if os.path.exists(self.chain_file) and backend.iteration > 0:
@@ -454,17 +476,33 @@ class RobustMCMCRunner:
             backend = None
             nsteps_remaining = nsteps
 
-        # Create sampler
+        # Create sampler (picklable posterior, data shipped once per worker)
+        posterior = Posterior(log_prob_fn, data, vectorize=vectorize)
+        pool = posterior.pool(processes) if processes and processes > 1 else None
         sampler = emcee.EnsembleSampler(
             nwalkers, ndim,
-            lambda p: log_prob_fn(p, catalog),
-            backend=backend
+            PooledPosterior(posterior, pool) if pool and vectorize else posterior,
+            pool=pool,
+            backend=backend,
+            vectorize=vectorize
         )
 
+        # Convergence checks on each new block only, resumed iterations included
+        controller = None
+        if convergence is not None:
+            controller = ConvergenceController(convergence, block_size=checkpoint_interval)
+            for chunk in iter_chunks(sampler.backend):
+                controller.update(chunk)
+
+        # Stage profile of this run (JANUS_PROFILE), evaluations in this process only
+        PROFILER.reset()
+        if PROFILER.enabled and pool is not None:
+            self._log("Profiling: stages evaluated in pool workers are not recorded")
+
         # Run in blocks with checkpoints
         try:
             steps_done = 0
-            while steps_done < nsteps_remaining:
+            while steps_done < nsteps_remaining and not (controller and controller.converged):
                 steps_this_round = min(checkpoint_interval, nsteps_remaining - steps_done)
 
                 sampler.run_mcmc(
@@ -484,6 +522,18 @@ class RobustMCMCRunner:
                 else:
                     self._log(f"Progress: {steps_done}/{nsteps_remaining}")
 
+                if controller:
+                    status = controller.update(
+                        sampler.get_chain(discard=sampler.iteration - steps_this_round))
+                    self._log(f"Convergence: tau_max={np.nanmax(status.tau):.1f}, "
+                              f"R-hat max={np.nanmax(status.rhat):.3f}, "
+                              f"ESS min={np.nanmin(status.ess):.0f}")
+                    if status.converged:
+                        config["converged_at"] = sampler.iteration
+                        self._log(f"Converged at iteration {sampler.iteration}, stopping")
+
+            if backend:
+                backend.flush()
             self._save_metadata(config, status="completed")
             self._log("Run completed successfully")
 
@@ -497,6 +547,17 @@ class RobustMCMCRunner:
             self._log(f"Error: {str(e)}")
             raise
 
+        finally:
+            if backend:
+                backend.close()
+            if pool is not None:
+                pool.close()
+                pool.join()
+            posterior.close()
+            if PROFILER.enabled:
+                summary_file, _ = PROFILER.dump(self.output_dir, f"{self.run_name}_profile")
+                self._log(f"Stage profile: {summary_file}")
+
         return sampler
 
 
@@ -512,9 +573,10 @@ def run_simple_fit(catalog):
 
     # Initial guess: Planck 2018 values
     x0 = [67.4, 0.315, 5e-4, -20.5, -1.8]
+    uv_lf_data = prepare_uv_lf_data(catalog)
 
     def neg_log_lik(params):
-        ll = log_likelihood_lcdm(params, catalog)
+        ll = log_likelihood_lcdm(params, uv_lf_data)
         return -ll if np.isfinite(ll) else 1e10
 
     result = minimize(neg_log_lik, x0, method='Nelder-Mead',
@@ -560,10 +622,11 @@ def run_mcmc_fit(catalog, nwalkers=32, nsteps=500):
     runner = RobustMCMCRunner(MCMC_DIR, "lcdm_uv_lf")
 
     sampler = runner.run(
-        log_posterior_lcdm,
+        log_posterior_lcdm_batch,
         nwalkers, ndim, nsteps,
-        pos, catalog,
-        checkpoint_interval=100
+        pos, prepare_uv_lf_data(catalog),
+        checkpoint_interval=100,
+        convergence=ConvergenceCriteria()
     )
 
     # Check convergence
@@ -571,7 +634,8 @@ def run_mcmc_fit(catalog, nwalkers=32, nsteps=500):
 
     # Get samples
     samples = sampler.get_chain(discard=50, thin=10, flat=True)
-    print(f"Effective samples: {len(samples)}")
+    ess = autocorrelation_diagnostics(sampler.get_chain(discard=50)).ess
+    print(f"Samples: {len(samples)} (thinned), effective: {np.min(ess):.0f} (min over parameters)")
 
     # Parameter estimates
     params_names = ['H0', 'Omega_m', 'phi_star_0', 'M_star_0', 'alpha_0']
@@ -694,7 +758,7 @@ def generate_report(catalog, params_lcdm, convergence, params_janus=None):
         params_janus = [78.8, 0.47, 0.03, 3.6e-4, -21.4, -2.43]
 
     # Compute chi2 for both models
-    chi2_lcdm = -2 * log_likelihood_lcdm(params_lcdm, catalog)
+    chi2_lcdm = -2 * log_likelihood_lcdm(params_lcdm, prepare_uv_lf_data(catalog))
 
     # JANUS chi2 (from Phase 3.2)
     chi2_janus = 2603.23  # From Phase 3.2 results
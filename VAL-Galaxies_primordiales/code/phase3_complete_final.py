@@ -23,7 +23,6 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
-from scipy.integrate import quad
 from scipy.optimize import minimize
 import json
 from datetime import datetime
@@ -81,87 +80,72 @@ PRIOR_H0_JANUS = (75.0, 5.0)       # H0 ~ N(75, 5) for JANUS
 PRIOR_H0_LCDM = (67.4, 5.0)        # H0 ~ N(67.4, 5) for LCDM (Planck)
 PRIOR_OMEGA_M = (0.315, 0.05)      # Omega_m ~ N(0.315, 0.05) (Planck)
 
-# Physical constants
-C_LIGHT = 2.998e5  # km/s
+# Likelihood
+SIGMA_LOG_PHI = 0.3                # Scatter of log10(phi) per UV LF bin [dex]
+
+# MCMC stopping criteria (INS-Statistiques.md)
+TAU_FACTOR = 50.0                  # N > 50 tau
+RHAT_MAX = 1.1                     # split R-hat < 1.1
+ESS_MIN = 100.0                    # ESS > 100
+CHECKPOINT_INTERVAL = 500          # Steps per HDF5 write (background thread)
+
+# Shared cosmology implementation (src/cosmology/models.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+from cosmology.models import BackgroundCosmology
+from cosmology.cache import grid_cache_info
+from statistics.likelihood import UVLFLikelihood
+from statistics.convergence import ConvergenceCriteria, ConvergenceController, run_until_converged
+from statistics.autocorr import autocorrelation_diagnostics
+from statistics.checkpoint import AsyncHDFBackend
+from utils.profiling import PROFILER, profiled
 
 
 # =============================================================================
 # COSMOLOGY CLASSES
 # =============================================================================
-class Cosmology:
-    """Base cosmology class with distance calculations"""
+class Cosmology(BackgroundCosmology):
+    """
+    Flat ΛCDM with the Phase 3 method names, served by cosmology.models
+
+    Subclasses select another registered E(z) variant.
+    """
 
     def __init__(self, H0=70.0, Omega_m=0.30):
-        self.H0 = H0
-        self.Omega_m = Omega_m
-        self.Omega_Lambda = 1.0 - Omega_m
+        super().__init__('lcdm', H0=H0, Omega_m=Omega_m, Omega_Lambda=1.0 - Omega_m)
         self.h = H0 / 100.0
 
     def E(self, z):
         """E(z) = H(z)/H0"""
-        return np.sqrt(self.Omega_m * (1 + z)**3 + self.Omega_Lambda)
+        return np.reshape(self.efunc(z), np.shape(z))
 
     def H(self, z):
         """Hubble parameter H(z) in km/s/Mpc"""
         return self.H0 * self.E(z)
 
-    def comoving_distance(self, z):
-        """Comoving distance in Mpc"""
-        def integrand(zp):
-            return 1.0 / self.E(zp)
-        result, _ = quad(integrand, 0, z)
-        return (C_LIGHT / self.H0) * result
-
-    def luminosity_distance(self, z):
-        """Luminosity distance in Mpc"""
-        return (1 + z) * self.comoving_distance(z)
-
     def comoving_volume_element(self, z):
         """dV/dz/dOmega in Mpc^3/sr"""
-        Dc = self.comoving_distance(z)
-        return (C_LIGHT / self.H0) * Dc**2 / self.E(z)
+        return self.differential_comoving_volume(z)
 
     def comoving_volume(self, z_low, z_high, area_deg2):
         """Comoving volume in Mpc^3 for given sky area"""
-        area_sr = area_deg2 * (np.pi / 180)**2
-        def integrand(z):
-            return self.comoving_volume_element(z)
-        result, _ = quad(integrand, z_low, z_high)
-        return result * area_sr
+        return self.shell_volume(z_low, z_high, area_deg2)
 
     def age_at_z(self, z):
         """Age of universe at redshift z in Gyr"""
-        H0_inv_Gyr = 978.0 / self.H0
-        def integrand(zp):
-            return 1.0 / ((1 + zp) * self.E(zp))
-        result, _ = quad(integrand, z, np.inf)
-        return result * H0_inv_Gyr
-
-    def lookback_time(self, z):
-        """Lookback time to redshift z in Gyr"""
-        return self.age_at_z(0) - self.age_at_z(z)
+        return self.age_of_universe(z)
 
 
 class JANUSCosmology(Cosmology):
-    """JANUS bimetric cosmology with negative matter component"""
+    """JANUS bimetric cosmology with negative matter component ('janus_u6' variant)"""
 
     def __init__(self, H0=75.0, Omega_plus=0.40, Omega_minus=0.05):
-        self.H0 = H0
-        self.Omega_plus = Omega_plus      # Positive matter density
-        self.Omega_minus = Omega_minus    # Negative matter density
+        BackgroundCosmology.__init__(self, 'janus_u6', H0=H0, Omega_plus=Omega_plus,
+                                     Omega_minus=Omega_minus)
         self.Omega_Lambda = 1.0 - Omega_plus - Omega_minus
         self.h = H0 / 100.0
         # For compatibility
         self.Omega_m = Omega_plus
 
-    def E(self, z):
-        """Modified E(z) for JANUS with negative matter term"""
-        return np.sqrt(
-            self.Omega_plus * (1 + z)**3 +
-            self.Omega_minus * (1 + z)**6 +  # Steeper evolution
-            self.Omega_Lambda
-        )
-
 
 class LCDMCosmology(Cosmology):
     """Standard Lambda-CDM cosmology"""
@@ -263,6 +247,7 @@ def compute_uv_lf(catalog, z_bins, survey_area_deg2=500.0, cosmo=None):
 # =============================================================================
 # STATISTICAL FUNCTIONS
 # =============================================================================
+@profiled('prior')
 def log_prior_gaussian(x, mu, sigma):
     """Gaussian log-prior: -0.5 * ((x - mu) / sigma)^2"""
     return -0.5 * ((x - mu) / sigma)**2
@@ -296,31 +281,6 @@ def gelman_rubin(chains):
     return R_hat
 
 
-def effective_sample_size(chain):
-    """Calculate effective sample size from autocorrelation"""
-    n = len(chain)
-    if n < 10:
-        return n
-
-    mean = np.mean(chain)
-    var = np.var(chain)
-    if var == 0:
-        return n
-
-    max_lag = min(n // 2, 500)
-    rho = np.zeros(max_lag)
-    for k in range(max_lag):
-        rho[k] = np.mean((chain[:n-k] - mean) * (chain[k:] - mean)) / var
-
-    first_neg = np.where(rho < 0.05)[0]
-    if len(first_neg) > 0:
-        tau = 1 + 2 * np.sum(rho[:first_neg[0]])
-    else:
-        tau = 1 + 2 * np.sum(rho)
-
-    return n / max(tau, 1)
-
-
 def compute_bic(log_likelihood, n_params, n_data):
     """Bayesian Information Criterion: BIC = -2*logL + k*ln(n)"""
     return -2 * log_likelihood + n_params * np.log(n_data)
@@ -334,6 +294,15 @@ def compute_aic(log_likelihood, n_params):
 # =============================================================================
 # MCMC LIKELIHOOD FUNCTIONS
 # =============================================================================
+@profiled('uvlf_pack')
+def uv_lf_likelihood(uv_lf_data):
+    """Binned UV LF packed for the likelihood (0.3 dex scatter); packed data pass through"""
+    if isinstance(uv_lf_data, UVLFLikelihood):
+        return uv_lf_data
+    return UVLFLikelihood.from_table(uv_lf_data, sigma_dex=SIGMA_LOG_PHI)
+
+
+@profiled('log_posterior_janus')
 def log_likelihood_janus(theta, uv_lf_data):
     """Log-posterior for JANUS model with Gaussian priors"""
     H0, Omega_plus, Omega_minus, log_phi_star, M_star, alpha = theta
@@ -359,22 +328,11 @@ def log_likelihood_janus(theta, uv_lf_data):
     log_prior += log_prior_gaussian(M_star, PRIOR_M_STAR[0], PRIOR_M_STAR[1])
     log_prior += log_prior_gaussian(alpha, PRIOR_ALPHA[0], PRIOR_ALPHA[1])
 
-    phi_star = 10**log_phi_star
-
-    # Chi-squared in log-space
-    chi2 = 0
-    for _, row in uv_lf_data.iterrows():
-        M_UV = row['M_UV']
-        phi_obs = row['phi']
-
-        phi_pred = schechter_function(M_UV, phi_star, M_star, alpha)
-
-        if phi_pred > 0 and phi_obs > 0:
-            chi2 += ((np.log10(phi_obs) - np.log10(phi_pred)) / 0.3)**2
-
-    return log_prior - 0.5 * chi2
+    # Chi-squared in log-space, all bins at once
+    return log_prior + uv_lf_likelihood(uv_lf_data)(log_phi_star, M_star, alpha)
 
 
+@profiled('log_posterior_lcdm')
 def log_likelihood_lcdm(theta, uv_lf_data):
     """Log-posterior for LCDM model with Gaussian priors"""
     H0, Omega_m, log_phi_star, M_star, alpha = theta
@@ -399,19 +357,8 @@ def log_likelihood_lcdm(theta, uv_lf_data):
     log_prior += log_prior_gaussian(M_star, PRIOR_M_STAR[0], PRIOR_M_STAR[1])
     log_prior += log_prior_gaussian(alpha, PRIOR_ALPHA[0], PRIOR_ALPHA[1])
 
-    phi_star = 10**log_phi_star
-
-    chi2 = 0
-    for _, row in uv_lf_data.iterrows():
-        M_UV = row['M_UV']
-        phi_obs = row['phi']
-
-        phi_pred = schechter_function(M_UV, phi_star, M_star, alpha)
-
-        if phi_pred > 0 and phi_obs > 0:
-            chi2 += ((np.log10(phi_obs) - np.log10(phi_pred)) / 0.3)**2
-
-    return log_prior - 0.5 * chi2
+    # Chi-squared in log-space, all bins at once
+    return log_prior + uv_lf_likelihood(uv_lf_data)(log_phi_star, M_star, alpha)
 
 
 # =============================================================================
@@ -629,20 +576,28 @@ def phase32_janus_mcmc(uv_lf_data, nwalkers=64, nsteps=3000, burn_frac=0.5):
 
     # Backend for saving
     backend_file = MCMC_DIR / 'janus_final.h5'
-    backend = emcee.backends.HDFBackend(str(backend_file))
+    backend = AsyncHDFBackend(backend_file, flush_interval=CHECKPOINT_INTERVAL)
     backend.reset(nwalkers, ndim)
 
     # Create sampler
     sampler = emcee.EnsembleSampler(
         nwalkers, ndim,
         log_likelihood_janus,
-        args=(uv_lf_data,),
+        args=(uv_lf_likelihood(uv_lf_data),),
         backend=backend
     )
 
-    # Run MCMC
-    print(f"Running MCMC: {nsteps} steps...")
-    sampler.run_mcmc(p0, nsteps, progress=True)
+    # Run MCMC until converged (R-hat, N > 50 tau, ESS), at most nsteps
+    print(f"Running MCMC: up to {nsteps} steps, stopping once converged...")
+    PROFILER.reset()
+    status = run_until_converged(sampler, p0, nsteps, progress=True,
+                                 controller=ConvergenceController(
+                                     ConvergenceCriteria(TAU_FACTOR, RHAT_MAX, ESS_MIN)))
+    backend.close()
+    if PROFILER.enabled:
+        print(f"  Stage profile (JANUS_PROFILE): {PROFILER.dump(MCMC_DIR, 'janus_profile')[0]}")
+    nsteps = sampler.iteration
+    print(f"  Stopped after {nsteps} steps (converged: {status.converged})")
 
     # Analyze results
     chain = sampler.get_chain()
@@ -654,8 +609,8 @@ def phase32_janus_mcmc(uv_lf_data, nwalkers=64, nsteps=3000, burn_frac=0.5):
     chains_split = np.transpose(chain_burned, (1, 0, 2))
     R_hat = gelman_rubin(chains_split)
 
-    # ESS
-    ess = [effective_sample_size(flat_chain[:, i]) for i in range(ndim)]
+    # ESS (batched FFT autocorrelation, walker-averaged)
+    ess = autocorrelation_diagnostics(chain_burned).ess.tolist()
 
     # Best-fit
     log_prob = sampler.get_log_prob(flat=True, discard=burn)
@@ -745,20 +700,28 @@ def phase33_lcdm_mcmc(uv_lf_data, nwalkers=64, nsteps=2000, burn_frac=0.5):
 
     # Backend
     backend_file = MCMC_DIR / 'lcdm_final.h5'
-    backend = emcee.backends.HDFBackend(str(backend_file))
+    backend = AsyncHDFBackend(backend_file, flush_interval=CHECKPOINT_INTERVAL)
     backend.reset(nwalkers, ndim)
 
     # Create sampler
     sampler = emcee.EnsembleSampler(
         nwalkers, ndim,
         log_likelihood_lcdm,
-        args=(uv_lf_data,),
+        args=(uv_lf_likelihood(uv_lf_data),),
         backend=backend
     )
 
-    # Run MCMC
-    print(f"Running MCMC: {nsteps} steps...")
-    sampler.run_mcmc(p0, nsteps, progress=True)
+    # Run MCMC until converged (R-hat, N > 50 tau, ESS), at most nsteps
+    print(f"Running MCMC: up to {nsteps} steps, stopping once converged...")
+    PROFILER.reset()
+    status = run_until_converged(sampler, p0, nsteps, progress=True,
+                                 controller=ConvergenceController(
+                                     ConvergenceCriteria(TAU_FACTOR, RHAT_MAX, ESS_MIN)))
+    backend.close()
+    if PROFILER.enabled:
+        print(f"  Stage profile (JANUS_PROFILE): {PROFILER.dump(MCMC_DIR, 'lcdm_profile')[0]}")
+    nsteps = sampler.iteration
+    print(f"  Stopped after {nsteps} steps (converged: {status.converged})")
 
     # Analyze results
     chain = sampler.get_chain()
@@ -770,8 +733,8 @@ def phase33_lcdm_mcmc(uv_lf_data, nwalkers=64, nsteps=2000, burn_frac=0.5):
     chains_split = np.transpose(chain_burned, (1, 0, 2))
     R_hat = gelman_rubin(chains_split)
 
-    # ESS
-    ess = [effective_sample_size(flat_chain[:, i]) for i in range(ndim)]
+    # ESS (batched FFT autocorrelation, walker-averaged)
+    ess = autocorrelation_diagnostics(chain_burned).ess.tolist()
 
     # Best-fit
     log_prob = sampler.get_log_prob(flat=True, discard=burn)
@@ -1278,6 +1241,10 @@ def main():
     print(f"\nModel Comparison: {comparison_results['interpretation']}")
     print(f"ΔBIC = {comparison_results['delta_bic']:.2f}")
 
+    cache = grid_cache_info()
+    print(f"\nCosmology grid cache: {cache.hits} hits, {cache.misses} misses "
+          f"({cache.currsize}/{cache.maxsize} tables)")
+
     print(f"\nOutput files:")
     print(f"  - Figures: {FIGURES_DIR}")
     print(f"  - MCMC chains: {MCMC_DIR}")
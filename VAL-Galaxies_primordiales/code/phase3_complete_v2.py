@@ -56,6 +56,8 @@ except ImportError:
 # Import validated cosmology modules
 from cosmology.janus import JANUSCosmology
 from cosmology.lcdm import LCDMCosmology
+from statistics.likelihood import UVLFLikelihood
+from utils.profiling import PROFILER, profiled
 
 # Setup paths (BASE_DIR already defined above)
 DATA_DIR = BASE_DIR / 'data/jwst/processed'
@@ -147,102 +149,92 @@ def compute_uv_lf_bins(catalog, z_bins=[(6.5, 8), (8, 10), (10, 12), (12, 16)],
 # MCMC FITTING
 # =============================================================================
 
-def log_prior_janus(theta):
-    """Log prior for JANUS parameters"""
-    H0, Omega_plus, Omega_minus, log_phi_star, M_star, alpha = theta
+@profiled('prior')
+def log_prior_janus_batch(thetas):
+    """Log prior for JANUS parameters, one value per walker of (nwalkers, 6)"""
+    H0, Omega_plus, Omega_minus, log_phi_star, M_star, alpha = np.atleast_2d(thetas).T
 
     # Physical priors
-    if not (50 < H0 < 100):
-        return -np.inf
-    if not (0.1 < Omega_plus < 0.9):
-        return -np.inf
-    if not (0.0 < Omega_minus < 0.3):
-        return -np.inf
-    if not (-6 < log_phi_star < -2):
-        return -np.inf
-    if not (-25 < M_star < -18):
-        return -np.inf
-    if not (-3.0 < alpha < -1.0):
-        return -np.inf
-    if Omega_plus + Omega_minus > 1.0:
-        return -np.inf
-
-    return 0.0
+    inside = ((50 < H0) & (H0 < 100) &
+              (0.1 < Omega_plus) & (Omega_plus < 0.9) &
+              (0.0 < Omega_minus) & (Omega_minus < 0.3) &
+              (-6 < log_phi_star) & (log_phi_star < -2) &
+              (-25 < M_star) & (M_star < -18) &
+              (-3.0 < alpha) & (alpha < -1.0) &
+              (Omega_plus + Omega_minus <= 1.0))
+
+    return np.where(inside, 0.0, -np.inf)
+
+
+@profiled('prior')
+def log_prior_lcdm_batch(thetas):
+    """Log prior for LCDM parameters, one value per walker of (nwalkers, 5)"""
+    H0, Omega_m, log_phi_star, M_star, alpha = np.atleast_2d(thetas).T
+
+    inside = ((50 < H0) & (H0 < 100) &
+              (0.1 < Omega_m) & (Omega_m < 0.6) &
+              (-6 < log_phi_star) & (log_phi_star < -2) &
+              (-25 < M_star) & (M_star < -18) &
+              (-3.0 < alpha) & (alpha < -1.0))
+
+    return np.where(inside, 0.0, -np.inf)
+
+
+def log_prior_janus(theta):
+    """Log prior for JANUS parameters"""
+    return float(log_prior_janus_batch(theta)[0])
 
 
 def log_prior_lcdm(theta):
     """Log prior for LCDM parameters"""
-    H0, Omega_m, log_phi_star, M_star, alpha = theta
+    return float(log_prior_lcdm_batch(theta)[0])
 
-    if not (50 < H0 < 100):
-        return -np.inf
-    if not (0.1 < Omega_m < 0.6):
-        return -np.inf
-    if not (-6 < log_phi_star < -2):
-        return -np.inf
-    if not (-25 < M_star < -18):
-        return -np.inf
-    if not (-3.0 < alpha < -1.0):
-        return -np.inf
 
-    return 0.0
+@profiled('uvlf_pack')
+def pack_uv_lf(uv_lf_data):
+    """UV LF bins packed once for the vectorized likelihood; packed data pass through"""
+    if isinstance(uv_lf_data, UVLFLikelihood):
+        return uv_lf_data
+    # Errors propagated to log10(phi); -100 per bin where the model underflows
+    return UVLFLikelihood.from_table(uv_lf_data, magnitude='M_mid', underflow_penalty=100)
 
 
 def log_likelihood_uv_lf(phi_star, M_star, alpha, uv_lf_data):
     """Log likelihood for UV LF fit"""
-    log_L = 0.0
-
-    for _, row in uv_lf_data.iterrows():
-        M = row['M_mid']
-        phi_obs = row['phi']
-        phi_err = row['phi_err']
+    return pack_uv_lf(uv_lf_data)(np.log10(phi_star), M_star, alpha)
 
-        if phi_err <= 0 or phi_obs <= 0:
-            continue
 
-        phi_model = schechter_function(M, phi_star, M_star, alpha)
+def _log_posterior_batch(log_prior_batch, thetas, uv_lf_data):
+    """Prior + UV LF likelihood for the walkers inside the prior (last 3 columns Schechter)"""
+    thetas = np.atleast_2d(thetas)
+    log_post = log_prior_batch(thetas)
+    inside = np.isfinite(log_post)
+    if np.any(inside):
+        log_phi_star, M_star, alpha = thetas[inside, -3:].T
+        log_post[inside] += pack_uv_lf(uv_lf_data)(log_phi_star, M_star, alpha)
+    return log_post
 
-        if phi_model <= 0:
-            log_L -= 100
-            continue
 
-        # Log-space likelihood
-        log_phi_obs = np.log10(phi_obs)
-        log_phi_model = np.log10(phi_model)
-        log_err = 0.434 * phi_err / phi_obs
+@profiled('log_posterior_janus')
+def log_posterior_janus_batch(thetas, uv_lf_data):
+    """Log posterior for JANUS model, walker matrix (nwalkers, 6) -> (nwalkers,)"""
+    return _log_posterior_batch(log_prior_janus_batch, thetas, uv_lf_data)
 
-        chi2 = ((log_phi_obs - log_phi_model) / log_err)**2
-        log_L -= 0.5 * chi2
 
-    return log_L
+@profiled('log_posterior_lcdm')
+def log_posterior_lcdm_batch(thetas, uv_lf_data):
+    """Log posterior for LCDM model, walker matrix (nwalkers, 5) -> (nwalkers,)"""
+    return _log_posterior_batch(log_prior_lcdm_batch, thetas, uv_lf_data)
 
 
 def log_posterior_janus(theta, uv_lf_data):
     """Log posterior for JANUS model"""
-    lp = log_prior_janus(theta)
-    if not np.isfinite(lp):
-        return -np.inf
-
-    H0, Omega_plus, Omega_minus, log_phi_star, M_star, alpha = theta
-    phi_star = 10**log_phi_star
-
-    ll = log_likelihood_uv_lf(phi_star, M_star, alpha, uv_lf_data)
-
-    return lp + ll
+    return float(log_posterior_janus_batch(theta, uv_lf_data)[0])
 
 
 def log_posterior_lcdm(theta, uv_lf_data):
     """Log posterior for LCDM model"""
-    lp = log_prior_lcdm(theta)
-    if not np.isfinite(lp):
-        return -np.inf
-
-    H0, Omega_m, log_phi_star, M_star, alpha = theta
-    phi_star = 10**log_phi_star
-
-    ll = log_likelihood_uv_lf(phi_star, M_star, alpha, uv_lf_data)
-
-    return lp + ll
+    return float(log_posterior_lcdm_batch(theta, uv_lf_data)[0])
 
 
 def calculate_rhat(chain):
@@ -288,6 +280,7 @@ def calculate_rhat(chain):
 
 def run_mcmc_janus(uv_lf_data, nwalkers=32, nsteps=500, backend_file=None):
     """Run MCMC for JANUS model"""
+    uv_lf = pack_uv_lf(uv_lf_data)
     ndim = 6
 
     # Initial positions
@@ -316,19 +309,25 @@ def run_mcmc_janus(uv_lf_data, nwalkers=32, nsteps=500, backend_file=None):
     # Create sampler
     sampler = emcee.EnsembleSampler(
         nwalkers, ndim,
-        lambda p: log_posterior_janus(p, uv_lf_data),
-        backend=backend
+        log_posterior_janus_batch,
+        args=(uv_lf,),
+        backend=backend,
+        vectorize=True
     )
 
     # Run
     if nsteps > 0:
+        PROFILER.reset()
         sampler.run_mcmc(p0, nsteps, progress=True)
+        if PROFILER.enabled:
+            print(f"Stage profile (JANUS_PROFILE): {PROFILER.dump(MCMC_DIR, 'janus_v2_profile')[0]}")
 
     return sampler
 
 
 def run_mcmc_lcdm(uv_lf_data, nwalkers=32, nsteps=500, backend_file=None):
     """Run MCMC for LCDM model"""
+    uv_lf = pack_uv_lf(uv_lf_data)
     ndim = 5
 
     # Initial positions
@@ -356,13 +355,18 @@ def run_mcmc_lcdm(uv_lf_data, nwalkers=32, nsteps=500, backend_file=None):
     # Create sampler
     sampler = emcee.EnsembleSampler(
         nwalkers, ndim,
-        lambda p: log_posterior_lcdm(p, uv_lf_data),
-        backend=backend
+        log_posterior_lcdm_batch,
+        args=(uv_lf,),
+        backend=backend,
+        vectorize=True
     )
 
     # Run
     if nsteps > 0:
+        PROFILER.reset()
         sampler.run_mcmc(p0, nsteps, progress=True)
+        if PROFILER.enabled:
+            print(f"Stage profile (JANUS_PROFILE): {PROFILER.dump(MCMC_DIR, 'lcdm_v2_profile')[0]}")
 
     return sampler
 
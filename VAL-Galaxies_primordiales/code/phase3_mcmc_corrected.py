@@ -20,7 +20,6 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
-from scipy.integrate import quad
 import json
 from datetime import datetime
 import warnings
@@ -35,6 +34,10 @@ except ImportError as e:
     print(f"Missing dependency: {e}")
     sys.exit(1)
 
+# Shared cosmology implementation (src/cosmology/models.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+from cosmology.models import BackgroundCosmology
+
 # Setup paths
 BASE_DIR = Path('/Users/patrickguerin/Desktop/JANUS/VAL-Galaxies_primordiales')
 DATA_DIR = BASE_DIR / 'data/jwst/processed'
@@ -60,51 +63,19 @@ plt.rcParams.update({
 # COSMOLOGICAL MODELS
 # =============================================================================
 
-class JANUSCosmology:
-    """JANUS bimetric cosmology model"""
+class JANUSCosmology(BackgroundCosmology):
+    """JANUS bimetric cosmology model ('janus_u6' variant of cosmology.models)"""
 
     def __init__(self, H0=70.0, Omega_plus=0.30, Omega_minus=0.05):
-        self.H0 = H0
-        self.Omega_plus = Omega_plus
-        self.Omega_minus = Omega_minus
+        super().__init__('janus_u6', H0=H0, Omega_plus=Omega_plus, Omega_minus=Omega_minus)
         self.Omega_Lambda = 1.0 - Omega_plus - Omega_minus
 
-    def hubble_parameter(self, z):
-        return self.H0 * np.sqrt(
-            self.Omega_plus * (1 + z)**3 +
-            self.Omega_minus * (1 + z)**6 +
-            self.Omega_Lambda
-        )
-
-    def age_of_universe(self, z):
-        """Age in Gyr"""
-        H0_inv_Gyr = 978.0 / self.H0
-        def integrand(zp):
-            return 1.0 / ((1 + zp) * self.hubble_parameter(zp) / self.H0)
-        result, _ = quad(integrand, z, np.inf)
-        return result * H0_inv_Gyr
-
 
-class LCDMCosmology:
-    """Standard LCDM cosmology model"""
+class LCDMCosmology(BackgroundCosmology):
+    """Standard LCDM cosmology model ('lcdm' variant of cosmology.models)"""
 
     def __init__(self, H0=67.4, Omega_m=0.315):
-        self.H0 = H0
-        self.Omega_m = Omega_m
-        self.Omega_Lambda = 1.0 - Omega_m
-
-    def hubble_parameter(self, z):
-        return self.H0 * np.sqrt(
-            self.Omega_m * (1 + z)**3 + self.Omega_Lambda
-        )
-
-    def age_of_universe(self, z):
-        """Age in Gyr"""
-        H0_inv_Gyr = 978.0 / self.H0
-        def integrand(zp):
-            return 1.0 / ((1 + zp) * self.hubble_parameter(zp) / self.H0)
-        result, _ = quad(integrand, z, np.inf)
-        return result * H0_inv_Gyr
+        super().__init__('lcdm', H0=H0, Omega_m=Omega_m, Omega_Lambda=1.0 - Omega_m)
 
 
 # =============================================================================
@@ -21,7 +21,6 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
-from scipy.integrate import quad
 import json
 from datetime import datetime
 import warnings
@@ -36,6 +35,10 @@ except ImportError as e:
     print(f"Missing dependency: {e}")
     sys.exit(1)
 
+# Shared statistics implementation (src/statistics)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+from statistics.autocorr import autocorrelation_diagnostics
+
 # Setup paths
 BASE_DIR = Path('/Users/patrickguerin/Desktop/JANUS/VAL-Galaxies_primordiales')
 DATA_DIR = BASE_DIR / 'data/jwst/processed'
@@ -70,60 +73,42 @@ PRIOR_H0_LCDM = (70.0, 5.0)    # H0 ~ N(70, 5) for LCDM
 PRIOR_OMEGA_M = (0.30, 0.05)   # Omega_m ~ N(0.30, 0.05)
 
 
+# Shared cosmology implementation (src/cosmology/models.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+from cosmology.models import BackgroundCosmology
+
+
 # =============================================================================
 # COSMOLOGY
 # =============================================================================
-class Cosmology:
-    """Generic cosmology class"""
+class Cosmology(BackgroundCosmology):
+    """Generic cosmology class (flat ΛCDM, served by cosmology.models)"""
     c = 2.998e5  # km/s
 
     def __init__(self, H0=70.0, Omega_m=0.30):
-        self.H0 = H0
-        self.Omega_m = Omega_m
-        self.Omega_Lambda = 1.0 - Omega_m
+        super().__init__('lcdm', H0=H0, Omega_m=Omega_m, Omega_Lambda=1.0 - Omega_m)
 
     def E(self, z):
         """E(z) = H(z)/H0"""
-        return np.sqrt(self.Omega_m * (1 + z)**3 + self.Omega_Lambda)
-
-    def comoving_distance(self, z):
-        """Comoving distance in Mpc"""
-        def integrand(zp):
-            return 1.0 / self.E(zp)
-        result, _ = quad(integrand, 0, z)
-        return (self.c / self.H0) * result
+        return np.reshape(self.efunc(z), np.shape(z))
 
     def comoving_volume_element(self, z):
         """dV/dz/dOmega in Mpc^3/sr"""
-        Dc = self.comoving_distance(z)
-        return (self.c / self.H0) * Dc**2 / self.E(z)
+        return self.differential_comoving_volume(z)
 
     def comoving_volume(self, z_low, z_high, area_deg2):
-        """Comoving volume in Mpc^3 for given area"""
-        area_sr = area_deg2 * (np.pi / 180)**2
-        def integrand(z):
-            return self.comoving_volume_element(z)
-        result, _ = quad(integrand, z_low, z_high)
-        return result * area_sr
+        """Comoving volume in Mpc^3 for given sky area"""
+        return self.shell_volume(z_low, z_high, area_deg2)
 
 
 class JANUSCosmology(Cosmology):
-    """JANUS bimetric cosmology"""
+    """JANUS bimetric cosmology ('janus_u6' variant)"""
 
     def __init__(self, H0=75.0, Omega_plus=0.40, Omega_minus=0.05):
-        self.H0 = H0
-        self.Omega_plus = Omega_plus
-        self.Omega_minus = Omega_minus
+        BackgroundCosmology.__init__(self, 'janus_u6', H0=H0, Omega_plus=Omega_plus,
+                                     Omega_minus=Omega_minus)
         self.Omega_Lambda = 1.0 - Omega_plus - Omega_minus
 
-    def E(self, z):
-        """Modified E(z) for JANUS"""
-        return np.sqrt(
-            self.Omega_plus * (1 + z)**3 +
-            self.Omega_minus * (1 + z)**6 +
-            self.Omega_Lambda
-        )
-
 
 # =============================================================================
 # UV LUMINOSITY FUNCTION
@@ -343,34 +328,6 @@ def gelman_rubin(chains):
     return R_hat
 
 
-def effective_sample_size(chain):
-    """Calculate ESS using autocorrelation"""
-    n = len(chain)
-    if n < 10:
-        return n
-
-    # Simple autocorrelation-based ESS
-    mean = np.mean(chain)
-    var = np.var(chain)
-    if var == 0:
-        return n
-
-    # Calculate autocorrelation up to lag n/2
-    max_lag = min(n // 2, 500)
-    rho = np.zeros(max_lag)
-    for k in range(max_lag):
-        rho[k] = np.mean((chain[:n-k] - mean) * (chain[k:] - mean)) / var
-
-    # Find first negative autocorrelation
-    first_neg = np.where(rho < 0.05)[0]
-    if len(first_neg) > 0:
-        tau = 1 + 2 * np.sum(rho[:first_neg[0]])
-    else:
-        tau = 1 + 2 * np.sum(rho)
-
-    return n / max(tau, 1)
-
-
 # =============================================================================
 # MCMC RUNNERS
 # =============================================================================
@@ -468,8 +425,8 @@ def analyze_mcmc(sampler, model_name, param_names, burn_frac=0.5):
 
     R_hat = gelman_rubin(chains_split)
 
-    # ESS per parameter
-    ess = [effective_sample_size(flat_chain[:, i]) for i in range(n_params)]
+    # ESS per parameter (batched FFT autocorrelation, walker-averaged)
+    ess = autocorrelation_diagnostics(chain_burned).ess.tolist()
 
     # Best-fit
     log_prob = sampler.get_log_prob(flat=True, discard=burn)
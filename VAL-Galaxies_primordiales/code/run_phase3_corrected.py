@@ -30,9 +30,10 @@ sys.path.insert(0, str(BASE_DIR / 'code'))
 from phase3_complete_v2 import (
     compute_uv_lf_bins, schechter_function,
     log_prior_janus, log_prior_lcdm,
-    log_posterior_janus, log_posterior_lcdm,
+    log_posterior_janus_batch, log_posterior_lcdm_batch, pack_uv_lf,
     calculate_rhat
 )
+from statistics.posterior import Posterior, PooledPosterior
 
 import emcee
 import corner
@@ -58,7 +59,7 @@ plt.rcParams.update({
 })
 
 
-def run_mcmc_janus_corrected(uv_lf_data, nwalkers=64, nsteps=2000):
+def run_mcmc_janus_corrected(uv_lf_data, nwalkers=64, nsteps=2000, processes=None):
     """Run JANUS MCMC with more iterations for convergence"""
     ndim = 6
 
@@ -80,21 +81,30 @@ def run_mcmc_janus_corrected(uv_lf_data, nwalkers=64, nsteps=2000):
     backend = emcee.backends.HDFBackend(backend_file)
     backend.reset(nwalkers, ndim)
 
-    # Create sampler
+    # Create sampler (picklable posterior; with processes > 1 the UV LF
+    # reaches each worker once, when the pool starts)
+    posterior = Posterior(log_posterior_janus_batch, pack_uv_lf(uv_lf_data), vectorize=True)
+    pool = posterior.pool(processes) if processes and processes > 1 else None
     sampler = emcee.EnsembleSampler(
         nwalkers, ndim,
-        lambda p: log_posterior_janus(p, uv_lf_data),
-        backend=backend
+        PooledPosterior(posterior, pool) if pool else posterior,
+        backend=backend,
+        vectorize=True
     )
 
     # Run
     print(f"Running JANUS MCMC ({nwalkers} walkers, {nsteps} steps)...")
-    sampler.run_mcmc(p0, nsteps, progress=True)
+    try:
+        sampler.run_mcmc(p0, nsteps, progress=True)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
 
     return sampler
 
 
-def run_mcmc_lcdm_corrected(uv_lf_data, nwalkers=64, nsteps=2000):
+def run_mcmc_lcdm_corrected(uv_lf_data, nwalkers=64, nsteps=2000, processes=None):
     """Run LCDM MCMC with more iterations for convergence"""
     ndim = 5
 
@@ -115,16 +125,25 @@ def run_mcmc_lcdm_corrected(uv_lf_data, nwalkers=64, nsteps=2000):
     backend = emcee.backends.HDFBackend(backend_file)
     backend.reset(nwalkers, ndim)
 
-    # Create sampler
+    # Create sampler (picklable posterior; with processes > 1 the UV LF
+    # reaches each worker once, when the pool starts)
+    posterior = Posterior(log_posterior_lcdm_batch, pack_uv_lf(uv_lf_data), vectorize=True)
+    pool = posterior.pool(processes) if processes and processes > 1 else None
     sampler = emcee.EnsembleSampler(
         nwalkers, ndim,
-        lambda p: log_posterior_lcdm(p, uv_lf_data),
-        backend=backend
+        PooledPosterior(posterior, pool) if pool else posterior,
+        backend=backend,
+        vectorize=True
     )
 
     # Run
     print(f"Running LCDM MCMC ({nwalkers} walkers, {nsteps} steps)...")
-    sampler.run_mcmc(p0, nsteps, progress=True)
+    try:
+        sampler.run_mcmc(p0, nsteps, progress=True)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
 
     return sampler
 
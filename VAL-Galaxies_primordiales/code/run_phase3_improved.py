@@ -32,9 +32,10 @@ sys.path.insert(0, str(BASE_DIR / 'code'))
 from phase3_complete_v2 import (
     compute_uv_lf_bins, schechter_function,
     log_prior_janus, log_prior_lcdm,
-    log_posterior_janus, log_posterior_lcdm,
+    log_posterior_janus_batch, log_posterior_lcdm_batch, pack_uv_lf,
     calculate_rhat
 )
+from statistics.posterior import Posterior, PooledPosterior
 
 import emcee
 import corner
@@ -65,7 +66,7 @@ plt.rcParams.update({
 })
 
 
-def run_mcmc_janus_improved(uv_lf_data):
+def run_mcmc_janus_improved(uv_lf_data, processes=None):
     """Run JANUS MCMC with improved parameters"""
     ndim = 6
 
@@ -87,22 +88,31 @@ def run_mcmc_janus_improved(uv_lf_data):
     backend = emcee.backends.HDFBackend(backend_file)
     backend.reset(N_WALKERS, ndim)
 
-    # Create sampler
+    # Create sampler (picklable posterior; with processes > 1 the UV LF
+    # reaches each worker once, when the pool starts)
+    posterior = Posterior(log_posterior_janus_batch, pack_uv_lf(uv_lf_data), vectorize=True)
+    pool = posterior.pool(processes) if processes and processes > 1 else None
     sampler = emcee.EnsembleSampler(
         N_WALKERS, ndim,
-        lambda p: log_posterior_janus(p, uv_lf_data),
-        backend=backend
+        PooledPosterior(posterior, pool) if pool else posterior,
+        backend=backend,
+        vectorize=True
     )
 
     # Run
     print(f"Running JANUS MCMC ({N_WALKERS} walkers, {N_STEPS} steps)...")
     print(f"This will take approximately 3-5 minutes...")
-    sampler.run_mcmc(p0, N_STEPS, progress=True)
+    try:
+        sampler.run_mcmc(p0, N_STEPS, progress=True)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
 
     return sampler
 
 
-def run_mcmc_lcdm_improved(uv_lf_data):
+def run_mcmc_lcdm_improved(uv_lf_data, processes=None):
     """Run LCDM MCMC with improved parameters"""
     ndim = 5
 
@@ -123,17 +133,26 @@ def run_mcmc_lcdm_improved(uv_lf_data):
     backend = emcee.backends.HDFBackend(backend_file)
     backend.reset(N_WALKERS, ndim)
 
-    # Create sampler
+    # Create sampler (picklable posterior; with processes > 1 the UV LF
+    # reaches each worker once, when the pool starts)
+    posterior = Posterior(log_posterior_lcdm_batch, pack_uv_lf(uv_lf_data), vectorize=True)
+    pool = posterior.pool(processes) if processes and processes > 1 else None
     sampler = emcee.EnsembleSampler(
         N_WALKERS, ndim,
-        lambda p: log_posterior_lcdm(p, uv_lf_data),
-        backend=backend
+        PooledPosterior(posterior, pool) if pool else posterior,
+        backend=backend,
+        vectorize=True
     )
 
     # Run
     print(f"Running LCDM MCMC ({N_WALKERS} walkers, {N_STEPS} steps)...")
     print(f"This will take approximately 3-5 minutes...")
-    sampler.run_mcmc(p0, N_STEPS, progress=True)
+    try:
+        sampler.run_mcmc(p0, N_STEPS, progress=True)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
 
     return sampler
 
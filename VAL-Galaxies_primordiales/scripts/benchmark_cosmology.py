@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: backends ΛCDM (astropy vs NumPy natif)
+=================================================
+
+Mesure le coût de construction d'un LCDMCosmology et le coût par appel des
+distances/âges pour:
+1. backend='astropy' (référence de validation)
+2. backend='numpy', method='numerical' (intégrateur sur grille partagée)
+3. backend='numpy', method='analytic' (formes closes, Tcmb0=0)
+
+et vérifie l'accord numérique avec astropy.
+
+Usage:
+    python3 scripts/benchmark_cosmology.py [--repeat N]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from cosmology import LCDMCosmology
+
+Z_SCALAR = 10.0
+Z_ARRAY = np.linspace(0.1, 20.0, 1000)
+
+CONFIGS = {
+    'astropy': dict(backend='astropy'),
+    'numpy': dict(backend='numpy'),
+    'numpy-analytic': dict(backend='numpy', method='analytic', Tcmb0=0.0),
+}
+
+
+def best_time(stmt, repeat):
+    """Best wall time per call [s] over `repeat` rounds"""
+    timer = timeit.Timer(stmt)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def benchmark(repeat):
+    """Time construction and per-call evaluation for every configuration"""
+    rng = np.random.default_rng(42)
+    results = {}
+
+    for name, kwargs in CONFIGS.items():
+        # Fresh parameters at each construction, as in an MCMC proposal
+        def construct_flat():
+            Om = rng.uniform(0.2, 0.4)
+            return LCDMCosmology(H0=rng.uniform(60, 80), Omega_m=Om,
+                                 Omega_Lambda=1.0 - Om, **kwargs)
+
+        cosmo = construct_flat()
+        results[name] = {
+            'construction': best_time(construct_flat, repeat),
+            'd_L(z) scalar': best_time(lambda: cosmo.luminosity_distance(Z_SCALAR), repeat),
+            'd_L(z) 1000 z': best_time(lambda: cosmo.luminosity_distance(Z_ARRAY), repeat),
+            'age(z) scalar': best_time(
+                lambda: construct_flat().age_of_universe(Z_SCALAR), repeat),
+        }
+    return results
+
+
+def accuracy():
+    """Maximum relative deviation of the native backend from astropy"""
+    ref = LCDMCosmology(backend='astropy')
+    native = LCDMCosmology()
+    z = Z_ARRAY[::50]
+    deviations = {}
+    for method in ['comoving_distance', 'luminosity_distance', 'comoving_volume',
+                   'age_of_universe', 'lookback_time']:
+        expected = np.array([getattr(ref, method)(zi) for zi in z])
+        deviations[method] = np.max(np.abs(getattr(native, method)(z) / expected - 1.0))
+    return deviations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=5, help='Timing rounds (best kept)')
+    args = parser.parse_args()
+
+    results = benchmark(args.repeat)
+    reference = results['astropy']
+
+    print("=" * 78)
+    print("LCDMCosmology: temps par opération (meilleur de", args.repeat, "séries)")
+    print("=" * 78)
+    print(f"{'opération':<18}" + "".join(f"{name:>20}" for name in results))
+    for op in reference:
+        row = f"{op:<18}"
+        for name, timings in results.items():
+            speedup = reference[op] / timings[op]
+            row += f"{timings[op] * 1e6:>11.1f} µs ×{speedup:<6.0f}"
+        print(row)
+    print("(age(z) scalar inclut la construction: cas d'une proposition MCMC)")
+
+    print("\nÉcart relatif maximal numpy vs astropy:")
+    for method, deviation in accuracy().items():
+        print(f"  {method:<22} {deviation:.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,13 @@
 """Cosmology modules for JANUS and ΛCDM models"""
 
-from .janus import JANUSCosmology
-from .lcdm import LCDMCosmology
+from .janus import JANUSCosmology, JANUSCosmologyBatch
+from .lcdm import LCDMCosmology, LCDMCosmologyBatch
+from .emulator import JANUSEmulator
+from .bimetric import BimetricSolution
+from .models import Cosmology, BackgroundCosmology, register_variant, VARIANTS
+from .cache import grid_cache_info, clear_grid_cache
 
-__all__ = ['JANUSCosmology', 'LCDMCosmology']
+__all__ = ['JANUSCosmology', 'LCDMCosmology',
+           'JANUSCosmologyBatch', 'LCDMCosmologyBatch', 'JANUSEmulator', 'BimetricSolution',
+           'Cosmology', 'BackgroundCosmology', 'register_variant', 'VARIANTS',
+           'grid_cache_info', 'clear_grid_cache']
@@ -0,0 +1,170 @@
+"""
+Closed-Form Background Integrals
+
+Analytic line-of-sight and age integrals for expansion histories of the form
+
+    E²(u) = Omega_m u³ + Omega_k u²,    u = 1 + z
+
+which covers the JANUS Friedmann equation (effective matter term plus
+curvature). Both integrals reduce to elementary functions:
+
+    D(u) = ∫_1^u du' / (u' sqrt(Omega_m u' + Omega_k))
+    T(u) = ∫_u^u_max du' / (u'² sqrt(Omega_m u' + Omega_k))
+
+Near-flat parameters (|Omega_k| < ANALYTIC_OMEGA_K_MIN) suffer catastrophic
+cancellation and are not covered: callers fall back to numerical integration.
+
+Flat ΛCDM without radiation, E²(u) = Omega_m u³ + Omega_Lambda, has an
+elementary age and a comoving distance given by an incomplete elliptic
+integral of the first kind, evaluated through Carlson's R_F.
+"""
+
+import numpy as np
+from scipy.special import elliprf
+
+try:
+    from ..utils.constants import ANALYTIC_OMEGA_K_MIN
+except ImportError:
+    from utils.constants import ANALYTIC_OMEGA_K_MIN
+
+
+def matter_curvature_supported(Omega_m, Omega_k):
+    """
+    Check whether the closed forms apply
+
+    Requires a positive matter term, E² > 0 at z=0, and curvature far enough
+    from zero for the curved-space antiderivatives to be well conditioned.
+    Accepts scalars or arrays of parameters (one entry per model).
+    """
+    return ((np.asarray(Omega_m) > 0) & (np.asarray(Omega_m) + Omega_k > 0)
+            & (np.abs(Omega_k) >= ANALYTIC_OMEGA_K_MIN))
+
+
+def _log_arctan_primitive(u, Omega_m, Omega_k):
+    """Antiderivative of 1 / (u sqrt(Omega_m u + Omega_k)), Omega_k != 0"""
+    s = np.sqrt(Omega_m * u + Omega_k)
+    r = np.sqrt(np.abs(Omega_k))
+    if np.ndim(Omega_k) == 0:
+        if Omega_k > 0:
+            return np.log((s - r) / (s + r)) / r
+        return 2.0 * np.arctan(s / r) / r
+
+    # Parameter arrays: evaluate both branches, select per model
+    with np.errstate(divide='ignore', invalid='ignore'):
+        open_branch = np.log((s - r) / (s + r)) / r
+        closed_branch = 2.0 * np.arctan(s / r) / r
+    return np.where(Omega_k > 0, open_branch, closed_branch)
+
+
+def _age_primitive(u, Omega_m, Omega_k):
+    """Antiderivative of 1 / (u² sqrt(Omega_m u + Omega_k)), Omega_k != 0"""
+    s = np.sqrt(Omega_m * u + Omega_k)
+    return (-s / (Omega_k * u)
+            - Omega_m / (2.0 * Omega_k) * _log_arctan_primitive(u, Omega_m, Omega_k))
+
+
+def matter_curvature_distance(z, Omega_m, Omega_k):
+    """
+    Dimensionless comoving distance ∫_0^z dz' / E(z')
+
+    Parameters
+    ----------
+    z : array-like
+        Redshift(s), any shape. Values z <= 0 map to 0.
+    Omega_m, Omega_k : float or array
+        Effective matter and curvature terms of E², broadcast against z
+
+    Returns
+    -------
+    D : array
+        H0 d_c / c, same shape as z
+    """
+    u = 1.0 + np.maximum(np.asarray(z, dtype=float), 0.0)
+    return (_log_arctan_primitive(u, Omega_m, Omega_k)
+            - _log_arctan_primitive(1.0, Omega_m, Omega_k))
+
+
+def matter_curvature_age(z, Omega_m, Omega_k, z_max):
+    """
+    Dimensionless cosmic time ∫_z^z_max dz' / ((1+z') E(z'))
+
+    Parameters
+    ----------
+    z : array-like
+        Redshift(s), any shape
+    Omega_m, Omega_k : float or array
+        Effective matter and curvature terms of E², broadcast against z
+    z_max : float
+        Upper integration limit
+
+    Returns
+    -------
+    T : array
+        H0 t(z), same shape as z
+    """
+    u = 1.0 + np.minimum(np.asarray(z, dtype=float), z_max)
+    return (_age_primitive(1.0 + z_max, Omega_m, Omega_k)
+            - _age_primitive(u, Omega_m, Omega_k))
+
+
+# ∫_x^∞ dt / sqrt(t³ + 1) = 3^(-1/4) F(φ, k),  cos φ = (x + 1 - √3) / (x + 1 + √3)
+_SQRT3 = np.sqrt(3.0)
+_K2 = (2.0 + _SQRT3) / 4.0
+_K_COMPLETE = elliprf(0.0, 1.0 - _K2, 1.0)
+
+
+def _cubic_tail(x):
+    """∫_x^∞ dt / sqrt(t³ + 1) for x >= 0, via Carlson's R_F"""
+    cos_phi = (x + 1.0 - _SQRT3) / (x + 1.0 + _SQRT3)
+    sin2_phi = 1.0 - cos_phi**2
+    F_reduced = np.sqrt(sin2_phi) * elliprf(cos_phi**2, 1.0 - _K2 * sin2_phi, 1.0)
+    # R_F form holds for φ <= π/2; beyond, F(φ) = 2K - F(π - φ)
+    return np.where(cos_phi >= 0, F_reduced, 2.0 * _K_COMPLETE - F_reduced) / 3.0**0.25
+
+
+def flat_lambda_supported(Omega_m, Omega_Lambda, Omega_k, Omega_r):
+    """Check whether the flat ΛCDM closed forms apply (per model for arrays)"""
+    return ((np.asarray(Omega_m) > 0) & (np.asarray(Omega_Lambda) > 0)
+            & (np.asarray(Omega_k) == 0) & (np.asarray(Omega_r) == 0))
+
+
+def flat_lambda_distance(z, Omega_m, Omega_Lambda):
+    """
+    Dimensionless comoving distance for flat ΛCDM without radiation
+
+    Parameters
+    ----------
+    z : array-like
+        Redshift(s), any shape. Values z <= 0 map to 0.
+    Omega_m, Omega_Lambda : float or array
+        Density parameters, broadcast against z
+
+    Returns
+    -------
+    D : array
+        H0 d_c / c = ∫_0^z dz' / sqrt(Omega_m (1+z')³ + Omega_Lambda)
+    """
+    u = 1.0 + np.maximum(np.asarray(z, dtype=float), 0.0)
+    s = np.cbrt(Omega_Lambda / Omega_m)
+    return (_cubic_tail(1.0 / s) - _cubic_tail(u / s)) / np.sqrt(Omega_m * s)
+
+
+def flat_lambda_age(z, Omega_m, Omega_Lambda):
+    """
+    Dimensionless cosmic time for flat ΛCDM without radiation
+
+    Parameters
+    ----------
+    z : array-like
+        Redshift(s), any shape
+    Omega_m, Omega_Lambda : float or array
+        Density parameters, broadcast against z
+
+    Returns
+    -------
+    T : array
+        H0 t(z) = 2 / (3 sqrt(Omega_Lambda)) asinh(sqrt(Omega_Lambda/Omega_m) (1+z)^-3/2)
+    """
+    u = 1.0 + np.asarray(z, dtype=float)
+    return (2.0 / (3.0 * np.sqrt(Omega_Lambda))
+            * np.arcsinh(np.sqrt(Omega_Lambda / Omega_m) * u**-1.5))
@@ -0,0 +1,195 @@
+"""
+Bimetric Background Solver
+
+Integrates the coupled Friedmann equations of the two JANUS metrics
+(JANUS-MODELE/EQUATIONS_FONDAMENTALES.md §3.2)
+
+    a² d²a/dt² = (χ/2) E        ā² d²ā/dt² = -(χ/2) E
+
+with E = ρc²a³ + ρ̄c̄²ā³ conserved for dust in both sectors. In units of the
+Hubble time, with a = ā = 1 and da/dt = H0 today, the source term is
+(χ/2) E = -K/2 H0², where K is the effective a^-3 coefficient of E²(z)
+(JANUSCosmology.Omega_m_eff: positive sector plus coupled negative sector).
+K < 0 (negative mass dominant) accelerates the positive sector.
+
+The system is integrated once per parameter set, backwards from today, with
+the independent variable x = ln(1+z) = -ln a and the state
+
+    τ = H0 t,  v = da/dτ,  D = ∫_0^z dz'/E,  ā,  w = dā/dτ
+
+so that H(z)/H0 = v (1+z), distances and ages come out of the same solve.
+odeint (LSODA, adaptive step control) advances all models of a batch in a
+single call; the solution is stored on the ln(1+z) grid of the other
+cosmology tables and served by cubic Hermite splines built from the exact
+derivatives (dense output in both z and t).
+
+Limitations:
+- the expansion of the positive sector has a big bang only for K >= 0; for
+  K < 0 it bounces at z = 1/|K|, and redshifts beyond are rejected
+- the negative sector needs H̄0/H0 as initial condition (hbar_ratio); it
+  does not feed back on a(t), whose only coupling is through K
+"""
+
+import numpy as np
+from scipy.integrate import odeint
+from scipy.interpolate import CubicHermiteSpline
+
+try:
+    from ..utils.constants import (
+        CHI_DEFAULT, KAPPA, AGE_Z_MAX, BIMETRIC_RTOL, BIMETRIC_ATOL,
+        BIMETRIC_GRID_SIZE, BIMETRIC_HBAR_RATIO, BIMETRIC_ABAR_MIN
+    )
+except ImportError:
+    from utils.constants import (
+        CHI_DEFAULT, KAPPA, AGE_Z_MAX, BIMETRIC_RTOL, BIMETRIC_ATOL,
+        BIMETRIC_GRID_SIZE, BIMETRIC_HBAR_RATIO, BIMETRIC_ABAR_MIN
+    )
+
+
+def effective_matter(Omega_plus, Omega_minus, chi=CHI_DEFAULT, kappa=KAPPA):
+    """Source term K of the Friedmann equations (E² a^-3 coefficient)"""
+    return Omega_plus + chi * np.abs(Omega_minus) * (
+        1.0 + kappa * np.sqrt(np.abs(Omega_minus) / Omega_plus)
+    )
+
+
+def _rates(state, x, K):
+    """d/dx of state = (τ, v, D, ā, w), stacked on the first axis"""
+    tau, v, D, abar, w = state
+    a = np.exp(-x)
+    dtau = -a / v
+    return np.stack([
+        dtau,                                                       # dτ/dx
+        K / (2.0 * a * v),                                          # dv/dx = ä dτ/dx
+        1.0 / v,                                                    # dD/dx = (1+z)/E
+        w * dtau,                                                   # dā/dx
+        K / (2.0 * np.maximum(abar, BIMETRIC_ABAR_MIN)**2) * dtau,  # dw/dx
+    ])
+
+
+def _derivatives(y, x, K):
+    """odeint right-hand side: all models in one flat state vector"""
+    return _rates(y.reshape(5, -1), x, K).ravel()
+
+
+class BimetricSolution:
+    """
+    Background of one or many JANUS models from the coupled Friedmann system
+
+    Parameters
+    ----------
+    Omega_plus, Omega_minus : float or array (n_models,)
+        Density parameters of the two sectors
+    chi, kappa : float or array (n_models,), optional
+        Coupling parameters. Default: CHI_DEFAULT, KAPPA
+    hbar_ratio : float or array (n_models,), optional
+        Initial expansion rate of the negative sector H̄0/H0.
+        Default: BIMETRIC_HBAR_RATIO
+    z_max : float, optional
+        Highest solved redshift (approximate big bang for ages).
+        Default: AGE_Z_MAX
+    n_grid : int, optional
+        Nodes of the stored ln(1+z) grid. Default: BIMETRIC_GRID_SIZE
+
+    All accessors return arrays of shape (n_models,) + np.shape(z).
+
+    Examples
+    --------
+    >>> sol = BimetricSolution([0.3, 0.35], [0.05, 0.08])
+    >>> sol.efunc([1.0, 10.0]).shape
+    (2, 2)
+    """
+
+    def __init__(self, Omega_plus, Omega_minus, chi=CHI_DEFAULT, kappa=KAPPA,
+                 hbar_ratio=BIMETRIC_HBAR_RATIO, z_max=AGE_Z_MAX, n_grid=BIMETRIC_GRID_SIZE):
+        Omega_plus, Omega_minus, chi, kappa, hbar_ratio = np.broadcast_arrays(
+            *[np.atleast_1d(np.asarray(p, dtype=float))
+              for p in (Omega_plus, Omega_minus, chi, kappa, hbar_ratio)])
+        self.K = effective_matter(Omega_plus, Omega_minus, chi, kappa)
+        self.Omega_k = 1.0 - self.K
+        self.z_max = z_max
+
+        bounce = self.K < 0
+        if np.any(1.0 / np.abs(self.K[bounce]) <= z_max):
+            raise ValueError("Negative-mass dominated model (K < 0) bounces at "
+                             f"z = 1/|K| < z_max = {z_max}")
+
+        n = len(self.K)
+        initial = np.concatenate([np.zeros(n), np.ones(n), np.zeros(n),
+                                  np.ones(n), hbar_ratio])
+        x_grid = np.linspace(0.0, np.log1p(z_max), n_grid)
+        states = odeint(_derivatives, initial, x_grid, args=(self.K,),
+                        rtol=BIMETRIC_RTOL, atol=BIMETRIC_ATOL)
+
+        # (n_grid, 5 n) -> (5, n_models, n_grid)
+        states = states.T.reshape(5, n, n_grid)
+        slopes = _rates(states, x_grid, self.K[:, None])
+        tau, v, D, abar, w = states
+        self.t_min = tau[:, -1]
+        self.t0 = -self.t_min
+
+        self._x_grid = x_grid
+        self._splines = {
+            name: CubicHermiteSpline(x_grid, states[i], slopes[i], axis=-1)
+            for i, name in enumerate(['tau', 'v', 'D', 'abar', 'w'])
+        }
+        # τ decreases with x: reversed for the inverse (dx/dτ = -v/a)
+        self._x_of_tau = [
+            CubicHermiteSpline(tau[m, ::-1], x_grid[::-1], -v[m, ::-1] * np.exp(x_grid[::-1]))
+            for m in range(n)
+        ]
+
+    def __len__(self):
+        return len(self.K)
+
+    def _x(self, z):
+        """ln(1+z) after checking the solved range"""
+        z = np.asarray(z, dtype=float)
+        if np.any(z < 0) or np.any(z > self.z_max):
+            raise ValueError(f"Redshift must lie in [0, {self.z_max}]")
+        return np.log1p(z)
+
+    def efunc(self, z):
+        """H(z)/H0 of the positive sector"""
+        z = np.asarray(z, dtype=float)
+        return self._splines['v'](self._x(z)) * (1.0 + z)
+
+    def distance(self, z):
+        """H0 d_c / c = ∫_0^z dz'/E(z'); 0 for z <= 0"""
+        return self._splines['D'](self._x(np.maximum(z, 0.0)))
+
+    def age(self, z):
+        """H0 t(z), counted from the solution at z_max (z beyond maps to 0)"""
+        t_min = self.t_min.reshape((-1,) + (1,) * np.ndim(z))
+        return self._splines['tau'](self._x(np.minimum(z, self.z_max))) - t_min
+
+    def negative_scale_factor(self, z):
+        """ā at the redshift z of the positive sector (NaN once ā has collapsed)"""
+        abar = self._splines['abar'](self._x(z))
+        return np.where(abar > BIMETRIC_ABAR_MIN, abar, np.nan)
+
+    def negative_efunc(self, z):
+        """H̄/H0 = (dā/dτ)/ā of the negative sector"""
+        return self._splines['w'](self._x(z)) / self.negative_scale_factor(z)
+
+    def scale_factors(self, t):
+        """
+        Scale factors (a, ā) at cosmic time H0 t
+
+        Parameters
+        ----------
+        t : float or array-like
+            H0 t, same for every model, within [0, t0] of each model
+
+        Returns
+        -------
+        a, abar : arrays (n_models,) + np.shape(t)
+        """
+        t = np.asarray(t, dtype=float)
+        if np.any(t < 0) or np.any(t[..., None] > self.t0):
+            raise ValueError("H0*t must lie in [0, H0 t0] for every model")
+        x = np.stack([spline(t + self.t_min[m]) for m, spline in enumerate(self._x_of_tau)])
+        # Each model's ā spline at that model's own x
+        models = np.arange(len(self))
+        abar = self._splines['abar'](x)[models, models]
+        return np.exp(-x), np.where(abar > BIMETRIC_ABAR_MIN, abar, np.nan)
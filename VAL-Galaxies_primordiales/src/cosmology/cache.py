@@ -0,0 +1,120 @@
+"""
+Process-wide Grid Cache
+
+Distance and age tables (cosmology.integration.DistanceTable / AgeTable)
+shared by every cosmology instance of the process. Scripts evaluate the same
+few redshifts many times for one parameter set (bin midpoints, age grids,
+report tables); each table is built on the first query and reused by all
+later instances with the same parameters.
+
+Keys are (model name, rounded parameter tuple, quantity). Parameters are
+rounded to GRID_CACHE_DIGITS significant digits so values differing only by
+floating-point noise share a table. The least recently used table is evicted
+beyond GRID_CACHE_SIZE entries. Hit and miss counters are kept for
+monitoring long MCMC runs:
+
+>>> from cosmology import grid_cache_info
+>>> grid_cache_info()
+GridCacheInfo(hits=..., misses=..., maxsize=512, currsize=...)
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+try:
+    from ..utils.constants import GRID_CACHE_SIZE, GRID_CACHE_DIGITS
+except ImportError:
+    from utils.constants import GRID_CACHE_SIZE, GRID_CACHE_DIGITS
+
+
+GridCacheInfo = namedtuple('GridCacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class GridCache:
+    """
+    Size-bounded LRU cache of precomputed grids
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of stored tables. Default: GRID_CACHE_SIZE
+    digits : int, optional
+        Significant digits kept when rounding parameters. Default: GRID_CACHE_DIGITS
+    """
+
+    def __init__(self, maxsize=GRID_CACHE_SIZE, digits=GRID_CACHE_DIGITS):
+        self.maxsize = maxsize
+        self.digits = digits
+        self.hits = 0
+        self.misses = 0
+        self._tables = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, model, params, quantity):
+        """Cache key (model, rounded params, quantity)"""
+        rounded = tuple(float(f"{float(p):.{self.digits}g}") for p in params)
+        return (model, rounded, quantity)
+
+    def get(self, model, params, quantity, build):
+        """
+        Cached table, built with build() on a miss
+
+        Parameters
+        ----------
+        model : str
+            Model name, e.g. 'janus'
+        params : sequence of float
+            Parameters the table depends on, in a fixed order per model
+        quantity : str
+            Tabulated quantity, e.g. 'distance' or 'age'
+        build : callable
+            Called without arguments to compute the table on a miss
+        """
+        key = self.key(model, params, quantity)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                self.hits += 1
+                return table
+            self.misses += 1
+
+        # Built outside the lock: other threads keep reading meanwhile
+        table = build()
+        with self._lock:
+            self._tables[key] = table
+            self._tables.move_to_end(key)
+            while len(self._tables) > self.maxsize:
+                self._tables.popitem(last=False)
+        return table
+
+    def info(self):
+        """Hit/miss counters and occupancy"""
+        with self._lock:
+            return GridCacheInfo(self.hits, self.misses, self.maxsize, len(self._tables))
+
+    def clear(self):
+        """Drop all tables and reset the counters"""
+        with self._lock:
+            self._tables.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._tables)
+
+    def __contains__(self, key):
+        return key in self._tables
+
+
+GRID_CACHE = GridCache()
+
+
+def grid_cache_info():
+    """Counters of the process-wide grid cache"""
+    return GRID_CACHE.info()
+
+
+def clear_grid_cache():
+    """Empty the process-wide grid cache and reset its counters"""
+    GRID_CACHE.clear()
@@ -0,0 +1,459 @@
+"""
+JANUS Background Emulator
+
+Tabulates the dimensionless JANUS integrals
+
+    D(z) = H0 d_c / c = ∫_0^z dz' / E(z')
+    T(z) = H0 t(z)    = ∫_z^z_max dz' / ((1+z') E(z'))
+
+over a box of density parameters (Omega_plus, Omega_minus, chi) and serves
+them by interpolation, so that the cost of a cosmology evaluation inside an
+MCMC chain no longer depends on the cost of the integrals. H0 only rescales
+D and T (d_c = c/H0 D, t = T/H0) and is not tabulated.
+
+Interpolation:
+- Parameters: tensor-product Chebyshev series ('chebyshev', default) or
+  multilinear interpolation on a uniform grid ('linear'). The Omega_minus
+  axis is tabulated in sqrt(Omega_minus), in which E(z) is smooth (the
+  coupling term contains |Omega_minus|^3/2).
+- Redshift: cubic Hermite interpolation on a ln(1+z) grid, using the exact
+  derivatives (1+z)/E and -1/E of the interpolated integrals.
+
+Error bound: estimated from the tables (trailing Chebyshev coefficients, or
+second differences for the multilinear scheme), then checked at build time
+against direct evaluation at random points of the box. The larger of the
+two is stored in JANUSEmulator.error_bound (maximum relative error).
+
+Tables are saved to .npz, or to HDF5 (.h5, .hdf5) when h5py is available.
+"""
+
+from pathlib import Path
+
+import numpy as np
+from numpy.polynomial import chebyshev
+
+from .janus import JANUSCosmologyBatch
+
+try:
+    from ..utils.constants import (
+        C_LIGHT, MPC_TO_KM, GYR_TO_S, H0_JANUS_DEFAULT, CHI_DEFAULT, KAPPA,
+        EMULATOR_OMEGA_PLUS_RANGE, EMULATOR_OMEGA_MINUS_RANGE, EMULATOR_CHI_RANGE,
+        EMULATOR_NODES, EMULATOR_Z_MAX, EMULATOR_Z_NODES, EMULATOR_VALIDATION_SAMPLES
+    )
+except ImportError:
+    from utils.constants import (
+        C_LIGHT, MPC_TO_KM, GYR_TO_S, H0_JANUS_DEFAULT, CHI_DEFAULT, KAPPA,
+        EMULATOR_OMEGA_PLUS_RANGE, EMULATOR_OMEGA_MINUS_RANGE, EMULATOR_CHI_RANGE,
+        EMULATOR_NODES, EMULATOR_Z_MAX, EMULATOR_Z_NODES, EMULATOR_VALIDATION_SAMPLES
+    )
+
+
+DEFAULT_BOX = {
+    'Omega_plus': EMULATOR_OMEGA_PLUS_RANGE,
+    'Omega_minus': EMULATOR_OMEGA_MINUS_RANGE,
+    'chi': EMULATOR_CHI_RANGE,
+}
+
+
+class JANUSEmulator:
+    """
+    Interpolated JANUS distance and age integrals over a parameter box
+
+    Use JANUSEmulator.build() to tabulate, save()/load() to reuse tables.
+
+    Parameters
+    ----------
+    box : dict
+        (low, high) range for each of 'Omega_plus', 'Omega_minus', 'chi'
+    scheme : {'chebyshev', 'linear'}
+        Interpolation in the parameters
+    z_max : float
+        Highest tabulated redshift
+    kappa : float
+        Sign of the negative sector, fixed for the whole table
+    distance_table, age_table : array (n_nodes, n_nodes, n_nodes, n_z)
+        D and T at the parameter nodes (axes Omega_plus, sqrt(Omega_minus),
+        chi) and at the redshift nodes
+    error_bound : dict, optional
+        Maximum relative error of 'distance' and 'age'
+    """
+
+    PARAM_NAMES = ('Omega_plus', 'Omega_minus', 'chi')
+    SCHEMES = ('chebyshev', 'linear')
+
+    def __init__(self, box, scheme, z_max, kappa, distance_table, age_table,
+                 error_bound=None):
+        if scheme not in self.SCHEMES:
+            raise ValueError(f"scheme must be one of {self.SCHEMES}, got {scheme!r}")
+
+        self.box = {name: (float(box[name][0]), float(box[name][1]))
+                    for name in self.PARAM_NAMES}
+        self.scheme = scheme
+        self.z_max = float(z_max)
+        self.kappa = float(kappa)
+        self.distance_table = np.asarray(distance_table, dtype=float)
+        self.age_table = np.asarray(age_table, dtype=float)
+        self.error_bound = dict(error_bound) if error_bound is not None else None
+
+        self.n_nodes = self.distance_table.shape[0]
+        self.x_nodes = np.linspace(0.0, np.log1p(self.z_max), self.distance_table.shape[-1])
+        self._dx = self.x_nodes[1]
+        self._u_nodes = np.exp(self.x_nodes)
+        self._u2_nodes = self._u_nodes**2
+        self._u3_nodes = self._u_nodes**3
+        self._orders = np.arange(self.n_nodes)
+
+        # Affine map of the tabulation coordinates onto [-1, 1]
+        ranges = np.array([_axis_range(self.box, name) for name in self.PARAM_NAMES])
+        self._unit_scale = (2.0 / (ranges[:, 1] - ranges[:, 0]))[:, None]
+        self._unit_offset = (-1.0 - ranges[:, 0] * self._unit_scale[:, 0])[:, None]
+
+        # Chebyshev: interpolate coefficients; linear: node values directly
+        self._distance_tensor = self._to_tensor(self.distance_table)
+        self._age_tensor = self._to_tensor(self.age_table)
+        # Redshift-major copies: one contiguous row of n_nodes³ values per z node
+        self._distance_rows = np.ascontiguousarray(
+            self._distance_tensor.reshape(-1, self.x_nodes.size).T)
+        self._age_rows = np.ascontiguousarray(self._age_tensor.reshape(-1, self.x_nodes.size).T)
+
+    # ------------------------------------------------------------------
+    # Construction and storage
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(cls, box=None, n_nodes=EMULATOR_NODES, scheme='chebyshev',
+              z_max=EMULATOR_Z_MAX, n_z=EMULATOR_Z_NODES, kappa=KAPPA,
+              n_validation=EMULATOR_VALIDATION_SAMPLES, seed=0):
+        """
+        Tabulate the integrals and estimate the interpolation error
+
+        Parameters
+        ----------
+        box : dict, optional
+            (low, high) per parameter. Default: prior box of log_likelihood_janus
+            with chi in EMULATOR_CHI_RANGE
+        n_nodes : int, optional
+            Nodes per parameter axis. Default: EMULATOR_NODES
+        scheme : {'chebyshev', 'linear'}, optional
+            Interpolation in the parameters. Default: 'chebyshev'
+        z_max : float, optional
+            Highest tabulated redshift. Default: EMULATOR_Z_MAX
+        n_z : int, optional
+            Nodes of the ln(1+z) grid. Default: EMULATOR_Z_NODES
+        kappa : float, optional
+            Sign of the negative sector. Default: -1
+        n_validation : int, optional
+            Random parameter sets compared with direct evaluation. Default:
+            EMULATOR_VALIDATION_SAMPLES
+        seed : int, optional
+            Seed of the validation points
+
+        Returns
+        -------
+        emulator : JANUSEmulator
+        """
+        if scheme not in cls.SCHEMES:
+            raise ValueError(f"scheme must be one of {cls.SCHEMES}, got {scheme!r}")
+        box = {**DEFAULT_BOX, **(box or {})}
+        if box['Omega_minus'][0] < 0:
+            raise ValueError("Omega_minus range must be non-negative")
+
+        unit_nodes = _unit_nodes(n_nodes, scheme)
+        axes = [_from_unit(unit_nodes, *_axis_range(box, name)) for name in cls.PARAM_NAMES]
+        axes[1] = axes[1]**2  # sqrt(Omega_minus) -> Omega_minus
+
+        grid = np.meshgrid(*axes, indexing='ij')
+        z_nodes = np.expm1(np.linspace(0.0, np.log1p(z_max), n_z))
+        distance, age = _exact_integrals(z_nodes, *(g.ravel() for g in grid), kappa)
+        shape = (n_nodes,) * 3 + (n_z,)
+
+        emulator = cls(box, scheme, z_max, kappa, distance.reshape(shape), age.reshape(shape))
+        estimate = emulator._estimate_error()
+        measured = emulator.validate(n_validation, seed=seed)
+        emulator.error_bound = {key: max(estimate[key], measured[key]) for key in estimate}
+        return emulator
+
+    def save(self, path):
+        """
+        Save the tables to .npz, or HDF5 for a .h5/.hdf5 suffix
+
+        Parameters
+        ----------
+        path : str or Path
+            Output file
+        """
+        path = Path(path)
+        arrays = {
+            'distance_table': self.distance_table,
+            'age_table': self.age_table,
+            'box': np.array([self.box[name] for name in self.PARAM_NAMES]),
+            'error_bound': np.array([self.error_bound['distance'], self.error_bound['age']]),
+        }
+        attributes = {'scheme': self.scheme, 'z_max': self.z_max, 'kappa': self.kappa}
+
+        if path.suffix in ('.h5', '.hdf5'):
+            import h5py
+            with h5py.File(path, 'w') as f:
+                for key, value in arrays.items():
+                    f.create_dataset(key, data=value)
+                f.attrs.update(attributes)
+        else:
+            np.savez_compressed(path, **arrays, **attributes)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load tables written by save()
+
+        Parameters
+        ----------
+        path : str or Path
+            .npz, .h5 or .hdf5 file
+
+        Returns
+        -------
+        emulator : JANUSEmulator
+        """
+        path = Path(path)
+        if path.suffix in ('.h5', '.hdf5'):
+            import h5py
+            with h5py.File(path, 'r') as f:
+                data = {key: f[key][()] for key in f.keys()}
+                data.update({key: f.attrs[key] for key in f.attrs})
+        else:
+            with np.load(path) as f:
+                data = {key: f[key] for key in f.files}
+
+        box = dict(zip(cls.PARAM_NAMES, data['box']))
+        error_bound = dict(zip(('distance', 'age'), map(float, data['error_bound'])))
+        return cls(box, str(data['scheme']), float(data['z_max']), float(data['kappa']),
+                   data['distance_table'], data['age_table'], error_bound=error_bound)
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+    def contains(self, Omega_plus, Omega_minus, chi=CHI_DEFAULT):
+        """True where the parameters lie inside the tabulated box"""
+        inside = True
+        for name, value in zip(self.PARAM_NAMES, (Omega_plus, np.abs(Omega_minus), chi)):
+            low, high = self.box[name]
+            inside = inside & (np.asarray(value) >= low) & (np.asarray(value) <= high)
+        return inside
+
+    def dimensionless_distance(self, z, Omega_plus, Omega_minus, chi=CHI_DEFAULT):
+        """
+        H0 d_c / c interpolated from the table
+
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift(s), any shape, at most z_max. Values z <= 0 map to 0.
+        Omega_plus, Omega_minus, chi : float or 1D array
+            Density parameters. Arrays of length n_points evaluate several
+            parameter sets at once.
+
+        Returns
+        -------
+        D : float or array
+            Shape z.shape, or (n_points,) + z.shape for array parameters
+        """
+        z = np.asarray(z, dtype=float)
+        return self._evaluate(self._distance_rows, np.maximum(z, 0.0), True,
+                              Omega_plus, Omega_minus, chi)
+
+    def dimensionless_age(self, z, Omega_plus, Omega_minus, chi=CHI_DEFAULT):
+        """
+        H0 t(z) interpolated from the table
+
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift(s), any shape, in [0, z_max]
+        Omega_plus, Omega_minus, chi : float or 1D array
+            Density parameters (see dimensionless_distance)
+
+        Returns
+        -------
+        T : float or array
+            Shape z.shape, or (n_points,) + z.shape for array parameters
+        """
+        z = np.asarray(z, dtype=float)
+        if np.any(z < 0):
+            raise ValueError("Redshift must be non-negative")
+        return self._evaluate(self._age_rows, z, False, Omega_plus, Omega_minus, chi)
+
+    def comoving_distance(self, z, H0, Omega_plus, Omega_minus, chi=CHI_DEFAULT):
+        """Comoving distance [Mpc]; H0 scalar or per parameter set"""
+        D = self.dimensionless_distance(z, Omega_plus, Omega_minus, chi)
+        return _per_point(C_LIGHT / np.asarray(H0, dtype=float), z) * D
+
+    def age_of_universe(self, z, H0, Omega_plus, Omega_minus, chi=CHI_DEFAULT):
+        """Age of the universe [Gyr]; H0 scalar or per parameter set"""
+        T = self.dimensionless_age(z, Omega_plus, Omega_minus, chi)
+        return _per_point(MPC_TO_KM / (np.asarray(H0, dtype=float) * GYR_TO_S), z) * T
+
+    def lookback_time(self, z, H0, Omega_plus, Omega_minus, chi=CHI_DEFAULT):
+        """Lookback time [Gyr]; H0 scalar or per parameter set"""
+        z = np.maximum(np.asarray(z, dtype=float), 0.0)
+        T = self.dimensionless_age(np.concatenate([[0.0], z.ravel()]),
+                                   Omega_plus, Omega_minus, chi)
+        t_lb = (T[..., :1] - T[..., 1:]).reshape(np.shape(T)[:-1] + z.shape)
+        return _per_point(MPC_TO_KM / (np.asarray(H0, dtype=float) * GYR_TO_S), z) * t_lb
+
+    def validate(self, n_samples=EMULATOR_VALIDATION_SAMPLES, seed=0):
+        """
+        Maximum relative error against direct evaluation at random points
+
+        Parameters
+        ----------
+        n_samples : int, optional
+            Random parameter sets, each evaluated at 32 random redshifts
+        seed : int, optional
+            Random seed
+
+        Returns
+        -------
+        errors : dict
+            Maximum relative error of 'distance' and 'age'
+        """
+        rng = np.random.default_rng(seed)
+        params = [rng.uniform(*self.box[name], n_samples) for name in self.PARAM_NAMES]
+        z = np.expm1(rng.uniform(0.0, np.log1p(self.z_max), 32))
+
+        distance, age = _exact_integrals(z, *params, self.kappa)
+        return {
+            'distance': float(np.max(np.abs(self.dimensionless_distance(z, *params)
+                                            / distance - 1.0))),
+            'age': float(np.max(np.abs(self.dimensionless_age(z, *params) / age - 1.0))),
+        }
+
+    def _to_tensor(self, table):
+        """Interpolation tensor: Chebyshev coefficients or node values"""
+        if self.scheme == 'linear':
+            return table
+        inverse = np.linalg.inv(chebyshev.chebvander(_unit_nodes(self.n_nodes, 'chebyshev'),
+                                                     self.n_nodes - 1))
+        for axis in range(3):
+            table = np.moveaxis(np.tensordot(inverse, table, axes=(1, axis)), 0, axis)
+        return table
+
+    def _weights(self, t):
+        """Interpolation weights (..., n_nodes) at unit coordinates t in [-1, 1]"""
+        t = np.minimum(np.maximum(t, -1.0), 1.0)
+        if self.scheme == 'chebyshev':
+            # T_k(t) = cos(k arccos t)
+            return np.cos(np.arccos(t)[..., None] * self._orders)
+
+        # Hat functions on the uniform grid: two non-zero weights per point
+        position = (t + 1.0) / 2.0 * (self.n_nodes - 1)
+        index = np.minimum(position.astype(int), self.n_nodes - 2)
+        frac = (position - index)[..., None]
+        return (np.where(self._orders == index[..., None], 1.0 - frac, 0.0)
+                + np.where(self._orders == index[..., None] + 1, frac, 0.0))
+
+    def _evaluate(self, rows, z, distance, Omega_plus, Omega_minus, chi):
+        """Interpolate in the parameters, then in ln(1+z) (cubic Hermite)"""
+        if z.size and z.max() > self.z_max:
+            raise ValueError(f"Redshift must not exceed the tabulated z_max = {self.z_max}")
+        scalar_params = np.ndim(Omega_plus) == 0 and np.ndim(Omega_minus) == 0 and np.ndim(chi) == 0
+        Omega_plus, Omega_minus, chi = np.broadcast_arrays(
+            np.atleast_1d(Omega_plus), np.abs(np.atleast_1d(Omega_minus)), np.atleast_1d(chi))
+        n_points = Omega_plus.size
+
+        # Tabulation coordinates (Omega_plus, sqrt(Omega_minus), chi) mapped onto [-1, 1]
+        units = (np.stack([Omega_plus, np.sqrt(Omega_minus), chi]) * self._unit_scale
+                 + self._unit_offset)
+        if units.min() < -1.0 - 1e-12 or units.max() > 1.0 + 1e-12:
+            raise ValueError(f"Parameters outside the emulator box {self.box}")
+        w_plus, w_minus, w_chi = self._weights(units)
+        weights = (w_plus[:, :, None, None] * w_minus[:, None, :, None]
+                   * w_chi[:, None, None, :]).reshape(n_points, -1)
+
+        # Redshift nodes bracketing each requested z
+        x = np.log1p(z.ravel())
+        index = np.minimum((x / self._dx).astype(int), self.x_nodes.size - 2)
+        if 2 * x.size < self.x_nodes.size:
+            # Few redshifts: interpolate the parameters at the bracketing nodes only
+            nodes = np.concatenate([index, index + 1])
+            left, right = slice(0, x.size), slice(x.size, None)
+        else:
+            nodes, left, right = slice(None), index, index + 1
+        columns = weights @ rows[nodes].T
+
+        # Exact slopes dI/dx: (1+z)/E for distances, -1/E for ages
+        A = Omega_plus + chi * Omega_minus * (1.0 + self.kappa * np.sqrt(Omega_minus / Omega_plus))
+        Omega_k = 1.0 - Omega_plus - Omega_minus
+        inverse_E = 1.0 / np.sqrt(A[:, None] * self._u3_nodes[nodes]
+                                  + Omega_k[:, None] * self._u2_nodes[nodes])
+        slopes = self._u_nodes[nodes] * inverse_E if distance else -inverse_E
+
+        # Cubic Hermite basis on the uniform ln(1+z) grid
+        s = x / self._dx - index
+        s2 = s * s
+        h10 = s * (s - 1.0)**2 * self._dx
+        h11 = s2 * (s - 1.0) * self._dx
+        h01 = s2 * (3.0 - 2.0 * s)
+        values = (columns[:, left] + h01 * (columns[:, right] - columns[:, left])
+                  + h10 * slopes[:, left] + h11 * slopes[:, right])
+
+        values = values.reshape((n_points,) + z.shape)
+        if scalar_params:
+            values = values[0]
+            return float(values) if values.ndim == 0 else values
+        return values
+
+    def _estimate_error(self):
+        """Relative error estimated from the tables themselves"""
+        estimate = {}
+        for key, table, tensor in [('distance', self.distance_table, self._distance_tensor),
+                                   ('age', self.age_table, self._age_tensor)]:
+            absolute = 0.0
+            for axis in range(3):
+                if self.scheme == 'chebyshev':
+                    # Interpolation error <= 2 Σ|neglected coefficients|, estimated
+                    # by the two trailing coefficients along each axis
+                    tail = np.take(tensor, [-2, -1], axis=axis)
+                    absolute = absolute + 2.0 * np.abs(tail).sum(axis=(0, 1, 2))
+                else:
+                    # Multilinear error <= h² max|f''| / 8 per axis
+                    second = np.abs(np.diff(table, n=2, axis=axis))
+                    absolute = absolute + second.max(axis=(0, 1, 2)) / 8.0
+            scale = np.abs(table).min(axis=(0, 1, 2))
+            estimate[key] = float(np.max(absolute[scale > 0] / scale[scale > 0]))
+        return estimate
+
+    def __repr__(self):
+        return (f"JANUSEmulator(scheme={self.scheme!r}, n_nodes={self.n_nodes}, "
+                f"z_max={self.z_max}, error_bound={self.error_bound})")
+
+
+def _axis_range(box, name):
+    """Tabulation coordinate range of one parameter (Omega_minus in sqrt)"""
+    low, high = box[name]
+    if name == 'Omega_minus':
+        return np.sqrt(low), np.sqrt(high)
+    return low, high
+
+
+def _unit_nodes(n_nodes, scheme):
+    """Nodes on [-1, 1]: Chebyshev points of the first kind, or uniform"""
+    if scheme == 'chebyshev':
+        return np.cos(np.pi * (np.arange(n_nodes) + 0.5) / n_nodes)[::-1]
+    return np.linspace(-1.0, 1.0, n_nodes)
+
+
+def _from_unit(t, low, high):
+    return low + (t + 1.0) / 2.0 * (high - low)
+
+
+def _per_point(values, z):
+    """Reshape a scalar or per-parameter-set vector to broadcast against z"""
+    return np.reshape(values, np.shape(values) + (1,) * np.ndim(z))
+
+
+def _exact_integrals(z, Omega_plus, Omega_minus, chi, kappa):
+    """D and T of every parameter set at every z, shape (n_models, n_z)"""
+    n_models = len(Omega_plus)
+    params = np.column_stack([np.full(n_models, H0_JANUS_DEFAULT), Omega_plus,
+                              Omega_minus, chi, np.full(n_models, kappa)])
+    batch = JANUSCosmologyBatch(params, method='analytic')
+    return batch._dimensionless_distance(z), batch._dimensionless_age(z)
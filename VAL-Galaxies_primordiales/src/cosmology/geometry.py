@@ -0,0 +1,215 @@
+"""
+Survey Geometry
+
+Comoving volumes from distances already computed by a cosmology model,
+following Hogg (1999), astro-ph/9905116:
+
+- transverse comoving distance d_M from the line-of-sight distance d_c
+- all-sky comoving volume V_c(z) in closed form from d_M (Eq. 29)
+- volume element dV/dz/dΩ = d_H d_M² / E(z) (Eq. 28)
+- volume of redshift shells as V_c(z_hi) - V_c(z_lo) scaled to the sky
+  area, so no integration beyond the distances themselves
+
+All functions broadcast, so Omega_k and d_H may be per-model arrays.
+|Omega_k| < FLAT_OMEGA_K_TOL is treated as flat: the curved formulas lose
+precision to cancellation there, while the flat ones are accurate.
+
+ComovingGeometry gives the model classes, single and batched, these
+quantities as methods.
+"""
+
+import numpy as np
+
+from .integration import as_output
+
+try:
+    from ..utils.constants import FULL_SKY_DEG2, FLAT_OMEGA_K_TOL
+except ImportError:
+    from utils.constants import FULL_SKY_DEG2, FLAT_OMEGA_K_TOL
+
+
+def comoving_transverse_distance(d_c, d_H, Omega_k):
+    """
+    Transverse comoving distance d_M [Mpc]
+
+    Parameters
+    ----------
+    d_c : array
+        Line-of-sight comoving distance [Mpc]
+    d_H : float or array
+        Hubble distance c/H0 [Mpc]
+    Omega_k : float or array
+        Curvature density parameter (0: flat, > 0: open, < 0: closed)
+    """
+    sqrt_k = np.sqrt(np.abs(Omega_k))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        open_ = d_H * np.sinh(sqrt_k * d_c / d_H) / sqrt_k
+        closed = d_H * np.sin(sqrt_k * d_c / d_H) / sqrt_k
+    flat = np.abs(Omega_k) < FLAT_OMEGA_K_TOL
+    return np.where(flat, d_c, np.where(Omega_k > 0, open_, closed))
+
+
+def comoving_volume(d_M, d_H, Omega_k):
+    """
+    All-sky comoving volume V_c [Mpc^3] enclosed within d_M
+
+    Parameters
+    ----------
+    d_M : array
+        Transverse comoving distance [Mpc]
+    d_H : float or array
+        Hubble distance c/H0 [Mpc]
+    Omega_k : float or array
+        Curvature density parameter
+    """
+    sqrt_k = np.sqrt(np.abs(Omega_k))
+    x = d_M / d_H
+    with np.errstate(divide='ignore', invalid='ignore'):
+        prefactor = 4.0 * np.pi * d_H**3 / (2.0 * Omega_k)
+        open_ = prefactor * (x * np.sqrt(1.0 + Omega_k * x**2) - np.arcsinh(sqrt_k * x) / sqrt_k)
+        closed = prefactor * (x * np.sqrt(1.0 + Omega_k * x**2) - np.arcsin(sqrt_k * x) / sqrt_k)
+    flat = (4.0 / 3.0) * np.pi * d_M**3
+    return np.where(np.abs(Omega_k) < FLAT_OMEGA_K_TOL, flat,
+                    np.where(Omega_k > 0, open_, closed))
+
+
+def differential_comoving_volume(d_M, d_H, E):
+    """
+    Comoving volume element dV_c / dz / dΩ [Mpc^3 / sr]
+
+    Parameters
+    ----------
+    d_M : array
+        Transverse comoving distance at z [Mpc]
+    d_H : float or array
+        Hubble distance c/H0 [Mpc]
+    E : array
+        H(z)/H0 at the same redshifts
+    """
+    return d_H * d_M**2 / E
+
+
+def sky_fraction(area_deg2):
+    """Fraction of the full sky covered by area_deg2 square degrees"""
+    return np.asarray(area_deg2, dtype=float) / FULL_SKY_DEG2
+
+
+def shell_volume(volume_low, volume_high, area_deg2=FULL_SKY_DEG2):
+    """
+    Comoving volume [Mpc^3] of redshift shells over a sky area
+
+    Parameters
+    ----------
+    volume_low, volume_high : array
+        All-sky comoving volumes V_c at the inner and outer shell edges
+    area_deg2 : float or array, optional
+        Survey area [deg^2]. Default: full sky
+    """
+    return (volume_high - volume_low) * sky_fraction(area_deg2)
+
+
+class ComovingGeometry:
+    """
+    Transverse distance and comoving volumes of a cosmology model
+
+    Mixin built on the model's comoving_distance(z), efunc(z),
+    hubble_distance and Omega_k. Batch classes override _per_model, to
+    broadcast their per-model values against z, and _output: their methods
+    return arrays (n_models,) + np.shape(z).
+    """
+
+    @staticmethod
+    def _per_model(values, z):
+        """Model values broadcast against z: unchanged for a single model"""
+        return values
+
+    def _output(self, value, z):
+        """float for scalar z, ndarray otherwise"""
+        return as_output(value, z)
+
+    def comoving_transverse_distance(self, z):
+        """
+        Comoving transverse distance
+
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift(s), any shape
+
+        Returns
+        -------
+        d_M : float or array
+            Comoving transverse distance [Mpc]
+        """
+        d_c = np.asarray(self.comoving_distance(z), dtype=float)
+        d_M = comoving_transverse_distance(d_c, self._per_model(self.hubble_distance, z),
+                                           self._per_model(self.Omega_k, z))
+        return self._output(d_M, z)
+
+    def _all_sky_volume(self, z):
+        """V_c(z) as an array [Mpc^3]"""
+        d_M = np.asarray(self.comoving_transverse_distance(z), dtype=float)
+        return comoving_volume(d_M, self._per_model(self.hubble_distance, z),
+                               self._per_model(self.Omega_k, z))
+
+    def comoving_volume(self, z):
+        """
+        All-sky comoving volume out to redshift z
+
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift(s), any shape
+
+        Returns
+        -------
+        V_c : float or array
+            Comoving volume [Mpc^3]
+        """
+        return self._output(self._all_sky_volume(z), z)
+
+    def differential_comoving_volume(self, z):
+        """
+        Comoving volume element dV_c/dz/dΩ
+
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift(s), any shape
+
+        Returns
+        -------
+        dV : float or array
+            Comoving volume per unit redshift and solid angle [Mpc^3/sr]
+        """
+        d_M = np.asarray(self.comoving_transverse_distance(z), dtype=float)
+        E = np.reshape(self.efunc(z), d_M.shape)
+        dV = differential_comoving_volume(d_M, self._per_model(self.hubble_distance, z), E)
+        return self._output(dV, z)
+
+    def shell_volume(self, z_lo, z_hi, area_deg2=FULL_SKY_DEG2):
+        """
+        Comoving volume of redshift shells over a survey area
+
+        All shell edges are evaluated in one pass; no integration beyond the
+        comoving distances.
+
+        Parameters
+        ----------
+        z_lo, z_hi : float or array-like
+            Inner and outer redshift of each shell, broadcast together
+        area_deg2 : float or array-like, optional
+            Survey area [deg^2]. Default: full sky
+
+        Returns
+        -------
+        V : float or array
+            Comoving volume of each shell [Mpc^3]
+        """
+        z_edges = np.stack(np.broadcast_arrays(np.asarray(z_lo, dtype=float),
+                                               np.asarray(z_hi, dtype=float)))
+        V_c = self._all_sky_volume(z_edges)
+        edge_axis = V_c.ndim - z_edges.ndim
+        V = shell_volume(np.take(V_c, 0, axis=edge_axis), np.take(V_c, 1, axis=edge_axis),
+                         area_deg2)
+        return self._output(V, V)
@@ -10,28 +10,40 @@ References:
 """
 
 import numpy as np
-from scipy.integrate import quad, odeint
-from scipy.interpolate import interp1d
+from scipy.integrate import odeint
 import warnings
 
+from .integration import line_of_sight_integral, age_integral, as_output
+from .cache import GRID_CACHE
+from .analytic import (
+    matter_curvature_supported, matter_curvature_distance, matter_curvature_age
+)
+from .bimetric import BimetricSolution
+from .models import BackgroundCosmology
+from .geometry import ComovingGeometry
+
 try:
     from ..utils.constants import (
         C_LIGHT, H0_JANUS_DEFAULT,
         OMEGA_PLUS_DEFAULT, OMEGA_MINUS_DEFAULT, CHI_DEFAULT, KAPPA,
-        INTEGRATION_RTOL, INTEGRATION_ATOL, MPC_TO_KM, GYR_TO_S
+        MPC_TO_KM, GYR_TO_S, AGE_Z_MAX
     )
 except ImportError:
     from utils.constants import (
         C_LIGHT, H0_JANUS_DEFAULT,
         OMEGA_PLUS_DEFAULT, OMEGA_MINUS_DEFAULT, CHI_DEFAULT, KAPPA,
-        INTEGRATION_RTOL, INTEGRATION_ATOL, MPC_TO_KM, GYR_TO_S
+        MPC_TO_KM, GYR_TO_S, AGE_Z_MAX
     )
 
 
-class JANUSCosmology:
+class JANUSCosmology(BackgroundCosmology):
     """
     JANUS Bimetric Cosmology Model
 
+    The 'janus' variant of cosmology.models.BackgroundCosmology, which
+    serves distances, volumes and ages, with closed-form and coupled
+    Friedmann evaluations on top.
+
     Parameters
     ----------
     H0 : float, optional
@@ -44,25 +56,47 @@ class JANUSCosmology:
         Bimetric coupling parameter. Default: 1.0
     kappa : float, optional
         Sign for negative sector. Default: -1
+    method : {'numerical', 'analytic', 'ode'}, optional
+        Evaluation of distances, age and lookback time. 'analytic' uses the
+        closed forms of cosmology.analytic and falls back to numerical
+        integration where they do not apply. 'ode' solves the coupled
+        Friedmann system of the two metrics (cosmology.bimetric) for H(z) as
+        well; its curvature follows from H(0) = H0, Omega_k = 1 - Omega_m_eff.
+        Default: 'numerical'
     """
 
-    def __init__(self, H0=H0_JANUS_DEFAULT, Omega_plus=OMEGA_PLUS_DEFAULT,
-                 Omega_minus=OMEGA_MINUS_DEFAULT, chi=CHI_DEFAULT, kappa=KAPPA):
-        self.H0 = H0
-        self.Omega_plus = Omega_plus
-        self.Omega_minus = Omega_minus
-        self.chi = chi
-        self.kappa = kappa
+    METHODS = ('numerical', 'analytic', 'ode')
 
-        # Derived parameters
-        self.Omega_k = 1.0 - Omega_plus - abs(Omega_minus)  # Curvature
+    def __init__(self, H0=H0_JANUS_DEFAULT, Omega_plus=OMEGA_PLUS_DEFAULT,
+                 Omega_minus=OMEGA_MINUS_DEFAULT, chi=CHI_DEFAULT, kappa=KAPPA,
+                 method='numerical'):
+        if method not in self.METHODS:
+            raise ValueError(f"method must be one of {self.METHODS}, got {method!r}")
+
+        super().__init__('janus', H0=H0, Omega_plus=Omega_plus, Omega_minus=Omega_minus,
+                         chi=chi, kappa=kappa)
+        self.method = method
+
+        # Curvature of the bimetric solution
+        if method == 'ode':
+            self.Omega_k = 1.0 - self.Omega_m_eff
+
+    @property
+    def Omega_m_eff(self):
+        """Effective a^-3 coefficient of E²(z): Omega_plus plus the coupled negative sector"""
+        return self.Omega_plus + self.chi * abs(self.Omega_minus) * (
+            1.0 + self.kappa * np.sqrt(abs(self.Omega_minus) / self.Omega_plus)
+        )
 
-        # Precompute age of universe for inverse lookups
-        self._setup_age_interpolator()
+    @property
+    def _use_analytic(self):
+        """True if the closed forms are requested and valid for these parameters"""
+        return (self.method == 'analytic'
+                and matter_curvature_supported(self.Omega_m_eff, self.Omega_k))
 
-    def hubble_parameter(self, z):
+    def efunc(self, z):
         """
-        Hubble parameter H(z) for JANUS model
+        Dimensionless Hubble parameter E(z) = H(z)/H0
 
         Parameters
         ----------
@@ -71,65 +105,91 @@ class JANUSCosmology:
 
         Returns
         -------
-        H : float or array
-            Hubble parameter [km/s/Mpc]
+        E : array
+            H(z)/H0
         """
-        z = np.atleast_1d(z)
-        a = 1.0 / (1.0 + z)  # Scale factor
-
-        # JANUS modification to Friedmann equation
-        # Includes coupling between positive and negative sectors
-        H_squared = self.H0**2 * (
-            self.Omega_plus * a**(-3) +
-            self.Omega_k * a**(-2) +
-            self.chi * abs(self.Omega_minus) * a**(-3) *
-            (1.0 + self.kappa * np.sqrt(abs(self.Omega_minus) / self.Omega_plus))
-        )
-
-        return np.sqrt(np.maximum(H_squared, 0))
+        if self.method == 'ode':
+            return self._bimetric.efunc(np.atleast_1d(z))[0]
+        return super().efunc(z)
 
     def comoving_distance(self, z):
         """
         Comoving distance to redshift z
 
+        Evaluated for all redshifts at once on a shared grid
+        (see cosmology.integration); relative error < DISTANCE_INTERP_RTOL.
+
         Parameters
         ----------
-        z : float
-            Redshift
+        z : float or array-like
+            Redshift(s), any shape
 
         Returns
         -------
-        d_c : float
-            Comoving distance [Mpc]
+        d_c : float or array
+            Comoving distance [Mpc], 0 for z <= 0
         """
-        if z <= 0:
-            return 0.0
-
-        integrand = lambda zp: C_LIGHT / self.hubble_parameter(zp)
-        d_c, _ = quad(integrand, 0, z, epsrel=INTEGRATION_RTOL, epsabs=INTEGRATION_ATOL)
-
-        return d_c
+        if self.method == 'ode':
+            integral = self._bimetric.distance(z)[0]
+        elif self._use_analytic:
+            integral = matter_curvature_distance(z, self.Omega_m_eff, self.Omega_k)
+        else:
+            return super().comoving_distance(z)
+        return as_output(self.hubble_distance * integral, z)
+
+    @property
+    def _bimetric(self):
+        """Solution of the coupled Friedmann system, from the process-wide grid cache"""
+        return GRID_CACHE.get('janus', tuple(self.params.values()), 'bimetric',
+                              lambda: BimetricSolution(*self.params.values()))
+
+    def _dimensionless_age(self, z):
+        """H0 * t(z), closed form, bimetric solution or age table depending on method"""
+        if self.method == 'ode':
+            return self._bimetric.age(z)[0]
+        if not self._use_analytic:
+            return super()._dimensionless_age(z)
+        if np.any(np.asarray(z) < 0):
+            raise ValueError("Redshift must be non-negative")
+        return matter_curvature_age(z, self.Omega_m_eff, self.Omega_k, AGE_Z_MAX)
 
-    def angular_diameter_distance(self, z):
+    def redshift_at_age(self, age):
         """
-        Angular diameter distance
+        Redshift at which the universe has a given age (inverse of age_of_universe)
 
         Parameters
         ----------
-        z : float
-            Redshift
+        age : float or array-like
+            Age of universe [Gyr], any shape
 
         Returns
         -------
-        d_A : float
-            Angular diameter distance [Mpc]
+        z : float or array
+            Redshift
+
+        Raises
+        ------
+        ValueError
+            If an age is negative, beyond the present age or (except for
+            method='ode') below the age at the largest tabulated redshift
         """
-        d_c = self.comoving_distance(z)
-        return d_c / (1.0 + z)
+        t = np.asarray(age, dtype=float) / self.hubble_time
+        if self.method == 'ode':
+            t_min, t_max = 0.0, self._bimetric.t0[0]
+        else:
+            t_min, t_max = self._age_table.t_min, self._age_table.t0
+        if np.any(t < t_min) or np.any(t > t_max):
+            raise ValueError(f"Age must lie in [{self.hubble_time * t_min:.3e}, "
+                             f"{self.hubble_time * t_max:.4f}] Gyr")
+        if self.method == 'ode':
+            a, _ = self._bimetric.scale_factors(t)
+            return as_output(1.0 / a[0] - 1.0, age)
+        z = self._age_table.redshift(t)
+        return as_output(z, age)
 
-    def luminosity_distance(self, z):
+    def critical_density(self, z):
         """
-        Luminosity distance
+        Critical density at redshift z
 
         Parameters
         ----------
@@ -138,124 +198,230 @@ class JANUSCosmology:
 
         Returns
         -------
-        d_L : float
-            Luminosity distance [Mpc]
+        rho_crit : float
+            Critical density [M_sun/Mpc^3]
         """
-        d_c = self.comoving_distance(z)
-        return d_c * (1.0 + z)
+        H_z = self.hubble_parameter(z)  # km/s/Mpc
+        # Convert to M_sun/Mpc^3
+        # rho_c = 3 H^2 / (8 pi G)
+        rho_crit = 2.77536627e11 * (H_z / 100.0)**2  # M_sun/Mpc^3
+        return rho_crit
+
+    def __repr__(self):
+        return (f"JANUSCosmology(H0={self.H0:.2f}, Omega_plus={self.Omega_plus:.3f}, "
+                f"Omega_minus={self.Omega_minus:.3f}, chi={self.chi:.2f}, "
+                f"method={self.method!r})")
+
+
+class JANUSCosmologyBatch(ComovingGeometry):
+    """
+    Batch of JANUS cosmologies evaluated in one vectorized pass
+
+    Every method returns an array of shape (n_models,) + np.shape(z), so a
+    whole emcee walker ensemble is scored with a single NumPy call instead
+    of one JANUSCosmology per walker.
+
+    Parameters
+    ----------
+    params : array (n_models, n_params)
+        Columns H0, Omega_plus, Omega_minus[, chi[, kappa]]. Missing
+        columns take the JANUSCosmology defaults.
+    method : {'numerical', 'analytic', 'ode'}, optional
+        As for JANUSCosmology. With 'analytic', models outside the range of
+        the closed forms are integrated numerically. With 'ode', the coupled
+        Friedmann system is solved for all models in one odeint call.
+        Default: 'numerical'
+    """
+
+    PARAM_NAMES = ('H0', 'Omega_plus', 'Omega_minus', 'chi', 'kappa')
+
+    def __init__(self, params, method='numerical'):
+        if method not in JANUSCosmology.METHODS:
+            raise ValueError(f"method must be one of {JANUSCosmology.METHODS}, got {method!r}")
+
+        params = np.atleast_2d(np.asarray(params, dtype=float))
+        n_columns = params.shape[1]
+        if not 3 <= n_columns <= len(self.PARAM_NAMES):
+            raise ValueError(f"params must have 3 to {len(self.PARAM_NAMES)} columns "
+                             f"{self.PARAM_NAMES}, got {n_columns}")
+
+        defaults = [H0_JANUS_DEFAULT, OMEGA_PLUS_DEFAULT, OMEGA_MINUS_DEFAULT, CHI_DEFAULT, KAPPA]
+        self.params = np.tile(np.array(defaults, dtype=float), (len(params), 1))
+        self.params[:, :n_columns] = params
+        self.method = method
+
+        self.H0, self.Omega_plus, self.Omega_minus, self.chi, self.kappa = self.params.T
 
-    def comoving_volume(self, z):
+        # Derived parameters
+        self.Omega_m_eff = self.Omega_plus + self.chi * np.abs(self.Omega_minus) * (
+            1.0 + self.kappa * np.sqrt(np.abs(self.Omega_minus) / self.Omega_plus)
+        )
+        if method == 'ode':
+            self.Omega_k = 1.0 - self.Omega_m_eff
+        else:
+            self.Omega_k = 1.0 - self.Omega_plus - np.abs(self.Omega_minus)
+
+    def __len__(self):
+        return len(self.params)
+
+    def __getitem__(self, index):
+        """Single JANUSCosmology for one model of the batch"""
+        return JANUSCosmology(*self.params[index], method=self.method)
+
+    @staticmethod
+    def _per_model(values, z):
+        """Reshape a per-model vector to broadcast against z"""
+        return values.reshape((-1,) + (1,) * np.ndim(z))
+
+    def _output(self, value, z):
+        """Arrays (n_models,) + np.shape(z), also for scalar z"""
+        return value
+
+    @property
+    def hubble_distance(self):
+        """Hubble distance c/H0 of every model [Mpc]"""
+        return C_LIGHT / self.H0
+
+    @property
+    def _bimetric(self):
+        """Coupled Friedmann solution of the whole batch, from the process-wide grid cache"""
+        grid_params = self.params[:, 1:]
+        return GRID_CACHE.get('janus', tuple(grid_params.ravel()), 'bimetric_batch',
+                              lambda: BimetricSolution(*grid_params.T))
+
+    def _analytic_mask(self):
+        """Models served by the closed forms"""
+        if self.method != 'analytic':
+            return np.zeros(len(self), dtype=bool)
+        return matter_curvature_supported(self.Omega_m_eff, self.Omega_k)
+
+    def efunc(self, z):
         """
-        Comoving volume out to redshift z
+        Dimensionless Hubble parameter E(z) = H(z)/H0 for every model
 
         Parameters
         ----------
-        z : float
-            Redshift
+        z : float or array-like
+            Redshift(s), any shape
 
         Returns
         -------
-        V_c : float
-            Comoving volume [Mpc^3]
+        E : array (n_models,) + z.shape
         """
-        d_c = self.comoving_distance(z)
-
-        if abs(self.Omega_k) < 1e-5:  # Flat universe
-            return (4.0 / 3.0) * np.pi * d_c**3
-        elif self.Omega_k > 0:  # Open universe
-            return (4.0 * np.pi / (2.0 * self.Omega_k)) * (
-                d_c * np.sqrt(1.0 + self.Omega_k * (d_c / C_LIGHT * self.H0)**2) -
-                np.arcsinh(np.sqrt(self.Omega_k) * d_c / C_LIGHT * self.H0) / np.sqrt(self.Omega_k)
-            )
-        else:  # Closed universe
-            Om_k_abs = abs(self.Omega_k)
-            return (4.0 * np.pi / (2.0 * Om_k_abs)) * (
-                np.arcsin(np.sqrt(Om_k_abs) * d_c / C_LIGHT * self.H0) / np.sqrt(Om_k_abs) -
-                d_c * np.sqrt(1.0 - Om_k_abs * (d_c / C_LIGHT * self.H0)**2)
-            )
+        z = np.asarray(z, dtype=float)
+        if self.method == 'ode':
+            return self._bimetric.efunc(z)
+        u = 1.0 + z
+        E_squared = (self._per_model(self.Omega_m_eff, z) * u**3 +
+                     self._per_model(self.Omega_k, z) * u**2)
+        return np.sqrt(np.maximum(E_squared, 0))
 
-    def age_of_universe(self, z):
+    def hubble_parameter(self, z):
         """
-        Age of the universe at redshift z
+        Hubble parameter H(z) for every model
 
         Parameters
         ----------
-        z : float
-            Redshift
+        z : float or array-like
+            Redshift(s), any shape
 
         Returns
         -------
-        t : float
-            Age of universe [Gyr]
+        H : array (n_models,) + z.shape
+            Hubble parameter [km/s/Mpc]
         """
-        if z < 0:
-            raise ValueError("Redshift must be non-negative")
-
-        # Integrate dt/dz from infinity (z_max) to z
-        z_max = 1000.0  # Approximate "infinity"
-
-        # Use scalar version of hubble_parameter for integration
-        def integrand(zp):
-            H = self.hubble_parameter(zp)
-            if hasattr(H, '__len__'):
-                H = float(H[0])
-            return 1.0 / ((1.0 + zp) * H)
+        return self._per_model(self.H0, z) * self.efunc(z)
+
+    def _dimensionless_distance(self, z):
+        """H0 d_c / c for every model"""
+        z = np.asarray(z, dtype=float)
+        if self.method == 'ode':
+            return self._bimetric.distance(z)
+        analytic = self._analytic_mask()
+        result = np.empty((len(self),) + z.shape)
+
+        if np.any(analytic):
+            result[analytic] = matter_curvature_distance(
+                z, self._per_model(self.Omega_m_eff[analytic], z),
+                self._per_model(self.Omega_k[analytic], z))
+        if not np.all(analytic):
+            numerical = JANUSCosmologyBatch(self.params[~analytic])
+            result[~analytic] = line_of_sight_integral(numerical.efunc, z,
+                                                       n_models=len(numerical))
+        return result
+
+    def _dimensionless_age(self, z):
+        """H0 t(z) for every model"""
+        z = np.asarray(z, dtype=float)
+        if self.method == 'ode':
+            return self._bimetric.age(z)
+        analytic = self._analytic_mask()
+        result = np.empty((len(self),) + z.shape)
+
+        if np.any(analytic):
+            if np.any(z < 0):
+                raise ValueError("Redshift must be non-negative")
+            result[analytic] = matter_curvature_age(
+                z, self._per_model(self.Omega_m_eff[analytic], z),
+                self._per_model(self.Omega_k[analytic], z), AGE_Z_MAX)
+        if not np.all(analytic):
+            numerical = JANUSCosmologyBatch(self.params[~analytic])
+            result[~analytic] = age_integral(numerical.efunc, z, n_models=len(numerical))
+        return result
 
-        t_Mpc, _ = quad(integrand, z, z_max, epsrel=INTEGRATION_RTOL, epsabs=INTEGRATION_ATOL)
-
-        # Convert from Mpc·s/km to Gyr
-        # t [Mpc·s/km] × (MPC_TO_KM km/Mpc) = t [s]
-        # t [Gyr] = t [s] / GYR_TO_S
-        # Hubble time check: 1/H0 = (1/70) Mpc·s/km × 3.09e19 km/Mpc / 3.16e16 s/Gyr ≈ 14 Gyr ✓
-        t_Gyr = t_Mpc * MPC_TO_KM / GYR_TO_S
+    def comoving_distance(self, z):
+        """
+        Comoving distance for every model
 
-        return t_Gyr
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift(s), any shape
 
-    def _setup_age_interpolator(self):
-        """Setup interpolator for age(z) for faster lookups"""
-        z_grid = np.logspace(-3, np.log10(1000), 100)
-        age_grid = np.array([self.age_of_universe(z) for z in z_grid])
-        self._age_interpolator = interp1d(z_grid, age_grid, kind='cubic',
-                                          bounds_error=False, fill_value='extrapolate')
+        Returns
+        -------
+        d_c : array (n_models,) + z.shape
+            Comoving distance [Mpc]
+        """
+        return self._per_model(self.hubble_distance, z) * self._dimensionless_distance(z)
 
-    def lookback_time(self, z):
+    def age_of_universe(self, z):
         """
-        Lookback time to redshift z
+        Age of the universe at redshift z for every model
 
         Parameters
         ----------
-        z : float
-            Redshift
+        z : float or array-like
+            Redshift(s), any shape
 
         Returns
         -------
-        t_lb : float
-            Lookback time [Gyr]
+        t : array (n_models,) + z.shape
+            Age of universe [Gyr]
         """
-        t0 = self.age_of_universe(0)
-        t_z = self.age_of_universe(z)
-        return t0 - t_z
+        hubble_time = MPC_TO_KM / (self._per_model(self.H0, z) * GYR_TO_S)
+        return hubble_time * self._dimensionless_age(z)
 
-    def critical_density(self, z):
+    def lookback_time(self, z):
         """
-        Critical density at redshift z
+        Lookback time to redshift z for every model
 
         Parameters
         ----------
-        z : float
-            Redshift
+        z : float or array-like
+            Redshift(s), any shape
 
         Returns
         -------
-        rho_crit : float
-            Critical density [M_sun/Mpc^3]
+        t_lb : array (n_models,) + z.shape
+            Lookback time [Gyr]
         """
-        H_z = self.hubble_parameter(z)  # km/s/Mpc
-        # Convert to M_sun/Mpc^3
-        # rho_c = 3 H^2 / (8 pi G)
-        rho_crit = 2.77536627e11 * (H_z / 100.0)**2  # M_sun/Mpc^3
-        return rho_crit
+        z = np.asarray(z, dtype=float)
+        # One pass for z=0 and the requested redshifts
+        ages = self._dimensionless_age(np.concatenate([[0.0], z.ravel()]))
+        t_lb = (ages[:, :1] - ages[:, 1:]).reshape((len(self),) + z.shape)
+        hubble_time = MPC_TO_KM / (self._per_model(self.H0, z) * GYR_TO_S)
+        return hubble_time * t_lb
 
     def __repr__(self):
-        return (f"JANUSCosmology(H0={self.H0:.2f}, Omega_plus={self.Omega_plus:.3f}, "
-                f"Omega_minus={self.Omega_minus:.3f}, chi={self.chi:.2f})")
+        return f"JANUSCosmologyBatch(n_models={len(self)}, method={self.method!r})"
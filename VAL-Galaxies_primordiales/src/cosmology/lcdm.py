@@ -4,28 +4,40 @@
 Implements standard ΛCDM cosmology using Planck 2018 parameters
 Interface compatible with JANUSCosmology for direct comparison
 
+Background quantities are evaluated natively with NumPy (shared grid
+integrator of cosmology.integration, or the closed forms of
+cosmology.analytic for flat models without radiation). astropy.cosmology
+remains available as a validation backend via backend='astropy'.
+
 References:
 - Planck Collaboration (2018) - A&A 641, A6
-- Uses astropy.cosmology as computational backend
+- Radiation content as astropy.cosmology (massless neutrinos, Neff = 3.04)
 """
 
 import numpy as np
-from astropy.cosmology import FlatLambdaCDM, LambdaCDM
-from astropy import units as u
+
+from .integration import (
+    line_of_sight_integral, age_integral, as_output, AgeTable, DistanceTable
+)
+from .cache import GRID_CACHE
+from .analytic import flat_lambda_supported, flat_lambda_distance, flat_lambda_age
+from .geometry import ComovingGeometry
 
 try:
     from ..utils.constants import (
         H0_PLANCK2018, OMEGA_M_PLANCK, OMEGA_LAMBDA_PLANCK,
-        C_LIGHT, MPC_TO_KM, GYR_TO_S
+        C_LIGHT, MPC_TO_KM, GYR_TO_S, RHO_CRIT_H100, TCMB0,
+        OMEGA_GAMMA_H2, NEUTRINO_PHOTON_RATIO, NEFF, LCDM_AGE_Z_MAX, LCDM_AGE_GRID_SIZE
     )
 except ImportError:
     from utils.constants import (
         H0_PLANCK2018, OMEGA_M_PLANCK, OMEGA_LAMBDA_PLANCK,
-        C_LIGHT, MPC_TO_KM, GYR_TO_S
+        C_LIGHT, MPC_TO_KM, GYR_TO_S, RHO_CRIT_H100, TCMB0,
+        OMEGA_GAMMA_H2, NEUTRINO_PHOTON_RATIO, NEFF, LCDM_AGE_Z_MAX, LCDM_AGE_GRID_SIZE
     )
 
 
-class LCDMCosmology:
+class LCDMCosmology(ComovingGeometry):
     """
     ΛCDM Standard Cosmology Model
 
@@ -37,25 +49,83 @@ class LCDMCosmology:
         Matter density parameter. Default: 0.315 (Planck 2018)
     Omega_Lambda : float, optional
         Dark energy density parameter. Default: 0.685 (Planck 2018)
+    Tcmb0 : float, optional
+        CMB temperature today [K], sets the radiation density. Default: 2.7255
+    backend : {'numpy', 'astropy'}, optional
+        'numpy' evaluates everything natively; 'astropy' delegates to
+        astropy.cosmology (slower, kept for validation). Default: 'numpy'
+    method : {'numerical', 'analytic'}, optional
+        Native evaluation of distances, age and lookback time. 'analytic' uses
+        the closed forms of cosmology.analytic, which require a flat model
+        without radiation (Tcmb0=0), and falls back to numerical integration
+        otherwise. Default: 'numerical'
     """
 
+    BACKENDS = ('numpy', 'astropy')
+    METHODS = ('numerical', 'analytic')
+
     def __init__(self, H0=H0_PLANCK2018, Omega_m=OMEGA_M_PLANCK,
-                 Omega_Lambda=OMEGA_LAMBDA_PLANCK):
+                 Omega_Lambda=OMEGA_LAMBDA_PLANCK, Tcmb0=TCMB0,
+                 backend='numpy', method='numerical'):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"backend must be one of {self.BACKENDS}, got {backend!r}")
+        if method not in self.METHODS:
+            raise ValueError(f"method must be one of {self.METHODS}, got {method!r}")
+
         self.H0 = H0
         self.Omega_m = Omega_m
         self.Omega_Lambda = Omega_Lambda
-        self.Omega_k = 1.0 - Omega_m - Omega_Lambda
-
-        # Create astropy cosmology object
-        if abs(self.Omega_k) < 1e-5:  # Flat universe
-            self._cosmo = FlatLambdaCDM(H0=H0 * u.km / u.s / u.Mpc,
-                                         Om0=Omega_m,
-                                         Tcmb0=2.7255 * u.K)
+        self.Tcmb0 = Tcmb0
+        self.backend = backend
+        self.method = method
+
+        # Radiation as astropy; flat models absorb it into dark energy (FlatLambdaCDM)
+        self.Omega_r = _radiation_density(H0, Tcmb0)
+        self._flat = abs(1.0 - Omega_m - Omega_Lambda) < 1e-5
+        if self._flat:
+            self._Omega_de = 1.0 - Omega_m - self.Omega_r
+            self.Omega_k = 0.0
         else:
-            self._cosmo = LambdaCDM(H0=H0 * u.km / u.s / u.Mpc,
-                                     Om0=Omega_m,
-                                     Ode0=Omega_Lambda,
-                                     Tcmb0=2.7255 * u.K)
+            self._Omega_de = Omega_Lambda
+            self.Omega_k = 1.0 - Omega_m - Omega_Lambda - self.Omega_r
+
+        self._cosmo = _astropy_cosmology(H0, Omega_m, Omega_Lambda, Tcmb0,
+                                         self._flat) if backend == 'astropy' else None
+
+    @property
+    def _use_analytic(self):
+        """True if the closed forms are requested and valid for these parameters"""
+        return (self.method == 'analytic'
+                and bool(flat_lambda_supported(self.Omega_m, self._Omega_de,
+                                               self.Omega_k, self.Omega_r)))
+
+    @property
+    def hubble_distance(self):
+        """Hubble distance c/H0 [Mpc]"""
+        return C_LIGHT / self.H0
+
+    @property
+    def hubble_time(self):
+        """Hubble time 1/H0 [Gyr]"""
+        return MPC_TO_KM / (self.H0 * GYR_TO_S)
+
+    def efunc(self, z):
+        """
+        Dimensionless Hubble parameter E(z) = H(z)/H0
+
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift(s), any shape
+
+        Returns
+        -------
+        E : array
+            H(z)/H0
+        """
+        u = 1.0 + np.asarray(z, dtype=float)
+        return np.sqrt(self.Omega_r * u**4 + self.Omega_m * u**3 +
+                       self.Omega_k * u**2 + self._Omega_de)
 
     def hubble_parameter(self, z):
         """
@@ -72,8 +142,11 @@ class LCDMCosmology:
             Hubble parameter [km/s/Mpc]
         """
         z = np.atleast_1d(z)
-        H = self._cosmo.H(z).to(u.km / u.s / u.Mpc).value
-        return H if H.shape != () else float(H)
+        if self._cosmo is not None:
+            from astropy import units as u
+            H = self._cosmo.H(z).to(u.km / u.s / u.Mpc).value
+            return H if H.shape != () else float(H)
+        return self.H0 * self.efunc(z)
 
     def comoving_distance(self, z):
         """
@@ -81,17 +154,21 @@ class LCDMCosmology:
 
         Parameters
         ----------
-        z : float
-            Redshift
+        z : float or array-like
+            Redshift(s), any shape
 
         Returns
         -------
-        d_c : float
-            Comoving distance [Mpc]
+        d_c : float or array
+            Comoving distance [Mpc], 0 for z <= 0
         """
-        if z <= 0:
-            return 0.0
-        return self._cosmo.comoving_distance(z).to(u.Mpc).value
+        if self._cosmo is not None:
+            return self._astropy_distance('comoving_distance', z)
+        if self._use_analytic:
+            integral = flat_lambda_distance(z, self.Omega_m, self._Omega_de)
+        else:
+            integral = self._line_of_sight(z)
+        return as_output(self.hubble_distance * integral, z)
 
     def angular_diameter_distance(self, z):
         """
@@ -99,17 +176,18 @@ class LCDMCosmology:
 
         Parameters
         ----------
-        z : float
-            Redshift
+        z : float or array-like
+            Redshift(s), any shape
 
         Returns
         -------
-        d_A : float
+        d_A : float or array
             Angular diameter distance [Mpc]
         """
-        if z <= 0:
-            return 0.0
-        return self._cosmo.angular_diameter_distance(z).to(u.Mpc).value
+        if self._cosmo is not None:
+            return self._astropy_distance('angular_diameter_distance', z)
+        d_M = self.comoving_transverse_distance(z)
+        return as_output(d_M / (1.0 + np.asarray(z, dtype=float)), z)
 
     def luminosity_distance(self, z):
         """
@@ -117,35 +195,76 @@ class LCDMCosmology:
 
         Parameters
         ----------
-        z : float
-            Redshift
+        z : float or array-like
+            Redshift(s), any shape
 
         Returns
         -------
-        d_L : float
+        d_L : float or array
             Luminosity distance [Mpc]
         """
-        if z <= 0:
-            return 0.0
-        return self._cosmo.luminosity_distance(z).to(u.Mpc).value
-
-    def comoving_volume(self, z):
+        if self._cosmo is not None:
+            return self._astropy_distance('luminosity_distance', z)
+        d_M = self.comoving_transverse_distance(z)
+        return as_output(d_M * (1.0 + np.asarray(z, dtype=float)), z)
+
+    def _all_sky_volume(self, z):
+        """V_c(z) as an array [Mpc^3], from astropy with that backend"""
+        if self._cosmo is not None:
+            return np.asarray(self._astropy_distance('comoving_volume', z, unit='Mpc3'),
+                              dtype=float)
+        return super()._all_sky_volume(z)
+
+    def differential_comoving_volume(self, z):
         """
-        Comoving volume out to redshift z
+        Comoving volume element dV_c/dz/dΩ
 
         Parameters
         ----------
-        z : float
-            Redshift
+        z : float or array-like
+            Redshift(s), any shape
 
         Returns
         -------
-        V_c : float
-            Comoving volume [Mpc^3]
+        dV : float or array
+            Comoving volume per unit redshift and solid angle [Mpc^3/sr]
         """
-        if z <= 0:
-            return 0.0
-        return self._cosmo.comoving_volume(z).to(u.Mpc**3).value
+        if self._cosmo is not None:
+            return self._astropy_distance('differential_comoving_volume', z, unit='Mpc3 / sr')
+        return super().differential_comoving_volume(z)
+
+    @property
+    def _grid_params(self):
+        """Parameters of E(z), keys of the shared distance and age tables"""
+        return (self.Omega_m, self.Omega_Lambda, self.Omega_r)
+
+    @property
+    def _distance_table(self):
+        """Distance table for these parameters, from the process-wide grid cache"""
+        return GRID_CACHE.get('lcdm_radiation', self._grid_params, 'distance',
+                              lambda: DistanceTable(self.efunc))
+
+    @property
+    def _age_table(self):
+        """Age table for these parameters, from the process-wide grid cache"""
+        return GRID_CACHE.get('lcdm_radiation', self._grid_params, 'age',
+                              lambda: AgeTable(self.efunc, z_max=LCDM_AGE_Z_MAX,
+                                               n_grid=LCDM_AGE_GRID_SIZE))
+
+    def _line_of_sight(self, z):
+        """∫_0^z dz'/E(z'), from the distance table within its range"""
+        table = self._distance_table
+        if table.covers(z):
+            return table.integral(z)
+        return line_of_sight_integral(self.efunc, z)
+
+    def _dimensionless_age(self, z):
+        """H0 * t(z), closed form or age table depending on method"""
+        if not self._use_analytic:
+            return self._age_table.age(z)
+        if np.any(np.asarray(z) < 0):
+            raise ValueError("Redshift must be non-negative")
+        return flat_lambda_age(z, self.Omega_m, self._Omega_de)
 
     def age_of_universe(self, z):
         """
@@ -153,17 +272,19 @@ class LCDMCosmology:
 
         Parameters
         ----------
-        z : float
-            Redshift
+        z : float or array-like
+            Redshift(s), any shape
 
         Returns
         -------
-        t : float
+        t : float or array
             Age of universe [Gyr]
         """
-        if z < 0:
-            raise ValueError("Redshift must be non-negative")
-        return self._cosmo.age(z).to(u.Gyr).value
+        if self._cosmo is not None:
+            if np.any(np.asarray(z) < 0):
+                raise ValueError("Redshift must be non-negative")
+            return self._astropy_distance('age', z, unit='Gyr')
+        return as_output(self.hubble_time * self._dimensionless_age(z), z)
 
     def lookback_time(self, z):
         """
@@ -171,17 +292,19 @@ class LCDMCosmology:
 
         Parameters
         ----------
-        z : float
-            Redshift
+        z : float or array-like
+            Redshift(s), any shape
 
         Returns
         -------
-        t_lb : float
-            Lookback time [Gyr]
+        t_lb : float or array
+            Lookback time [Gyr], 0 for z <= 0
         """
-        if z <= 0:
-            return 0.0
-        return self._cosmo.lookback_time(z).to(u.Gyr).value
+        if self._cosmo is not None:
+            return self._astropy_distance('lookback_time', z, unit='Gyr')
+        z_pos = np.maximum(np.asarray(z, dtype=float), 0.0)
+        t_lb = self.hubble_time * (self._dimensionless_age(0.0) - self._dimensionless_age(z_pos))
+        return as_output(t_lb, z)
 
     def critical_density(self, z):
         """
@@ -189,18 +312,19 @@ class LCDMCosmology:
 
         Parameters
         ----------
-        z : float
+        z : float or array-like
             Redshift
 
         Returns
         -------
-        rho_crit : float
+        rho_crit : float or array
             Critical density [M_sun/Mpc^3]
         """
-        rho_crit_astropy = self._cosmo.critical_density(z)
-        # Convert to M_sun/Mpc^3
-        rho_crit = rho_crit_astropy.to(u.Msun / u.Mpc**3).value
-        return rho_crit
+        if self._cosmo is not None:
+            from astropy import units as u
+            return self._cosmo.critical_density(z).to(u.Msun / u.Mpc**3).value
+        H_z = self.H0 * self.efunc(z)
+        return as_output(RHO_CRIT_H100 * (H_z / 100.0)**2, z)
 
     def distmod(self, z):
         """
@@ -208,45 +332,259 @@ class LCDMCosmology:
 
         Parameters
         ----------
-        z : float
+        z : float or array-like
             Redshift
 
         Returns
         -------
-        mu : float
-            Distance modulus [mag]
+        mu : float or array
+            Distance modulus [mag], -inf for z <= 0
         """
-        if z <= 0:
-            return -np.inf
-        return self._cosmo.distmod(z).value
+        if self._cosmo is not None:
+            if np.ndim(z) == 0 and z <= 0:
+                return -np.inf
+            return self._cosmo.distmod(z).value
+        d_L = np.asarray(self.luminosity_distance(z), dtype=float)
+        with np.errstate(divide='ignore'):
+            mu = np.where(d_L > 0, 5.0 * np.log10(d_L) + 25.0, -np.inf)
+        return as_output(mu, z)
+
+    def _astropy_distance(self, name, z, unit='Mpc'):
+        """Evaluate an astropy.cosmology method, 0 for z <= 0 as the native backend"""
+        from astropy import units as u
+        z_arr = np.asarray(z, dtype=float)
+        value = getattr(self._cosmo, name)(np.maximum(z_arr, 0.0)).to(u.Unit(unit)).value
+        if name != 'age':
+            value = np.where(z_arr > 0, value, 0.0)
+        return as_output(value, z)
+
+    def __repr__(self):
+        return (f"LCDMCosmology(H0={self.H0:.2f}, Omega_m={self.Omega_m:.3f}, "
+                f"Omega_Lambda={self.Omega_Lambda:.3f}, backend={self.backend!r}, "
+                f"method={self.method!r})")
+
+
+def _astropy_cosmology(H0, Omega_m, Omega_Lambda, Tcmb0, flat):
+    """astropy.cosmology object for the validation backend (imported lazily)"""
+    from astropy.cosmology import FlatLambdaCDM, LambdaCDM
+    from astropy import units as u
+
+    if flat:
+        return FlatLambdaCDM(H0=H0 * u.km / u.s / u.Mpc, Om0=Omega_m, Tcmb0=Tcmb0 * u.K)
+    return LambdaCDM(H0=H0 * u.km / u.s / u.Mpc, Om0=Omega_m, Ode0=Omega_Lambda,
+                     Tcmb0=Tcmb0 * u.K)
+
+
+def _radiation_density(H0, Tcmb0=TCMB0):
+    """Photon + massless neutrino density parameter (zero for Tcmb0 = 0)"""
+    Omega_gamma = OMEGA_GAMMA_H2 * (Tcmb0 / TCMB0)**4 / (H0 / 100.0)**2
+    return Omega_gamma * (1.0 + NEUTRINO_PHOTON_RATIO * NEFF)
+
+
+class LCDMCosmologyBatch(ComovingGeometry):
+    """
+    Batch of ΛCDM cosmologies evaluated in one vectorized pass
+
+    Same interface as JANUSCosmologyBatch: every method returns an array of
+    shape (n_models,) + np.shape(z). Radiation (photons and massless
+    neutrinos) is included as in LCDMCosmology.
+
+    Parameters
+    ----------
+    params : array (n_models, n_params)
+        Columns H0, Omega_m[, Omega_Lambda]. Without an Omega_Lambda column,
+        or when Omega_m + Omega_Lambda = 1 within 1e-5, the model is flat.
+    Tcmb0 : float, optional
+        CMB temperature today [K], shared by all models. Default: 2.7255
+    method : {'numerical', 'analytic'}, optional
+        As LCDMCosmology; models outside the closed-form domain are integrated
+        numerically. Default: 'numerical'
+    """
+
+    PARAM_NAMES = ('H0', 'Omega_m', 'Omega_Lambda')
+
+    def __init__(self, params, Tcmb0=TCMB0, method='numerical'):
+        if method not in LCDMCosmology.METHODS:
+            raise ValueError(f"method must be one of {LCDMCosmology.METHODS}, got {method!r}")
+        self.Tcmb0 = Tcmb0
+        self.method = method
+
+        params = np.atleast_2d(np.asarray(params, dtype=float))
+        n_columns = params.shape[1]
+        if n_columns not in (2, 3):
+            raise ValueError(f"params must have 2 or 3 columns {self.PARAM_NAMES}, "
+                             f"got {n_columns}")
+
+        self.H0 = params[:, 0].copy()
+        self.Omega_m = params[:, 1].copy()
+        self.Omega_r = _radiation_density(self.H0, Tcmb0)
 
-    def comoving_transverse_distance(self, z):
+        if n_columns == 2:
+            flat = np.ones(len(params), dtype=bool)
+            Omega_Lambda = 1.0 - self.Omega_m
+        else:
+            Omega_Lambda = params[:, 2].copy()
+            flat = np.abs(1.0 - self.Omega_m - Omega_Lambda) < 1e-5
+
+        # Flat models absorb radiation into Omega_Lambda (as astropy FlatLambdaCDM)
+        self.Omega_Lambda = np.where(flat, 1.0 - self.Omega_m - self.Omega_r, Omega_Lambda)
+        self.Omega_k = np.where(flat, 0.0,
+                                1.0 - self.Omega_m - self.Omega_Lambda - self.Omega_r)
+        self.params = np.column_stack([self.H0, self.Omega_m, Omega_Lambda])
+
+    def __len__(self):
+        return len(self.H0)
+
+    def __getitem__(self, index):
+        """Single LCDMCosmology for one model of the batch"""
+        return LCDMCosmology(*self.params[index], Tcmb0=self.Tcmb0, method=self.method)
+
+    @staticmethod
+    def _per_model(values, z):
+        """Reshape a per-model vector to broadcast against z"""
+        return values.reshape((-1,) + (1,) * np.ndim(z))
+
+    def _output(self, value, z):
+        """Arrays (n_models,) + np.shape(z), also for scalar z"""
+        return value
+
+    @property
+    def hubble_distance(self):
+        """Hubble distance c/H0 of every model [Mpc]"""
+        return C_LIGHT / self.H0
+
+    def _analytic_mask(self):
+        """Models served by the closed forms"""
+        if self.method != 'analytic':
+            return np.zeros(len(self), dtype=bool)
+        return flat_lambda_supported(self.Omega_m, self.Omega_Lambda,
+                                     self.Omega_k, self.Omega_r)
+
+    def _dimensionless_distance(self, z):
+        """H0 d_c / c for every model"""
+        z = np.asarray(z, dtype=float)
+        analytic = self._analytic_mask()
+        result = np.empty((len(self),) + z.shape)
+
+        if np.any(analytic):
+            result[analytic] = flat_lambda_distance(
+                z, self._per_model(self.Omega_m[analytic], z),
+                self._per_model(self.Omega_Lambda[analytic], z))
+        if not np.all(analytic):
+            numerical = LCDMCosmologyBatch(self.params[~analytic], Tcmb0=self.Tcmb0)
+            result[~analytic] = line_of_sight_integral(numerical.efunc, z,
+                                                       n_models=len(numerical))
+        return result
+
+    def _dimensionless_age(self, z):
+        """H0 t(z) for every model"""
+        z = np.asarray(z, dtype=float)
+        analytic = self._analytic_mask()
+        result = np.empty((len(self),) + z.shape)
+
+        if np.any(analytic):
+            if np.any(z < 0):
+                raise ValueError("Redshift must be non-negative")
+            result[analytic] = flat_lambda_age(
+                z, self._per_model(self.Omega_m[analytic], z),
+                self._per_model(self.Omega_Lambda[analytic], z))
+        if not np.all(analytic):
+            numerical = LCDMCosmologyBatch(self.params[~analytic], Tcmb0=self.Tcmb0)
+            result[~analytic] = age_integral(numerical.efunc, z, z_max=LCDM_AGE_Z_MAX,
+                                             n_grid=LCDM_AGE_GRID_SIZE,
+                                             n_models=len(numerical))
+        return result
+
+    def efunc(self, z):
         """
-        Comoving transverse distance
+        Dimensionless Hubble parameter E(z) = H(z)/H0 for every model
 
         Parameters
         ----------
-        z : float
-            Redshift
+        z : float or array-like
+            Redshift(s), any shape
 
         Returns
         -------
-        d_M : float
-            Comoving transverse distance [Mpc]
-        """
-        if z <= 0:
-            return 0.0
-        d_c = self.comoving_distance(z)
-
-        if abs(self.Omega_k) < 1e-5:  # Flat
-            return d_c
-        elif self.Omega_k > 0:  # Open
-            DH = C_LIGHT / self.H0
-            return DH * np.sinh(np.sqrt(self.Omega_k) * d_c / DH) / np.sqrt(self.Omega_k)
-        else:  # Closed
-            DH = C_LIGHT / self.H0
-            return DH * np.sin(np.sqrt(abs(self.Omega_k)) * d_c / DH) / np.sqrt(abs(self.Omega_k))
+        E : array (n_models,) + z.shape
+        """
+        z = np.asarray(z, dtype=float)
+        u = 1.0 + z
+        E_squared = (self._per_model(self.Omega_r, z) * u**4 +
+                     self._per_model(self.Omega_m, z) * u**3 +
+                     self._per_model(self.Omega_k, z) * u**2 +
+                     self._per_model(self.Omega_Lambda, z))
+        return np.sqrt(E_squared)
+
+    def hubble_parameter(self, z):
+        """
+        Hubble parameter H(z) for every model
+
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift(s), any shape
+
+        Returns
+        -------
+        H : array (n_models,) + z.shape
+            Hubble parameter [km/s/Mpc]
+        """
+        return self._per_model(self.H0, z) * self.efunc(z)
+
+    def comoving_distance(self, z):
+        """
+        Comoving distance for every model
+
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift(s), any shape
+
+        Returns
+        -------
+        d_c : array (n_models,) + z.shape
+            Comoving distance [Mpc]
+        """
+        return self._per_model(self.hubble_distance, z) * self._dimensionless_distance(z)
+
+    def age_of_universe(self, z):
+        """
+        Age of the universe at redshift z for every model
+
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift(s), any shape
+
+        Returns
+        -------
+        t : array (n_models,) + z.shape
+            Age of universe [Gyr]
+        """
+        hubble_time = MPC_TO_KM / (self._per_model(self.H0, z) * GYR_TO_S)
+        return hubble_time * self._dimensionless_age(z)
+
+    def lookback_time(self, z):
+        """
+        Lookback time to redshift z for every model
+
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift(s), any shape
+
+        Returns
+        -------
+        t_lb : array (n_models,) + z.shape
+            Lookback time [Gyr]
+        """
+        z = np.asarray(z, dtype=float)
+        # One pass for z=0 and the requested redshifts
+        ages = self._dimensionless_age(np.concatenate([[0.0], np.maximum(z, 0.0).ravel()]))
+        t_lb = (ages[:, :1] - ages[:, 1:]).reshape((len(self),) + z.shape)
+        hubble_time = MPC_TO_KM / (self._per_model(self.H0, z) * GYR_TO_S)
+        return hubble_time * t_lb
 
     def __repr__(self):
-        return (f"LCDMCosmology(H0={self.H0:.2f}, Omega_m={self.Omega_m:.3f}, "
-                f"Omega_Lambda={self.Omega_Lambda:.3f})")
+        return f"LCDMCosmologyBatch(n_models={len(self)}, method={self.method!r})"
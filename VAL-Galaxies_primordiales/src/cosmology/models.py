@@ -0,0 +1,405 @@
+"""
+Unified Background Cosmology
+
+One typed interface for every background model used in the analysis and
+one implementation serving any expansion history registered by name:
+
+- `Cosmology`: typing.Protocol implemented by JANUSCosmology, LCDMCosmology
+  and BackgroundCosmology, so likelihoods and scripts can accept any of them
+- `register_variant`: registers E²(z) as a function of u = 1+z and named
+  density parameters, with their defaults and the curvature they imply
+- `BackgroundCosmology(variant, H0, **params)`: distances, volumes and ages
+  for a registered variant, all from the shared grid integrator of
+  cosmology.integration, the closed-form volumes of cosmology.geometry and
+  the distance and age tables of the process-wide grid cache
+
+Built-in variants:
+- 'janus': bimetric E² = [Ω+ + χ|Ω−|(1 + κ√(|Ω−|/Ω+))] u³ + Ω_k u²
+  (cosmology.janus.JANUSCosmology is this variant)
+- 'janus_u6': E² = Ω+ u³ + Ω− u⁶ + Ω_Λ with Ω_Λ = 1 − Ω+ − Ω−, the flat
+  variant of the Phase 3 MCMC scripts
+- 'lcdm': E² = Ω_m u³ + Ω_k u² + Ω_Λ, no radiation (the Phase 3 scripts'
+  ΛCDM; cosmology.lcdm.LCDMCosmology adds radiation)
+"""
+
+from typing import Callable, NamedTuple, Protocol, runtime_checkable
+
+import numpy as np
+
+from .integration import line_of_sight_integral, as_output, AgeTable, DistanceTable
+from .cache import GRID_CACHE
+from .geometry import ComovingGeometry
+
+try:
+    from ..utils.constants import (
+        C_LIGHT, MPC_TO_KM, GYR_TO_S, H0_JANUS_DEFAULT,
+        OMEGA_PLUS_DEFAULT, OMEGA_MINUS_DEFAULT, CHI_DEFAULT, KAPPA,
+        OMEGA_M_PLANCK, OMEGA_LAMBDA_PLANCK, AGE_Z_MAX, AGE_GRID_SIZE,
+        LCDM_AGE_Z_MAX, LCDM_AGE_GRID_SIZE, U6_AGE_Z_MAX, FULL_SKY_DEG2
+    )
+except ImportError:
+    from utils.constants import (
+        C_LIGHT, MPC_TO_KM, GYR_TO_S, H0_JANUS_DEFAULT,
+        OMEGA_PLUS_DEFAULT, OMEGA_MINUS_DEFAULT, CHI_DEFAULT, KAPPA,
+        OMEGA_M_PLANCK, OMEGA_LAMBDA_PLANCK, AGE_Z_MAX, AGE_GRID_SIZE,
+        LCDM_AGE_Z_MAX, LCDM_AGE_GRID_SIZE, U6_AGE_Z_MAX, FULL_SKY_DEG2
+    )
+
+
+@runtime_checkable
+class Cosmology(Protocol):
+    """
+    Interface shared by all background cosmology models
+
+    Redshift arguments accept floats or arrays of any shape; distances and
+    times return a float for scalar input and an ndarray otherwise.
+    """
+
+    H0: float
+
+    def efunc(self, z) -> np.ndarray:
+        """Dimensionless Hubble parameter E(z) = H(z)/H0"""
+        ...
+
+    def hubble_parameter(self, z) -> np.ndarray:
+        """Hubble parameter H(z) [km/s/Mpc]"""
+        ...
+
+    def comoving_distance(self, z):
+        """Line-of-sight comoving distance [Mpc]"""
+        ...
+
+    def luminosity_distance(self, z):
+        """Luminosity distance [Mpc]"""
+        ...
+
+    def comoving_volume(self, z):
+        """All-sky comoving volume [Mpc^3]"""
+        ...
+
+    def differential_comoving_volume(self, z):
+        """Comoving volume element dV_c/dz/dΩ [Mpc^3/sr]"""
+        ...
+
+    def shell_volume(self, z_lo, z_hi, area_deg2=FULL_SKY_DEG2):
+        """Comoving volume of redshift shells over a survey area [Mpc^3]"""
+        ...
+
+    def age_of_universe(self, z):
+        """Age of the universe at redshift z [Gyr]"""
+        ...
+
+    def lookback_time(self, z):
+        """Lookback time to redshift z [Gyr]"""
+        ...
+
+
+class Variant(NamedTuple):
+    """
+    Registered expansion history
+
+    Attributes
+    ----------
+    name : str
+        Registry key
+    e2 : callable
+        e2(u, **params) -> E² at u = 1+z, vectorized in u
+    defaults : dict
+        Parameter names and default values, in signature order
+    curvature : callable
+        curvature(**params) -> Omega_k
+    age_z_max : float
+        Upper limit of the age integral ("infinity")
+    age_grid_size : int
+        Nodes of the age table ln(1+z) grid
+    """
+    name: str
+    e2: Callable
+    defaults: dict
+    curvature: Callable
+    age_z_max: float
+    age_grid_size: int
+
+
+VARIANTS = {}
+
+
+def _flat(**params):
+    return 0.0
+
+
+# Module-level curvatures (not lambdas), so that models pickle for process pools
+
+def _janus_curvature(Omega_plus, Omega_minus, **params):
+    return 1.0 - Omega_plus - abs(Omega_minus)
+
+
+def _lcdm_curvature(Omega_m, Omega_Lambda):
+    return 1.0 - Omega_m - Omega_Lambda
+
+
+def register_variant(name, defaults, curvature=_flat,
+                     age_z_max=AGE_Z_MAX, age_grid_size=AGE_GRID_SIZE):
+    """
+    Decorator registering an E²(u) function under `name`
+
+    Parameters
+    ----------
+    name : str
+        Name used by BackgroundCosmology(variant=name)
+    defaults : dict
+        Density parameters accepted by the function, with default values
+    curvature : callable, optional
+        Omega_k as a function of the parameters. Default: flat
+    age_z_max : float, optional
+        Upper limit of age integrals. Default: AGE_Z_MAX
+    age_grid_size : int, optional
+        Nodes of the age table grid. Default: AGE_GRID_SIZE
+
+    Examples
+    --------
+    >>> @register_variant('wcdm', {'Omega_m': 0.3, 'w': -1.0})
+    ... def wcdm(u, Omega_m, w):
+    ...     return Omega_m * u**3 + (1.0 - Omega_m) * u**(3.0 * (1.0 + w))
+    """
+    if name in VARIANTS:
+        raise ValueError(f"Variant {name!r} is already registered")
+
+    def decorator(e2):
+        VARIANTS[name] = Variant(name, e2, dict(defaults), curvature,
+                                 age_z_max, age_grid_size)
+        return e2
+
+    return decorator
+
+
+@register_variant(
+    'janus',
+    {'Omega_plus': OMEGA_PLUS_DEFAULT, 'Omega_minus': OMEGA_MINUS_DEFAULT,
+     'chi': CHI_DEFAULT, 'kappa': KAPPA},
+    curvature=_janus_curvature,
+)
+def janus_e2(u, Omega_plus, Omega_minus, chi, kappa):
+    """JANUS bimetric expansion: coupled matter sectors plus curvature"""
+    Omega_m_eff = Omega_plus + chi * abs(Omega_minus) * (
+        1.0 + kappa * np.sqrt(abs(Omega_minus) / Omega_plus)
+    )
+    Omega_k = 1.0 - Omega_plus - abs(Omega_minus)
+    return Omega_m_eff * u**3 + Omega_k * u**2
+
+
+@register_variant(
+    'janus_u6',
+    {'Omega_plus': 0.40, 'Omega_minus': OMEGA_MINUS_DEFAULT},
+    age_z_max=U6_AGE_Z_MAX,
+)
+def janus_u6_e2(u, Omega_plus, Omega_minus):
+    """Flat JANUS variant of the Phase 3 scripts with a (1+z)^6 negative sector"""
+    return Omega_plus * u**3 + Omega_minus * u**6 + (1.0 - Omega_plus - Omega_minus)
+
+
+@register_variant(
+    'lcdm',
+    {'Omega_m': OMEGA_M_PLANCK, 'Omega_Lambda': OMEGA_LAMBDA_PLANCK},
+    curvature=_lcdm_curvature,
+    age_z_max=LCDM_AGE_Z_MAX, age_grid_size=LCDM_AGE_GRID_SIZE,
+)
+def lcdm_e2(u, Omega_m, Omega_Lambda):
+    """ΛCDM without radiation"""
+    return Omega_m * u**3 + (1.0 - Omega_m - Omega_Lambda) * u**2 + Omega_Lambda
+
+
+def get_variant(name):
+    """Registered Variant for `name`, ValueError listing the known names otherwise"""
+    try:
+        return VARIANTS[name]
+    except KeyError:
+        raise ValueError(f"Unknown variant {name!r}, registered: {sorted(VARIANTS)}") from None
+
+
+class BackgroundCosmology(ComovingGeometry):
+    """
+    Background cosmology for any registered E(z) variant
+
+    Parameters
+    ----------
+    variant : str
+        Registered variant name (see VARIANTS)
+    H0 : float, optional
+        Hubble constant [km/s/Mpc]. Default: 70.0
+    **params
+        Density parameters of the variant; missing ones take the variant
+        defaults. They are also exposed as attributes.
+
+    Examples
+    --------
+    >>> cosmo = BackgroundCosmology('janus_u6', H0=75.0, Omega_plus=0.4)
+    >>> cosmo.age_of_universe([8.0, 10.0, 12.0])
+    """
+
+    def __init__(self, variant, H0=H0_JANUS_DEFAULT, **params):
+        self.variant = get_variant(variant)
+
+        unknown = set(params) - set(self.variant.defaults)
+        if unknown:
+            raise TypeError(f"Unknown parameters for variant {variant!r}: {sorted(unknown)}")
+
+        self.H0 = H0
+        self.params = {**self.variant.defaults, **params}
+        for key, value in self.params.items():
+            setattr(self, key, value)
+        self.Omega_k = self.variant.curvature(**self.params)
+
+    def efunc(self, z):
+        """
+        Dimensionless Hubble parameter E(z) = H(z)/H0
+
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift
+
+        Returns
+        -------
+        E : array
+            H(z)/H0
+        """
+        u = 1.0 + np.atleast_1d(np.asarray(z, dtype=float))
+        return np.sqrt(np.maximum(self.variant.e2(u, **self.params), 0))
+
+    def hubble_parameter(self, z):
+        """
+        Hubble parameter H(z)
+
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift
+
+        Returns
+        -------
+        H : array
+            Hubble parameter [km/s/Mpc]
+        """
+        return self.H0 * self.efunc(z)
+
+    @property
+    def hubble_distance(self):
+        """Hubble distance c/H0 [Mpc]"""
+        return C_LIGHT / self.H0
+
+    @property
+    def hubble_time(self):
+        """Hubble time 1/H0 [Gyr]"""
+        return MPC_TO_KM / (self.H0 * GYR_TO_S)
+
+    def comoving_distance(self, z):
+        """
+        Line-of-sight comoving distance
+
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift(s), any shape
+
+        Returns
+        -------
+        d_c : float or array
+            Comoving distance [Mpc], 0 for z <= 0
+        """
+        table = self._distance_table
+        if table.covers(z):
+            integral = table.integral(z)
+        else:
+            integral = line_of_sight_integral(self.efunc, z)
+        d_c = self.hubble_distance * integral
+        return as_output(d_c, z)
+
+    def angular_diameter_distance(self, z):
+        """
+        Angular diameter distance
+
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift(s), any shape
+
+        Returns
+        -------
+        d_A : float or array
+            Angular diameter distance [Mpc]
+        """
+        d_M = self.comoving_transverse_distance(z)
+        return as_output(d_M / (1.0 + np.asarray(z, dtype=float)), z)
+
+    def luminosity_distance(self, z):
+        """
+        Luminosity distance
+
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift(s), any shape
+
+        Returns
+        -------
+        d_L : float or array
+            Luminosity distance [Mpc]
+        """
+        d_M = self.comoving_transverse_distance(z)
+        return as_output(d_M * (1.0 + np.asarray(z, dtype=float)), z)
+
+    @property
+    def _distance_table(self):
+        """Distance table for these parameters, from the process-wide grid cache"""
+        return GRID_CACHE.get(self.variant.name, tuple(self.params.values()), 'distance',
+                              lambda: DistanceTable(self.efunc))
+
+    @property
+    def _age_table(self):
+        """Age table for these parameters, from the process-wide grid cache"""
+        return GRID_CACHE.get(self.variant.name, tuple(self.params.values()), 'age',
+                              lambda: AgeTable(self.efunc, z_max=self.variant.age_z_max,
+                                               n_grid=self.variant.age_grid_size))
+
+    def _dimensionless_age(self, z):
+        """H0 * t(z), from the age table"""
+        return self._age_table.age(z)
+
+    def age_of_universe(self, z):
+        """
+        Age of the universe at redshift z
+
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift(s), any shape, non-negative
+
+        Returns
+        -------
+        t : float or array
+            Age of universe [Gyr]
+        """
+        t = self.hubble_time * self._dimensionless_age(z)
+        return as_output(t, z)
+
+    def lookback_time(self, z):
+        """
+        Lookback time to redshift z
+
+        Parameters
+        ----------
+        z : float or array-like
+            Redshift(s), any shape, non-negative
+
+        Returns
+        -------
+        t_lb : float or array
+            Lookback time [Gyr]
+        """
+        t_lb = self.hubble_time * (self._dimensionless_age(0.0) - self._dimensionless_age(z))
+        return as_output(t_lb, z)
+
+    def __repr__(self):
+        params = ", ".join(f"{key}={value}" for key, value in self.params.items())
+        return f"BackgroundCosmology({self.variant.name!r}, H0={self.H0}, {params})"
@@ -1,7 +1,44 @@
 """Statistical analysis and model fitting"""
 
 from .fitting import *
+from .likelihood import (
+    UVLFLikelihood, ObservedUVLF, schechter_function, log_schechter_function
+)
+from .posterior import Posterior, PooledPosterior, make_pool
+from .streaming import BlockMoments, ChainDiagnostics, StreamingDiagnostics, iter_chunks
+from .checkpoint import AsyncHDFBackend
+from .tuning import ParallelPlan, ChunkedPool, plan_parallelism
+from .metrics import MetricsSeries, MetricsServer, prometheus_text
+from .autocorr import (
+    AutocorrResult, autocorrelation, autocorrelation_function, autocorrelation_diagnostics,
+    integrated_time, sokal_time, geyer_time
+)
+from .information import (
+    InformationCriterion, pointwise_log_likelihood, dic, waic, psis_loo, psis_smooth, gpd_fit
+)
+from .convergence import (
+    ConvergenceCriteria, ConvergenceStatus, ConvergenceController, run_until_converged
+)
+from .samplers import (
+    SamplerConfig, SamplerResult, SAMPLERS, register_sampler, get_sampler, run_sampler,
+    stepping_stone_evidence
+)
 
 __all__ = ['log_likelihood', 'log_prior', 'log_posterior',
+           'log_likelihood_batch', 'log_likelihood_pointwise', 'log_prior_batch',
+           'log_posterior_batch',
            'run_mcmc', 'compute_aic', 'compute_bic', 'compute_dic',
-           'gelman_rubin_diagnostic', 'autocorrelation_time']
+           'gelman_rubin_diagnostic', 'autocorrelation_time',
+           'UVLFLikelihood', 'ObservedUVLF', 'schechter_function', 'log_schechter_function',
+           'Posterior', 'PooledPosterior', 'make_pool',
+           'SamplerConfig', 'SamplerResult', 'SAMPLERS', 'register_sampler', 'get_sampler',
+           'run_sampler', 'stepping_stone_evidence',
+           'ConvergenceCriteria', 'ConvergenceStatus', 'ConvergenceController',
+           'run_until_converged', 'AutocorrResult', 'autocorrelation',
+           'autocorrelation_function', 'autocorrelation_diagnostics', 'integrated_time',
+           'sokal_time', 'geyer_time',
+           'InformationCriterion', 'pointwise_log_likelihood', 'dic', 'waic', 'psis_loo',
+           'psis_smooth', 'gpd_fit',
+           'BlockMoments', 'ChainDiagnostics', 'StreamingDiagnostics', 'iter_chunks',
+           'AsyncHDFBackend', 'ParallelPlan', 'ChunkedPool', 'plan_parallelism',
+           'MetricsSeries', 'MetricsServer', 'prometheus_text']
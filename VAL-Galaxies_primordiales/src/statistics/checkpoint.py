@@ -0,0 +1,325 @@
+"""
+Asynchronous HDF5 Checkpoints
+
+emcee.backends.HDFBackend opens the file and writes every step as the
+sampler makes it, so each step waits for the disk. AsyncHDFBackend keeps
+the newest steps in memory and hands them, half a flush_interval at a time,
+to a writer thread that appends them to chunked, compressed datasets while
+sampling goes on.
+
+The file has the HDFBackend layout and is readable by it, by
+statistics.streaming and by the Phase 3 report scripts. The iteration
+attribute is written last in each flush, so a reader (or a resumed run)
+always sees whole steps. A new batch is handed over only once the previous
+one is on disk, so at most one batch is being written while the next one
+fills: a crash loses at most flush_interval steps. On normal exit, an
+exception leaving a `with` block, or close(), everything is flushed.
+
+>>> with AsyncHDFBackend('chains/janus.h5', flush_interval=200) as backend:
+...     backend.reset(nwalkers, ndim)
+...     sampler = emcee.EnsembleSampler(nwalkers, ndim, log_prob, backend=backend)
+...     sampler.run_mcmc(p0, 50000)
+>>> backend.write_time, backend.wait_time   # seconds writing, seconds sampling waited
+"""
+
+import atexit
+import queue
+import threading
+import time
+import weakref
+
+import numpy as np
+
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+try:
+    import emcee
+    from emcee.backends import HDFBackend
+    HAS_EMCEE = True
+except ImportError:
+    HDFBackend = object
+    HAS_EMCEE = False
+
+_FIELDS = ('chain', 'log_prob', 'blobs')
+
+
+def _close_at_exit(ref):
+    """atexit hook: flush a backend that is still alive and writable"""
+    backend = ref()
+    if backend is not None and backend._error is None:
+        backend.close()
+
+
+class AsyncHDFBackend(HDFBackend):
+    """
+    emcee backend buffering steps in memory and writing them from a thread
+
+    Parameters
+    ----------
+    filename : str or Path
+        HDF5 file; an existing chain in group `name` is resumed
+    name : str, optional
+        HDF5 group. Default: 'mcmc'
+    flush_interval : int, optional
+        Most steps not yet on disk; they are written flush_interval // 2 at a
+        time, the HDF5 chunk length along the steps (1: every step, waiting
+        for the disk). Default: 100
+    compression : str, optional
+        HDF5 filter of the datasets. Default: 'gzip'
+    compression_opts : int, optional
+        Filter level. Default: 4
+    read_only : bool, optional
+        Refuse to write. Default: False
+    dtype : numpy dtype, optional
+        Default: float64
+
+    Attributes
+    ----------
+    write_time : float
+        Seconds spent writing, in the writer thread
+    wait_time : float
+        Seconds the sampler waited for the writer (the checkpoint overhead)
+    """
+
+    def __init__(self, filename, name='mcmc', flush_interval=100, compression='gzip',
+                 compression_opts=4, read_only=False, dtype=None):
+        if not (HAS_EMCEE and HAS_H5PY):
+            raise ImportError("emcee and h5py are required: pip install emcee h5py")
+        super().__init__(str(filename), name=name, read_only=read_only, dtype=dtype,
+                         compression=compression, compression_opts=compression_opts)
+        self.flush_interval = max(1, int(flush_interval))
+        # One batch written while the next one fills: two batches unwritten
+        self._batch_steps = max(1, self.flush_interval // 2)
+        self.write_time = 0.0
+        self.wait_time = 0.0
+
+        self._lock = threading.Lock()       # File access, _pending and _written
+        self._queue = None
+        self._thread = None
+        self._error = None
+        self._pending = []                  # Batches handed over, not yet written
+        self._buffer = {field: [] for field in _FIELDS}
+        self._load()
+        atexit.register(_close_at_exit, weakref.ref(self))
+
+    def _load(self):
+        """Chain state of an existing file, or an empty backend"""
+        self._shape = None
+        self._iteration = self._written = 0
+        self._accepted = None
+        self._random_state = None
+        self._has_blobs = False
+        if not super().initialized:
+            return
+        with self.open() as f:
+            g = f[self.name]
+            self._shape = (int(g.attrs['nwalkers']), int(g.attrs['ndim']))
+            self._iteration = self._written = int(g.attrs['iteration'])
+            self._accepted = g['accepted'][...]
+            self._has_blobs = bool(g.attrs['has_blobs'])
+            states = [v for k, v in sorted(g.attrs.items()) if k.startswith('random_state_')]
+            self._random_state = states or None
+
+    # emcee backend interface, served from memory
+
+    @property
+    def initialized(self):
+        return self._shape is not None
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def iteration(self):
+        return self._iteration
+
+    @property
+    def accepted(self):
+        return self._accepted
+
+    @property
+    def random_state(self):
+        return self._random_state
+
+    def has_blobs(self):
+        return self._has_blobs
+
+    def reset(self, nwalkers, ndim):
+        """Clear the chain, in memory and in the file"""
+        self.flush()
+        chunk = min(self._batch_steps, 10000)
+        options = dict(compression=self.compression, compression_opts=self.compression_opts)
+        with self._lock, self.open('a') as f:
+            if self.name in f:
+                del f[self.name]
+            g = f.create_group(self.name)
+            g.attrs['version'] = emcee.__version__
+            g.attrs['nwalkers'] = nwalkers
+            g.attrs['ndim'] = ndim
+            g.attrs['has_blobs'] = False
+            g.attrs['iteration'] = 0
+            g.create_dataset('accepted', data=np.zeros(nwalkers), **options)
+            g.create_dataset('chain', (0, nwalkers, ndim), maxshape=(None, nwalkers, ndim),
+                             chunks=(chunk, nwalkers, ndim), dtype=self.dtype, **options)
+            g.create_dataset('log_prob', (0, nwalkers), maxshape=(None, nwalkers),
+                             chunks=(chunk, nwalkers), dtype=self.dtype, **options)
+        self._shape = (nwalkers, ndim)
+        self._iteration = self._written = 0
+        self._accepted = np.zeros(nwalkers)
+        self._random_state = None
+        self._has_blobs = False
+
+    def grow(self, ngrow, blobs):
+        """Nothing to allocate: datasets grow at each flush"""
+        self._check_blobs(blobs)
+        if blobs is not None:
+            self._has_blobs = True
+
+    def save_step(self, state, accepted):
+        """Buffer a step; hand the buffer to the writer every half flush_interval"""
+        self._check(state, accepted)
+        self._buffer['chain'].append(np.array(state.coords, dtype=self.dtype))
+        self._buffer['log_prob'].append(np.array(state.log_prob, dtype=self.dtype))
+        if state.blobs is not None:
+            self._buffer['blobs'].append(np.array(state.blobs))
+        self._accepted = self._accepted + accepted
+        self._random_state = state.random_state
+        self._iteration += 1
+        if len(self._buffer['chain']) >= self._batch_steps:
+            self._submit()
+            if self.flush_interval == 1:    # No room for a second batch
+                self._wait()
+
+    def get_value(self, name, flat=False, thin=1, discard=0):
+        if self._iteration <= 0:
+            raise AttributeError("You must run the sampler with 'store == True' "
+                                 "before accessing the results")
+        if name == 'blobs' and not self._has_blobs:
+            return None
+        v = self.read(name, discard + thin - 1, self._iteration, thin)
+        if flat:
+            s = list(v.shape[1:])
+            s[0] = np.prod(v.shape[:2])
+            return v.reshape(s)
+        return v
+
+    # Reading across the file and the buffers
+
+    def read(self, name, start=0, stop=None, thin=1):
+        """
+        Steps start:stop:thin of 'chain', 'log_prob' or 'blobs'
+
+        Steps already on disk come from the file, newer ones from memory.
+        """
+        stop = self._iteration if stop is None else min(stop, self._iteration)
+        with self._lock:
+            written = self._written
+            memory = [batch[name] for batch in self._pending]
+            if self._buffer[name]:
+                memory.append(np.array(self._buffer[name]))
+            if stop <= written or not memory:
+                with self.open() as f:
+                    return f[self.name][name][start:stop:thin]
+            recent = np.concatenate(memory)
+            if start >= written:
+                return recent[start - written:stop - written:thin]
+            with self.open() as f:
+                stored = f[self.name][name][start:written:thin]
+        first = start + -(-(written - start) // thin) * thin
+        return np.concatenate([stored, recent[first - written:stop - written:thin]])
+
+    # Writer thread
+
+    def _submit(self):
+        """Hand the buffered steps to the writer, once the previous batch is on disk"""
+        self._wait()
+        batch = {field: np.array(values) for field, values in self._buffer.items() if values}
+        batch.update(start=self._iteration - len(batch['chain']), accepted=self._accepted.copy(),
+                     random_state=self._random_state, has_blobs=self._has_blobs)
+        self._buffer = {field: [] for field in _FIELDS}
+
+        if self._thread is None:
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(target=self._run_writer, daemon=True,
+                                            name=f'AsyncHDFBackend({self.filename})')
+            self._thread.start()
+        with self._lock:
+            self._pending.append(batch)
+        self._queue.put(batch)
+
+    def _wait(self):
+        """Block until the writer is idle; raise if a write failed"""
+        if self._queue is not None:
+            t0 = time.perf_counter()
+            self._queue.join()
+            self.wait_time += time.perf_counter() - t0
+        if self._error is not None:
+            # Later steps cannot be appended after a lost batch: the error stays
+            raise RuntimeError(f"Checkpoint write to {self.filename} failed") from self._error
+
+    def _run_writer(self):
+        while True:
+            batch = self._queue.get()
+            try:
+                if batch is None:
+                    return
+                t0 = time.perf_counter()
+                with self._lock:
+                    self._write(batch)
+                    self._pending.pop(0)
+                    self._written = batch['start'] + len(batch['chain'])
+                self.write_time += time.perf_counter() - t0
+            except Exception as error:
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+    def _write(self, batch):
+        """Append a batch to the file; the iteration attribute goes last"""
+        start, n = batch['start'], len(batch['chain'])
+        with self.open('a') as f:
+            g = f[self.name]
+            end = start + n
+            for field in ('chain', 'log_prob'):
+                g[field].resize(end, axis=0)
+                g[field][start:end] = batch[field]
+            if batch['has_blobs']:
+                blobs = batch['blobs']
+                if 'blobs' not in g:
+                    g.create_dataset('blobs', (0,) + blobs.shape[1:2],
+                                     maxshape=(None,) + blobs.shape[1:2],
+                                     dtype=np.dtype((blobs.dtype, blobs.shape[2:])),
+                                     compression=self.compression,
+                                     compression_opts=self.compression_opts)
+                g['blobs'].resize(end, axis=0)
+                g['blobs'][start:end] = blobs
+                g.attrs['has_blobs'] = True
+            g['accepted'][:] = batch['accepted']
+            for i, v in enumerate(batch['random_state'] or ()):
+                g.attrs[f'random_state_{i}'] = v
+            g.attrs['iteration'] = end
+
+    def flush(self):
+        """Write every buffered step and wait until it is on disk"""
+        if self._buffer['chain']:
+            self._submit()
+        self._wait()
+
+    def close(self):
+        """Flush and stop the writer thread"""
+        self.flush()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = self._queue = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
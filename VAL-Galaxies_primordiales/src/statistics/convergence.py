@@ -0,0 +1,193 @@
+"""
+Adaptive MCMC Stopping
+
+A ConvergenceController is fed the chain block by block while the sampler
+runs, and decides when the INS-Statistiques.md criteria are met:
+
+- N > 50 τ          (integrated autocorrelation time, every parameter),
+                    with τ changed by less than 1% since the previous check
+- split R-hat < 1.1
+- ESS >= target     (walkers × post-burn-in steps / τ)
+
+τ comes from a batched FFT over the whole chain (its newest max_window
+steps for long runs), centred on the ensemble mean: per-walker means bias
+τ low by about a fifth at 50 τ. R-hat comes from running per-walker sums
+kept for each block (statistics.streaming.BlockMoments).
+
+run_until_converged drives an emcee sampler in blocks and stops as soon as
+the criteria pass; max_steps only bounds runs that do not converge.
+
+>>> controller = ConvergenceController(ConvergenceCriteria(ess_min=2000))
+>>> status = run_until_converged(sampler, p0, max_steps=50000, controller=controller)
+>>> status.converged, status.iteration, status.tau
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+try:
+    from .autocorr import integrated_time
+    from .streaming import BlockMoments, iter_chunks
+except ImportError:
+    from statistics.autocorr import integrated_time
+    from statistics.streaming import BlockMoments, iter_chunks
+
+
+class ConvergenceCriteria(NamedTuple):
+    """
+    Stopping criteria (INS-Statistiques.md)
+
+    tau_factor : run at least tau_factor × τ steps. Default: 50
+    rhat_max : split R-hat below this for every parameter. Default: 1.1
+    ess_min : effective sample size of every parameter. Default: 100
+    tau_rtol : largest relative change of τ between two checks (emcee's
+        stability test). Default: 0.01
+    """
+    tau_factor: float = 50.0
+    rhat_max: float = 1.1
+    ess_min: float = 100.0
+    tau_rtol: float = 0.01
+
+
+class ConvergenceStatus(NamedTuple):
+    """Latest convergence estimates of a ConvergenceController"""
+    iteration: int
+    tau: np.ndarray
+    rhat: np.ndarray
+    ess: np.ndarray
+    checks: dict
+    converged: bool
+
+
+class ConvergenceController:
+    """
+    Incremental τ, split R-hat and ESS of a running ensemble
+
+    Parameters
+    ----------
+    criteria : ConvergenceCriteria, optional
+    discard : float, optional
+        Fraction of the chain treated as burn-in for R-hat and ESS. Default: 0.5
+    c : float, optional
+        Sokal window constant for τ. Default: 5
+    max_window : int, optional
+        Steps kept for τ; a τ above max_window / tau_factor is estimated on
+        fewer than tau_factor × τ steps. Default: 20000
+    block_size : int, optional
+        Resolution, in steps, of the running sums (and of the burn-in and
+        R-hat split points). Default: 100
+
+    Examples
+    --------
+    >>> controller = ConvergenceController()
+    >>> for block in blocks:            # (steps, nwalkers, ndim)
+    ...     if controller.update(block).converged:
+    ...         break
+    """
+
+    def __init__(self, criteria=ConvergenceCriteria(), discard=0.5, c=5.0,
+                 max_window=20000, block_size=100):
+        self.criteria = criteria
+        self.discard = discard
+        self.c = c
+        self.max_window = max_window
+        self.block_size = block_size
+
+        self.iteration = 0
+        self.status = None
+        self.moments = BlockMoments(block_size)
+        self._window = []       # Newest blocks, at most max_window steps
+        self._tau = None
+
+    def update(self, block):
+        """
+        Add the newest steps and re-evaluate the criteria
+
+        Parameters
+        ----------
+        block : array (steps, nwalkers, ndim)
+
+        Returns
+        -------
+        status : ConvergenceStatus
+        """
+        block = np.asarray(block, dtype=float)
+        if len(block) == 0:
+            return self.status
+        self.moments.add(block)
+
+        self._window.append(block)
+        while len(self._window) > 1 and sum(map(len, self._window[1:])) >= self.max_window:
+            self._window.pop(0)
+        self.iteration += len(block)
+
+        previous_tau = self._tau
+        tau = self._estimate_tau()
+        rhat = self.moments.split_rhat(self.discard)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ess = self.moments.n_post(self.discard) * block.shape[1] / tau
+
+        crit = self.criteria
+        with np.errstate(invalid='ignore', divide='ignore'):
+            stable = previous_tau is not None and np.all(
+                np.abs(tau - previous_tau) < crit.tau_rtol * tau)
+        checks = {
+            'autocorr': bool(stable and np.all(self.iteration > crit.tau_factor * tau)),
+            'rhat': bool(np.all(rhat < crit.rhat_max)),
+            'ess': bool(np.all(ess >= crit.ess_min)),
+        }
+        self.status = ConvergenceStatus(self.iteration, tau, rhat, ess, checks,
+                                        all(checks.values()))
+        return self.status
+
+    @property
+    def converged(self):
+        return self.status is not None and self.status.converged
+
+    def _estimate_tau(self):
+        """τ on all buffered steps, centred on the ensemble mean"""
+        tau = integrated_time(np.concatenate(self._window), self.c, center='ensemble')
+        self._tau = tau
+        return tau
+
+
+def run_until_converged(sampler, initial_state, max_steps, controller=None,
+                        check_interval=100, progress=False):
+    """
+    Run an emcee sampler in blocks until the convergence criteria pass
+
+    Parameters
+    ----------
+    sampler : emcee.EnsembleSampler
+        Fresh or resumed from a backend; existing iterations count
+    initial_state : array (nwalkers, ndim) or None
+        Starting positions; None continues from the sampler's last state
+    max_steps : int
+        Total iterations at most, for runs that do not converge
+    controller : ConvergenceController, optional
+        Default: ConvergenceController(block_size=check_interval)
+    check_interval : int, optional
+        Steps between convergence checks. Default: 100
+    progress : bool, optional
+        emcee progress bar for each block. Default: False
+
+    Returns
+    -------
+    status : ConvergenceStatus
+        Status at the last check; status.converged is False if max_steps
+        was reached first
+    """
+    if controller is None:
+        controller = ConvergenceController(block_size=check_interval)
+    # Resumed run: existing steps, read in chunks
+    for chunk in iter_chunks(sampler.backend, controller.iteration, 10 * check_interval):
+        controller.update(chunk)
+
+    while not controller.converged and sampler.iteration < max_steps:
+        n = min(check_interval, max_steps - sampler.iteration)
+        sampler.run_mcmc(initial_state, n, progress=progress,
+                         skip_initial_state_check=initial_state is None)
+        initial_state = None
+        controller.update(sampler.get_chain(discard=sampler.iteration - n))
+    return controller.status
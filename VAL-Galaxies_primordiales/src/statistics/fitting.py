@@ -13,7 +13,19 @@ import h5py
 from scipy.stats import norm
 import warnings
 
-
+try:
+    from .autocorr import integrated_time, autocorrelation_diagnostics
+    from .samplers import SamplerConfig, get_sampler
+    from .information import pointwise_log_likelihood, dic
+    from ..utils.profiling import profiled
+except ImportError:
+    from statistics.autocorr import integrated_time, autocorrelation_diagnostics
+    from statistics.samplers import SamplerConfig, get_sampler
+    from statistics.information import pointwise_log_likelihood, dic
+    from utils.profiling import profiled
+
+
+@profiled('log_likelihood')
 def log_likelihood(params, model, data, errors):
     """
     Log-likelihood function (chi-squared)
@@ -45,6 +57,7 @@ def log_likelihood(params, model, data, errors):
     return log_L
 
 
+@profiled('log_prior')
 def log_prior(params, bounds):
     """
     Log-prior function (uniform priors within bounds)
@@ -68,6 +81,7 @@ def log_prior(params, bounds):
     return 0.0  # Flat prior within bounds
 
 
+@profiled('log_posterior')
 def log_posterior(params, model, data, errors, bounds):
     """
     Log-posterior function
@@ -99,8 +113,116 @@ def log_posterior(params, model, data, errors, bounds):
     return lp + ll
 
 
+@profiled('log_likelihood_batch')
+def log_likelihood_batch(params, model, data, errors):
+    """
+    Log-likelihood of a whole walker ensemble (vectorized log_likelihood)
+
+    Parameters
+    ----------
+    params : array (n_walkers, n_params)
+        One parameter vector per walker
+    model : callable
+        Model function mapping the (n_walkers, n_params) matrix to
+        predictions of shape (n_walkers, n_data)
+    data : array (n_data,)
+        Observed data
+    errors : array (n_data,)
+        Observational errors
+
+    Returns
+    -------
+    log_L : array (n_walkers,)
+        Log-likelihood of each walker
+    """
+    residuals = (data - model(params)) / errors
+    return -0.5 * np.sum(residuals**2, axis=-1)
+
+
+@profiled('log_likelihood_pointwise')
+def log_likelihood_pointwise(params, model, data, errors):
+    """
+    Gaussian log-likelihood of each data point, for WAIC and PSIS-LOO
+
+    Parameters
+    ----------
+    params : array (n_samples, n_params)
+        Parameter vectors
+    model : callable
+        Model function (n_samples, n_params) -> (n_samples, n_data)
+    data : array (n_data,)
+        Observed data
+    errors : array (n_data,)
+        Observational errors
+
+    Returns
+    -------
+    log_L : array (n_samples, n_data)
+        Sums to log_likelihood_batch over the data points
+    """
+    residuals = (data - model(np.atleast_2d(params))) / errors
+    return -0.5 * residuals**2
+
+
+@profiled('log_prior_batch')
+def log_prior_batch(params, bounds):
+    """
+    Uniform log-prior of a whole walker ensemble (vectorized log_prior)
+
+    Parameters
+    ----------
+    params : array (n_walkers, n_params)
+        One parameter vector per walker
+    bounds : list of tuples
+        [(min1, max1), (min2, max2), ...] for each parameter
+
+    Returns
+    -------
+    log_P : array (n_walkers,)
+        0 within bounds, -inf outside
+    """
+    params = np.atleast_2d(params)
+    lower, upper = np.asarray(bounds, dtype=float).T
+    inside = np.all((params > lower) & (params < upper), axis=-1)
+    return np.where(inside, 0.0, -np.inf)
+
+
+@profiled('log_posterior_batch')
+def log_posterior_batch(params, model, data, errors, bounds):
+    """
+    Log-posterior of a whole walker ensemble, for emcee's vectorize=True
+
+    The model is evaluated once for the walkers inside the prior bounds.
+
+    Parameters
+    ----------
+    params : array (n_walkers, n_params)
+        One parameter vector per walker
+    model : callable
+        Model function (n_walkers, n_params) -> (n_walkers, n_data)
+    data : array
+        Observed data
+    errors : array
+        Observational errors
+    bounds : list of tuples
+        Parameter bounds for priors
+
+    Returns
+    -------
+    log_post : array (n_walkers,)
+        Log-posterior of each walker
+    """
+    params = np.atleast_2d(params)
+    log_post = log_prior_batch(params, bounds)
+    inside = np.isfinite(log_post)
+    if np.any(inside):
+        log_post[inside] += log_likelihood_batch(params[inside], model, data, errors)
+    return log_post
+
+
 def run_mcmc(log_prob_fn, initial_params, nwalkers=32, nsteps=5000,
-             burn_in=500, backend_file=None, progress=True):
+             burn_in=500, backend_file=None, progress=True, vectorize=False,
+             processes=None, convergence=None):
     """
     Run MCMC sampling with emcee
 
@@ -120,6 +242,15 @@ def run_mcmc(log_prob_fn, initial_params, nwalkers=32, nsteps=5000,
         HDF5 file for checkpointing. If None, no checkpointing.
     progress : bool, optional
         Show progress bar. Default: True
+    vectorize : bool, optional
+        log_prob_fn takes the (nwalkers, ndim) walker matrix and returns one
+        value per walker (e.g. log_posterior_batch). Default: False
+    processes : int, optional
+        Evaluate log_prob_fn in a pool of this many workers (picklable
+        log_prob_fn, e.g. statistics.posterior.Posterior). Default: None
+    convergence : ConvergenceCriteria, optional
+        Stop as soon as these pass (checked every 100 steps); nsteps is then
+        the maximum. Default: None (always run nsteps)
 
     Returns
     -------
@@ -128,26 +259,17 @@ def run_mcmc(log_prob_fn, initial_params, nwalkers=32, nsteps=5000,
     samples : array
         Flattened MCMC samples (post burn-in)
     """
-    ndim = len(initial_params)
-
     # Initialize walkers in a small ball around initial params
-    pos = initial_params + 1e-4 * np.random.randn(nwalkers, ndim)
+    pos = initial_params + 1e-4 * np.random.randn(nwalkers, len(initial_params))
 
-    # Setup backend for checkpointing (conforme INS-Statistiques.md)
-    backend = None
-    if backend_file is not None:
-        backend = emcee.backends.HDFBackend(backend_file)
-        backend.reset(nwalkers, ndim)
+    # Checkpointing (conforme INS-Statistiques.md) and pool handled by the emcee backend
+    config = SamplerConfig(nwalkers=nwalkers, nsteps=nsteps, burn_in=burn_in,
+                           processes=processes, checkpoint_file=backend_file,
+                           resume=False, progress=progress, convergence=convergence)
 
-    # Create sampler
-    sampler = emcee.EnsembleSampler(nwalkers, ndim, log_prob_fn, backend=backend)
-
-    # Run MCMC
     print(f"Running MCMC with {nwalkers} walkers for {nsteps} steps...")
-    sampler.run_mcmc(pos, nsteps, progress=progress)
-
-    # Get samples (discard burn-in)
-    samples = sampler.get_chain(discard=burn_in, flat=True)
+    result = get_sampler('emcee', log_prob_fn, config=config, vectorize=vectorize).run(pos)
+    sampler, samples = result.sampler, result.samples
 
     print(f"MCMC complete. Final chain shape: {samples.shape}")
     print(f"Mean acceptance fraction: {np.mean(sampler.acceptance_fraction):.3f}")
@@ -217,19 +339,29 @@ def compute_bic(log_likelihood, n_params, n_data):
     return bic
 
 
-def compute_dic(samples, log_likelihood_fn):
+def compute_dic(samples, log_likelihood_fn, vectorize=False, chunk_size=None, pool=None):
     """
     Compute Deviance Information Criterion
 
     DIC = p_D + D_bar
     where p_D = D_bar - D(theta_bar)
 
+    The samples are evaluated in chunks (see
+    statistics.information.pointwise_log_likelihood).
+
     Parameters
     ----------
     samples : array
         MCMC samples (n_samples, n_params)
     log_likelihood_fn : callable
-        Log-likelihood function
+        Log-likelihood function, total or pointwise (one value per data point)
+    vectorize : bool, optional
+        log_likelihood_fn takes a (n_chunk, n_params) chunk of samples.
+        Default: False
+    chunk_size : int, optional
+        Samples per call. Default: chunks of about 64 MB of output
+    pool : multiprocessing.pool.Pool, optional
+        Evaluate the chunks in a process pool
 
     Returns
     -------
@@ -238,19 +370,17 @@ def compute_dic(samples, log_likelihood_fn):
     p_d : float
         Effective number of parameters
     """
-    # Deviance = -2 * log_likelihood
-    deviances = np.array([-2 * log_likelihood_fn(sample) for sample in samples])
-
-    D_bar = np.mean(deviances)  # Mean deviance
+    samples = np.atleast_2d(samples)
+    log_lik = pointwise_log_likelihood(log_likelihood_fn, samples, vectorize=vectorize,
+                                       chunk_size=chunk_size, pool=pool)
 
-    # Deviance at posterior mean
+    # Log-likelihood at posterior mean
     theta_bar = np.mean(samples, axis=0)
-    D_theta_bar = -2 * log_likelihood_fn(theta_bar)
+    at_mean = (np.asarray(log_likelihood_fn(theta_bar[None]))[0] if vectorize
+               else log_likelihood_fn(theta_bar))
 
-    p_d = D_bar - D_theta_bar  # Effective number of parameters
-    dic = p_d + D_bar
-
-    return dic, p_d
+    result = dic(log_lik, at_mean)
+    return result.ic, result.p_eff
 
 
 def gelman_rubin_diagnostic(chains):
@@ -285,70 +415,49 @@ def gelman_rubin_diagnostic(chains):
     return R_hat
 
 
-def autocorrelation_time(chain):
+def autocorrelation_time(chain, method='sokal'):
     """
-    Estimate autocorrelation time using emcee
+    Estimate autocorrelation time (batched FFT, statistics.autocorr)
 
     Parameters
     ----------
     chain : array
-        MCMC chain (n_steps, n_params)
+        MCMC chain (n_steps, n_params), or (n_steps, n_walkers, n_params)
+        for an ensemble (walker-averaged autocorrelation)
+    method : {'sokal', 'geyer'}, optional
+        Window of the autocorrelation sum; 'sokal' is emcee's estimator.
+        Default: 'sokal'
 
     Returns
     -------
     tau : array
         Autocorrelation time for each parameter
     """
-    chain = np.atleast_2d(chain)
-    n_steps, n_params = chain.shape
-
-    try:
-        # Use emcee's integrated autocorrelation time estimator
-        from emcee.autocorr import integrated_time
-
-        # Compute tau for each parameter separately to ensure array output
-        tau = np.zeros(n_params)
-        for i in range(n_params):
-            try:
-                tau_val = integrated_time(chain[:, i], quiet=True)
-                # Handle both scalar and array returns
-                tau[i] = float(np.atleast_1d(tau_val)[0])
-            except Exception:
-                # If estimation fails for a parameter, use heuristic
-                tau[i] = n_steps / 10.0  # Conservative estimate
-
-        return tau
-
-    except Exception as e:
-        warnings.warn(f"Could not compute autocorrelation time: {e}")
-        return np.full(n_params, np.nan)
+    chain = np.asarray(chain, dtype=float)
+    if chain.ndim < 3:
+        chain = np.atleast_2d(chain)
+    return integrated_time(chain, method=method)
 
 
-def effective_sample_size(chain):
+def effective_sample_size(chain, method='sokal'):
     """
     Compute effective sample size
 
-    ESS = N / tau
+    ESS = N / tau, with N the number of draws (all walkers)
 
     Parameters
     ----------
     chain : array
-        MCMC chain (n_steps, n_params)
+        MCMC chain (n_steps, n_params) or (n_steps, n_walkers, n_params)
+    method : {'sokal', 'geyer'}, optional
+        See autocorrelation_time. Default: 'sokal'
 
     Returns
     -------
     ess : array
         Effective sample size for each parameter
     """
-    chain = np.atleast_2d(chain)
-    n_steps, n_params = chain.shape
-    tau = autocorrelation_time(chain)
-
-    # Ensure tau is an array with correct shape
-    tau = np.atleast_1d(tau)
-    if len(tau) != n_params:
-        warnings.warn(f"tau shape mismatch: expected {n_params}, got {len(tau)}")
-        tau = np.full(n_params, tau[0] if len(tau) > 0 else 1.0)
-
-    ess = n_steps / tau
-    return ess
+    chain = np.asarray(chain, dtype=float)
+    if chain.ndim < 3:
+        chain = np.atleast_2d(chain)
+    return autocorrelation_diagnostics(chain, method=method).ess
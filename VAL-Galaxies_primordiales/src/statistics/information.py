@@ -0,0 +1,325 @@
+"""
+Information Criteria from Pointwise Log-Likelihoods
+
+DIC, WAIC and PSIS-LOO of a model are all reductions of one matrix,
+log p(y_i | θ_s), for S posterior samples and n data points (UV LF bins).
+pointwise_log_likelihood builds that matrix in chunks of samples, with a
+vectorized likelihood (one call per chunk) and optionally across a process
+pool; memory is bounded by the chunk size, and the matrix itself may be an
+np.memmap or HDF5 dataset. The criteria then reduce it column block by
+column block:
+
+- dic:      D̄ + p_D, p_D = D̄ - D(θ̄)              (Spiegelhalter et al. 2002)
+- waic:     -2 (lppd - p_WAIC), p_WAIC = Σ_i Var_s   (Watanabe 2010)
+- psis_loo: leave-one-out elpd by Pareto-smoothed importance sampling,
+            with the Pareto k diagnostic of each point  (Vehtari et al. 2017)
+
+>>> log_lik = pointwise_log_likelihood(lambda s: like.pointwise(*s.T), flat_samples)
+>>> waic(log_lik).ic, psis_loo(log_lik).pareto_k.max()
+"""
+
+import warnings
+from typing import NamedTuple, Optional
+
+import numpy as np
+from scipy.special import logsumexp
+
+# Pareto k above which PSIS estimates are unreliable
+PARETO_K_THRESHOLD = 0.7
+
+
+class InformationCriterion(NamedTuple):
+    """
+    Expected log pointwise predictive density and its criterion
+
+    elpd : float
+        Σ_i elpd_i (higher is better)
+    p_eff : float
+        Effective number of parameters
+    ic : float
+        -2 elpd, on the deviance scale (lower is better)
+    se : float
+        Standard error of ic, from the spread of the pointwise terms
+    pointwise : array (n_data,)
+        elpd_i of each data point
+    pareto_k : array (n_data,) or None
+        PSIS-LOO only: Pareto shape of each point's importance weights
+    """
+    elpd: float
+    p_eff: float
+    ic: float
+    se: float
+    pointwise: np.ndarray
+    pareto_k: Optional[np.ndarray] = None
+
+
+class _RowByRow:
+    """Picklable wrapper evaluating a per-sample function over a chunk"""
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def __call__(self, chunk):
+        return np.array([self.fn(row) for row in chunk])
+
+
+def pointwise_log_likelihood(log_likelihood_fn, samples, vectorize=True, chunk_size=None,
+                             max_memory=64e6, pool=None, out=None):
+    """
+    Log-likelihood matrix of posterior samples, evaluated in chunks
+
+    Parameters
+    ----------
+    log_likelihood_fn : callable
+        Pointwise log-likelihood: (n_chunk, n_params) -> (n_chunk, n_data)
+        if vectorize, else (n_params,) -> (n_data,). A function returning
+        the total log-likelihood gives a (n_samples,) vector instead.
+        Must be picklable with a pool (a Posterior, a module-level function)
+    samples : array (n_samples, n_params)
+        Flat posterior samples
+    vectorize : bool, optional
+        log_likelihood_fn takes a whole chunk. Default: True
+    chunk_size : int, optional
+        Samples per call. Default: chunks of about max_memory bytes of output
+    max_memory : float, optional
+        Bytes of output per chunk when chunk_size is None. Default: 64e6
+    pool : multiprocessing.pool.Pool, optional
+        Chunks are evaluated by the pool workers, in order
+    out : array-like (n_samples, n_data), optional
+        Destination, e.g. an np.memmap or h5py dataset for matrices larger
+        than memory. Default: a new array
+
+    Returns
+    -------
+    log_lik : array (n_samples, n_data)
+        `out` if given
+    """
+    samples = np.atleast_2d(samples)
+    n_samples = len(samples)
+    fn = log_likelihood_fn if vectorize else _RowByRow(log_likelihood_fn)
+
+    # One sample gives the shape of a row
+    first = np.asarray(fn(samples[:1]), dtype=float)[0]
+    if chunk_size is None:
+        chunk_size = int(max(1, max_memory // (8 * max(first.size, 1))))
+    if out is None:
+        out = np.empty((n_samples,) + first.shape)
+
+    chunks = (samples[i:i + chunk_size] for i in range(0, n_samples, chunk_size))
+    results = pool.imap(fn, chunks) if pool is not None else map(fn, chunks)
+    start = 0
+    for values in results:
+        out[start:start + len(values)] = values
+        start += len(values)
+    return out
+
+
+def _column_blocks(log_lik, max_memory, per_column=None):
+    """Column slices of a (n_samples, n_data) matrix, about max_memory bytes each"""
+    n_samples, n_data = log_lik.shape
+    per_column = per_column or 8 * n_samples
+    width = int(max(1, max_memory // per_column))
+    for start in range(0, n_data, width):
+        columns = slice(start, min(start + width, n_data))
+        yield columns, np.asarray(log_lik[:, columns], dtype=float)
+
+
+def _as_matrix(log_lik):
+    """(n_samples, n_data) view; a (n_samples,) vector is one data point"""
+    if np.ndim(log_lik) == 1:
+        return np.asarray(log_lik, dtype=float)[:, None]
+    return log_lik
+
+
+def _criterion(pointwise, p_eff, pareto_k=None):
+    """InformationCriterion from the elpd_i of each data point"""
+    elpd = float(np.sum(pointwise))
+    se = 2.0 * float(np.sqrt(len(pointwise) * np.var(pointwise)))
+    return InformationCriterion(elpd, float(p_eff), -2.0 * elpd, se, pointwise, pareto_k)
+
+
+def dic(log_lik, log_lik_at_mean, max_memory=64e6):
+    """
+    Deviance information criterion
+
+    Parameters
+    ----------
+    log_lik : array (n_samples, n_data) or (n_samples,)
+        Pointwise or total log-likelihood of each sample
+    log_lik_at_mean : array (n_data,) or float
+        Log-likelihood at the posterior mean θ̄
+    max_memory : float, optional
+        Bytes of the matrix read at a time. Default: 64e6
+
+    Returns
+    -------
+    result : InformationCriterion
+        ic = D̄ + p_D = D(θ̄) + 2 p_D, p_eff = p_D
+    """
+    log_lik = _as_matrix(log_lik)
+    mean_log_lik = np.concatenate(
+        [block.mean(axis=0) for _, block in _column_blocks(log_lik, max_memory)])
+    at_mean = np.atleast_1d(np.asarray(log_lik_at_mean, dtype=float))
+    p_d = 2.0 * (at_mean - mean_log_lik)
+    return _criterion(at_mean - p_d, np.sum(p_d))
+
+
+def waic(log_lik, max_memory=64e6):
+    """
+    Widely applicable information criterion
+
+    Parameters
+    ----------
+    log_lik : array-like (n_samples, n_data)
+        Pointwise log-likelihood (see pointwise_log_likelihood)
+    max_memory : float, optional
+        Bytes of the matrix read at a time. Default: 64e6
+
+    Returns
+    -------
+    result : InformationCriterion
+        p_eff = p_WAIC, the summed posterior variances of log p(y_i | θ)
+    """
+    log_lik = _as_matrix(log_lik)
+    n_samples = log_lik.shape[0]
+    lppd, p_waic = [], []
+    for _, block in _column_blocks(log_lik, max_memory):
+        lppd.append(logsumexp(block, axis=0) - np.log(n_samples))
+        p_waic.append(block.var(axis=0, ddof=1))
+    lppd, p_waic = np.concatenate(lppd), np.concatenate(p_waic)
+    return _criterion(lppd - p_waic, np.sum(p_waic))
+
+
+def gpd_fit(tail, prior_k=10.0, prior_bs=3.0):
+    """
+    Generalized Pareto fit of sorted exceedances (Zhang & Stephens 2009)
+
+    Parameters
+    ----------
+    tail : array (n, ...)
+        Positive exceedances, ascending along the first axis; each column
+        is fitted on its own
+    prior_k : float, optional
+        Weight of the shrinkage of k towards 0.5 (Vehtari et al. 2017). Default: 10
+    prior_bs : float, optional
+        Scale of the θ grid around the first quartile. Default: 3
+
+    Returns
+    -------
+    k, sigma : arrays (...)
+        Shape and scale
+    """
+    n = len(tail)
+    m = 30 + int(np.sqrt(n))
+    quartile = tail[int(n / 4 + 0.5) - 1]
+    grid = 1.0 - np.sqrt(m / (np.arange(1, m + 1) - 0.5))
+    grid = grid.reshape((m,) + (1,) * (tail.ndim - 1))
+    theta = grid / (prior_bs * quartile) + 1.0 / tail[-1]        # (m, ...)
+
+    # Profile log-likelihood of each θ, then the posterior mean of θ
+    k_grid = np.mean(np.log1p(-theta[:, None] * tail[None]), axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        profile = n * (np.log(-theta / k_grid) - k_grid - 1.0)
+    weights = np.exp(profile - logsumexp(profile, axis=0))
+    theta = np.sum(np.nan_to_num(weights) * theta, axis=0)
+
+    k = np.mean(np.log1p(-theta * tail), axis=0)
+    sigma = -k / theta
+    return (n * k + prior_k * 0.5) / (n + prior_k), sigma
+
+
+def _gpd_quantile(p, k, sigma):
+    """Quantiles of the generalized Pareto distribution, k = 0 included"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        q = sigma * np.expm1(-k * np.log1p(-p)) / k
+    return np.where(np.abs(k) < 1e-12, -sigma * np.log1p(-p), q)
+
+
+def psis_smooth(log_ratios, r_eff=1.0):
+    """
+    Pareto-smoothed importance weights
+
+    The largest M = min(S/5, 3 sqrt(S/r_eff)) ratios of each column are
+    replaced by the expected order statistics of a generalized Pareto fit
+    to them, and truncated at the largest raw ratio.
+
+    Parameters
+    ----------
+    log_ratios : array (n_samples, n_columns)
+        Log importance ratios, one column per target
+    r_eff : float, optional
+        Relative efficiency of the draws (ESS / S). Default: 1
+
+    Returns
+    -------
+    log_weights : array (n_samples, n_columns)
+        Normalized over the samples
+    k : array (n_columns,)
+        Pareto shape; inf when the tail is too short to fit
+    """
+    log_ratios = np.array(log_ratios, dtype=float)
+    n_samples = len(log_ratios)
+    log_ratios -= log_ratios.max(axis=0)
+    tail_length = int(np.ceil(min(0.2 * n_samples, 3.0 * np.sqrt(n_samples / r_eff))))
+
+    k = np.full(log_ratios.shape[1], np.inf)
+    if tail_length > 4:
+        order = np.argsort(log_ratios, axis=0)
+        tail_index = order[-tail_length:]
+        cutoff = np.maximum(np.take_along_axis(log_ratios, order[-tail_length - 1][None], axis=0),
+                            np.log(np.finfo(float).tiny))
+        tail = np.exp(np.take_along_axis(log_ratios, tail_index, axis=0)) - np.exp(cutoff)
+        k, sigma = gpd_fit(tail)
+
+        probabilities = (np.arange(tail_length) + 0.5)[:, None] / tail_length
+        with np.errstate(divide='ignore'):
+            smoothed = np.log(_gpd_quantile(probabilities, k, sigma) + np.exp(cutoff))
+        fitted = np.isfinite(k)
+        current = np.take_along_axis(log_ratios, tail_index, axis=0)
+        np.put_along_axis(log_ratios, tail_index,
+                          np.minimum(np.where(fitted, smoothed, current), 0.0), axis=0)
+    return log_ratios - logsumexp(log_ratios, axis=0), k
+
+
+def psis_loo(log_lik, r_eff=1.0, max_memory=64e6):
+    """
+    Leave-one-out cross-validation by Pareto-smoothed importance sampling
+
+    Parameters
+    ----------
+    log_lik : array-like (n_samples, n_data)
+        Pointwise log-likelihood (see pointwise_log_likelihood)
+    r_eff : float, optional
+        Relative efficiency of the draws, e.g. ESS / S of the chain. Default: 1
+    max_memory : float, optional
+        Bytes of working memory per column block. Default: 64e6
+
+    Returns
+    -------
+    result : InformationCriterion
+        ic = LOOIC; p_eff = lppd - elpd_loo; pareto_k per data point
+
+    Warns
+    -----
+    UserWarning
+        If some Pareto k exceed 0.7: those elpd_i are unreliable
+    """
+    log_lik = _as_matrix(log_lik)
+    n_samples = log_lik.shape[0]
+    # Sort, tail fit and θ grid dominate the working memory of a column
+    tail_length = min(0.2 * n_samples, 3.0 * np.sqrt(n_samples / r_eff))
+    per_column = 8 * (4 * n_samples + (30 + np.sqrt(tail_length)) * tail_length)
+
+    pointwise, lppd, pareto_k = [], [], []
+    for _, block in _column_blocks(log_lik, max_memory, per_column):
+        log_weights, k = psis_smooth(-block, r_eff)
+        pointwise.append(logsumexp(log_weights + block, axis=0))
+        lppd.append(logsumexp(block, axis=0) - np.log(n_samples))
+        pareto_k.append(k)
+    pointwise, pareto_k = np.concatenate(pointwise), np.concatenate(pareto_k)
+
+    bad = np.sum(pareto_k > PARETO_K_THRESHOLD)
+    if bad:
+        warnings.warn(f"{bad} of {len(pareto_k)} data points have Pareto k > "
+                      f"{PARETO_K_THRESHOLD}: PSIS-LOO is unreliable for them")
+    return _criterion(pointwise, np.sum(np.concatenate(lppd)) - np.sum(pointwise), pareto_k)
@@ -0,0 +1,304 @@
+"""
+Vectorized UV Luminosity Function Likelihood
+
+The binned UV LF is packed once into contiguous NumPy arrays (magnitudes,
+log10 φ_obs, per-bin errors in dex), so a likelihood evaluation is a single
+array expression over all bins instead of a DataFrame.iterrows() loop.
+
+The Schechter function is evaluated directly in log space,
+
+    log10 φ(M) = log10(0.4 ln 10 φ*) + 0.4 (α + 1)(M* - M) - x / ln 10,
+    x = 10^(0.4 (M* - M)),
+
+which avoids the power, exponential and logarithm of the linear form.
+Parameters may be arrays (one entry per walker): the likelihood then
+returns one value per walker, for emcee's vectorize=True mode.
+
+Two error models reproduce the Phase 3 scripts:
+- constant scatter in dex (sigma_dex=0.3, phase3_complete_final)
+- errors propagated from phi_err, σ = 0.434 φ_err / φ (phase3_complete_v2)
+
+ObservedUVLF is the prepared data of the Phase 3.2/3.3 fits, which bin the
+galaxy catalog in (z, M_UV) themselves: the histograms, errors and masks are
+computed once per run, and each likelihood call only compares model values.
+"""
+
+import numpy as np
+
+try:
+    from ..utils.profiling import profiled
+except ImportError:
+    from utils.profiling import profiled
+
+_LN10 = np.log(10.0)
+_LOG10_NORM = np.log10(0.4 * _LN10)
+# Below this, the linear-space Schechter function underflows to 0
+_LOG10_MIN_POSITIVE = np.log10(np.finfo(float).tiny)
+
+
+def schechter_function(M, phi_star, M_star, alpha):
+    """
+    Schechter UV luminosity function per magnitude
+
+    Parameters
+    ----------
+    M : float or array
+        Absolute UV magnitude
+    phi_star : float or array
+        Normalization [Mpc^-3 mag^-1]
+    M_star : float or array
+        Characteristic magnitude
+    alpha : float or array
+        Faint-end slope
+
+    Returns
+    -------
+    phi : float or array
+        Number density [Mpc^-3 mag^-1]
+    """
+    x = 10**(0.4 * (M_star - M))
+    return 0.4 * _LN10 * phi_star * x**(alpha + 1) * np.exp(-x)
+
+
+@profiled('schechter')
+def log_schechter_function(M, log_phi_star, M_star, alpha):
+    """
+    log10 of the Schechter function, evaluated in log space
+
+    Parameters
+    ----------
+    M : float or array
+        Absolute UV magnitude
+    log_phi_star : float or array
+        log10 of the normalization [Mpc^-3 mag^-1]
+    M_star, alpha : float or array
+        Characteristic magnitude and faint-end slope
+
+    Returns
+    -------
+    log_phi : float or array
+        log10 number density, broadcast over the inputs
+    """
+    dM = 0.4 * (M_star - M)
+    return _LOG10_NORM + log_phi_star + (alpha + 1.0) * dM - 10**dM / _LN10
+
+
+class UVLFLikelihood:
+    """
+    Gaussian likelihood of a binned UV LF in log10 φ
+
+    Parameters
+    ----------
+    M_UV : array (n_bins,)
+        Bin magnitudes
+    phi : array (n_bins,)
+        Observed number densities [Mpc^-3 mag^-1]
+    sigma_dex : float or array (n_bins,)
+        Error on log10 φ of each bin
+    underflow_penalty : float, optional
+        Subtracted from log L for each bin whose predicted φ underflows to 0.
+        Default: 0 (bin ignored, as in phase3_complete_final)
+
+    Bins with φ <= 0 or non-positive/non-finite errors are dropped once, at
+    construction.
+
+    Examples
+    --------
+    >>> like = UVLFLikelihood.from_table(uv_lf_data, sigma_dex=0.3)
+    >>> like(-4.0, -21.0, -2.0)
+    >>> like(np.array([-4.0, -3.5]), np.array([-21.0, -20.5]), np.array([-2.0, -1.9]))
+    """
+
+    def __init__(self, M_UV, phi, sigma_dex, underflow_penalty=0.0):
+        M_UV = np.asarray(M_UV, dtype=float)
+        phi = np.asarray(phi, dtype=float)
+        sigma_dex = np.broadcast_to(np.asarray(sigma_dex, dtype=float), phi.shape)
+
+        valid = (phi > 0) & np.isfinite(sigma_dex) & (sigma_dex > 0)
+        self.M_UV = np.ascontiguousarray(M_UV[valid])
+        self.log_phi_obs = np.ascontiguousarray(np.log10(phi[valid]))
+        self.inv_sigma = np.ascontiguousarray(1.0 / sigma_dex[valid])
+        self.underflow_penalty = underflow_penalty
+
+    @classmethod
+    def from_table(cls, table, sigma_dex=None, magnitude='M_UV', underflow_penalty=0.0):
+        """
+        Pack a binned UV LF table
+
+        Parameters
+        ----------
+        table : DataFrame or mapping of arrays
+            Columns `magnitude`, 'phi' and, if sigma_dex is None, 'phi_err'
+        sigma_dex : float, optional
+            Constant error on log10 φ. If None, σ = 0.434 φ_err / φ per bin
+        magnitude : str, optional
+            Name of the magnitude column. Default: 'M_UV'
+        underflow_penalty : float, optional
+            See UVLFLikelihood. Default: 0
+        """
+        phi = np.asarray(table['phi'], dtype=float)
+        if sigma_dex is None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sigma_dex = 0.434 * np.asarray(table['phi_err'], dtype=float) / phi
+        return cls(table[magnitude], phi, sigma_dex, underflow_penalty=underflow_penalty)
+
+    def __len__(self):
+        return len(self.M_UV)
+
+    def log_phi_model(self, log_phi_star, M_star, alpha):
+        """Predicted log10 φ in every bin, shape np.shape(params) + (n_bins,)"""
+        return log_schechter_function(self.M_UV, np.asarray(log_phi_star)[..., None],
+                                      np.asarray(M_star)[..., None],
+                                      np.asarray(alpha)[..., None])
+
+    def chi2(self, log_phi_star, M_star, alpha):
+        """χ² over bins with a positive prediction, one value per parameter set"""
+        log_phi = self.log_phi_model(log_phi_star, M_star, alpha)
+        positive = log_phi > _LOG10_MIN_POSITIVE
+        residual = (self.log_phi_obs - log_phi) * self.inv_sigma
+        return np.sum(np.where(positive, residual * residual, 0.0), axis=-1), positive
+
+    @profiled('uvlf_pointwise')
+    def pointwise(self, log_phi_star, M_star, alpha):
+        """
+        Log-likelihood of each bin, for WAIC and PSIS-LOO
+
+        Returns
+        -------
+        log_L : array np.shape(params) + (n_bins,)
+            -r²/2 per bin, or -underflow_penalty where the prediction
+            underflows; sums to __call__ over the bins
+        """
+        log_phi = self.log_phi_model(log_phi_star, M_star, alpha)
+        residual = (self.log_phi_obs - log_phi) * self.inv_sigma
+        return np.where(log_phi > _LOG10_MIN_POSITIVE, -0.5 * residual * residual,
+                        -float(self.underflow_penalty))
+
+    @profiled('uvlf_likelihood')
+    def __call__(self, log_phi_star, M_star, alpha):
+        """
+        Log-likelihood for one or many parameter sets
+
+        Parameters
+        ----------
+        log_phi_star, M_star, alpha : float or array
+            Schechter parameters, broadcast together (e.g. one per walker)
+
+        Returns
+        -------
+        log_L : float or array
+            -χ²/2 minus the underflow penalties, shape np.shape(params)
+        """
+        chi2, positive = self.chi2(log_phi_star, M_star, alpha)
+        log_L = -0.5 * chi2
+        if self.underflow_penalty:
+            log_L = log_L - self.underflow_penalty * np.sum(~positive, axis=-1)
+        return log_L if np.ndim(log_L) else float(log_L)
+
+
+class ObservedUVLF:
+    """
+    Binned UV LF of a galaxy catalog, prepared once for repeated fits
+
+    Reproduces compute_observed_uv_lf of phase32_janus_fitting and
+    phase33_lcdm_fitting for every redshift bin at once: φ = N / (ΔM N_z),
+    σ_φ = sqrt(N + 1) / (ΔM N_z), with N_z the galaxies of the redshift bin.
+    Redshift bins with fewer than min_galaxies galaxies are dropped.
+
+    Parameters
+    ----------
+    catalog : DataFrame
+        Galaxy catalog with 'z' and 'M_UV' columns (NaN M_UV ignored)
+    z_bins : sequence of (z_min, z_max)
+        Redshift bins, z_min <= z < z_max
+    M_bins : array
+        Magnitude bin edges (uniform width), shared by all redshift bins
+    min_galaxies : int, optional
+        Minimum galaxies per redshift bin. Default: 10
+    sigma_floor : float, optional
+        Added in quadrature to the log10 φ errors [dex]. Default: 0.1
+    min_bin_points, min_points : int, optional
+        A redshift bin enters χ² with at least min_bin_points valid
+        magnitude bins; the likelihood is -inf below min_points in total.
+        Default: 3, 5
+
+    Attributes
+    ----------
+    z_mid : array (n_z, 1)
+        Redshift bin centres, broadcastable against M_centers
+    M_centers : array (n_mag,)
+        Magnitude bin centres
+    phi, phi_err : arrays (n_z, n_mag)
+        Observed number densities and errors
+
+    Examples
+    --------
+    >>> data = ObservedUVLF(catalog, [(6.5, 8), (8, 10)], np.arange(-25, -14, 1.0))
+    >>> data.log_likelihood(model(data.M_centers, data.z_mid, walkers))
+    """
+
+    offset = 1e-10  # Added to φ before taking logs
+
+    def __init__(self, catalog, z_bins, M_bins, min_galaxies=10, sigma_floor=0.1,
+                 min_bin_points=3, min_points=5):
+        z = np.asarray(catalog['z'], dtype=float)
+        M_UV = np.asarray(catalog['M_UV'], dtype=float)
+        has_mag = ~np.isnan(M_UV)
+        M_bins = np.asarray(M_bins, dtype=float)
+        bin_width = M_bins[1] - M_bins[0]
+
+        z_mid, phi, phi_err = [], [], []
+        for z_min, z_max in z_bins:
+            M_z = M_UV[(z >= z_min) & (z < z_max) & has_mag]
+            if len(M_z) < min_galaxies:
+                continue
+            counts, _ = np.histogram(M_z, bins=M_bins)
+            z_mid.append((z_min + z_max) / 2)
+            phi.append(counts / (bin_width * len(M_z)))
+            phi_err.append(np.sqrt(counts + 1) / (bin_width * len(M_z)))
+
+        n_mag = len(M_bins) - 1
+        self.z_mid = np.array(z_mid, dtype=float).reshape(-1, 1)
+        self.M_centers = (M_bins[:-1] + M_bins[1:]) / 2
+        self.phi = np.array(phi, dtype=float).reshape(-1, n_mag)
+        self.phi_err = np.array(phi_err, dtype=float).reshape(-1, n_mag)
+
+        self.observed = self.phi > 0
+        self.log_phi_obs = np.log10(self.phi + self.offset)
+        log_err = 0.434 * self.phi_err / (self.phi + self.offset)
+        self.weight = 1.0 / (log_err**2 + sigma_floor**2)
+        self.min_bin_points = min_bin_points
+        self.min_points = min_points
+
+    def __len__(self):
+        return len(self.z_mid)
+
+    @profiled('uvlf_chi2')
+    def log_likelihood(self, phi_model):
+        """
+        Log-likelihood of model number densities in the observed bins
+
+        Parameters
+        ----------
+        phi_model : array (..., n_z, n_mag)
+            Model φ in every bin, e.g. one (n_z, n_mag) slab per walker
+
+        Returns
+        -------
+        log_L : float or array (...)
+            -χ²/2 over the bins with φ_obs > 0 and φ_model > 0, skipping
+            redshift bins with fewer than min_bin_points such bins
+        """
+        phi_model = np.asarray(phi_model, dtype=float)
+        valid = self.observed & (phi_model > 0)
+        n_valid = np.sum(valid, axis=-1)
+        used = n_valid >= self.min_bin_points
+
+        log_model = np.log10(np.where(valid, phi_model, 0.0) + self.offset)
+        chi2 = np.sum(np.where(valid, (self.log_phi_obs - log_model)**2 * self.weight, 0.0),
+                      axis=-1)
+        chi2_total = np.sum(np.where(used, chi2, 0.0), axis=-1)
+        n_points = np.sum(np.where(used, n_valid, 0), axis=-1)
+
+        log_L = np.where(n_points < self.min_points, -np.inf, -0.5 * chi2_total)
+        return log_L if np.ndim(log_L) else float(log_L)
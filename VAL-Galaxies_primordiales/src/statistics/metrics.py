@@ -0,0 +1,250 @@
+"""
+Live Metrics of Running Samplers
+
+A long run reports its progress at each checkpoint: iteration rate, τ_max,
+acceptance, memory, ETA, posterior evaluations per second. MetricsSeries
+keeps the last values in a fixed-size ring buffer (one float64 row per
+checkpoint); MetricsServer serves them from a thread, on a local TCP port or
+a Unix socket:
+
+    GET /metrics    latest values, Prometheus text format (version 0.0.4)
+    GET /series     the buffered time series, JSON columns
+
+>>> series = MetricsSeries(maxlen=720)
+>>> with MetricsServer(series, port=9464, labels={'run': 'janus_z10'}) as server:
+...     series.record(iteration=500, rate=12.3, tau_max=48.0)
+...     server.address                      # 'http://127.0.0.1:9464'
+$ curl -s localhost:9464/metrics
+"""
+
+import http.server
+import json
+import math
+import os
+import socketserver
+import threading
+import time
+
+import numpy as np
+
+# (field, Prometheus name, type, help) of each recorded value
+METRICS = (
+    ('iteration', 'iteration', 'gauge', 'Sampler iterations done'),
+    ('progress', 'progress_ratio', 'gauge', 'Fraction of the planned iterations done'),
+    ('rate', 'iterations_per_second', 'gauge', 'Iterations per second of this run'),
+    ('tau_max', 'tau_max', 'gauge', 'Largest integrated autocorrelation time (steps)'),
+    ('acceptance', 'acceptance_fraction', 'gauge', 'Mean acceptance fraction of the walkers'),
+    ('memory', 'memory_rss_bytes', 'gauge', 'Resident memory of the sampling process'),
+    ('eta', 'eta_seconds', 'gauge', 'Estimated seconds to the planned end'),
+    ('evals_per_s', 'posterior_evaluations_per_second', 'gauge',
+     'Posterior evaluations per second'),
+)
+FIELDS = ('time',) + tuple(m[0] for m in METRICS)
+
+
+class MetricsSeries:
+    """
+    Ring buffer of the last `maxlen` checkpoints
+
+    Each row holds the Unix time and the METRICS fields; values not given
+    are NaN. Safe to record from the sampler and read from the server thread.
+
+    Parameters
+    ----------
+    maxlen : int, optional
+        Rows kept (720 rows: 12 h at one checkpoint a minute). Default: 720
+    """
+
+    def __init__(self, maxlen=720):
+        self.maxlen = max(1, int(maxlen))
+        self.state = 'starting'
+        self._rows = np.full((self.maxlen, len(FIELDS)), np.nan)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self._count, self.maxlen)
+
+    def record(self, timestamp=None, **values):
+        """Append a row; keywords are FIELDS names"""
+        unknown = set(values) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown metrics: {sorted(unknown)}")
+        row = np.full(len(FIELDS), np.nan)
+        row[0] = time.time() if timestamp is None else timestamp
+        for i, field in enumerate(FIELDS[1:], 1):
+            if values.get(field) is not None:
+                row[i] = values[field]
+        with self._lock:
+            self._rows[self._count % self.maxlen] = row
+            self._count += 1
+
+    def array(self):
+        """Rows (n, len(FIELDS)), oldest first"""
+        with self._lock:
+            if self._count <= self.maxlen:
+                return self._rows[:self._count].copy()
+            return np.roll(self._rows, -(self._count % self.maxlen), axis=0)
+
+    def latest(self):
+        """Last row as {field: value}, NaN values left out"""
+        with self._lock:
+            if not self._count:
+                return {}
+            row = self._rows[(self._count - 1) % self.maxlen].copy()
+        return {f: float(v) for f, v in zip(FIELDS, row) if np.isfinite(v)}
+
+    def to_dict(self):
+        """JSON-ready columns {field: [values]}, NaN as None"""
+        rows = self.array()
+        return {f: [None if not math.isfinite(v) else v for v in rows[:, i].tolist()]
+                for i, f in enumerate(FIELDS)}
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(v).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+               for v in labels.values())
+    return '{' + ','.join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + '}'
+
+
+def prometheus_text(series, labels=None, prefix='mcmc'):
+    """
+    Latest values of a MetricsSeries in Prometheus text format
+
+    Parameters
+    ----------
+    series : MetricsSeries
+    labels : dict, optional
+        Labels of every sample (e.g. {'run': run_name})
+    prefix : str, optional
+        Metric name prefix. Default: 'mcmc'
+
+    Returns
+    -------
+    text : str
+    """
+    labels = dict(labels or {})
+    latest = series.latest()
+    lines = [f'# HELP {prefix}_state Run state, as the state label (value 1)',
+             f'# TYPE {prefix}_state gauge',
+             f'{prefix}_state{_format_labels({**labels, "state": series.state})} 1']
+    if 'time' in latest:
+        lines += [f'# HELP {prefix}_last_checkpoint_timestamp_seconds Unix time of the last checkpoint',
+                  f'# TYPE {prefix}_last_checkpoint_timestamp_seconds gauge',
+                  f'{prefix}_last_checkpoint_timestamp_seconds{_format_labels(labels)} '
+                  f'{latest["time"]:.3f}']
+    for field, name, kind, help_text in METRICS:
+        if field in latest:
+            lines += [f'# HELP {prefix}_{name} {help_text}',
+                      f'# TYPE {prefix}_{name} {kind}',
+                      f'{prefix}_{name}{_format_labels(labels)} {latest[field]!r}']
+    return '\n'.join(lines) + '\n'
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """GET /metrics and /series of the server's MetricsSeries"""
+
+    def do_GET(self):
+        server = self.server.metrics
+        path = self.path.split('?', 1)[0].rstrip('/')
+        if path == '/metrics':
+            body = prometheus_text(server.series, server.labels, server.prefix).encode()
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+        elif path == '/series':
+            body = json.dumps({'labels': server.labels, 'state': server.series.state,
+                               'series': server.series.to_dict()}).encode()
+            content_type = 'application/json'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes are not worth a line each; client_address is '' on Unix sockets
+        pass
+
+
+class _TCPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class MetricsServer:
+    """
+    HTTP endpoint of a MetricsSeries, served from a daemon thread
+
+    Parameters
+    ----------
+    series : MetricsSeries
+    host : str, optional
+        TCP interface. Default: '127.0.0.1' (local only)
+    port : int, optional
+        TCP port; 0 picks a free one (see `address`). Default: 0
+    socket_path : str or Path, optional
+        Serve on this Unix socket instead of TCP; a stale file is replaced
+    labels : dict, optional
+        Labels of every Prometheus sample
+    prefix : str, optional
+        Metric name prefix. Default: 'mcmc'
+    """
+
+    def __init__(self, series, host='127.0.0.1', port=0, socket_path=None, labels=None,
+                 prefix='mcmc'):
+        self.series = series
+        self.host = host
+        self.port = port
+        self.socket_path = None if socket_path is None else str(socket_path)
+        self.labels = dict(labels or {})
+        self.prefix = prefix
+        self._server = None
+        self._thread = None
+
+    @property
+    def address(self):
+        """'http://host:port' or 'unix:/path' once started, else None"""
+        if self._server is None:
+            return None
+        if self.socket_path is not None:
+            return f'unix:{self.socket_path}'
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        if self._server is not None:
+            return self
+        if self.socket_path is not None:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self._server = _UnixServer(self.socket_path, _Handler)
+        else:
+            self._server = _TCPServer((self.host, self.port), _Handler)
+        self._server.metrics = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True,
+                                        name=f'MetricsServer({self.address})')
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        if self.socket_path is not None and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.stop()
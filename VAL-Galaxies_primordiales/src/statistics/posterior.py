@@ -0,0 +1,179 @@
+"""
+Picklable Posteriors for Parallel Sampling
+
+emcee sends the log-probability function to the pool workers with every
+batch of walkers. Closures such as `lambda p: log_posterior(p, data)` cannot
+be pickled at all, and functions passed with args=(data,) ship the data on
+every call.
+
+Posterior keeps the data in a module-level registry, keyed by a unique id.
+Only the function reference and the key are pickled; the data reach each
+worker once, through the Pool initializer (Posterior.pool), and stay in the
+worker's globals for the whole run. By default their arrays are published in
+shared memory (statistics.shared.SharedData): workers attach to them by name
+instead of receiving copies.
+
+>>> posterior = Posterior(log_posterior_janus_batch, uv_lf, vectorize=True)
+>>> with posterior.pool(4) as pool:
+...     sampler = emcee.EnsembleSampler(nwalkers, ndim, PooledPosterior(posterior, pool),
+...                                     vectorize=True)
+...     sampler.run_mcmc(p0, nsteps)
+
+Scalar posteriors use the pool directly: EnsembleSampler(..., posterior, pool=pool).
+Vectorized posteriors (emcee bypasses the pool when vectorize=True) are wrapped
+in PooledPosterior, which splits the walker matrix into one chunk per worker.
+"""
+
+import os
+import uuid
+import multiprocessing
+
+import numpy as np
+
+try:
+    from .shared import SharedData
+except ImportError:
+    from statistics.shared import SharedData
+
+# Data of the live posteriors, in the parent and in every pool worker
+_WORKER_DATA = {}
+
+
+def _install_worker_data(data):
+    """Pool initializer: store posterior data in the worker's globals"""
+    for key, value in data.items():
+        _WORKER_DATA[key] = value.attach() if isinstance(value, SharedData) else value
+
+
+class Posterior:
+    """
+    Picklable log-posterior with its data held in (worker) globals
+
+    Parameters
+    ----------
+    log_prob_fn : callable
+        Module-level function log_prob_fn(params, data)
+    data : object
+        Fixed data of the posterior (prepared UV LF, catalog, ...)
+    vectorize : bool, optional
+        log_prob_fn takes the (nwalkers, ndim) walker matrix and returns one
+        value per walker. Default: False
+
+    Notes
+    -----
+    The data, and their shared-memory copy, are held until close() is
+    called; the shared memory is also released at interpreter exit.
+    """
+
+    def __init__(self, log_prob_fn, data, vectorize=False):
+        self.log_prob_fn = log_prob_fn
+        self.vectorize = vectorize
+        self.key = uuid.uuid4().hex
+        self._shared = None
+        _WORKER_DATA[self.key] = data
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_shared'] = None
+        return state
+
+    @property
+    def data(self):
+        """Data registered for this posterior"""
+        return _WORKER_DATA[self.key]
+
+    def __call__(self, params):
+        return self.log_prob_fn(params, _WORKER_DATA[self.key])
+
+    def __repr__(self):
+        name = getattr(self.log_prob_fn, '__qualname__', repr(self.log_prob_fn))
+        return f"Posterior({name}, vectorize={self.vectorize})"
+
+    def pool(self, processes=None, shared_memory=True):
+        """
+        Process pool whose workers receive the data once, at start-up
+
+        Parameters
+        ----------
+        processes : int, optional
+            Number of workers. Default: os.cpu_count()
+        shared_memory : bool, optional
+            Publish the array attributes of the data in shared memory, once
+            for all pools of this posterior; workers attach without copying.
+            Data without arrays (e.g. a DataFrame) are pickled. Default: True
+
+        Returns
+        -------
+        pool : multiprocessing.pool.Pool
+            Usable as a context manager
+        """
+        return make_pool([self], processes, shared_memory)
+
+    def _payload(self, shared_memory):
+        """What the pool initializer sends: the data or their shared-memory handle"""
+        if shared_memory:
+            if self._shared is None:
+                self._shared = SharedData(self.data)
+            if self._shared.specs:
+                return self._shared
+        return self.data
+
+    def close(self):
+        """Release the data held for this posterior in this process"""
+        _WORKER_DATA.pop(self.key, None)
+        if self._shared is not None:
+            self._shared.release()
+            self._shared = None
+
+
+def make_pool(posteriors, processes=None, shared_memory=True):
+    """
+    Process pool serving the data of several posteriors
+
+    Parameters
+    ----------
+    posteriors : sequence of Posterior
+        Posteriors evaluated in the pool (e.g. a log-prior and a log-likelihood)
+    processes : int, optional
+        Number of workers. Default: os.cpu_count()
+    shared_memory : bool, optional
+        See Posterior.pool. Default: True
+
+    Returns
+    -------
+    pool : multiprocessing.pool.Pool
+    """
+    payload = {posterior.key: posterior._payload(shared_memory) for posterior in posteriors}
+    return multiprocessing.Pool(processes or os.cpu_count(),
+                                initializer=_install_worker_data, initargs=(payload,))
+
+
+class PooledPosterior:
+    """
+    Vectorized posterior evaluated in chunks across a process pool
+
+    For emcee's vectorize=True mode, where the sampler calls the posterior
+    once per step with the whole walker matrix and never uses its pool.
+
+    Parameters
+    ----------
+    posterior : Posterior or picklable callable
+        Vectorized posterior (vectorize=True)
+    pool : multiprocessing.pool.Pool
+        Pool from posterior.pool() or make_pool()
+    n_chunks : int, optional
+        Walker chunks per call. Default: number of pool workers
+    """
+
+    def __init__(self, posterior, pool, n_chunks=None):
+        if not getattr(posterior, 'vectorize', True):
+            raise ValueError("PooledPosterior needs a vectorized posterior; "
+                             "pass pool= to the sampler for scalar posteriors")
+        self.posterior = posterior
+        self.pool = pool
+        self.n_chunks = n_chunks or getattr(pool, '_processes', None) or os.cpu_count()
+
+    def __call__(self, walkers):
+        walkers = np.atleast_2d(walkers)
+        chunks = np.array_split(walkers, min(self.n_chunks, len(walkers)))
+        return np.concatenate(self.pool.map(self.posterior, chunks))
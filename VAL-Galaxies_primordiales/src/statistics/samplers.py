@@ -0,0 +1,601 @@
+"""
+Sampler Backends
+
+One interface for the posterior samplers of the JANUS vs ΛCDM comparison,
+so the Bayesian evidence comes directly from the sampler instead of BIC
+(INS-Infrastructure.md §5.2):
+
+- 'emcee'    affine-invariant ensemble (emcee.EnsembleSampler), no evidence
+- 'tempered' parallel-tempered ensemble, evidence by stepping-stone
+             sampling over the temperature ladder
+- 'nested'   nested sampling (dynesty), evidence from the nested integral
+
+All backends take the same SamplerConfig, the same (vectorized) log-prior
+and log-likelihood callables, checkpoint to config.checkpoint_file and
+evaluate the likelihood in a process pool when config.processes > 1. With
+statistics.posterior.Posterior callables, the pool workers receive the data
+once, through shared memory.
+
+>>> like = Posterior(log_likelihood_batch, uv_lf, vectorize=True)
+>>> prior = Posterior(log_prior_batch, None, vectorize=True)
+>>> result = run_sampler('nested', like, prior, bounds, nlive=400, processes=8)
+>>> result.log_evidence, result.log_evidence_err
+
+The evidence is relative to the uniform distribution on `bounds`: log_prior
+is the log density with respect to it (0 for flat priors).
+"""
+
+import os
+import multiprocessing
+import warnings
+from typing import NamedTuple, Optional
+
+import numpy as np
+from scipy.special import logsumexp
+
+try:
+    from .posterior import Posterior, PooledPosterior, make_pool
+except ImportError:
+    from statistics.posterior import Posterior, PooledPosterior, make_pool
+
+try:
+    from .convergence import ConvergenceCriteria, ConvergenceController, run_until_converged
+except ImportError:
+    from statistics.convergence import ConvergenceCriteria, ConvergenceController, run_until_converged
+
+try:
+    from .checkpoint import AsyncHDFBackend
+except ImportError:
+    from statistics.checkpoint import AsyncHDFBackend
+
+try:
+    import emcee
+    HAS_EMCEE = True
+except ImportError:
+    HAS_EMCEE = False
+
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+try:
+    import dynesty
+    from dynesty.utils import resample_equal
+    HAS_DYNESTY = True
+except ImportError:
+    HAS_DYNESTY = False
+
+# Log-likelihood handed to dynesty outside the prior support
+_LOGL_FLOOR = -1e300
+
+
+class SamplerConfig(NamedTuple):
+    """
+    Settings shared by all sampler backends
+
+    nwalkers, nsteps, burn_in : ensemble size, steps, discarded steps (emcee, tempered)
+    ntemps, tmax : temperatures of the ladder and highest temperature (tempered)
+    nlive, dlogz : live points and stopping tolerance on ln Z (nested)
+    processes : pool workers; None or 1 runs in this process
+    checkpoint_file, checkpoint_interval : HDF5/pickle checkpoint and its period in steps
+    resume : continue from an existing checkpoint
+    progress : show progress
+    seed : random seed (tempered)
+    convergence : ConvergenceCriteria; stop the emcee run once they pass,
+        nsteps becoming the maximum (checked every checkpoint_interval steps)
+    """
+    nwalkers: int = 32
+    nsteps: int = 5000
+    burn_in: int = 500
+    ntemps: int = 16
+    tmax: float = 1e6
+    nlive: int = 500
+    dlogz: float = 0.1
+    processes: Optional[int] = None
+    checkpoint_file: Optional[str] = None
+    checkpoint_interval: int = 100
+    resume: bool = True
+    progress: bool = True
+    seed: Optional[int] = None
+    convergence: Optional[ConvergenceCriteria] = None
+
+
+class SamplerResult(NamedTuple):
+    """Equally weighted posterior samples and evidence of a sampler run"""
+    samples: np.ndarray
+    log_prob: np.ndarray
+    log_evidence: float
+    log_evidence_err: float
+    sampler: object
+
+
+SAMPLERS = {}
+
+
+def register_sampler(name):
+    """Class decorator adding a sampler backend to SAMPLERS"""
+    def decorator(cls):
+        if name in SAMPLERS:
+            raise ValueError(f"Sampler '{name}' is already registered")
+        cls.name = name
+        SAMPLERS[name] = cls
+        return cls
+    return decorator
+
+
+def get_sampler(name, log_likelihood, log_prior=None, bounds=None, config=SamplerConfig(),
+                vectorize=True):
+    """
+    Sampler backend by name
+
+    Parameters
+    ----------
+    name : str
+        One of SAMPLERS ('emcee', 'tempered', 'nested')
+    log_likelihood : callable
+        Log-likelihood (or full log-posterior for 'emcee' without log_prior)
+    log_prior : callable, optional
+        Log-prior; required by 'tempered' and 'nested'
+    bounds : list of tuples, optional
+        [(min, max), ...] prior box; required by 'tempered' and 'nested'
+    config : SamplerConfig, optional
+    vectorize : bool, optional
+        The callables take a (n, ndim) matrix and return n values. Default: True
+    """
+    if name not in SAMPLERS:
+        raise ValueError(f"Unknown sampler '{name}'. Available: {sorted(SAMPLERS)}")
+    return SAMPLERS[name](log_likelihood, log_prior, bounds, config, vectorize)
+
+
+def run_sampler(name, log_likelihood, log_prior=None, bounds=None, initial=None,
+                vectorize=True, **config):
+    """
+    Run a sampler backend; keyword arguments are SamplerConfig fields
+
+    Returns
+    -------
+    result : SamplerResult
+    """
+    sampler = get_sampler(name, log_likelihood, log_prior, bounds,
+                          SamplerConfig(**config), vectorize)
+    return sampler.run(initial)
+
+
+class _LogPosterior:
+    """log_prior + log_likelihood, the likelihood only inside the prior (picklable)"""
+
+    def __init__(self, log_likelihood, log_prior, vectorize=True):
+        self.log_likelihood = log_likelihood
+        self.log_prior = log_prior
+        self.vectorize = vectorize
+
+    def __call__(self, params):
+        if not self.vectorize:
+            lp = self.log_prior(params)
+            return lp + self.log_likelihood(params) if np.isfinite(lp) else -np.inf
+        params = np.atleast_2d(params)
+        log_post = np.array(self.log_prior(params), dtype=float)
+        inside = np.isfinite(log_post)
+        if np.any(inside):
+            log_post[inside] += self.log_likelihood(params[inside])
+        return log_post
+
+
+class _PointLogLikelihood:
+    """Scalar log L + log prior for dynesty, from (vectorized) callables (picklable)"""
+
+    def __init__(self, log_likelihood, log_prior, vectorize=True):
+        self.log_posterior = _LogPosterior(log_likelihood, log_prior, vectorize)
+        self.vectorize = vectorize
+
+    def __call__(self, theta):
+        value = self.log_posterior(theta[None, :] if self.vectorize else theta)
+        value = float(np.asarray(value).ravel()[0])
+        return value if np.isfinite(value) else _LOGL_FLOOR
+
+
+class _BoxTransform:
+    """Unit cube to the prior box (picklable)"""
+
+    def __init__(self, bounds):
+        self.lower = bounds[:, 0]
+        self.width = bounds[:, 1] - bounds[:, 0]
+
+    def __call__(self, u):
+        return self.lower + u * self.width
+
+
+class SamplerBackend:
+    """
+    Base class of the sampler backends
+
+    Parameters
+    ----------
+    log_likelihood, log_prior, bounds, config, vectorize
+        See get_sampler
+    """
+    name = None
+    needs_prior = True
+
+    def __init__(self, log_likelihood, log_prior=None, bounds=None, config=SamplerConfig(),
+                 vectorize=True):
+        if self.needs_prior and (log_prior is None or bounds is None):
+            raise ValueError(f"Sampler '{self.name}' needs log_prior and bounds")
+        self.log_likelihood = log_likelihood
+        self.log_prior = log_prior
+        self.bounds = None if bounds is None else np.asarray(bounds, dtype=float)
+        self.config = config
+        self.vectorize = vectorize
+
+    @property
+    def ndim(self):
+        return None if self.bounds is None else len(self.bounds)
+
+    def run(self, initial=None):
+        """
+        Sample the posterior
+
+        Parameters
+        ----------
+        initial : array, optional
+            Starting point (ndim,), ball centre, or walker positions
+            (nwalkers, ndim). Default: uniform draws in the prior box
+
+        Returns
+        -------
+        result : SamplerResult
+        """
+        pool = self._pool()
+        try:
+            return self._run(initial, pool)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    def _run(self, initial, pool):
+        raise NotImplementedError
+
+    def _pool(self):
+        """Worker pool for config.processes > 1, data shipped once per worker"""
+        processes = self.config.processes
+        if not processes or processes < 2:
+            return None
+        posteriors = [fn for fn in (self.log_likelihood, self.log_prior)
+                      if isinstance(fn, Posterior)]
+        if posteriors:
+            return make_pool(posteriors, processes)
+        return multiprocessing.Pool(processes)
+
+    def _initial(self, initial, rng):
+        """Walker positions (nwalkers, ndim) inside the prior"""
+        nwalkers = self.config.nwalkers
+        if initial is not None:
+            initial = np.asarray(initial, dtype=float)
+            if initial.ndim == 2:
+                return initial.copy()
+            return initial + 1e-4 * rng.standard_normal((nwalkers, len(initial)))
+
+        lower, upper = self.bounds.T
+        pos = lower + rng.random((nwalkers, self.ndim)) * (upper - lower)
+        for _ in range(100):
+            outside = ~np.isfinite(self._log_prior(pos))
+            if not np.any(outside):
+                break
+            pos[outside] = lower + rng.random((outside.sum(), self.ndim)) * (upper - lower)
+        return pos
+
+    def _log_prior(self, walkers):
+        """Log-prior of a walker matrix, evaluated in this process"""
+        if self.log_prior is None:
+            return np.zeros(len(walkers))
+        if self.vectorize:
+            return np.asarray(self.log_prior(walkers), dtype=float)
+        return np.array([self.log_prior(w) for w in walkers], dtype=float)
+
+    def _map(self, fn, walkers, pool):
+        """fn over the rows of walkers, in chunks across the pool if any"""
+        if pool is None:
+            if self.vectorize:
+                return np.asarray(fn(walkers), dtype=float)
+            return np.array([fn(w) for w in walkers], dtype=float)
+        if self.vectorize:
+            return PooledPosterior(fn, pool, self.config.processes)(walkers)
+        return np.array(pool.map(fn, list(walkers)), dtype=float)
+
+    def _evaluate(self, walkers, pool):
+        """(log_prior, log_likelihood) of a walker matrix; L only inside the prior"""
+        lp = self._log_prior(walkers)
+        ll = np.full(len(walkers), -np.inf)
+        inside = np.isfinite(lp)
+        if np.any(inside):
+            ll[inside] = self._map(self.log_likelihood, walkers[inside], pool)
+        return lp, ll
+
+
+@register_sampler('emcee')
+class EmceeSampler(SamplerBackend):
+    """
+    emcee affine-invariant ensemble sampler
+
+    Checkpoints to an AsyncHDFBackend (HDFBackend layout, written from a thread,
+    at most checkpoint_interval steps behind); without log_prior, log_likelihood is
+    taken as the full log-posterior. No evidence (NaN). With
+    config.convergence, the run stops early once converged and the final
+    ConvergenceStatus is kept in the convergence attribute.
+    """
+    convergence = None
+    needs_prior = False
+
+    def _run(self, initial, pool):
+        if not HAS_EMCEE:
+            raise ImportError("emcee is required: pip install emcee")
+        cfg = self.config
+        rng = np.random.default_rng(cfg.seed)
+
+        if self.log_prior is None:
+            log_prob = self.log_likelihood
+        else:
+            log_prob = _LogPosterior(self.log_likelihood, self.log_prior, self.vectorize)
+        pos = self._initial(initial, rng)
+        nwalkers, ndim = pos.shape
+
+        backend = None
+        nsteps = cfg.nsteps
+        if cfg.checkpoint_file is not None:
+            backend = AsyncHDFBackend(cfg.checkpoint_file, flush_interval=cfg.checkpoint_interval)
+            try:
+                resuming = (cfg.resume and os.path.exists(cfg.checkpoint_file)
+                            and backend.iteration > 0)
+            except (OSError, KeyError):
+                resuming = False
+            if resuming:
+                pos = None
+                nsteps = max(0, cfg.nsteps - backend.iteration)
+            else:
+                backend.reset(nwalkers, ndim)
+
+        if pool is not None and self.vectorize:
+            log_prob, pool = PooledPosterior(log_prob, pool, cfg.processes), None
+        sampler = emcee.EnsembleSampler(nwalkers, ndim, log_prob, pool=pool,
+                                        backend=backend, vectorize=self.vectorize)
+        try:
+            if cfg.convergence is not None:
+                self.convergence = run_until_converged(
+                    sampler, pos, cfg.nsteps,
+                    ConvergenceController(cfg.convergence, block_size=cfg.checkpoint_interval),
+                    check_interval=cfg.checkpoint_interval, progress=cfg.progress)
+            elif nsteps > 0:
+                sampler.run_mcmc(pos, nsteps, progress=cfg.progress)
+        finally:
+            if backend is not None:
+                backend.close()
+
+        return SamplerResult(
+            samples=sampler.get_chain(discard=cfg.burn_in, flat=True),
+            log_prob=sampler.get_log_prob(discard=cfg.burn_in, flat=True),
+            log_evidence=np.nan,
+            log_evidence_err=np.nan,
+            sampler=sampler,
+        )
+
+
+def stepping_stone_evidence(log_stones, nwalkers, n_blocks=4):
+    """
+    ln Z by stepping-stone sampling over a temperature ladder
+
+    Z = Π_k <L^(β_k - β_k+1)>_β_k+1 down to β = 0, each ratio averaged over
+    the walkers and steps of the hotter ensemble (the hottest ensemble stands
+    in for the prior).
+
+    Parameters
+    ----------
+    log_stones : array (nsteps, ntemps)
+        Per step, log Σ_walkers L^Δβ of each stone
+    nwalkers : int
+        Walkers per ensemble
+    n_blocks : int, optional
+        Consecutive blocks of steps for the error. Default: 4
+
+    Returns
+    -------
+    log_z, log_z_err : float
+        Estimate from all steps and standard error across the blocks
+    """
+    def estimate(stones):
+        return np.sum(logsumexp(stones, axis=0) - np.log(len(stones) * nwalkers))
+
+    log_z = estimate(log_stones)
+    blocks = [b for b in np.array_split(log_stones, n_blocks) if len(b)]
+    if len(blocks) < 2:
+        return log_z, np.nan
+    return log_z, np.std([estimate(b) for b in blocks], ddof=1) / np.sqrt(len(blocks))
+
+
+@register_sampler('tempered')
+class ParallelTemperingSampler(SamplerBackend):
+    """
+    Parallel-tempered affine-invariant ensemble sampler
+
+    config.ntemps ensembles of config.nwalkers walkers sample
+    π(θ) L(θ)^β on a geometric ladder from β = 1 to 1/config.tmax. Each step
+    makes one stretch move per half-ensemble at every temperature (all
+    proposals evaluated in one call) and proposes swaps between adjacent
+    temperatures. The β = 1 ensemble gives the posterior samples; the
+    likelihood ratios between adjacent temperatures the evidence
+    (stepping_stone_evidence; less biased than thermodynamic integration on
+    a coarse ladder).
+
+    Attributes (after run)
+    ----------------------
+    betas : array (ntemps,)
+    chain : array (nsteps, nwalkers, ndim)
+        β = 1 chain
+    mean_log_likelihood : array (nsteps, ntemps)
+        Mean ln L of each ensemble, for checking the ladder
+    acceptance_fraction : array (ntemps,)
+    swap_fraction : array (ntemps - 1,)
+    """
+    stretch = 2.0
+
+    @property
+    def betas(self):
+        return np.geomspace(1.0, 1.0 / self.config.tmax, self.config.ntemps)
+
+    def _run(self, initial, pool):
+        cfg = self.config
+        rng = np.random.default_rng(cfg.seed)
+        betas = self.betas
+        nt, nw, nd = len(betas), cfg.nwalkers, self.ndim
+        if nw % 2 or nw < 2 * nd:
+            raise ValueError("nwalkers must be even and at least 2*ndim")
+
+        state = self._restore()
+        if state is None:
+            pos = np.repeat(self._initial(initial, rng)[None], nt, axis=0)
+            lp, ll = (x.reshape(nt, nw) for x in self._evaluate(pos.reshape(-1, nd), pool))
+            state = dict(step=0, pos=pos, lp=lp, ll=ll,
+                         chain=np.empty((cfg.nsteps, nw, nd)),
+                         log_prob=np.empty((cfg.nsteps, nw)),
+                         mean_logl=np.empty((cfg.nsteps, nt)),
+                         log_stones=np.empty((cfg.nsteps, nt)),
+                         accepted=np.zeros(nt), swapped=np.zeros(max(nt - 1, 0)))
+        pos, lp, ll = state['pos'], state['lp'], state['ll']
+        halves = (np.arange(nw // 2), np.arange(nw // 2, nw))
+        # Stone k: L^(β_k - β_k+1) over ensemble k+1, the hottest one for β_min -> 0
+        delta_betas = np.append(betas[:-1] - betas[1:], betas[-1])
+        stone_temps = np.append(np.arange(1, nt), nt - 1)
+        a = self.stretch
+
+        for step in range(state['step'], cfg.nsteps):
+            # Stretch moves, one half-ensemble against the other, all temperatures at once
+            for moving, fixed in (halves, halves[::-1]):
+                z = ((a - 1.0) * rng.random((nt, len(moving))) + 1.0)**2 / a
+                partner = fixed[rng.integers(len(fixed), size=(nt, len(moving)))]
+                other = np.take_along_axis(pos, partner[..., None], axis=1)
+                proposal = other + z[..., None] * (pos[:, moving] - other)
+                lp_new, ll_new = (x.reshape(nt, -1) for x in
+                                  self._evaluate(proposal.reshape(-1, nd), pool))
+                with np.errstate(invalid='ignore'):
+                    log_ratio = ((nd - 1) * np.log(z) + lp_new + betas[:, None] * ll_new
+                                 - lp[:, moving] - betas[:, None] * ll[:, moving])
+                accept = np.log(rng.random(log_ratio.shape)) < log_ratio
+                t_idx, w_idx = np.nonzero(accept)
+                pos[t_idx, moving[w_idx]] = proposal[t_idx, w_idx]
+                lp[t_idx, moving[w_idx]] = lp_new[t_idx, w_idx]
+                ll[t_idx, moving[w_idx]] = ll_new[t_idx, w_idx]
+                state['accepted'] += accept.sum(axis=1)
+
+            # Swaps between adjacent temperatures, hottest pair first
+            for t in range(nt - 1, 0, -1):
+                partner = rng.permutation(nw)
+                log_swap = (betas[t - 1] - betas[t]) * (ll[t, partner] - ll[t - 1])
+                swap = np.flatnonzero(np.log(rng.random(nw)) < log_swap)
+                j = partner[swap]
+                for array in (pos, lp, ll):
+                    cold = array[t - 1, swap].copy()
+                    array[t - 1, swap] = array[t, j]
+                    array[t, j] = cold
+                state['swapped'][t - 1] += len(swap)
+
+            state['chain'][step] = pos[0]
+            state['log_prob'][step] = lp[0] + ll[0]
+            state['mean_logl'][step] = ll.mean(axis=1)
+            state['log_stones'][step] = logsumexp(delta_betas[:, None] * ll[stone_temps], axis=1)
+            state['step'] = step + 1
+            if cfg.checkpoint_file and (step + 1) % cfg.checkpoint_interval == 0:
+                self._save(state)
+
+        if cfg.checkpoint_file:
+            self._save(state)
+
+        n = state['step']
+        self.chain = state['chain'][:n]
+        self.mean_log_likelihood = state['mean_logl'][:n]
+        self.acceptance_fraction = state['accepted'] / (n * nw)
+        self.swap_fraction = state['swapped'] / (n * nw)
+
+        burn = min(cfg.burn_in, n - 1)
+        log_z, log_z_err = stepping_stone_evidence(state['log_stones'][burn:n], nw)
+        return SamplerResult(
+            samples=self.chain[burn:].reshape(-1, nd),
+            log_prob=state['log_prob'][burn:n].ravel(),
+            log_evidence=log_z,
+            log_evidence_err=log_z_err,
+            sampler=self,
+        )
+
+    def _save(self, state):
+        """Write the sampler state to the HDF5 checkpoint"""
+        if not HAS_H5PY:
+            raise ImportError("h5py is required for checkpointing: pip install h5py")
+        tmp = f"{self.config.checkpoint_file}.tmp"
+        with h5py.File(tmp, 'w') as f:
+            f.attrs['step'] = state['step']
+            f.attrs['betas'] = self.betas
+            for key, value in state.items():
+                if key != 'step':
+                    f.create_dataset(key, data=value)
+        os.replace(tmp, self.config.checkpoint_file)
+
+    def _restore(self):
+        """Sampler state from a compatible checkpoint, or None"""
+        cfg = self.config
+        if not (cfg.resume and cfg.checkpoint_file and os.path.exists(cfg.checkpoint_file)):
+            return None
+        if not HAS_H5PY:
+            raise ImportError("h5py is required for checkpointing: pip install h5py")
+        with h5py.File(cfg.checkpoint_file, 'r') as f:
+            state = {key: f[key][()] for key in f}
+            state['step'] = int(f.attrs['step'])
+            betas = f.attrs['betas']
+        if (not np.allclose(betas, self.betas) or state['pos'].shape[1] != cfg.nwalkers
+                or len(state['chain']) != cfg.nsteps):
+            warnings.warn(f"Checkpoint {cfg.checkpoint_file} does not match the "
+                          "configuration; starting a new run")
+            return None
+        return state
+
+
+@register_sampler('nested')
+class NestedSampler(SamplerBackend):
+    """
+    Nested sampling with dynesty
+
+    The prior box is mapped from the unit cube; log_prior is added to the
+    log-likelihood (0 for flat priors). Checkpoints are dynesty's own
+    (config.checkpoint_file) and resumed when config.resume is set.
+    """
+
+    def _run(self, initial, pool):
+        if not HAS_DYNESTY:
+            raise ImportError("dynesty is required for nested sampling: pip install dynesty")
+        cfg = self.config
+        queue_size = cfg.processes if pool is not None else None
+        loglike = _PointLogLikelihood(self.log_likelihood, self.log_prior, self.vectorize)
+
+        checkpoint = cfg.checkpoint_file
+        if checkpoint and cfg.resume and os.path.exists(checkpoint):
+            sampler = dynesty.NestedSampler.restore(checkpoint, pool=pool)
+            sampler.run_nested(resume=True, dlogz=cfg.dlogz, checkpoint_file=checkpoint,
+                               print_progress=cfg.progress)
+        else:
+            sampler = dynesty.NestedSampler(loglike, _BoxTransform(self.bounds), self.ndim,
+                                            nlive=cfg.nlive, pool=pool, queue_size=queue_size,
+                                            rstate=np.random.default_rng(cfg.seed))
+            sampler.run_nested(dlogz=cfg.dlogz, checkpoint_file=checkpoint,
+                               print_progress=cfg.progress)
+
+        results = sampler.results
+        weights = np.exp(results.logwt - results.logz[-1])
+        equal = resample_equal(np.column_stack([results.samples, results.logl]),
+                               weights / weights.sum())
+        return SamplerResult(
+            samples=equal[:, :-1],
+            log_prob=equal[:, -1],
+            log_evidence=float(results.logz[-1]),
+            log_evidence_err=float(results.logzerr[-1]),
+            sampler=sampler,
+        )
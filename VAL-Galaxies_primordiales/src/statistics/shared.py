@@ -0,0 +1,134 @@
+"""
+Shared-Memory Data for Pool Workers
+
+The prepared likelihood data (ObservedUVLF, UVLFLikelihood, plain arrays)
+are published once in POSIX shared memory. A SharedData handle pickles to
+block names, shapes and dtypes only; a worker attaches to the blocks by name
+and rebuilds the object around read-only views of them, without copying the
+arrays. Per-worker memory therefore does not grow with the data size or with
+the number of workers.
+
+The blocks are unlinked by release(), when the handle is garbage collected,
+or at interpreter exit, whichever comes first.
+
+>>> shared = SharedData(uv_lf)           # parent: publish once
+>>> data = pickle.loads(pickle.dumps(shared)).attach()   # worker: zero copy
+"""
+
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Blocks attached in this process, kept open while their views are in use
+_ATTACHED = {}
+
+
+def _unlink(blocks):
+    """Close and remove shared-memory blocks (parent side)"""
+    for block in blocks:
+        try:
+            block.close()
+            block.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _split_arrays(data):
+    """(kind, arrays, other attributes) of an array, a dict or an object"""
+    if isinstance(data, np.ndarray):
+        return 'array', {'data': data}, {}
+    if not isinstance(data, dict) and not hasattr(data, '__dict__'):
+        # Tuples, NamedTuples, __slots__ objects: nothing shared, pickled whole
+        return 'pickled', {}, {'data': data}
+    items = dict(data) if isinstance(data, dict) else vars(data)
+    arrays = {k: v for k, v in items.items() if isinstance(v, np.ndarray)}
+    others = {k: v for k, v in items.items() if k not in arrays}
+    return ('dict' if isinstance(data, dict) else 'object'), arrays, others
+
+
+class SharedData:
+    """
+    Arrays of a data object published in shared memory
+
+    Parameters
+    ----------
+    data : ndarray, dict or object
+        Array, dict of arrays, or object whose NumPy array attributes are
+        shared (other attributes are pickled with the handle). Data without
+        a __dict__ (tuple, NamedTuple, __slots__ object) are pickled whole
+
+    Attributes
+    ----------
+    specs : dict
+        {attribute: (block name, shape, dtype)} of the shared arrays
+    nbytes : int
+        Total size of the shared arrays
+    """
+
+    def __init__(self, data):
+        self.kind, arrays, self.attributes = _split_arrays(data)
+        self.cls = type(data)
+        self.specs = {}
+        self._blocks = []
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            # Zero-size blocks are not allowed
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            self.specs[name] = (block.name, array.shape, array.dtype.str)
+        self.nbytes = sum(np.prod(shape, dtype=int) * np.dtype(dtype).itemsize
+                          for _, shape, dtype in self.specs.values())
+        self._finalizer = weakref.finalize(self, _unlink, self._blocks)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_blocks'], state['_finalizer']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._blocks = []
+        self._finalizer = None
+
+    @property
+    def owner(self):
+        """True in the process that created the blocks"""
+        return self._finalizer is not None
+
+    def attach(self):
+        """
+        Rebuild the data around read-only views of the shared blocks
+
+        Returns
+        -------
+        data : same type as the published data
+        """
+        arrays = {}
+        for name, (block_name, shape, dtype) in self.specs.items():
+            block = _ATTACHED.get(block_name)
+            if block is None:
+                block = _ATTACHED[block_name] = shared_memory.SharedMemory(name=block_name)
+            view = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+            view.flags.writeable = False
+            arrays[name] = view
+
+        if self.kind == 'array':
+            return arrays['data']
+        if self.kind == 'pickled':
+            return self.attributes['data']
+        if self.kind == 'dict':
+            return {**self.attributes, **arrays}
+        data = self.cls.__new__(self.cls)
+        data.__dict__.update(self.attributes)
+        data.__dict__.update(arrays)
+        return data
+
+    def release(self):
+        """Unlink the blocks now (owner only; no-op in workers)"""
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def __repr__(self):
+        return f"SharedData({self.cls.__name__}, {len(self.specs)} arrays, {self.nbytes} bytes)"
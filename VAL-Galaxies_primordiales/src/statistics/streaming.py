@@ -0,0 +1,293 @@
+"""
+Streaming Chain Diagnostics
+
+Convergence diagnostics of long runs (50,000 steps × 32 walkers and more)
+without loading the chain: the emcee HDF5 backend is read in chunks of
+steps, and only running sums are kept.
+
+- BlockMoments: per-walker Σx and Σx² for each block of steps, from which
+  split R-hat, batch-means ESS, means and standard deviations follow for
+  any burn-in fraction
+- StreamingDiagnostics: reads the new steps of a backend at each update()
+  and exposes R-hat, ESS, τ and acceptance from those sums
+
+>>> diagnostics = StreamingDiagnostics('chains/lcdm_uv_lf.h5')
+>>> result = diagnostics.update()      # again later: reads only the new steps
+>>> result.rhat, result.ess, result.acceptance
+"""
+
+import os
+from typing import NamedTuple
+
+import numpy as np
+
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+
+class BlockMoments:
+    """
+    Per-walker running sums of a chain, kept for each block of steps
+
+    Parameters
+    ----------
+    block_size : int, optional
+        Steps per block; burn-in and R-hat split points fall on block
+        boundaries. Default: 100
+
+    Notes
+    -----
+    Memory grows as (steps / block_size) × nwalkers × ndim, not with the
+    chain length. Sums are taken relative to the mean of the first block,
+    which avoids cancellation in Σx² for parameters far from zero.
+    """
+
+    def __init__(self, block_size=100):
+        self.block_size = block_size
+        self.n_steps = 0
+        self._counts = []
+        self._sums = []
+        self._squares = []
+        self._offset = None
+
+    def add(self, chain):
+        """
+        Add the next steps
+
+        Parameters
+        ----------
+        chain : array (steps, nwalkers, ndim)
+        """
+        chain = np.asarray(chain, dtype=float)
+        if len(chain) == 0:
+            return
+        if self._offset is None:
+            self._offset = chain[:self.block_size].mean(axis=(0, 1))
+
+        # Top up an incomplete last block first, so blocks stay block_size long
+        start = 0
+        if self._counts and self._counts[-1] < self.block_size:
+            start = self.block_size - self._counts[-1]
+            centred = chain[:start] - self._offset
+            self._counts[-1] += len(centred)
+            self._sums[-1] = self._sums[-1] + centred.sum(axis=0)
+            self._squares[-1] = self._squares[-1] + (centred**2).sum(axis=0)
+
+        for i in range(start, len(chain), self.block_size):
+            centred = chain[i:i + self.block_size] - self._offset
+            self._counts.append(len(centred))
+            self._sums.append(centred.sum(axis=0))
+            self._squares.append((centred**2).sum(axis=0))
+        self.n_steps += len(chain)
+
+    @property
+    def ndim(self):
+        return None if self._offset is None else len(self._offset)
+
+    def _post_burn_in(self, discard):
+        """Block indices after the first `discard` fraction of the steps"""
+        counts = np.array(self._counts)
+        starts = np.cumsum(counts) - counts
+        return np.flatnonzero(starts >= int(discard * self.n_steps))
+
+    def _moments(self, blocks):
+        """(steps, per-walker mean, per-walker variance) over some blocks"""
+        n = sum(self._counts[i] for i in blocks)
+        s1 = np.sum([self._sums[i] for i in blocks], axis=0)
+        s2 = np.sum([self._squares[i] for i in blocks], axis=0)
+        mean = s1 / n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return n, mean, (s2 - n * mean**2) / (n - 1)
+
+    def n_post(self, discard=0.5):
+        """Steps after burn-in"""
+        return int(sum(self._counts[i] for i in self._post_burn_in(discard)))
+
+    def split_rhat(self, discard=0.5):
+        """
+        Split R-hat after burn-in, each walker split in two halves
+
+        Returns
+        -------
+        rhat : array (ndim,)
+            NaN with fewer than two blocks after burn-in
+        """
+        post = self._post_burn_in(discard)
+        if len(post) < 2:
+            return np.full(self.ndim or 0, np.nan)
+
+        # Halves at the block boundary closest to the middle
+        cumulative = np.cumsum([self._counts[i] for i in post])
+        mid = int(np.argmin(np.abs(cumulative[:-1] - cumulative[-1] / 2))) + 1
+        n1, mean1, var1 = self._moments(post[:mid])
+        n2, mean2, var2 = self._moments(post[mid:])
+
+        # Unequal halves: use the shorter length, as for split R-hat on odd chains
+        n = min(n1, n2)
+        W = np.concatenate([var1, var2]).mean(axis=0)
+        B = n * np.concatenate([mean1, mean2]).var(axis=0, ddof=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.sqrt(((n - 1) / n * W + B / n) / W)
+
+    def batch_means_ess(self, discard=0.5):
+        """
+        Effective sample size by non-overlapping batch means
+
+        Batches of about sqrt(n) steps (whole blocks) after burn-in; the
+        variance of the batch means of each walker estimates the asymptotic
+        variance of its mean.
+
+        Returns
+        -------
+        ess : array (ndim,)
+            Over all walkers; NaN with fewer than two batches
+        """
+        post = self._post_burn_in(discard)
+        n_post = sum(self._counts[i] for i in post)
+        k = max(1, int(round(np.sqrt(n_post) / self.block_size)))
+        n_batches = len(post) // k
+        if n_batches < 2:
+            return np.full(self.ndim or 0, np.nan)
+        batches = post[len(post) - n_batches * k:].reshape(n_batches, k)
+
+        means = np.array([self._moments(b)[1] for b in batches])  # (batches, nwalkers, ndim)
+        n, _, var = self._moments(batches.ravel())
+        batch_length = n / n_batches
+        sigma2 = batch_length * means.var(axis=0, ddof=1)
+        nwalkers = var.shape[0]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return n * nwalkers * var.mean(axis=0) / sigma2.mean(axis=0)
+
+    def mean_std(self, discard=0.5):
+        """Posterior mean and standard deviation over all walkers after burn-in"""
+        post = self._post_burn_in(discard)
+        if len(post) == 0:
+            nan = np.full(self.ndim or 0, np.nan)
+            return nan, nan
+        n = sum(self._counts[i] for i in post)
+        s1 = np.sum([self._sums[i] for i in post], axis=(0, 1))
+        s2 = np.sum([self._squares[i] for i in post], axis=(0, 1))
+        total = n * len(self._sums[0])
+        mean = s1 / total
+        return mean + self._offset, np.sqrt(np.maximum(s2 / total - mean**2, 0.0))
+
+
+def iter_chunks(backend, start=0, chunk_size=1000, name='mcmc'):
+    """
+    Steps of an emcee backend in chunks, without reading the whole chain
+
+    Parameters
+    ----------
+    backend : str, Path, emcee backend or statistics.checkpoint.AsyncHDFBackend
+        HDF5 chain file or emcee backend
+    start : int, optional
+        First step. Default: 0
+    chunk_size : int, optional
+        Steps per chunk. Default: 1000
+    name : str, optional
+        HDF5 group, for file names. Default: 'mcmc'
+
+    Yields
+    ------
+    chain : array (steps, nwalkers, ndim)
+    """
+    if hasattr(backend, 'read'):
+        # Buffered backend: steps on disk and steps still in memory
+        for i in range(start, backend.iteration, chunk_size):
+            yield backend.read('chain', i, i + chunk_size)
+        return
+
+    filename = backend if isinstance(backend, (str, os.PathLike)) else getattr(
+        backend, 'filename', None)
+    if filename is None:
+        # In-memory backend: slices are views
+        for i in range(start, backend.iteration, chunk_size):
+            yield backend.chain[i:min(i + chunk_size, backend.iteration)]
+        return
+
+    if not HAS_H5PY:
+        raise ImportError("h5py is required to read HDF5 chains: pip install h5py")
+    name = getattr(backend, 'name', name)
+    with h5py.File(filename, 'r') as f:
+        group = f[name]
+        iteration = int(group.attrs['iteration'])
+        for i in range(start, iteration, chunk_size):
+            yield group['chain'][i:min(i + chunk_size, iteration)]
+
+
+class ChainDiagnostics(NamedTuple):
+    """Diagnostics of a chain from running sums"""
+    iteration: int
+    rhat: np.ndarray
+    ess: np.ndarray
+    tau: np.ndarray
+    acceptance: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray
+
+
+class StreamingDiagnostics:
+    """
+    Online split R-hat, batch-means ESS and acceptance of a stored chain
+
+    Parameters
+    ----------
+    backend : str, Path or emcee backend
+        HDF5 chain file (emcee HDFBackend layout) or emcee backend
+    discard : float, optional
+        Burn-in fraction for R-hat, ESS, mean and std. Default: 0.5
+    chunk_size : int, optional
+        Steps read at a time. Default: 1000
+    block_size : int, optional
+        See BlockMoments. Default: 100
+
+    Notes
+    -----
+    Acceptance is counted from walker moves (a step is accepted when the
+    position changed), over the whole chain.
+    """
+
+    def __init__(self, backend, discard=0.5, chunk_size=1000, block_size=100):
+        self.backend = backend
+        self.discard = discard
+        self.chunk_size = chunk_size
+        self.moments = BlockMoments(block_size)
+        self.iteration = 0
+        self._last = None
+        self._moves = None
+
+    def update(self):
+        """
+        Read the steps added since the last update
+
+        Returns
+        -------
+        diagnostics : ChainDiagnostics
+        """
+        for chunk in iter_chunks(self.backend, self.iteration, self.chunk_size):
+            previous = chunk[:-1] if self._last is None else np.concatenate(
+                [self._last[None], chunk[:-1]])
+            current = chunk if self._last is not None else chunk[1:]
+            moves = np.sum(np.any(current != previous, axis=-1), axis=0)
+            self._moves = moves if self._moves is None else self._moves + moves
+            self._last = chunk[-1]
+            self.moments.add(chunk)
+            self.iteration += len(chunk)
+        return self.result
+
+    @property
+    def result(self):
+        """Diagnostics of the steps read so far"""
+        if self._last is None:
+            raise ValueError("No steps read yet: the chain is empty")
+        discard = self.discard
+        ess = self.moments.batch_means_ess(discard)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            tau = self.moments.n_post(discard) * len(self._last) / ess
+            acceptance = self._moves / max(self.iteration - 1, 1)
+        mean, std = self.moments.mean_std(discard)
+        return ChainDiagnostics(self.iteration, self.moments.split_rhat(discard), ess, tau,
+                                acceptance, mean, std)
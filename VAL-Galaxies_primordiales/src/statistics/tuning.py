@@ -0,0 +1,241 @@
+"""
+Parallel Evaluation Plans for Ensemble Samplers
+
+emcee evaluates half of the ensemble per move, by one pool.map call with one
+task per walker. Whether a process pool pays off, and with how many workers,
+depends on the cost of one posterior evaluation against the cost of a round
+trip to a worker (pickling the function and walkers, dispatch, result).
+
+plan_parallelism measures both at start-up and picks the cheapest plan:
+
+    serial:  n t                    (vectorized: a + b n)
+    pool:    ceil(n / w) t + d w    (vectorized: a + b ceil(n / w) + d w)
+
+for n walkers per move, w workers, a posterior cost t per walker (a + b k
+for a batch of k) and a per-chunk overhead d, each worker receiving one
+chunk of ceil(n / w) walkers. Among pool plans within 5% of the fastest,
+the one with the fewest workers is kept.
+
+>>> posterior = Posterior(log_prob, data)
+>>> plan = plan_parallelism(posterior, p0, max_workers=os.cpu_count())
+>>> pool = plan.make_pool([posterior])  # None for serial plans
+>>> sampler = emcee.EnsembleSampler(nwalkers, ndim, plan.wrap(posterior, pool),
+...                                 pool=plan.sampler_pool(pool), vectorize=plan.vectorize)
+"""
+
+import math
+import multiprocessing
+import os
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+try:
+    from .posterior import PooledPosterior, make_pool
+except ImportError:
+    from statistics.posterior import PooledPosterior, make_pool
+
+
+class ChunkedPool:
+    """
+    Pool whose map() sends fixed-size chunks of tasks
+
+    emcee calls pool.map(fn, walkers); multiprocessing then picks its own
+    chunk size. This wrapper imposes the planned one.
+    """
+
+    def __init__(self, pool, chunksize):
+        self.pool = pool
+        self.chunksize = chunksize
+
+    def map(self, fn, iterable):
+        return self.pool.map(fn, iterable, chunksize=self.chunksize)
+
+
+class _Discard:
+    """Picklable stand-in for fn that only pays its transfer: returns 0"""
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def __call__(self, walker):
+        return 0.0
+
+
+class ParallelPlan(NamedTuple):
+    """
+    How to evaluate the posterior of an ensemble
+
+    mode : 'serial' or 'pool'
+    n_workers : pool workers (1 for serial plans)
+    chunksize : walkers per pool task
+    vectorize : the posterior takes a (n, ndim) walker matrix
+    eval_time : seconds per walker evaluation (batched cost per walker if vectorized)
+    call_time : fixed seconds per call of a vectorized posterior (0 otherwise)
+    overhead : seconds of pool round trip per chunk (NaN if not measured)
+    move_time : predicted seconds per emcee move (half the ensemble)
+    throughput : predicted posterior evaluations per second (sampler overhead excluded)
+    """
+    mode: str
+    n_workers: int
+    chunksize: int
+    vectorize: bool
+    eval_time: float
+    call_time: float
+    overhead: float
+    move_time: float
+    throughput: float
+
+    @classmethod
+    def fixed(cls, n_workers, nwalkers, vectorize=False):
+        """Plan with a given worker count, nothing measured"""
+        n_workers = max(1, min(n_workers, nwalkers // 2))
+        return cls('pool' if n_workers > 1 else 'serial', n_workers,
+                   math.ceil(max(nwalkers // 2, 1) / n_workers), vectorize,
+                   np.nan, np.nan, np.nan, np.nan, np.nan)
+
+    def describe(self):
+        """One-line summary for logs"""
+        if self.mode == 'serial':
+            head = "serial" + (" vectorized" if self.vectorize else "")
+        else:
+            head = f"pool {self.n_workers} workers x {self.chunksize} walkers/chunk"
+        if not np.isfinite(self.eval_time):
+            return f"{head} (fixed)"
+        cost = f"posterior {1e3 * self.eval_time:.3g} ms/walker"
+        if self.vectorize:
+            cost += f" + {1e3 * self.call_time:.3g} ms/call"
+        if np.isfinite(self.overhead):
+            cost += f", IPC {1e3 * self.overhead:.3g} ms/chunk"
+        return f"{head} ({cost}): {self.throughput:.0f} evaluations/s predicted"
+
+    def make_pool(self, posteriors=(), shared_memory=True):
+        """
+        New process pool for pool plans, None for serial ones
+
+        The workers receive the data of `posteriors` (statistics.posterior.Posterior)
+        once, at start-up, through statistics.posterior.make_pool.
+        """
+        if self.mode == 'serial':
+            return None
+        return make_pool(list(posteriors), self.n_workers, shared_memory)
+
+    def wrap(self, log_prob_fn, pool):
+        """Posterior to hand to emcee: vectorized pool plans go through PooledPosterior"""
+        if pool is not None and self.vectorize:
+            return PooledPosterior(log_prob_fn, pool, n_chunks=self.n_workers)
+        return log_prob_fn
+
+    def sampler_pool(self, pool):
+        """pool= argument of emcee.EnsembleSampler"""
+        if pool is None or self.vectorize:
+            return None
+        return ChunkedPool(pool, self.chunksize)
+
+
+def _time_calls(fn, arg, min_time, max_calls):
+    """Mean seconds per call of fn(arg), over at least min_time seconds"""
+    fn(arg)     # Warm-up (caches, JIT)
+    calls, start = 0, time.perf_counter()
+    while True:
+        fn(arg)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or calls >= max_calls:
+            return elapsed / calls
+
+
+def measure_posterior_cost(log_prob_fn, walkers, vectorize=False, min_time=0.2, max_calls=100):
+    """
+    Cost of the posterior on a set of walkers
+
+    Parameters
+    ----------
+    log_prob_fn : callable
+    walkers : array (n, ndim)
+        Representative positions (e.g. the initial ensemble)
+    vectorize : bool, optional
+        log_prob_fn takes the walker matrix. Default: False
+    min_time : float, optional
+        Seconds of timing per measurement. Default: 0.2
+
+    Returns
+    -------
+    eval_time, call_time : float
+        Seconds per walker and, for vectorized posteriors, fixed seconds per call
+    """
+    walkers = np.atleast_2d(walkers)
+    n = len(walkers)
+    if not vectorize:
+        per_ensemble = _time_calls(lambda w: [log_prob_fn(p) for p in w], walkers,
+                                   min_time, max_calls)
+        return per_ensemble / n, 0.0
+
+    whole = _time_calls(log_prob_fn, walkers, min_time, max_calls)
+    single = _time_calls(log_prob_fn, walkers[:1], min_time / 2, max_calls)
+    per_walker = max((whole - single) / max(n - 1, 1), 0.0)
+    return per_walker, max(single - per_walker, 0.0)
+
+
+def measure_pool_overhead(log_prob_fn, walkers, processes=2, min_time=0.2, max_calls=50):
+    """
+    Seconds of pool round trip per chunk, posterior excluded
+
+    Chunks of one walker go through a pool of `processes` workers with a
+    stand-in that pickles like log_prob_fn but returns at once.
+    """
+    walkers = np.atleast_2d(walkers)
+    task = _Discard(log_prob_fn)
+    with multiprocessing.Pool(processes) as pool:
+        per_map = _time_calls(lambda w: pool.map(task, list(w), chunksize=1), walkers,
+                              min_time, max_calls)
+    return per_map / len(walkers)
+
+
+def plan_parallelism(log_prob_fn, walkers, max_workers=None, vectorize=False, min_time=0.2,
+                     tolerance=0.05):
+    """
+    Benchmark the posterior and choose serial or pool evaluation
+
+    Parameters
+    ----------
+    log_prob_fn : callable
+        Picklable posterior (module-level function, Posterior, ...)
+    walkers : array (nwalkers, ndim)
+        Initial ensemble; each move evaluates nwalkers / 2 of them
+    max_workers : int, optional
+        Upper bound on pool workers. Default: os.cpu_count()
+    vectorize : bool, optional
+        log_prob_fn takes the walker matrix. Default: False
+    min_time : float, optional
+        Seconds of timing per measurement. Default: 0.2
+    tolerance : float, optional
+        Relative slack for preferring fewer workers. Default: 0.05
+
+    Returns
+    -------
+    plan : ParallelPlan
+    """
+    walkers = np.atleast_2d(walkers)
+    n = max(len(walkers) // 2, 1)
+    max_workers = min(max_workers or os.cpu_count() or 1, n)
+
+    t, a = measure_posterior_cost(log_prob_fn, walkers[:n], vectorize, min_time)
+    serial = a + t * n
+
+    def plan(mode, workers, move_time, overhead):
+        return ParallelPlan(mode, workers, math.ceil(n / workers), vectorize, t, a, overhead,
+                            move_time, n / move_time if move_time > 0 else np.inf)
+
+    if max_workers < 2:
+        return plan('serial', 1, serial, np.nan)
+    d = measure_pool_overhead(log_prob_fn, walkers[:n], 2, min_time / 2)
+
+    # Posterior cheaper than IPC: the serial plan wins
+    workers = np.arange(2, max_workers + 1)
+    pooled = a + t * np.ceil(n / workers) + d * workers
+    if serial <= (1 + tolerance) * pooled.min():
+        return plan('serial', 1, serial, d)
+    chosen = int(workers[np.argmax(pooled <= (1 + tolerance) * pooled.min())])
+    return plan('pool', chosen, float(pooled[chosen - 2]), d)
@@ -1,3 +1,4 @@
 """Utility functions and constants"""
 
 from .constants import *
+from .profiling import PROFILER, StageProfiler, StageStats, Profiled, profiled
@@ -29,6 +29,10 @@ OMEGA_MINUS_DEFAULT = 0.05  # Negative mass density
 CHI_DEFAULT = 1.0  # Bimetric coupling parameter
 KAPPA = -1  # Sign for negative sector
 
+# Survey geometry
+FULL_SKY_DEG2 = 4.0 * np.pi * (180.0 / np.pi)**2  # Full sky [deg^2] (≈ 41253)
+FLAT_OMEGA_K_TOL = 1e-8  # Below this |Omega_k|, volumes use the flat-space formulas
+
 # Redshift ranges for high-z galaxies
 Z_MIN_JWST = 8.0  # Minimum redshift for JWST primordial galaxies
 Z_MAX_JWST = 20.0  # Maximum observed redshift
@@ -37,12 +41,20 @@ Z_MAX_JWST = 20.0  # Maximum observed redshift
 MPC_TO_KM = 3.08567758149137e19  # Megaparsec to kilometers
 GYR_TO_S = 3.15576e16  # Gigayear to seconds
 
+# Radiation content of ΛCDM (matches astropy with Tcmb0=2.7255, massless neutrinos)
+TCMB0 = 2.7255  # CMB temperature today [K]
+NEFF = 3.04  # Effective number of neutrino species (astropy default)
+_RHO_CRIT_H100 = 3 * (100.0 / MPC_TO_KM)**2 / (8 * np.pi * const.G.value)  # [kg/m^3], h=1
+OMEGA_GAMMA_H2 = 4 * const.sigma_sb.value * TCMB0**4 / const.c.value**3 / _RHO_CRIT_H100
+NEUTRINO_PHOTON_RATIO = 7.0 / 8.0 * (4.0 / 11.0)**(4.0 / 3.0)  # Per massless species
+
 # Age of universe at z=0 (Planck 2018)
 T0_PLANCK = 13.787  # Gyr
 
 # Solar values
 M_SUN = const.M_sun.value  # Solar mass [kg]
 L_SUN = const.L_sun.value  # Solar luminosity [W]
+RHO_CRIT_H100 = _RHO_CRIT_H100 * (MPC_TO_KM * 1e3)**3 / M_SUN  # ρ_crit / h² [M_sun/Mpc^3]
 
 # Astrophysical constants
 AB_MAGNITUDE_ZERO_POINT = -48.6  # AB magnitude zero point
@@ -50,3 +62,37 @@ AB_MAGNITUDE_ZERO_POINT = -48.6  # AB magnitude zero point
 # Numerical precision
 INTEGRATION_RTOL = 1e-8  # Relative tolerance for integrations
 INTEGRATION_ATOL = 1e-10  # Absolute tolerance for integrations
+
+# Vectorized distance engine (src/cosmology/integration.py)
+DISTANCE_GRID_SIZE = 256  # Nodes of the shared ln(1+z) grid
+GAUSS_LEGENDRE_ORDER = 8  # Quadrature order per grid panel
+DISTANCE_INTERP_RTOL = 1e-8  # Guaranteed relative error after interpolation
+AGE_GRID_SIZE = 512  # Nodes of the age table ln(1+z) grid
+AGE_Z_MAX = 1000.0  # Upper limit of age integrals (approximate "infinity")
+LCDM_AGE_Z_MAX = 1e8  # ΛCDM ages include radiation: integrand negligible beyond
+LCDM_AGE_GRID_SIZE = 1024  # Longer ln(1+z) range than AGE_Z_MAX: more nodes
+U6_AGE_Z_MAX = 1e4  # (1+z)^6 variant: t(z) ∝ (1+z)^-3, table resolves t down to ~1e-12
+DISTANCE_TABLE_Z_MAX = 50.0  # Range of the cached distance tables, beyond: direct integration
+
+# Bimetric background solver (src/cosmology/bimetric.py)
+BIMETRIC_GRID_SIZE = 512  # Nodes of the stored ln(1+z) grid
+BIMETRIC_HBAR_RATIO = 1.0  # Default H̄0/H0 of the negative sector
+BIMETRIC_ABAR_MIN = 1e-6  # ā below this is treated as collapsed
+BIMETRIC_RTOL = 1e-11  # odeint tolerances: ages at z ~ 20 are ~3% of t0
+BIMETRIC_ATOL = 1e-13
+
+# Process-wide grid cache (src/cosmology/cache.py)
+GRID_CACHE_SIZE = 512  # Distance and age tables kept in memory (LRU eviction)
+GRID_CACHE_DIGITS = 12  # Significant digits of parameters in cache keys
+
+# Closed-form background integrals (src/cosmology/analytic.py)
+ANALYTIC_OMEGA_K_MIN = 1e-3  # Below this |Omega_k|, fall back to numerical integration
+
+# Cosmology emulator (src/cosmology/emulator.py)
+EMULATOR_OMEGA_PLUS_RANGE = (0.20, 0.60)  # Prior box of log_likelihood_janus
+EMULATOR_OMEGA_MINUS_RANGE = (0.0, 0.15)
+EMULATOR_CHI_RANGE = (0.5, 1.5)
+EMULATOR_NODES = 16  # Interpolation nodes per parameter axis
+EMULATOR_Z_MAX = 50.0  # Highest tabulated redshift
+EMULATOR_Z_NODES = 128  # Nodes of the tabulated ln(1+z) grid
+EMULATOR_VALIDATION_SAMPLES = 64  # Random parameter sets checked at build time
@@ -0,0 +1,232 @@
+"""
+Per-Stage Profiling of Posterior Evaluations
+
+Records, for each stage of a posterior evaluation (prior, Schechter model,
+χ², cosmology integrals, data packing...), the number of calls and the
+cumulative wall time, nested by call path: a stage entered inside another
+one is counted under it, as in a flame graph.
+
+Profiling is opt-in. The library stages are marked with @profiled, which
+returns the function unchanged unless the environment variable
+JANUS_PROFILE enables it when the module is imported: unset, empty, '0',
+'false' or 'no' (any case) leave profiling off and posterior evaluations
+pay nothing; any other value ('1', 'true'...) turns it on. PROFILER then
+records from the start; the run scripts write its summary next to their
+chains:
+
+    $ JANUS_PROFILE=1 python scripts/run_mcmc_optimized.py --config run.json
+    $ cat mcmc_outputs/run_profile.txt         # tree: calls, total, self time
+    $ flamegraph.pl mcmc_outputs/run_profile.folded > profile.svg
+
+The .folded file has one "stage;substage;... microseconds" line per call
+path (self time), the input format of flamegraph.pl and speedscope.
+
+Stages run in pool workers are recorded by the workers and lost: profile
+with a serial evaluation plan. Each recorded stage costs about 2 µs.
+"""
+
+import functools
+import os
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import NamedTuple
+
+_NULL_STAGE = nullcontext()
+
+
+class StageStats(NamedTuple):
+    """Calls and seconds of one call path (self: minus the nested stages)"""
+    path: tuple
+    calls: int
+    total: float
+    self_time: float
+
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._stack().append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        elapsed = time.perf_counter() - self.start
+        stack = self.profiler._stack()
+        path = tuple(stack)
+        stack.pop()
+        self.profiler._add(path, elapsed)
+
+
+class StageProfiler:
+    """
+    Cumulative calls and time per call path of named stages
+
+    Parameters
+    ----------
+    enabled : bool, optional
+        Record from the start. Default: False
+
+    Examples
+    --------
+    >>> profiler = StageProfiler(enabled=True)
+    >>> @profiler.profiled('likelihood')
+    ... def log_likelihood(theta): ...
+    >>> with profiler.stage('posterior'):
+    ...     log_likelihood(theta)
+    >>> print(profiler.summary())
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._local = threading.local()   # Stack of open stages, per thread
+        self._totals = {}                 # path -> [calls, seconds]
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._totals = {}
+
+    def _stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def _add(self, path, elapsed):
+        with self._lock:
+            entry = self._totals.get(path)
+            if entry is None:
+                self._totals[path] = [1, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+
+    def stage(self, name):
+        """Context manager timing a block as stage `name` (no-op when disabled)"""
+        return _Stage(self, name) if self.enabled else _NULL_STAGE
+
+    def profiled(self, name=None):
+        """Decorator timing each call as stage `name` (default: the function name)"""
+        def decorator(fn):
+            stage_name = name or fn.__name__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Stage(self, stage_name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # Results
+
+    def stats(self):
+        """
+        StageStats of every call path, depth first, siblings by total time
+
+        Returns
+        -------
+        stats : list of StageStats
+        """
+        with self._lock:
+            totals = {path: tuple(entry) for path, entry in self._totals.items()}
+        children = {}
+        for path in totals:
+            children.setdefault(path[:-1], []).append(path)
+
+        def visit(parent):
+            for path in sorted(children.get(parent, ()), key=lambda p: -totals[p][1]):
+                calls, total = totals[path]
+                nested = sum(totals[child][1] for child in children.get(path, ()))
+                yield StageStats(path, calls, total, max(total - nested, 0.0))
+                yield from visit(path)
+        return list(visit(()))
+
+    def summary(self, width=30):
+        """Text tree of the stages: calls, total and self seconds, share of the roots"""
+        stats = self.stats()
+        if not stats:
+            return "No stage recorded\n"
+        root_total = sum(s.total for s in stats if len(s.path) == 1)
+        lines = [f"{'stage':<40} {'calls':>10} {'total s':>10} {'self s':>10} "
+                 f"{'%':>6} {'µs/call':>10}"]
+        for s in stats:
+            share = s.total / root_total if root_total > 0 else 0.0
+            label = '  ' * (len(s.path) - 1) + s.path[-1]
+            lines.append(f"{label:<40} {s.calls:>10,} {s.total:>10.3f} {s.self_time:>10.3f} "
+                         f"{100 * share:>6.1f} {1e6 * s.total / s.calls:>10.1f} "
+                         f"{'█' * round(width * share)}")
+        return '\n'.join(lines) + '\n'
+
+    def folded(self):
+        """Folded stacks ('a;b;c self_µs' per line) for flamegraph.pl or speedscope"""
+        return ''.join(f"{';'.join(s.path)} {round(1e6 * s.self_time)}\n"
+                       for s in self.stats() if round(1e6 * s.self_time) > 0)
+
+    def dump(self, directory, name='profile'):
+        """
+        Write <name>.txt (summary) and <name>.folded into directory
+
+        Returns
+        -------
+        summary_file, folded_file : Path
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        summary_file = directory / f"{name}.txt"
+        folded_file = directory / f"{name}.folded"
+        summary_file.write_text(self.summary(), encoding='utf-8')
+        folded_file.write_text(self.folded(), encoding='utf-8')
+        return summary_file, folded_file
+
+
+# Profiler of the library stages, recording iff JANUS_PROFILE enables it
+PROFILER = StageProfiler(
+    enabled=os.environ.get('JANUS_PROFILE', '').lower() not in ('', '0', 'false', 'no'))
+
+
+def profiled(name=None):
+    """
+    Mark a function as a stage of PROFILER
+
+    Unless JANUS_PROFILE enables profiling at import (any value but unset,
+    empty, '0', 'false' or 'no', in any case), the function is returned as
+    is, so marked stages cost nothing in normal runs.
+    """
+    if not PROFILER.enabled:
+        return lambda fn: fn
+    return PROFILER.profiled(name)
+
+
+class Profiled:
+    """
+    Picklable posterior recorded as a root stage of PROFILER
+
+    The sampler's log-probability usually comes from user code; wrapping it
+    gives the stages of the library a common root (and the time outside them).
+    """
+
+    def __init__(self, fn, name='log_prob'):
+        self.fn = fn
+        self.name = name
+
+    def __call__(self, *args, **kwargs):
+        if not PROFILER.enabled:
+            return self.fn(*args, **kwargs)
+        with _Stage(PROFILER, self.name):
+            return self.fn(*args, **kwargs)
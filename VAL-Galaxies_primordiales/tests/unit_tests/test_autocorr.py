@@ -0,0 +1,98 @@
+"""
+Unit tests for the batched autocorrelation and ESS estimators
+"""
+
+import pytest
+import numpy as np
+import emcee
+from numpy.testing import assert_allclose
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from statistics.autocorr import (
+    autocorrelation, integrated_time, autocorrelation_diagnostics
+)
+
+PHI = np.array([0.3, 0.7, 0.9])
+TAU_EXACT = (1 + PHI) / (1 - PHI)
+
+
+@pytest.fixture(scope='module')
+def chains():
+    """AR(1) walkers (nsteps, nwalkers, ndim) with known τ"""
+    rng = np.random.default_rng(7)
+    x = np.zeros((20000, 8, len(PHI)))
+    for t in range(1, len(x)):
+        x[t] = PHI * x[t - 1] + rng.standard_normal((8, len(PHI)))
+    return x
+
+
+class TestAutocorrelation:
+    """Test the batched FFT against direct estimates"""
+
+    def test_matches_lag_loop(self, chains):
+        """Test the FFT autocorrelation equals the explicit lag sum"""
+        x = chains[:500, 3, 1]
+        n, mean, var = len(x), x.mean(), x.var()
+        direct = [np.sum((x[:n - k] - mean) * (x[k:] - mean)) / (n * var) for k in range(50)]
+        assert_allclose(autocorrelation(x)[:50, 0], direct, rtol=1e-10, atol=1e-12)
+
+    def test_sokal_matches_emcee(self, chains):
+        assert_allclose(integrated_time(chains[:4000]),
+                        emcee.autocorr.integrated_time(chains[:4000], quiet=True), rtol=1e-10)
+
+    @pytest.mark.parametrize("method", ['sokal', 'geyer'])
+    def test_ar1_tau(self, chains, method):
+        assert_allclose(integrated_time(chains, method=method), TAU_EXACT, rtol=0.1)
+
+    def test_unknown_method(self, chains):
+        with pytest.raises(ValueError, match="Unknown method 'bartlett'"):
+            integrated_time(chains[:100], method='bartlett')
+
+    def test_ensemble_center(self):
+        """Test the ensemble mean removes the low bias of chains 50 τ long"""
+        rng = np.random.default_rng(3)
+        x = np.zeros((950, 128, 1))
+        x[0] = rng.standard_normal((128, 1)) / np.sqrt(1 - PHI[2]**2)
+        for t in range(1, len(x)):
+            x[t] = PHI[2] * x[t - 1] + rng.standard_normal((128, 1))
+        walker = integrated_time(x)[0]
+        ensemble = integrated_time(x, center='ensemble')[0]
+        assert walker < 0.88 * TAU_EXACT[2]
+        assert ensemble == pytest.approx(TAU_EXACT[2], rel=0.12)
+        with pytest.raises(ValueError, match="center"):
+            autocorrelation(x, center='median')
+
+    def test_constant_parameter(self):
+        chain = np.random.default_rng(0).standard_normal((200, 4, 2))
+        chain[..., 1] = 3.0
+        tau = integrated_time(chain)
+        assert np.isfinite(tau[0]) and np.isnan(tau[1])
+
+
+class TestAutocorrelationDiagnostics:
+    """Test per-walker and walker-averaged τ and ESS"""
+
+    def test_shapes_and_ess(self, chains):
+        result = autocorrelation_diagnostics(chains[:5000], method='geyer')
+        assert result.tau.shape == (3,)
+        assert result.tau_walkers.shape == (8, 3)
+        assert_allclose(result.ess, 5000 * 8 / result.tau)
+        assert_allclose(result.ess_walkers, 5000 / result.tau_walkers)
+        assert_allclose(np.median(result.tau_walkers, axis=0), result.tau, rtol=0.25)
+
+    def test_single_chain(self):
+        """Test 1D and 2D chains are one walker; ESS never exceeds the draws"""
+        chain = np.random.default_rng(1).standard_normal((1000, 2))
+        result = autocorrelation_diagnostics(chain)
+        assert result.tau_walkers.shape == (1, 2)
+        assert np.all(result.ess <= 1000)
+        assert autocorrelation_diagnostics(chain[:, 0]).ess.shape == (1,)
+
+    def test_unknown_method(self, chains):
+        with pytest.raises(ValueError):
+            autocorrelation_diagnostics(chains[:100], method='bartlett')
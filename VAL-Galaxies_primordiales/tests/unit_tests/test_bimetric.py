@@ -0,0 +1,103 @@
+"""
+Unit tests for the bimetric (coupled Friedmann) background solver
+"""
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from cosmology import JANUSCosmology, JANUSCosmologyBatch, clear_grid_cache, grid_cache_info
+from cosmology.bimetric import BimetricSolution
+from cosmology.analytic import matter_curvature_distance, matter_curvature_age
+from utils.constants import AGE_Z_MAX
+
+
+class TestBimetricSolution:
+    """Test the ODE solution against the first integral of the Friedmann system"""
+
+    z = np.array([0.0, 0.5, 3.0, 10.0, 20.0])
+
+    @pytest.mark.parametrize("params", [(0.3, 0.05, 1.0), (0.21, 0.14, 1.4), (0.55, 0.0, 1.0)])
+    def test_matches_closed_forms(self, params):
+        """Test E(z), distance and age against the matter + curvature closed forms"""
+        sol = BimetricSolution(*params)
+        K = sol.K[0]
+        u = 1.0 + self.z
+
+        assert_allclose(sol.efunc(self.z)[0], np.sqrt(K * u**3 + (1 - K) * u**2), rtol=1e-9)
+        assert_allclose(sol.distance(self.z)[0],
+                        matter_curvature_distance(self.z, K, 1 - K), rtol=1e-9, atol=1e-14)
+        assert_allclose(sol.age(self.z)[0],
+                        matter_curvature_age(self.z, K, 1 - K, AGE_Z_MAX), rtol=1e-8)
+
+    def test_batch_matches_single_solutions(self):
+        """Test one odeint call for many models reproduces per-model solves"""
+        rng = np.random.default_rng(3)
+        params = np.column_stack([rng.uniform(0.2, 0.6, 8), rng.uniform(0.0, 0.15, 8),
+                                  rng.uniform(0.5, 1.5, 8)])
+        batch = BimetricSolution(*params.T)
+        for i, p in enumerate(params):
+            single = BimetricSolution(*p)
+            assert_allclose(batch.distance(self.z)[i], single.distance(self.z)[0], rtol=1e-8)
+            assert_allclose(batch.age(self.z)[i], single.age(self.z)[0], rtol=1e-8)
+
+    def test_scale_factors(self):
+        """Test a(t) inverts t(z) and both sectors are normalised today"""
+        sol = BimetricSolution(0.3, 0.05)
+        a, abar = sol.scale_factors(sol.age(self.z)[0])
+        assert_allclose(1.0 / a[0] - 1.0, self.z, atol=1e-7)
+        assert a[0, 0] == pytest.approx(1.0) and abar[0, 0] == pytest.approx(1.0)
+        assert_allclose(sol.negative_efunc(0.0), 1.0)
+
+    def test_bounce_rejected(self):
+        """Test negative-mass dominated models without big bang are rejected"""
+        with pytest.raises(ValueError):
+            BimetricSolution(0.1, 0.5, chi=3.0, kappa=-1)
+
+    def test_redshift_range(self):
+        """Test redshifts outside the solved range are rejected"""
+        sol = BimetricSolution(0.3, 0.05, z_max=50.0)
+        with pytest.raises(ValueError):
+            sol.efunc(60.0)
+
+
+class TestODEMethod:
+    """Test method='ode' of JANUSCosmology and JANUSCosmologyBatch"""
+
+    def test_hubble_constant_today(self):
+        """Test H(0) = H0 exactly, unlike the algebraic approximation"""
+        cosmo = JANUSCosmology(H0=72.0, Omega_plus=0.3, Omega_minus=0.1, method='ode')
+        assert cosmo.hubble_parameter(0.0)[0] == pytest.approx(72.0, rel=1e-12)
+        assert cosmo.Omega_k == pytest.approx(1.0 - cosmo.Omega_m_eff)
+
+    def test_redshift_at_age_inverse(self):
+        """Test redshift_at_age inverts age_of_universe"""
+        cosmo = JANUSCosmology(method='ode')
+        z = np.array([0.0, 1.0, 8.0])
+        assert_allclose(cosmo.redshift_at_age(cosmo.age_of_universe(z)), z, atol=1e-6)
+
+    def test_solution_cached(self):
+        """Test instances with the same parameters share one solve"""
+        clear_grid_cache()
+        for _ in range(3):
+            JANUSCosmology(Omega_plus=0.32, method='ode').age_of_universe(10.0)
+        info = grid_cache_info()
+        assert info.misses == 1 and info.hits == 2
+
+    def test_batch_matches_single_models(self):
+        """Test the batch solve agrees with single models"""
+        batch = JANUSCosmologyBatch([[70.0, 0.3, 0.05, 1.0], [65.0, 0.45, 0.12, 0.8]],
+                                    method='ode')
+        z = np.array([0.5, 8.0, 12.0])
+        for i in range(len(batch)):
+            single = batch[i]
+            assert_allclose(batch.comoving_distance(z)[i], single.comoving_distance(z), rtol=1e-8)
+            assert_allclose(batch.age_of_universe(z)[i], single.age_of_universe(z), rtol=1e-8)
+            assert_allclose(batch.shell_volume(8.0, 10.0, 100.0)[i],
+                            single.shell_volume(8.0, 10.0, 100.0), rtol=1e-8)
@@ -0,0 +1,133 @@
+"""
+Unit tests for the asynchronous HDF5 checkpoint backend
+"""
+
+import os
+import subprocess
+
+import pytest
+import numpy as np
+import emcee
+from numpy.testing import assert_allclose, assert_array_equal
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from statistics.checkpoint import AsyncHDFBackend
+from statistics.streaming import iter_chunks
+
+NWALKERS, NDIM = 12, 3
+
+
+def log_prob(theta):
+    return -0.5 * np.sum(theta**2)
+
+
+def log_prob_blobs(theta):
+    return -0.5 * np.sum(theta**2), np.sum(theta)
+
+
+def run(backend, nsteps, fn=log_prob, seed=0):
+    """Seeded run, fresh or resumed"""
+    np.random.seed(seed)
+    p0 = np.random.randn(NWALKERS, NDIM)
+    sampler = emcee.EnsembleSampler(NWALKERS, NDIM, fn, backend=backend)
+    resume = backend.initialized and backend.iteration > 0
+    sampler.run_mcmc(None if resume else p0, nsteps)
+    return sampler
+
+
+class TestAsyncHDFBackend:
+    """Test the buffered backend against emcee's in-memory backend"""
+
+    def test_matches_memory_backend(self, tmp_path):
+        """Test chains read before the last flush combine file and buffers"""
+        reference = run(emcee.backends.Backend(), 250)
+        backend = AsyncHDFBackend(tmp_path / 'chain.h5', flush_interval=64)
+        backend.reset(NWALKERS, NDIM)
+        sampler = run(backend, 250)
+
+        assert backend.iteration == 250
+        for discard, thin in [(0, 1), (10, 7), (200, 3), (249, 1), (30, 64)]:
+            assert_array_equal(sampler.get_chain(discard=discard, thin=thin),
+                               reference.get_chain(discard=discard, thin=thin))
+        assert_array_equal(sampler.get_log_prob(flat=True), reference.get_log_prob(flat=True))
+        assert_allclose(sampler.acceptance_fraction, reference.acceptance_fraction)
+        assert_array_equal(np.concatenate(list(iter_chunks(backend, 20, chunk_size=100))),
+                           reference.get_chain()[20:])
+
+        backend.close()
+        stored = emcee.backends.HDFBackend(str(tmp_path / 'chain.h5'), read_only=True)
+        assert stored.iteration == 250
+        assert_array_equal(stored.get_chain(), reference.get_chain())
+        assert_allclose(stored.accepted, reference.backend.accepted)
+
+    def test_flush_windows(self, tmp_path):
+        """Test the file lags by at most flush_interval steps"""
+        backend = AsyncHDFBackend(tmp_path / 'chain.h5', flush_interval=50)
+        backend.reset(NWALKERS, NDIM)
+        run(backend, 180)
+        on_disk = emcee.backends.HDFBackend(str(tmp_path / 'chain.h5'), read_only=True).iteration
+        assert on_disk in (150, 175)
+        backend.flush()
+        assert emcee.backends.HDFBackend(str(tmp_path / 'chain.h5')).iteration == 180
+        backend.close()
+
+    @pytest.mark.parametrize('flush_interval', [1, 7, 20])
+    def test_crash_loses_at_most_flush_interval(self, tmp_path, flush_interval):
+        """Test a process killed mid-run, behind a slow writer, keeps its checkpoints"""
+        code = (
+            "import os, time\n"
+            "import numpy as np, emcee\n"
+            "from statistics.checkpoint import AsyncHDFBackend\n"
+            "write = AsyncHDFBackend._write\n"
+            "AsyncHDFBackend._write = lambda self, batch: (time.sleep(0.02), write(self, batch))\n"
+            f"backend = AsyncHDFBackend('chain.h5', flush_interval={flush_interval})\n"
+            f"backend.reset({NWALKERS}, {NDIM})\n"
+            f"sampler = emcee.EnsembleSampler({NWALKERS}, {NDIM}, "
+            "lambda t: -0.5 * np.sum(t**2), backend=backend)\n"
+            f"for state in sampler.sample(np.random.randn({NWALKERS}, {NDIM}), iterations=500):\n"
+            "    if backend.iteration == 137:\n"
+            "        os._exit(0)\n"
+        )
+        env = dict(os.environ, PYTHONPATH=str(src_path))
+        subprocess.run([sys.executable, '-c', code], env=env, check=True, cwd=tmp_path)
+
+        stored = emcee.backends.HDFBackend(str(tmp_path / 'chain.h5'), read_only=True)
+        assert 137 - flush_interval <= stored.iteration <= 137
+        assert stored.get_chain().shape == (stored.iteration, NWALKERS, NDIM)
+
+    def test_resume(self, tmp_path):
+        """Test a resumed run continues the stored chain"""
+        backend = AsyncHDFBackend(tmp_path / 'chain.h5', flush_interval=40)
+        backend.reset(NWALKERS, NDIM)
+        first = run(backend, 100).get_chain()
+        backend.close()
+
+        resumed = AsyncHDFBackend(tmp_path / 'chain.h5', flush_interval=40)
+        assert resumed.iteration == 100
+        with resumed:
+            run(resumed, 60)
+        stored = emcee.backends.HDFBackend(str(tmp_path / 'chain.h5'))
+        assert stored.iteration == 160
+        assert_array_equal(stored.get_chain()[:100], first)
+
+    def test_blobs(self, tmp_path):
+        reference = run(emcee.backends.Backend(), 90, log_prob_blobs)
+        with AsyncHDFBackend(tmp_path / 'chain.h5', flush_interval=32) as backend:
+            backend.reset(NWALKERS, NDIM)
+            sampler = run(backend, 90, log_prob_blobs)
+            assert_allclose(sampler.get_blobs(discard=5), reference.get_blobs(discard=5))
+        stored = emcee.backends.HDFBackend(str(tmp_path / 'chain.h5'))
+        assert_allclose(stored.get_blobs(), reference.get_blobs())
+
+    def test_write_error(self, tmp_path):
+        """Test a failed write is raised in the sampling thread"""
+        backend = AsyncHDFBackend(tmp_path / 'chain.h5', flush_interval=10)
+        backend.reset(NWALKERS, NDIM)
+        backend.name = 'missing'
+        with pytest.raises(RuntimeError, match="Checkpoint write"):
+            run(backend, 30)
@@ -0,0 +1,135 @@
+"""
+Unit tests for the adaptive MCMC stopping controller
+"""
+
+import numpy as np
+import emcee
+from numpy.testing import assert_allclose
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from statistics.convergence import (
+    ConvergenceCriteria, ConvergenceController, run_until_converged, integrated_time
+)
+
+
+def ar1_chains(n, nwalkers, phi, seed=0):
+    """AR(1) chains (n, nwalkers, ndim), τ = (1 + φ) / (1 - φ)"""
+    rng = np.random.default_rng(seed)
+    phi = np.asarray(phi)
+    x = np.zeros((n, nwalkers, len(phi)))
+    for t in range(1, n):
+        x[t] = phi * x[t - 1] + rng.standard_normal((nwalkers, len(phi)))
+    return x
+
+
+def split_rhat(chain):
+    """Split R-hat of a whole (nsteps, nwalkers, ndim) chain"""
+    half = len(chain) // 2
+    split = np.concatenate([chain[:half], chain[half:2 * half]], axis=1)
+    n = len(split)
+    W = split.var(axis=0, ddof=1).mean(axis=0)
+    B = n * split.mean(axis=0).var(axis=0, ddof=1)
+    return np.sqrt(((n - 1) / n * W + B / n) / W)
+
+
+def log_prob(walkers):
+    return -0.5 * np.sum(walkers**2, axis=-1)
+
+
+class TestConvergenceController:
+    """Test the incremental estimates against whole-chain computations"""
+
+    def test_integrated_time_matches_emcee(self):
+        chains = ar1_chains(3000, 8, [0.5, 0.9])
+        assert_allclose(integrated_time(chains),
+                        emcee.autocorr.integrated_time(chains, quiet=True), rtol=1e-10)
+
+    def test_rhat_matches_full_chain(self):
+        """Test running-sum split R-hat equals the post-burn-in computation"""
+        chains = ar1_chains(2000, 8, [0.5, 0.9], seed=1) + np.array([100.0, -5.0])
+        controller = ConvergenceController(block_size=100)
+        for start in range(0, len(chains), 250):
+            status = controller.update(chains[start:start + 250])
+        assert status.iteration == 2000
+        assert_allclose(status.rhat, split_rhat(chains[1000:]), rtol=1e-8)
+        assert_allclose(status.ess, 1000 * 8 / status.tau)
+
+    def test_criteria(self):
+        chains = ar1_chains(3000, 16, [0.5, 0.9], seed=2)
+        controller = ConvergenceController(ConvergenceCriteria(ess_min=100))
+        status = controller.update(chains[:100])
+        assert not status.checks['autocorr'] and not status.converged
+        for start in range(100, len(chains), 100):
+            status = controller.update(chains[start:start + 100])
+            if status.converged:
+                break
+        assert status.converged
+
+        strict = ConvergenceController(ConvergenceCriteria(ess_min=1e6))
+        status = strict.update(chains)
+        assert not status.checks['autocorr']    # Stability of τ needs a previous check
+
+        strict = ConvergenceController(ConvergenceCriteria(ess_min=1e6))
+        statuses = [strict.update(chains[start:start + 100])
+                    for start in range(0, len(chains), 100)]
+        assert any(s.checks['autocorr'] and s.checks['rhat'] for s in statuses)
+        assert not any(s.checks['ess'] or s.converged for s in statuses)
+
+    def test_stops_after_50_tau(self):
+        """Test chains of known τ = 50 stop after 50 τ, up to the noise of τ"""
+        tau = 50.0
+        stops = []
+        for seed in range(8):
+            chains = ar1_chains(6000, 32, [(tau - 1) / (tau + 1)], seed=seed)
+            controller = ConvergenceController()
+            for start in range(0, len(chains), 100):
+                status = controller.update(chains[start:start + 100])
+                if status.converged:
+                    break
+            assert status.converged
+            stops.append(status.iteration / (50 * tau))
+        # Walker-centred τ on the post-burn-in half stopped at 0.44-0.72 × 50 τ
+        assert min(stops) >= 0.8 and np.mean(stops) >= 0.9
+
+    def test_drifting_chain_not_converged(self):
+        """Test a chain still drifting after burn-in fails R-hat"""
+        chains = ar1_chains(2000, 8, [0.5], seed=3)
+        chains[1500:] += 5.0
+        status = ConvergenceController().update(chains)
+        assert not status.checks['rhat']
+
+
+class TestRunUntilConverged:
+    """Test the sampler driver stops early and extends otherwise"""
+
+    def test_stops_early(self):
+        np.random.seed(0)
+        sampler = emcee.EnsembleSampler(16, 2, log_prob, vectorize=True)
+        p0 = np.random.randn(16, 2)
+        status = run_until_converged(sampler, p0, max_steps=20000)
+        assert status.converged
+        assert sampler.iteration == status.iteration < 20000
+        assert sampler.iteration > 50 * np.max(status.tau)
+
+    def test_max_steps(self):
+        np.random.seed(1)
+        sampler = emcee.EnsembleSampler(16, 2, log_prob, vectorize=True)
+        status = run_until_converged(sampler, np.random.randn(16, 2), max_steps=250,
+                                     controller=ConvergenceController(
+                                         ConvergenceCriteria(ess_min=1e6)))
+        assert not status.converged
+        assert sampler.iteration == 250
+
+    def test_resumed_iterations_counted(self):
+        np.random.seed(2)
+        sampler = emcee.EnsembleSampler(16, 2, log_prob, vectorize=True)
+        sampler.run_mcmc(np.random.randn(16, 2), 300)
+        status = run_until_converged(sampler, None, max_steps=400,
+                                     controller=ConvergenceController(
+                                         ConvergenceCriteria(ess_min=1e6)))
+        assert status.iteration == sampler.iteration == 400
@@ -0,0 +1,110 @@
+"""
+Unit tests for the unified background cosmology and its variant registry
+"""
+
+import pickle
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.integrate import quad
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from cosmology import (
+    JANUSCosmology, LCDMCosmology, BackgroundCosmology, Cosmology,
+    register_variant, VARIANTS
+)
+
+
+class TestBackgroundCosmology:
+    """Test registered variants against the dedicated models and quad"""
+
+    z = np.array([0.0, 0.5, 3.0, 10.0, 15.0])
+
+    @pytest.mark.parametrize("params", [
+        dict(Omega_plus=0.35, Omega_minus=0.08, chi=1.2, kappa=-1),
+        dict(Omega_plus=0.3, Omega_minus=0.05),     # Open
+        dict(Omega_plus=0.9, Omega_minus=0.3),      # Closed
+    ])
+    @pytest.mark.parametrize("method", ['numerical', 'analytic'])
+    def test_janus_matches_janus_cosmology(self, params, method):
+        """Test the 'janus' variant and JANUSCosmology agree on every shared method"""
+        cosmo = BackgroundCosmology('janus', H0=72.0, **params)
+        reference = JANUSCosmology(H0=72.0, method=method, **params)
+
+        assert cosmo.Omega_k == pytest.approx(reference.Omega_k)
+        for name in ['efunc', 'hubble_parameter', 'comoving_distance',
+                     'comoving_transverse_distance', 'angular_diameter_distance',
+                     'luminosity_distance', 'comoving_volume', 'differential_comoving_volume',
+                     'age_of_universe', 'lookback_time']:
+            assert_allclose(getattr(cosmo, name)(self.z), getattr(reference, name)(self.z),
+                            rtol=1e-6, err_msg=name)
+        assert_allclose(cosmo.shell_volume(8.0, 10.0, 100.0),
+                        reference.shell_volume(8.0, 10.0, 100.0), rtol=1e-6)
+
+    def test_lcdm_matches_lcdm_cosmology(self):
+        """Test the 'lcdm' variant reproduces LCDMCosmology without radiation"""
+        cosmo = BackgroundCosmology('lcdm', H0=67.4, Omega_m=0.3, Omega_Lambda=0.6)
+        reference = LCDMCosmology(H0=67.4, Omega_m=0.3, Omega_Lambda=0.6, Tcmb0=0.0)
+
+        assert_allclose(cosmo.luminosity_distance(self.z),
+                        reference.luminosity_distance(self.z), rtol=1e-8)
+        assert_allclose(cosmo.lookback_time(self.z), reference.lookback_time(self.z), rtol=1e-8)
+
+    def test_janus_u6_matches_quad(self):
+        """Test the (1+z)^6 variant against direct integration"""
+        cosmo = BackgroundCosmology('janus_u6', H0=75.0, Omega_plus=0.4, Omega_minus=0.05)
+        E = lambda z: np.sqrt(0.4 * (1 + z)**3 + 0.05 * (1 + z)**6 + 0.55)
+
+        for z in [0.5, 8.0, 12.0]:
+            d_c = cosmo.hubble_distance * quad(lambda zp: 1.0 / E(zp), 0, z)[0]
+            t = cosmo.hubble_time * quad(lambda zp: 1.0 / ((1 + zp) * E(zp)), z, np.inf)[0]
+            assert cosmo.comoving_distance(z) == pytest.approx(d_c, rel=1e-8)
+            assert cosmo.age_of_universe(z) == pytest.approx(t, rel=1e-7)
+
+    def test_scalar_output(self):
+        """Test scalar redshifts return floats"""
+        cosmo = BackgroundCosmology('janus_u6')
+        assert isinstance(cosmo.comoving_distance(8.0), float)
+        assert isinstance(cosmo.age_of_universe(8.0), float)
+        assert isinstance(cosmo.shell_volume(8.0, 9.0, 50.0), float)
+
+    def test_register_variant(self):
+        """Test a user variant is served by the shared implementation"""
+        @register_variant('test_wcdm', {'Omega_m': 0.3, 'w': -1.0})
+        def wcdm(u, Omega_m, w):
+            return Omega_m * u**3 + (1.0 - Omega_m) * u**(3.0 * (1.0 + w))
+
+        try:
+            cosmo = BackgroundCosmology('test_wcdm', H0=67.4, w=-1.0)
+            reference = BackgroundCosmology('lcdm', H0=67.4, Omega_m=0.3, Omega_Lambda=0.7)
+            assert_allclose(cosmo.comoving_distance(self.z), reference.comoving_distance(self.z))
+
+            with pytest.raises(ValueError):
+                register_variant('test_wcdm', {})
+        finally:
+            del VARIANTS['test_wcdm']
+
+    def test_invalid_arguments(self):
+        """Test unknown variants and parameters are rejected"""
+        with pytest.raises(ValueError):
+            BackgroundCosmology('not_a_variant')
+        with pytest.raises(TypeError):
+            BackgroundCosmology('lcdm', Omega_plus=0.3)
+
+    def test_protocol(self):
+        """Test all model classes satisfy the Cosmology protocol"""
+        assert isinstance(BackgroundCosmology('janus'), Cosmology)
+        assert isinstance(JANUSCosmology(), Cosmology)
+        assert isinstance(LCDMCosmology(), Cosmology)
+
+    def test_models_pickle(self):
+        """Test models reach process pool workers"""
+        cosmo = pickle.loads(pickle.dumps(JANUSCosmology(Omega_plus=0.4, method='ode')))
+        assert cosmo.Omega_plus == 0.4 and cosmo.method == 'ode'
+        assert pickle.loads(pickle.dumps(BackgroundCosmology('lcdm'))).Omega_k == 0.0
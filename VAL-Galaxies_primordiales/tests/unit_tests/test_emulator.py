@@ -0,0 +1,96 @@
+"""
+Unit tests for the JANUS background emulator
+"""
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from cosmology import JANUSCosmology, JANUSEmulator
+
+
+@pytest.fixture(scope='module')
+def emulator():
+    """Chebyshev emulator over the default prior box"""
+    return JANUSEmulator.build()
+
+
+class TestJANUSEmulator:
+    """Test tabulated JANUS integrals"""
+
+    z = np.array([0.0, 0.5, 8.0, 12.0, 20.0])
+
+    @pytest.mark.parametrize("params", [
+        (72.0, 0.33, 0.07, 1.2),
+        (65.0, 0.21, 0.0, 0.55),
+        (80.0, 0.59, 0.149, 1.49),
+    ])
+    def test_matches_direct_evaluation(self, emulator, params):
+        """Test emulated distances and ages within the stored error bound"""
+        cosmo = JANUSCosmology(*params)
+        rtol = 2 * max(emulator.error_bound.values())
+
+        assert_allclose(emulator.comoving_distance(self.z, *params),
+                        cosmo.comoving_distance(self.z), rtol=rtol)
+        assert_allclose(emulator.age_of_universe(self.z, *params),
+                        cosmo.age_of_universe(self.z), rtol=rtol)
+        assert_allclose(emulator.lookback_time(self.z, *params),
+                        cosmo.lookback_time(self.z), rtol=rtol, atol=1e-12)
+
+    def test_error_bound(self, emulator):
+        """Test that the Chebyshev tables reach the target accuracy"""
+        assert emulator.error_bound['distance'] < 1e-6
+        assert emulator.error_bound['age'] < 1e-6
+        measured = emulator.validate(n_samples=200, seed=1)
+        assert measured['distance'] <= emulator.error_bound['distance']
+        assert measured['age'] <= emulator.error_bound['age']
+
+    def test_linear_scheme(self):
+        """Test the multilinear scheme against its own error bound"""
+        emulator = JANUSEmulator.build(n_nodes=8, scheme='linear')
+        measured = emulator.validate(n_samples=100, seed=2)
+        assert measured['distance'] <= emulator.error_bound['distance']
+
+    def test_array_parameters(self, emulator):
+        """Test several parameter sets evaluated at once"""
+        H0 = np.array([70.0, 75.0])
+        Omega_plus = np.array([0.30, 0.40])
+        Omega_minus = np.array([0.05, 0.10])
+        d_c = emulator.comoving_distance(self.z, H0, Omega_plus, Omega_minus, 1.0)
+        assert d_c.shape == (2, len(self.z))
+        for i in range(2):
+            assert_allclose(d_c[i], emulator.comoving_distance(
+                self.z, H0[i], Omega_plus[i], Omega_minus[i], 1.0))
+
+    def test_scalar_output(self, emulator):
+        """Test float output for scalar z and parameters"""
+        assert isinstance(emulator.comoving_distance(10.0, 70.0, 0.3, 0.05), float)
+
+    def test_outside_box(self, emulator):
+        """Test that parameters or redshifts outside the tables are rejected"""
+        with pytest.raises(ValueError):
+            emulator.comoving_distance(1.0, 70.0, 0.8, 0.05)
+        with pytest.raises(ValueError):
+            emulator.comoving_distance(emulator.z_max + 1.0, 70.0, 0.3, 0.05)
+        with pytest.raises(ValueError):
+            emulator.age_of_universe(-1.0, 70.0, 0.3, 0.05)
+
+    @pytest.mark.parametrize("suffix", ['.npz', '.h5'])
+    def test_save_load(self, emulator, tmp_path, suffix):
+        """Test that saved tables reproduce the emulator"""
+        if suffix == '.h5':
+            pytest.importorskip('h5py')
+        path = tmp_path / f"janus_emulator{suffix}"
+        emulator.save(path)
+        loaded = JANUSEmulator.load(path)
+
+        assert loaded.scheme == emulator.scheme
+        assert loaded.error_bound == emulator.error_bound
+        assert_allclose(loaded.age_of_universe(self.z, 70.0, 0.3, 0.05),
+                        emulator.age_of_universe(self.z, 70.0, 0.3, 0.05), rtol=1e-15)
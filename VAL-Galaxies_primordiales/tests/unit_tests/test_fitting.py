@@ -96,3 +96,43 @@ class TestFitting:
         assert np.all(ess > 0)
         # Pour des échantillons indépendants, ESS ≈ N (peut légèrement dépasser)
         assert np.all(ess <= 1.5 * n_steps), f"ESS {ess} too large"
+
+
+class TestBatchPosterior:
+    """Test the walker-matrix posteriors used with emcee's vectorize=True"""
+
+    data = np.array([1.0, 2.0, 3.0])
+    errors = np.array([0.1, 0.2, 0.1])
+    bounds = [(0.0, 2.0), (-1.0, 1.0)]
+
+    @staticmethod
+    def model(params):
+        """Line through x = 1, 2, 3, for one walker or a walker matrix"""
+        params = np.asarray(params)
+        return params[..., :1] * np.arange(1, 4) + params[..., 1:2]
+
+    def test_matches_scalar_posterior(self):
+        """Test one call over all walkers matches per-walker log_posterior"""
+        rng = np.random.default_rng(5)
+        walkers = np.column_stack([rng.uniform(-0.5, 2.5, 20), rng.uniform(-1.5, 1.5, 20)])
+
+        batch = fitting.log_posterior_batch(walkers, self.model, self.data, self.errors,
+                                            self.bounds)
+        scalar = [fitting.log_posterior(w, self.model, self.data, self.errors, self.bounds)
+                  for w in walkers]
+
+        assert batch.shape == (20,)
+        assert_allclose(batch, scalar, rtol=1e-14)
+        assert np.any(np.isinf(batch)) and np.any(np.isfinite(batch))
+
+    def test_run_mcmc_vectorized(self):
+        """Test run_mcmc samples with a vectorized posterior"""
+        np.random.seed(0)
+        log_prob = lambda walkers: fitting.log_posterior_batch(
+            walkers, self.model, self.data, self.errors, self.bounds)
+
+        sampler, samples = fitting.run_mcmc(log_prob, np.array([1.0, 0.0]), nwalkers=8,
+                                            nsteps=50, burn_in=10, progress=False,
+                                            vectorize=True)
+        assert samples.shape == (8 * 40, 2)
+        assert np.all(np.isfinite(sampler.get_log_prob()))
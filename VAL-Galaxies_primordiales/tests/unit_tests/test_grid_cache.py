@@ -0,0 +1,94 @@
+"""
+Unit tests for the process-wide distance/age grid cache
+"""
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from cosmology import (
+    JANUSCosmology, LCDMCosmology, BackgroundCosmology,
+    grid_cache_info, clear_grid_cache
+)
+from cosmology.cache import GridCache
+from cosmology.integration import line_of_sight_integral
+from utils.constants import C_LIGHT, DISTANCE_TABLE_Z_MAX
+
+
+class TestGridCache:
+    """Test LRU behaviour and counters of GridCache"""
+
+    def test_hits_and_misses(self):
+        """Test a table is built once per key"""
+        cache = GridCache(maxsize=4)
+        builds = []
+        build = lambda: builds.append(1) or len(builds)
+
+        assert cache.get('janus', (0.3, 0.05), 'age', build) == 1
+        assert cache.get('janus', (0.3, 0.05), 'age', build) == 1
+        assert cache.get('janus', (0.3, 0.05), 'distance', build) == 2
+        assert cache.info() == (1, 2, 4, 2)
+
+    def test_rounding(self):
+        """Test parameters differing by floating-point noise share a key"""
+        cache = GridCache()
+        assert cache.key('lcdm', (0.1 + 0.2,), 'age') == cache.key('lcdm', (0.3,), 'age')
+        assert cache.key('lcdm', (0.3,), 'age') != cache.key('lcdm', (0.3 + 1e-9,), 'age')
+
+    def test_lru_eviction(self):
+        """Test the least recently used table is evicted first"""
+        cache = GridCache(maxsize=2)
+        for p in [1.0, 2.0]:
+            cache.get('m', (p,), 'age', lambda: p)
+        cache.get('m', (1.0,), 'age', lambda: None)  # refresh 1.0
+        cache.get('m', (3.0,), 'age', lambda: 3.0)
+
+        assert len(cache) == 2
+        assert cache.key('m', (1.0,), 'age') in cache
+        assert cache.key('m', (2.0,), 'age') not in cache
+
+    def test_clear(self):
+        """Test clear drops tables and resets counters"""
+        cache = GridCache()
+        cache.get('m', (1.0,), 'age', lambda: 1.0)
+        cache.clear()
+        assert cache.info() == (0, 0, cache.maxsize, 0)
+
+
+class TestSharedTables:
+    """Test cosmology instances share tables through the process-wide cache"""
+
+    def test_instances_share_tables(self):
+        """Test one build per parameter set and quantity across instances"""
+        clear_grid_cache()
+        z = np.array([0.0, 6.0, 8.0, 10.0, 12.0, 14.0])
+        for _ in range(5):
+            cosmo = JANUSCosmology(H0=72.0, Omega_plus=0.32, Omega_minus=0.06)
+            cosmo.comoving_distance(z)
+            cosmo.age_of_universe(z)
+            cosmo.lookback_time(z)
+
+        info = grid_cache_info()
+        assert info.misses == 2 and info.hits >= 13
+
+    def test_variant_shares_janus_tables(self):
+        """Test the 'janus' variant reuses JANUSCosmology tables"""
+        clear_grid_cache()
+        JANUSCosmology(Omega_plus=0.3, Omega_minus=0.05).age_of_universe(8.0)
+        BackgroundCosmology('janus', Omega_plus=0.3, Omega_minus=0.05).age_of_universe(8.0)
+        assert grid_cache_info().misses == 1
+
+    @pytest.mark.parametrize("cosmo", [JANUSCosmology(), LCDMCosmology(),
+                                       BackgroundCosmology('janus_u6')])
+    def test_table_matches_direct_integration(self, cosmo):
+        """Test tabulated distances, and the fallback beyond the table range"""
+        z = np.array([0.0, 0.3, 6.0, 14.0, 45.0, DISTANCE_TABLE_Z_MAX + 10.0])
+        expected = C_LIGHT / cosmo.H0 * line_of_sight_integral(cosmo.efunc, z)
+        assert_allclose(cosmo.comoving_distance(z), expected, rtol=1e-8)
+        assert_allclose(cosmo.comoving_distance(z[-1]), expected[-1], rtol=1e-12)
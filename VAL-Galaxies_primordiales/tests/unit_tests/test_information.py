@@ -0,0 +1,134 @@
+"""
+Unit tests for DIC, WAIC and PSIS-LOO from pointwise log-likelihoods
+"""
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.special import logsumexp
+from scipy.stats import genpareto, norm
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from statistics import fitting
+from statistics.information import (
+    pointwise_log_likelihood, dic, waic, psis_loo, gpd_fit
+)
+from statistics.likelihood import UVLFLikelihood
+from statistics.posterior import Posterior
+
+
+def normal_pointwise(mu, y):
+    """log N(y_i | μ, 1) of each sample μ (n_samples, 1) and point"""
+    return norm.logpdf(y, loc=np.asarray(mu)[:, :1])
+
+
+@pytest.fixture
+def normal_model():
+    """y_i ~ N(μ, 1), flat prior: μ | y ~ N(ȳ, 1/n)"""
+    rng = np.random.default_rng(3)
+    y = rng.normal(0.5, 1.0, 30)
+    mu = rng.normal(y.mean(), 1 / np.sqrt(len(y)), (4000, 1))
+    return y, mu
+
+
+class TestPointwiseLogLikelihood:
+    """Test the chunked evaluation of the log-likelihood matrix"""
+
+    def test_chunks(self, normal_model):
+        y, mu = normal_model
+        expected = normal_pointwise(mu, y)
+        assert_allclose(pointwise_log_likelihood(lambda s: normal_pointwise(s, y), mu,
+                                                 chunk_size=333), expected)
+        # Row by row, and chunked by memory
+        row = lambda s: normal_pointwise(s[None], y)[0]
+        assert_allclose(pointwise_log_likelihood(row, mu[:100], vectorize=False),
+                        expected[:100])
+        assert_allclose(pointwise_log_likelihood(lambda s: normal_pointwise(s, y), mu,
+                                                 max_memory=8 * 30 * 7), expected)
+
+    def test_out_and_pool(self, normal_model):
+        """Test chunks evaluated by pool workers, written to a given array"""
+        y, mu = normal_model
+        posterior = Posterior(normal_pointwise, y, vectorize=True)
+        out = np.zeros((len(mu), len(y)))
+        with posterior.pool(2) as pool:
+            result = pointwise_log_likelihood(posterior, mu, chunk_size=500, pool=pool, out=out)
+        posterior.close()
+        assert result is out
+        assert_allclose(out, normal_pointwise(mu, y))
+
+    def test_uvlf_pointwise(self):
+        """Test the per-bin UV LF log-likelihood sums to the total"""
+        like = UVLFLikelihood([-22.0, -21.0, -20.0, -19.0], [1e-6, 1e-5, 5e-5, 1e-4], 0.3)
+        params = np.array([[-3.5, -21.0, -2.0], [-4.0, -20.5, -1.8]])
+        log_lik = pointwise_log_likelihood(lambda s: like.pointwise(*s.T), params)
+        assert log_lik.shape == (2, 4)
+        assert_allclose(log_lik.sum(axis=1), like(*params.T))
+
+
+class TestCriteria:
+    """Test the criteria against direct and analytic values"""
+
+    def test_dic(self, normal_model):
+        """Test the chunked DIC matches the per-sample formula"""
+        y, mu = normal_model
+        total = lambda theta: np.sum(norm.logpdf(y, loc=theta[0]))
+        deviances = np.array([-2 * total(m) for m in mu])
+        p_d = deviances.mean() + 2 * total(mu.mean(axis=0))
+
+        assert_allclose(fitting.compute_dic(mu, total), (deviances.mean() + p_d, p_d))
+        batch = lambda s: normal_pointwise(s, y).sum(axis=1)
+        assert_allclose(fitting.compute_dic(mu, batch, vectorize=True, chunk_size=999),
+                        (deviances.mean() + p_d, p_d))
+        # Pointwise: same totals, p_D close to the single parameter
+        result = dic(normal_pointwise(mu, y), norm.logpdf(y, loc=mu.mean()))
+        assert_allclose(result.ic, deviances.mean() + p_d)
+        assert result.p_eff == pytest.approx(1.0, abs=0.1)
+
+    def test_waic(self, normal_model):
+        y, mu = normal_model
+        log_lik = normal_pointwise(mu, y)
+        lppd = logsumexp(log_lik, axis=0) - np.log(len(mu))
+        p_waic = log_lik.var(axis=0, ddof=1)
+        result = waic(log_lik, max_memory=8 * len(mu) * 7)
+        assert_allclose(result.pointwise, lppd - p_waic)
+        assert_allclose(result.ic, -2 * np.sum(lppd - p_waic))
+        # Σ_i Var_μ log N(y_i | μ, 1) = Σ_i (y_i - ȳ)² / n
+        assert result.p_eff == pytest.approx(np.var(y), rel=0.1)
+
+    def test_psis_loo_exact(self, normal_model):
+        """Test PSIS-LOO against the exact leave-one-out predictive densities"""
+        y, mu = normal_model
+        n = len(y)
+        loo_mean = (y.sum() - y) / (n - 1)
+        exact = norm.logpdf(y, loc=loo_mean, scale=np.sqrt(1 + 1 / (n - 1)))
+
+        result = psis_loo(normal_pointwise(mu, y), max_memory=1e6)
+        assert_allclose(result.pointwise, exact, atol=0.01)
+        assert np.all(result.pareto_k < 0.5)
+        assert result.p_eff == pytest.approx(np.var(y), rel=0.1)
+
+    def test_psis_loo_outlier(self, normal_model):
+        """Test an influential point gets a large Pareto k and a warning"""
+        y, mu = normal_model
+        y = np.append(y, 20.0)
+        mu = np.random.default_rng(5).normal(y.mean(), 1 / np.sqrt(len(y)), (4000, 1))
+        with pytest.warns(UserWarning, match="Pareto k"):
+            result = psis_loo(normal_pointwise(mu, y))
+        assert np.argmax(result.pareto_k) == len(y) - 1
+
+    def test_gpd_fit(self):
+        """Test the generalized Pareto fit recovers k and σ of each column"""
+        rng = np.random.default_rng(0)
+        tail = np.sort(np.column_stack([genpareto.rvs(0.3, scale=2.0, size=20000,
+                                                      random_state=rng),
+                                        genpareto.rvs(0.8, size=20000, random_state=rng)]),
+                       axis=0)
+        k, sigma = gpd_fit(tail)
+        assert_allclose(k, [0.3, 0.8], atol=0.05)
+        assert_allclose(sigma, [2.0, 1.0], rtol=0.1)
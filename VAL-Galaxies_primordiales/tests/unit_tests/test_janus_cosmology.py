@@ -12,7 +12,7 @@ from pathlib import Path
 src_path = Path(__file__).parent.parent.parent / 'src'
 sys.path.insert(0, str(src_path))
 
-from cosmology import JANUSCosmology
+from cosmology import JANUSCosmology, JANUSCosmologyBatch
 
 
 class TestJANUSCosmology:
@@ -63,18 +63,19 @@ class TestJANUSCosmology:
     def test_angular_diameter_distance(self, janus_cosmo):
         """Test angular diameter distance"""
         z = 1.0
-        d_c = janus_cosmo.comoving_distance(z)
+        d_M = janus_cosmo.comoving_transverse_distance(z)
         d_A = janus_cosmo.angular_diameter_distance(z)
-        # d_A = d_c / (1+z)
-        assert_allclose(d_A, d_c / (1.0 + z), rtol=1e-6)
+        # d_A = d_M / (1+z), d_M > d_c in the open default model
+        assert_allclose(d_A, d_M / (1.0 + z), rtol=1e-6)
+        assert d_M > janus_cosmo.comoving_distance(z)
 
     def test_luminosity_distance(self, janus_cosmo):
         """Test luminosity distance"""
         z = 1.0
-        d_c = janus_cosmo.comoving_distance(z)
+        d_M = janus_cosmo.comoving_transverse_distance(z)
         d_L = janus_cosmo.luminosity_distance(z)
-        # d_L = d_c * (1+z)
-        assert_allclose(d_L, d_c * (1.0 + z), rtol=1e-6)
+        # d_L = d_M * (1+z)
+        assert_allclose(d_L, d_M * (1.0 + z), rtol=1e-6)
 
     def test_distance_duality(self, janus_cosmo):
         """Test distance duality: d_L = d_A * (1+z)^2"""
@@ -83,6 +84,34 @@ class TestJANUSCosmology:
         d_L = janus_cosmo.luminosity_distance(z)
         assert_allclose(d_L, d_A * (1.0 + z)**2, rtol=1e-6)
 
+    def test_distances_accept_arrays(self, janus_cosmo):
+        """Test array-in/array-out distances keep the input shape"""
+        z = np.array([[0.0, 0.5, 1.0], [2.0, 8.0, 12.0]])
+        d_c = janus_cosmo.comoving_distance(z)
+        assert d_c.shape == z.shape
+        d_M = janus_cosmo.comoving_transverse_distance(z)
+        assert d_M.shape == z.shape
+        assert_allclose(janus_cosmo.luminosity_distance(z), d_M * (1.0 + z))
+        assert_allclose(janus_cosmo.angular_diameter_distance(z), d_M / (1.0 + z))
+        assert janus_cosmo.comoving_volume(z).shape == z.shape
+        # Array result matches element-wise scalar calls
+        for zi, di in zip(z.ravel(), d_c.ravel()):
+            assert_allclose(janus_cosmo.comoving_distance(zi), di, rtol=1e-8)
+
+    def test_comoving_distance_matches_quad(self, janus_cosmo):
+        """Test grid + interpolation engine against adaptive quadrature"""
+        from scipy.integrate import quad
+        from utils.constants import C_LIGHT, DISTANCE_INTERP_RTOL
+
+        z = np.array([0.01, 0.5, 3.0, 8.0, 14.0])
+        d_ref = np.array([
+            quad(lambda zp: C_LIGHT / janus_cosmo.hubble_parameter(zp)[0],
+                 0, zi, epsrel=1e-12)[0]
+            for zi in z
+        ])
+        assert_allclose(janus_cosmo.comoving_distance(z), d_ref,
+                        rtol=DISTANCE_INTERP_RTOL)
+
     def test_comoving_volume_positive(self, janus_cosmo):
         """Test that comoving volume is positive"""
         z_values = [0.5, 1.0, 2.0, 5.0]
@@ -90,6 +119,30 @@ class TestJANUSCosmology:
             V_c = janus_cosmo.comoving_volume(z)
             assert V_c > 0, f"Comoving volume at z={z} should be positive"
 
+    @pytest.mark.parametrize("params", [
+        (70.0, 0.30, 0.05),  # open
+        (70.0, 0.70, 0.35),  # closed
+    ])
+    def test_shell_volume_matches_quad(self, params):
+        """Test shell volumes against direct integration of dV/dz/dΩ"""
+        from scipy.integrate import quad
+
+        cosmo = JANUSCosmology(*params)
+        z_lo = np.array([0.0, 8.0, 10.0])
+        z_hi = np.array([1.0, 9.0, 12.0])
+        area_deg2 = 100.0
+        area_sr = area_deg2 * (np.pi / 180.0)**2
+
+        V_ref = np.array([
+            quad(cosmo.differential_comoving_volume, lo, hi, epsrel=1e-12)[0] * area_sr
+            for lo, hi in zip(z_lo, z_hi)
+        ])
+        assert_allclose(cosmo.shell_volume(z_lo, z_hi, area_deg2), V_ref, rtol=1e-8)
+
+        # Full sky from z=0: the enclosed comoving volume
+        assert_allclose(cosmo.shell_volume(0.0, 5.0), cosmo.comoving_volume(5.0), rtol=1e-12)
+        assert isinstance(cosmo.shell_volume(8.0, 9.0, area_deg2), float)
+
     def test_age_positive(self, janus_cosmo):
         """Test that age of universe is positive"""
         z_values = [0.0, 1.0, 5.0, 10.0]
@@ -111,6 +164,77 @@ class TestJANUSCosmology:
         t_lb = janus_cosmo.lookback_time(z)
         assert_allclose(t_lb, t0 - t_z, rtol=1e-6)
 
+    def test_age_matches_quad(self, janus_cosmo):
+        """Test tabulated age against direct quadrature up to z=1000"""
+        from scipy.integrate import quad
+        from utils.constants import MPC_TO_KM, GYR_TO_S
+
+        z = np.array([0.0, 1.0, 8.0, 14.0])
+        t_ref = np.array([
+            quad(lambda zp: 1.0 / ((1.0 + zp) * janus_cosmo.hubble_parameter(zp)[0]),
+                 zi, 1000.0, epsrel=1e-12, limit=200)[0]
+            for zi in z
+        ]) * MPC_TO_KM / GYR_TO_S
+        assert_allclose(janus_cosmo.age_of_universe(z), t_ref, rtol=1e-8)
+
+    def test_age_table_lazy_and_shared(self):
+        """Test construction is free and the age table is shared per parameter set"""
+        from cosmology import grid_cache_info, clear_grid_cache
+        clear_grid_cache()
+
+        cosmo = JANUSCosmology(H0=71.0, Omega_plus=0.31, Omega_minus=0.04)
+        assert grid_cache_info().currsize == 0
+
+        cosmo.age_of_universe(10.0)
+        JANUSCosmology(H0=71.0, Omega_plus=0.31, Omega_minus=0.04).lookback_time(2.0)
+        info = grid_cache_info()
+        assert info.misses == 1 and info.hits >= 1
+
+    def test_redshift_at_age_inverse(self, janus_cosmo):
+        """Test redshift_at_age inverts age_of_universe"""
+        z = np.array([0.0, 0.5, 3.0, 10.0, 20.0])
+        ages = janus_cosmo.age_of_universe(z)
+        assert_allclose(janus_cosmo.redshift_at_age(ages), z, atol=1e-6)
+        with pytest.raises(ValueError):
+            janus_cosmo.redshift_at_age(2.0 * ages[0])
+
+    @pytest.mark.parametrize("method", ['numerical', 'ode'])
+    def test_redshift_at_age_range(self, method):
+        """Test out-of-range ages report the valid range in Gyr"""
+        cosmo = JANUSCosmology(method=method)
+        t0 = cosmo.age_of_universe(0.0)
+        with pytest.raises(ValueError, match=rf"Age must lie in \[.*, {t0:.4f}\] Gyr"):
+            cosmo.redshift_at_age([0.5 * t0, 1.5 * t0])
+        with pytest.raises(ValueError, match="Gyr"):
+            cosmo.redshift_at_age(-1.0)
+
+    @pytest.mark.parametrize("params", [
+        {},
+        {'H0': 80.0, 'Omega_plus': 0.50, 'Omega_minus': 0.15},
+        {'Omega_plus': 0.90, 'Omega_minus': 0.30},  # closed universe
+    ])
+    def test_analytic_matches_numerical(self, params):
+        """Test closed-form distances, age and lookback time against integration"""
+        numerical = JANUSCosmology(**params)
+        analytic = JANUSCosmology(method='analytic', **params)
+        assert analytic._use_analytic
+
+        z = np.array([0.0, 0.5, 2.0, 8.0, 14.0])
+        assert_allclose(analytic.comoving_distance(z), numerical.comoving_distance(z),
+                        rtol=1e-8)
+        assert_allclose(analytic.age_of_universe(z), numerical.age_of_universe(z),
+                        rtol=1e-8)
+        assert_allclose(analytic.lookback_time(z), numerical.lookback_time(z),
+                        rtol=1e-8, atol=1e-12)
+
+    def test_analytic_falls_back_near_flat(self):
+        """Test near-flat parameters use numerical integration"""
+        cosmo = JANUSCosmology(Omega_plus=0.95, Omega_minus=0.05, method='analytic')
+        assert not cosmo._use_analytic
+        assert cosmo.comoving_distance(1.0) > 0
+        with pytest.raises(ValueError):
+            JANUSCosmology(method='spline')
+
     def test_critical_density_positive(self, janus_cosmo):
         """Test that critical density is positive"""
         z_values = [0.0, 1.0, 5.0]
@@ -123,3 +247,53 @@ class TestJANUSCosmology:
         repr_str = repr(janus_cosmo)
         assert 'JANUSCosmology' in repr_str
         assert 'H0' in repr_str
+
+
+class TestJANUSCosmologyBatch:
+    """Test batched multi-cosmology evaluation"""
+
+    params = np.array([
+        [70.0, 0.30, 0.05],
+        [75.0, 0.45, 0.10],
+        [65.0, 0.90, 0.30],  # closed universe
+        [70.0, 0.95, 0.05],  # near-flat: numerical fallback in analytic mode
+    ])
+    z = np.array([0.0, 0.5, 8.0, 12.0])
+
+    @pytest.mark.parametrize("method", ['numerical', 'analytic'])
+    def test_matches_single_models(self, method):
+        """Test (n_models, n_z) outputs against one JANUSCosmology per model"""
+        batch = JANUSCosmologyBatch(self.params, method=method)
+        assert len(batch) == len(self.params)
+
+        for name in ['hubble_parameter', 'comoving_distance', 'comoving_volume',
+                     'age_of_universe', 'lookback_time']:
+            values = getattr(batch, name)(self.z)
+            assert values.shape == (len(self.params), len(self.z))
+            expected = np.array([getattr(JANUSCosmology(*p), name)(self.z)
+                                 for p in self.params])
+            assert_allclose(values, expected, rtol=1e-8, atol=1e-12, err_msg=name)
+
+    def test_shell_volume_matches_single_models(self):
+        """Test (n_models, n_bins) shell volumes and volume elements"""
+        params = np.array([[70.0, 0.30, 0.05], [75.0, 0.70, 0.35]])
+        batch = JANUSCosmologyBatch(params)
+        z_lo, z_hi = np.array([8.0, 10.0]), np.array([10.0, 12.0])
+
+        V = batch.shell_volume(z_lo, z_hi, 100.0)
+        dV = batch.differential_comoving_volume(z_hi)
+        assert V.shape == (2, 2)
+        for i, p in enumerate(params):
+            single = JANUSCosmology(*p)
+            assert_allclose(V[i], single.shell_volume(z_lo, z_hi, 100.0), rtol=1e-8)
+            assert_allclose(dV[i], single.differential_comoving_volume(z_hi), rtol=1e-8)
+
+    def test_default_columns(self):
+        """Test chi and kappa default when omitted"""
+        batch = JANUSCosmologyBatch(self.params)
+        assert_allclose(batch.chi, 1.0)
+        assert_allclose(batch.kappa, -1.0)
+        assert repr(batch[1]).startswith('JANUSCosmology(H0=75.00')
+        with pytest.raises(ValueError):
+            JANUSCosmologyBatch(self.params[:, :2])
+
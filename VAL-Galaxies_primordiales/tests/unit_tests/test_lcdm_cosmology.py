@@ -12,7 +12,7 @@ from pathlib import Path
 src_path = Path(__file__).parent.parent.parent / 'src'
 sys.path.insert(0, str(src_path))
 
-from cosmology import LCDMCosmology
+from cosmology import LCDMCosmology, LCDMCosmologyBatch
 
 
 class TestLCDMCosmology:
@@ -120,3 +120,109 @@ class TestLCDMCosmology:
         repr_str = repr(lcdm_cosmo)
         assert 'LCDMCosmology' in repr_str
         assert 'H0' in repr_str
+
+    @pytest.mark.parametrize("params", [
+        (67.4, 0.315, 0.685),  # flat
+        (70.0, 0.30, 0.80),    # closed
+        (70.0, 0.30, 0.60),    # open
+    ])
+    def test_numpy_backend_matches_astropy(self, params):
+        """Test the native backend against astropy.cosmology"""
+        native = LCDMCosmology(*params)
+        reference = LCDMCosmology(*params, backend='astropy')
+        z = np.array([0.0, 0.5, 2.0, 8.0, 15.0])
+
+        for name in ['comoving_distance', 'angular_diameter_distance', 'luminosity_distance',
+                     'comoving_transverse_distance', 'comoving_volume', 'age_of_universe',
+                     'lookback_time', 'critical_density', 'hubble_parameter']:
+            expected = np.ravel([getattr(reference, name)(zi) for zi in z])
+            assert_allclose(getattr(native, name)(z), expected, rtol=1e-8, atol=1e-10,
+                            err_msg=name)
+        assert_allclose(native.distmod(z[1:]), [reference.distmod(zi) for zi in z[1:]],
+                        rtol=1e-10)
+
+    @pytest.mark.parametrize("params", [
+        (67.4, 0.315, 0.685),  # flat
+        (70.0, 0.30, 0.80),    # closed
+    ])
+    def test_shell_volume(self, params):
+        """Test shell volumes and dV/dz/dΩ against astropy"""
+        native = LCDMCosmology(*params)
+        reference = LCDMCosmology(*params, backend='astropy')
+        z_lo = np.array([0.0, 8.0, 10.0])
+        z_hi = np.array([1.0, 9.0, 12.0])
+
+        assert_allclose(native.differential_comoving_volume(z_hi),
+                        reference.differential_comoving_volume(z_hi), rtol=1e-8)
+        V_ref = (reference.comoving_volume(z_hi) - reference.comoving_volume(z_lo)) * 100.0 / (
+            4.0 * np.pi * (180.0 / np.pi)**2)
+        assert_allclose(native.shell_volume(z_lo, z_hi, 100.0), V_ref, rtol=1e-8)
+
+    @pytest.mark.parametrize("Omega_m", [0.1, 0.315, 0.9])
+    def test_analytic_matches_numerical(self, Omega_m):
+        """Test closed forms (flat, Tcmb0=0) against numerical integration"""
+        analytic = LCDMCosmology(Omega_m=Omega_m, Omega_Lambda=1.0 - Omega_m,
+                                 Tcmb0=0.0, method='analytic')
+        numerical = LCDMCosmology(Omega_m=Omega_m, Omega_Lambda=1.0 - Omega_m, Tcmb0=0.0)
+        assert analytic._use_analytic
+        z = np.array([0.0, 0.1, 1.0, 10.0, 20.0])
+
+        for name in ['comoving_distance', 'comoving_volume', 'age_of_universe',
+                     'lookback_time']:
+            assert_allclose(getattr(analytic, name)(z), getattr(numerical, name)(z),
+                            rtol=1e-8, atol=1e-10, err_msg=name)
+
+    def test_analytic_falls_back_with_radiation(self):
+        """Test that radiation or curvature disables the closed forms"""
+        assert not LCDMCosmology(method='analytic')._use_analytic
+        assert not LCDMCosmology(Omega_Lambda=0.6, Tcmb0=0.0, method='analytic')._use_analytic
+
+    def test_invalid_backend(self):
+        """Test that unknown backends and methods are rejected"""
+        with pytest.raises(ValueError):
+            LCDMCosmology(backend='camb')
+        with pytest.raises(ValueError):
+            LCDMCosmology(method='exact')
+
+
+class TestLCDMCosmologyBatch:
+    """Test batched multi-cosmology evaluation"""
+
+    z = np.array([0.0, 0.5, 8.0, 12.0])
+
+    @pytest.mark.parametrize("params", [
+        np.array([[67.4, 0.315], [72.0, 0.25], [60.0, 0.45]]),  # flat
+        np.array([[67.4, 0.315, 0.60], [70.0, 0.30, 0.80]]),    # curved
+    ])
+    def test_matches_single_models(self, params):
+        """Test (n_models, n_z) outputs against single LCDMCosmology instances"""
+        batch = LCDMCosmologyBatch(params)
+        singles = [LCDMCosmology(*p) if len(p) == 3 else
+                   LCDMCosmology(H0=p[0], Omega_m=p[1], Omega_Lambda=1.0 - p[1])
+                   for p in params]
+
+        for name in ['comoving_distance', 'comoving_volume', 'age_of_universe',
+                     'lookback_time']:
+            values = getattr(batch, name)(self.z)
+            assert values.shape == (len(params), len(self.z))
+            expected = np.array([[getattr(c, name)(zi) for zi in self.z] for c in singles])
+            assert_allclose(values, expected, rtol=1e-7, atol=1e-10, err_msg=name)
+
+    def test_analytic_matches_single_models(self):
+        """Test mixed analytic/numerical batches against single models"""
+        params = np.array([[67.4, 0.315, 0.685], [70.0, 0.30, 0.80]])
+        batch = LCDMCosmologyBatch(params, Tcmb0=0.0, method='analytic')
+        assert batch._analytic_mask().tolist() == [True, False]
+
+        for i in range(len(batch)):
+            single = batch[i]
+            assert_allclose(batch.lookback_time(self.z)[i], single.lookback_time(self.z),
+                            rtol=1e-8, atol=1e-10)
+            assert_allclose(batch.comoving_distance(self.z)[i],
+                            single.comoving_distance(self.z), rtol=1e-8, atol=1e-10)
+
+    def test_hubble_at_z_zero(self):
+        """Test H(z=0) = H0 for every model"""
+        batch = LCDMCosmologyBatch([[67.4, 0.315], [72.0, 0.25]])
+        assert_allclose(batch.hubble_parameter(0.0), batch.H0, rtol=1e-12)
+
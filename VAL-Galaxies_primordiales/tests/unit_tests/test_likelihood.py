@@ -0,0 +1,158 @@
+"""
+Unit tests for the vectorized UV LF likelihood
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from statistics.likelihood import (
+    UVLFLikelihood, ObservedUVLF, schechter_function, log_schechter_function
+)
+
+
+@pytest.fixture
+def uv_lf_data():
+    """Binned UV LF with a few unusable bins"""
+    rng = np.random.default_rng(11)
+    M = np.arange(-23.0, -16.0, 0.5)
+    phi = schechter_function(M, 10**-3.6, -20.8, -2.1) * 10**rng.normal(0, 0.2, len(M))
+    phi_err = 0.3 * phi
+    phi[2] = 0.0
+    phi_err[5] = 0.0
+    return pd.DataFrame({'M_UV': M, 'M_mid': M, 'phi': phi, 'phi_err': phi_err})
+
+
+def reference_constant_scatter(log_phi_star, M_star, alpha, data):
+    """Row loop of phase3_complete_final"""
+    chi2 = 0
+    for _, row in data.iterrows():
+        phi_pred = schechter_function(row['M_UV'], 10**log_phi_star, M_star, alpha)
+        if phi_pred > 0 and row['phi'] > 0:
+            chi2 += ((np.log10(row['phi']) - np.log10(phi_pred)) / 0.3)**2
+    return -0.5 * chi2
+
+
+def reference_propagated_errors(log_phi_star, M_star, alpha, data):
+    """Row loop of phase3_complete_v2"""
+    log_L = 0.0
+    for _, row in data.iterrows():
+        if row['phi_err'] <= 0 or row['phi'] <= 0:
+            continue
+        phi_model = schechter_function(row['M_mid'], 10**log_phi_star, M_star, alpha)
+        if phi_model <= 0:
+            log_L -= 100
+            continue
+        log_err = 0.434 * row['phi_err'] / row['phi']
+        log_L -= 0.5 * ((np.log10(row['phi']) - np.log10(phi_model)) / log_err)**2
+    return log_L
+
+
+PARAMS = [(-3.5, -21.0, -2.0), (-4.2, -19.5, -1.2), (-2.5, -23.5, -2.8)]
+
+
+class TestUVLFLikelihood:
+    """Test the packed likelihood against the row-by-row implementations"""
+
+    def test_log_schechter(self):
+        """Test the log-space Schechter function"""
+        M = np.linspace(-24, -16, 9)
+        assert_allclose(log_schechter_function(M, -3.5, -21.0, -2.0),
+                        np.log10(schechter_function(M, 10**-3.5, -21.0, -2.0)), rtol=1e-12)
+
+    @pytest.mark.parametrize("params", PARAMS)
+    def test_constant_scatter(self, uv_lf_data, params):
+        """Test sigma_dex=0.3 reproduces the phase3_complete_final loop"""
+        like = UVLFLikelihood.from_table(uv_lf_data, sigma_dex=0.3)
+        assert len(like) == len(uv_lf_data) - 1
+        assert like(*params) == pytest.approx(
+            reference_constant_scatter(*params, uv_lf_data), rel=1e-10)
+
+    @pytest.mark.parametrize("params", PARAMS)
+    def test_propagated_errors(self, uv_lf_data, params):
+        """Test phi_err errors and penalty reproduce the phase3_complete_v2 loop"""
+        like = UVLFLikelihood.from_table(uv_lf_data, magnitude='M_mid', underflow_penalty=100)
+        assert len(like) == len(uv_lf_data) - 2
+        assert like(*params) == pytest.approx(
+            reference_propagated_errors(*params, uv_lf_data), rel=1e-10)
+
+    def test_underflow_penalty(self):
+        """Test bins where the model underflows to 0 are skipped or penalised"""
+        data = {'M_UV': np.array([-21.0, -40.0]), 'phi': np.array([1e-4, 1e-6]),
+                'phi_err': np.array([1e-5, 1e-7])}
+        skip = UVLFLikelihood.from_table(data, sigma_dex=0.3)
+        penalise = UVLFLikelihood.from_table(data, sigma_dex=0.3, underflow_penalty=100)
+        assert penalise(-3.5, -21.0, -2.0) == pytest.approx(skip(-3.5, -21.0, -2.0) - 100)
+
+    def test_walker_batch(self, uv_lf_data):
+        """Test one call over many walkers matches per-walker calls"""
+        like = UVLFLikelihood.from_table(uv_lf_data, sigma_dex=0.3)
+        batch = np.array(PARAMS)
+        values = like(*batch.T)
+        assert values.shape == (len(PARAMS),)
+        assert_allclose(values, [like(*p) for p in PARAMS], rtol=1e-14)
+
+
+class TestObservedUVLF:
+    """Test the prepared catalog binning of the Phase 3.2/3.3 fits"""
+
+    z_bins = [(6.5, 8), (8, 10), (10, 12)]
+    M_bins = np.arange(-25, -14, 1.0)
+
+    @pytest.fixture
+    def catalog(self):
+        rng = np.random.default_rng(2)
+        catalog = pd.DataFrame({'z': np.r_[rng.uniform(6.5, 10, 500), [11.0] * 5],
+                                'M_UV': rng.normal(-19.5, 1.5, 505)})
+        catalog.loc[::9, 'M_UV'] = np.nan
+        return catalog
+
+    def reference(self, phi_model_fn, catalog):
+        """Per-call binning and chi2 loop of phase33 log_likelihood_lcdm"""
+        chi2_total, n_points = 0.0, 0
+        for z_min, z_max in self.z_bins:
+            mask = (catalog['z'] >= z_min) & (catalog['z'] < z_max) & catalog['M_UV'].notna()
+            M_UV = catalog.loc[mask, 'M_UV'].values
+            if len(M_UV) < 10:
+                continue
+            counts, edges = np.histogram(M_UV, bins=self.M_bins)
+            M_centers = (edges[:-1] + edges[1:]) / 2
+            phi_obs = counts / len(M_UV)  # unit bin width
+            phi_err = np.sqrt(counts + 1) / len(M_UV)
+            phi_model = phi_model_fn(M_centers, (z_min + z_max) / 2)
+            valid = (phi_obs > 0) & (phi_model > 0)
+            if np.sum(valid) < 3:
+                continue
+            log_err = 0.434 * phi_err[valid] / (phi_obs[valid] + 1e-10)
+            chi2_total += np.sum((np.log10(phi_obs[valid] + 1e-10) -
+                                  np.log10(phi_model[valid] + 1e-10))**2 / (log_err**2 + 0.1**2))
+            n_points += np.sum(valid)
+        return -np.inf if n_points < 5 else -0.5 * chi2_total
+
+    def test_sparse_redshift_bin_dropped(self, catalog):
+        """Test redshift bins with fewer than 10 galaxies are not kept"""
+        data = ObservedUVLF(catalog, self.z_bins, self.M_bins)
+        assert len(data) == 2
+        assert data.phi.shape == (2, len(self.M_bins) - 1)
+
+    def test_matches_per_call_binning(self, catalog):
+        """Test the prepared likelihood reproduces binning inside the likelihood"""
+        data = ObservedUVLF(catalog, self.z_bins, self.M_bins)
+        walkers = np.array([[-3.0, -20.5, -1.8], [-1.5, -21.5, -2.2], [-4.5, -18.5, -1.2]])
+
+        def model(M, z, log_phi_star, M_star, alpha):
+            return schechter_function(M, 10**(log_phi_star - 0.5 * (z - 8)),
+                                      M_star - 0.5 * (z - 8), alpha)
+
+        log_phi_star, M_star, alpha = (walkers[:, i, None, None] for i in range(3))
+        batch = data.log_likelihood(model(data.M_centers, data.z_mid, log_phi_star, M_star, alpha))
+        for value, w in zip(batch, walkers):
+            expected = self.reference(lambda M, z: model(M, z, *w), catalog)
+            assert value == pytest.approx(expected, rel=1e-12)
@@ -0,0 +1,114 @@
+"""
+Unit tests for the in-memory metrics series and its HTTP endpoint
+"""
+
+import json
+import socket
+import urllib.error
+import urllib.request
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from statistics.metrics import FIELDS, MetricsSeries, MetricsServer, prometheus_text
+
+
+def parse_prometheus(text):
+    """{name: (labels, value)} of the samples of a Prometheus text page"""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith('#'):
+            continue
+        name_labels, value = line.rsplit(' ', 1)
+        name, _, labels = name_labels.partition('{')
+        samples[name] = (labels.rstrip('}'), float(value))
+    return samples
+
+
+class TestMetricsSeries:
+    """Test the ring buffer"""
+
+    def test_ring_buffer(self):
+        series = MetricsSeries(maxlen=4)
+        for i in range(6):
+            series.record(timestamp=100.0 + i, iteration=10 * i, rate=float(i))
+        rows = series.array()
+        assert len(series) == 4 and rows.shape == (4, len(FIELDS))
+        assert_allclose(rows[:, FIELDS.index('iteration')], [20, 30, 40, 50])
+        assert_allclose(rows[:, 0], [102, 103, 104, 105])
+        assert np.all(np.isnan(rows[:, FIELDS.index('tau_max')]))
+
+        assert series.latest() == {'time': 105.0, 'iteration': 50.0, 'rate': 5.0}
+        columns = series.to_dict()
+        assert columns['iteration'] == [20.0, 30.0, 40.0, 50.0]
+        assert columns['tau_max'] == [None] * 4
+        with pytest.raises(ValueError, match="Unknown"):
+            series.record(speed=1.0)
+
+    def test_prometheus_text(self):
+        series = MetricsSeries()
+        series.state = 'running'
+        assert 'mcmc_iteration' not in prometheus_text(series)
+        series.record(iteration=1500, tau_max=42.5, acceptance=0.31, memory=2.5e9,
+                      evals_per_s=None)
+        text = prometheus_text(series, {'run': 'janus "z10"'})
+        samples = parse_prometheus(text)
+
+        assert samples['mcmc_iteration'] == ('run="janus \\"z10\\""', 1500.0)
+        assert samples['mcmc_tau_max'][1] == 42.5
+        assert samples['mcmc_memory_rss_bytes'][1] == 2.5e9
+        assert samples['mcmc_state'][0].endswith('state="running"')
+        assert 'mcmc_posterior_evaluations_per_second' not in samples
+        assert '# TYPE mcmc_acceptance_fraction gauge' in text
+
+
+class TestMetricsServer:
+    """Test the endpoint on TCP and Unix sockets"""
+
+    def test_tcp(self):
+        series = MetricsSeries()
+        series.record(iteration=500, rate=12.0, eta=60.0)
+        with MetricsServer(series, port=0, labels={'run': 'test'}) as server:
+            url = server.address
+            assert url.startswith('http://127.0.0.1:')
+            with urllib.request.urlopen(url + '/metrics') as response:
+                assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+                samples = parse_prometheus(response.read().decode())
+            assert samples['mcmc_iterations_per_second'] == ('run="test"', 12.0)
+
+            series.record(iteration=1000, rate=13.0)
+            with urllib.request.urlopen(url + '/series') as response:
+                data = json.load(response)
+            assert data['labels'] == {'run': 'test'}
+            assert data['series']['iteration'] == [500.0, 1000.0]
+            assert data['series']['eta'] == [60.0, None]
+
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(url + '/other')
+        assert server.address is None
+
+    @pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="No Unix sockets")
+    def test_unix_socket(self, tmp_path):
+        path = tmp_path / 'run.sock'
+        path.touch()  # Stale file of a previous run
+        series = MetricsSeries()
+        series.record(iteration=7)
+        with MetricsServer(series, socket_path=path) as server:
+            assert server.address == f'unix:{path}'
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(str(path))
+                client.sendall(b'GET /metrics HTTP/1.0\r\n\r\n')
+                response = b''
+                while chunk := client.recv(4096):
+                    response += chunk
+        head, body = response.decode().split('\r\n\r\n', 1)
+        assert head.startswith('HTTP/1.0 200')
+        assert parse_prometheus(body)['mcmc_iteration'][1] == 7.0
+        assert not path.exists()
@@ -0,0 +1,154 @@
+"""
+Unit tests for the picklable posteriors used with process pools
+"""
+
+import pickle
+from typing import NamedTuple
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from statistics.likelihood import UVLFLikelihood, schechter_function
+from statistics.posterior import Posterior, PooledPosterior
+from statistics.shared import SharedData
+
+
+def log_posterior_batch(walkers, like):
+    """Flat prior on alpha, UV LF likelihood; one value per walker"""
+    walkers = np.atleast_2d(walkers)
+    return np.where(walkers[:, 2] < -1.0, like(*walkers.T), -np.inf)
+
+
+def log_posterior(theta, like):
+    """Scalar version of log_posterior_batch"""
+    return float(log_posterior_batch(theta, like)[0])
+
+
+class Gaussian(NamedTuple):
+    """Data without a __dict__: pickled whole instead of shared"""
+    mean: np.ndarray
+    sigma: float
+
+
+def log_gaussian(theta, data):
+    return -0.5 * float(np.sum(((np.asarray(theta) - data.mean) / data.sigma)**2))
+
+
+@pytest.fixture
+def like():
+    M = np.arange(-23.0, -16.0, 0.5)
+    return UVLFLikelihood(M, schechter_function(M, 10**-3.6, -20.8, -2.1), 0.2)
+
+
+@pytest.fixture
+def walkers():
+    rng = np.random.default_rng(4)
+    return np.column_stack([rng.uniform(-4.5, -3.0, 16), rng.uniform(-22, -20, 16),
+                            rng.uniform(-2.5, -0.8, 16)])
+
+
+class TestPosterior:
+    """Test data handling and pickling of Posterior"""
+
+    def test_pickle_excludes_data(self, like):
+        """Test the pickled posterior carries a key, not the data"""
+        posterior = Posterior(log_posterior, like)
+        assert len(pickle.dumps(posterior)) < len(pickle.dumps(like))
+        restored = pickle.loads(pickle.dumps(posterior))
+        assert restored([-3.6, -20.8, -2.1]) == posterior([-3.6, -20.8, -2.1])
+        posterior.close()
+
+    def test_close_releases_data(self, like):
+        """Test close drops the registered data"""
+        posterior = Posterior(log_posterior, like)
+        posterior.close()
+        with pytest.raises(KeyError):
+            posterior.data
+
+    def test_scalar_pool(self, like, walkers):
+        """Test a scalar posterior evaluated by pool workers"""
+        posterior = Posterior(log_posterior, like)
+        with posterior.pool(2) as pool:
+            values = pool.map(posterior, list(walkers))
+        assert_allclose(values, log_posterior_batch(walkers, like))
+        posterior.close()
+
+    def test_pooled_vectorized(self, like, walkers):
+        """Test chunked evaluation of a vectorized posterior across workers"""
+        posterior = Posterior(log_posterior_batch, like, vectorize=True)
+        with posterior.pool(2) as pool:
+            values = PooledPosterior(posterior, pool, n_chunks=3)(walkers)
+        assert_allclose(values, log_posterior_batch(walkers, like))
+        posterior.close()
+
+    def test_pool_without_shared_memory(self, like, walkers):
+        """Test the pickled-data path of the pool"""
+        posterior = Posterior(log_posterior_batch, like, vectorize=True)
+        with posterior.pool(2, shared_memory=False) as pool:
+            values = PooledPosterior(posterior, pool)(walkers)
+        assert_allclose(values, log_posterior_batch(walkers, like))
+        assert posterior._shared is None
+        posterior.close()
+
+    def test_pool_data_without_dict(self, walkers):
+        """Test NamedTuple and tuple data go to the workers pickled"""
+        data = Gaussian(np.array([-3.5, -21.0, -2.0]), 0.5)
+        posterior = Posterior(log_gaussian, data)
+        with posterior.pool(2) as pool:
+            values = pool.map(posterior, list(walkers))
+        assert_allclose(values, [log_gaussian(w, data) for w in walkers])
+        assert not posterior._shared.specs
+        posterior.close()
+
+        shared = SharedData((np.arange(3.0), 'bins'))
+        restored = pickle.loads(pickle.dumps(shared)).attach()
+        assert_allclose(restored[0], np.arange(3.0))
+        assert restored[1] == 'bins'
+        shared.release()
+
+    def test_pooled_requires_vectorized(self, like):
+        """Test scalar posteriors are rejected by PooledPosterior"""
+        posterior = Posterior(log_posterior, like)
+        with pytest.raises(ValueError):
+            PooledPosterior(posterior, pool=None)
+        posterior.close()
+
+
+class TestSharedData:
+    """Test the shared-memory data plane"""
+
+    def test_attach_zero_copy(self, like):
+        """Test a pickled handle rebuilds the object on read-only shared views"""
+        shared = SharedData(like)
+        handle = pickle.loads(pickle.dumps(shared))
+        assert not handle.owner and len(pickle.dumps(handle)) < 1000
+
+        data = handle.attach()
+        assert type(data) is UVLFLikelihood
+        assert not data.log_phi_obs.flags.owndata and not data.log_phi_obs.flags.writeable
+        assert data(-3.6, -20.8, -2.1) == like(-3.6, -20.8, -2.1)
+        shared.release()
+
+    def test_arrays_and_dicts(self):
+        """Test plain arrays and dicts of arrays are shared"""
+        array = np.arange(12.0).reshape(3, 4)
+        shared = SharedData({'x': array, 'label': 'bins'})
+        attached = pickle.loads(pickle.dumps(shared)).attach()
+        assert_allclose(attached['x'], array)
+        assert attached['label'] == 'bins'
+        shared.release()
+
+    def test_release(self, like):
+        """Test released blocks can no longer be attached"""
+        shared = SharedData(like)
+        handle = pickle.loads(pickle.dumps(shared))
+        shared.release()
+        with pytest.raises(FileNotFoundError):
+            handle.attach()
@@ -0,0 +1,150 @@
+"""
+Unit tests for the per-stage posterior profiler
+"""
+
+import os
+import pickle
+import subprocess
+import time
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from utils.profiling import PROFILER, Profiled, StageProfiler, profiled
+
+
+@pytest.fixture
+def profiler():
+    return StageProfiler(enabled=True)
+
+
+class TestStageProfiler:
+    """Test nesting, totals and the summaries"""
+
+    def test_nested_stages(self, profiler):
+        @profiler.profiled('prior')
+        def prior(x):
+            time.sleep(0.002)
+            return 0.0
+
+        @profiler.profiled('likelihood')
+        def likelihood(x):
+            with profiler.stage('schechter'):
+                time.sleep(0.005)
+            return -x**2
+
+        @profiler.profiled()
+        def posterior(x):
+            return prior(x) + likelihood(x)
+
+        for x in range(4):
+            assert posterior(x) == -x**2
+        stats = {s.path: s for s in profiler.stats()}
+
+        assert list(stats) == [('posterior',), ('posterior', 'likelihood'),
+                               ('posterior', 'likelihood', 'schechter'),
+                               ('posterior', 'prior')]
+        assert all(s.calls == 4 for s in stats.values())
+        root = stats[('posterior',)]
+        assert root.total >= 4 * 0.007
+        assert root.self_time == pytest.approx(
+            root.total - stats[('posterior', 'likelihood')].total
+            - stats[('posterior', 'prior')].total)
+        assert stats[('posterior', 'likelihood', 'schechter')].total >= 4 * 0.005
+
+        profiler.reset()
+        assert profiler.stats() == []
+
+    def test_disabled(self, profiler):
+        profiler.disable()
+        calls = []
+
+        @profiler.profiled('f')
+        def f():
+            calls.append(1)
+            return 1
+
+        with profiler.stage('block'):
+            f()
+        assert calls == [1] and profiler.stats() == []
+
+    def test_exception_closes_stage(self, profiler):
+        with pytest.raises(ValueError):
+            with profiler.stage('failing'):
+                raise ValueError
+        with profiler.stage('next'):
+            pass
+        assert [s.path for s in profiler.stats()] == [('failing',), ('next',)]
+
+    def test_summary_and_dump(self, profiler, tmp_path):
+        with profiler.stage('log_prob'):
+            with profiler.stage('chi2'):
+                time.sleep(0.002)
+        summary = profiler.summary()
+        assert summary.splitlines()[1].startswith('log_prob')
+        assert summary.splitlines()[2].startswith('  chi2')
+        folded = dict(line.rsplit(' ', 1) for line in profiler.folded().splitlines())
+        assert int(folded['log_prob;chi2']) >= 2000
+
+        summary_file, folded_file = profiler.dump(tmp_path / 'run', 'janus_profile')
+        assert summary_file.read_text(encoding='utf-8') == summary
+        assert folded_file.name == 'janus_profile.folded'
+        assert StageProfiler().summary() == "No stage recorded\n"
+
+
+class TestLibraryStages:
+    """Test the stages marked in the library"""
+
+    @pytest.mark.skipif(PROFILER.enabled, reason="JANUS_PROFILE is set")
+    def test_unwrapped_without_env(self):
+        from statistics import fitting
+        from statistics.likelihood import UVLFLikelihood
+        assert fitting.log_prior.__code__.co_name == 'log_prior'
+        assert not hasattr(UVLFLikelihood.__call__, '__wrapped__')
+
+        def f():
+            pass
+        assert profiled('f')(f) is f
+
+    def test_profiled_posterior_pickles(self):
+        wrapped = pickle.loads(pickle.dumps(Profiled(np.sum, 'sum')))
+        assert wrapped(np.ones(3)) == 3.0
+
+    def test_env_enables_stages(self, tmp_path):
+        """Test JANUS_PROFILE records the stages of fitting and likelihood"""
+        code = (
+            "import numpy as np\n"
+            "from statistics import fitting\n"
+            "from statistics.likelihood import UVLFLikelihood\n"
+            "from utils.profiling import PROFILER, Profiled\n"
+            "like = UVLFLikelihood([-22.0, -20.0], [1e-5, 1e-4], 0.3)\n"
+            "post = Profiled(lambda t: fitting.log_prior(t, [(-5, 0)] * 3) + like(*t))\n"
+            "for _ in range(3): post(np.array([-4.0, -21.0, -2.0]))\n"
+            f"PROFILER.dump({str(tmp_path)!r})\n"
+        )
+        env = dict(os.environ, JANUS_PROFILE='1', PYTHONPATH=str(src_path))
+        subprocess.run([sys.executable, '-c', code], env=env, check=True, cwd=tmp_path)
+
+        folded = [line.rsplit(' ', 1)[0]
+                  for line in (tmp_path / 'profile.folded').read_text().splitlines()]
+        assert 'log_prob;uvlf_likelihood;schechter' in folded
+        assert 'log_prob;log_prior' in folded
+        assert '3' in (tmp_path / 'profile.txt').read_text()
+
+    @pytest.mark.parametrize("value,enabled", [
+        ('0', False), ('false', False), ('No', False), ('', False),
+        ('1', True), ('TRUE', True), ('yes', True),
+    ])
+    def test_env_values(self, value, enabled):
+        """Test the JANUS_PROFILE values that turn profiling off"""
+        env = dict(os.environ, JANUS_PROFILE=value, PYTHONPATH=str(src_path))
+        code = "from utils.profiling import PROFILER; print(PROFILER.enabled)"
+        result = subprocess.run([sys.executable, '-c', code], env=env, check=True,
+                                capture_output=True, text=True)
+        assert result.stdout.strip() == str(enabled)
@@ -0,0 +1,111 @@
+"""
+Unit tests for the sampler backends
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from statistics.posterior import Posterior
+from statistics.samplers import (
+    SAMPLERS, register_sampler, get_sampler, run_sampler, stepping_stone_evidence
+)
+
+BOUNDS = [(-1.0, 1.0), (-1.0, 1.0)]
+SIGMA = 0.1
+# Normalized Gaussian likelihood well inside the box, uniform prior: Z = 1/4
+LOG_Z = np.log(0.25)
+
+
+def log_likelihood_batch(walkers, centre):
+    return (-0.5 * np.sum(((walkers - centre) / SIGMA)**2, axis=-1)
+            - np.log(2 * np.pi * SIGMA**2))
+
+
+def log_prior_batch(walkers, bounds):
+    inside = np.all((walkers >= bounds[:, 0]) & (walkers <= bounds[:, 1]), axis=-1)
+    return np.where(inside, 0.0, -np.inf)
+
+
+@pytest.fixture
+def posterior():
+    like = Posterior(log_likelihood_batch, np.array([0.2, -0.1]), vectorize=True)
+    prior = Posterior(log_prior_batch, np.array(BOUNDS), vectorize=True)
+    yield like, prior
+    like.close()
+    prior.close()
+
+
+class TestRegistry:
+    """Test sampler registration and lookup"""
+
+    def test_backends_registered(self):
+        assert {'emcee', 'tempered', 'nested'} <= set(SAMPLERS)
+
+    def test_unknown_sampler(self):
+        with pytest.raises(ValueError):
+            get_sampler('gibbs', log_likelihood_batch)
+
+    def test_duplicate_name(self):
+        with pytest.raises(ValueError):
+            register_sampler('emcee')(type('Other', (), {}))
+
+    def test_prior_required(self):
+        with pytest.raises(ValueError):
+            get_sampler('tempered', log_likelihood_batch)
+
+
+class TestSamplers:
+    """Test the backends on a Gaussian with known evidence"""
+
+    def test_emcee(self, posterior):
+        like, prior = posterior
+        result = run_sampler('emcee', like, prior, BOUNDS, nwalkers=16, nsteps=300,
+                             burn_in=100, progress=False, seed=1)
+        assert result.samples.shape == (16 * 200, 2)
+        assert np.allclose(result.samples.mean(axis=0), [0.2, -0.1], atol=0.03)
+        assert np.isnan(result.log_evidence)
+
+    def test_tempered_evidence(self, posterior):
+        like, prior = posterior
+        result = run_sampler('tempered', like, prior, BOUNDS, nwalkers=16, nsteps=400,
+                             burn_in=100, ntemps=12, tmax=1e4, progress=False, seed=2)
+        assert np.allclose(result.samples.mean(axis=0), [0.2, -0.1], atol=0.03)
+        assert result.log_evidence == pytest.approx(LOG_Z, abs=0.15)
+        assert np.all(result.sampler.swap_fraction > 0)
+
+    def test_tempered_pool_and_resume(self, posterior, tmp_path):
+        """Test the pooled run and a resumed checkpoint give the serial chain"""
+        like, prior = posterior
+        config = dict(nwalkers=8, nsteps=40, burn_in=0, ntemps=4, tmax=100.0,
+                      progress=False, seed=3)
+        serial = run_sampler('tempered', like, prior, BOUNDS, **config)
+        pooled = run_sampler('tempered', like, prior, BOUNDS, processes=2, **config)
+        np.testing.assert_allclose(pooled.samples, serial.samples)
+
+        checkpoint = str(tmp_path / 'pt.h5')
+        first = run_sampler('tempered', like, prior, BOUNDS, checkpoint_file=checkpoint,
+                            **config)
+        again = run_sampler('tempered', like, prior, BOUNDS, checkpoint_file=checkpoint,
+                            **config)
+        np.testing.assert_allclose(again.samples, first.samples)
+
+    def test_nested_evidence(self, posterior):
+        pytest.importorskip('dynesty')
+        like, prior = posterior
+        result = run_sampler('nested', like, prior, BOUNDS, nlive=200, progress=False, seed=4)
+        assert result.log_evidence == pytest.approx(LOG_Z, abs=3 * result.log_evidence_err + 0.1)
+
+
+def test_stepping_stone_constant_ratios():
+    """Test constant likelihood ratios give their product, with no scatter"""
+    log_ratios = np.array([-0.5, -1.0, -2.0])
+    log_stones = np.tile(log_ratios + np.log(8), (100, 1))
+    log_z, err = stepping_stone_evidence(log_stones, nwalkers=8)
+    assert log_z == pytest.approx(-3.5)
+    assert err == pytest.approx(0.0, abs=1e-12)
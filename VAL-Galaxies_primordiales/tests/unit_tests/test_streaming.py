@@ -0,0 +1,112 @@
+"""
+Unit tests for the streaming chain diagnostics
+"""
+
+import pytest
+import numpy as np
+import emcee
+from numpy.testing import assert_allclose
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from statistics.streaming import BlockMoments, StreamingDiagnostics, iter_chunks
+from statistics.convergence import integrated_time
+
+
+def ar1_chains(n, nwalkers, phi, seed=0):
+    """AR(1) chains (n, nwalkers, ndim), τ = (1 + φ) / (1 - φ)"""
+    rng = np.random.default_rng(seed)
+    phi = np.asarray(phi)
+    x = np.zeros((n, nwalkers, len(phi)))
+    for t in range(1, n):
+        x[t] = phi * x[t - 1] + rng.standard_normal((nwalkers, len(phi)))
+    return x
+
+
+def log_prob(walkers):
+    return -0.5 * np.sum(walkers**2, axis=-1)
+
+
+class TestBlockMoments:
+    """Test running sums against whole-chain computations"""
+
+    @pytest.fixture
+    def chains(self):
+        return ar1_chains(4000, 8, [0.5, 0.8], seed=4) + np.array([1e4, -3.0])
+
+    def test_split_rhat(self, chains):
+        """Test chunked input of any size gives the whole-chain split R-hat"""
+        moments = BlockMoments(block_size=100)
+        for start in range(0, len(chains), 333):
+            moments.add(chains[start:start + 333])
+
+        post = chains[2000:]
+        split = np.concatenate([post[:1000], post[1000:]], axis=1)
+        W = split.var(axis=0, ddof=1).mean(axis=0)
+        B = 1000 * split.mean(axis=0).var(axis=0, ddof=1)
+        assert_allclose(moments.split_rhat(0.5), np.sqrt((999 / 1000 * W + B / 1000) / W),
+                        rtol=1e-8)
+
+    def test_mean_std(self, chains):
+        moments = BlockMoments()
+        moments.add(chains)
+        mean, std = moments.mean_std(0.5)
+        assert_allclose(mean, chains[2000:].mean(axis=(0, 1)), rtol=1e-10)
+        assert_allclose(std, chains[2000:].std(axis=(0, 1)), rtol=1e-6)
+
+    def test_batch_means_ess(self, chains):
+        """Test batch-means ESS agrees with the FFT autocorrelation estimate"""
+        moments = BlockMoments(block_size=50)
+        moments.add(chains)
+        ess_fft = 2000 * 8 / integrated_time(chains[2000:])
+        assert_allclose(moments.batch_means_ess(0.5), ess_fft, rtol=0.3)
+
+
+class TestStreamingDiagnostics:
+    """Test incremental reads of an emcee HDF5 backend"""
+
+    @pytest.fixture
+    def chain_file(self, tmp_path):
+        np.random.seed(5)
+        filename = str(tmp_path / 'chain.h5')
+        backend = emcee.backends.HDFBackend(filename)
+        backend.reset(16, 2)
+        sampler = emcee.EnsembleSampler(16, 2, log_prob, backend=backend, vectorize=True)
+        sampler.run_mcmc(np.random.randn(16, 2), 600)
+        return filename, sampler
+
+    def test_chunks(self, chain_file):
+        filename, sampler = chain_file
+        chunks = list(iter_chunks(filename, start=100, chunk_size=200))
+        assert [len(c) for c in chunks] == [200, 200, 100]
+        assert_allclose(np.concatenate(chunks), sampler.get_chain()[100:])
+
+    def test_incremental_update(self, chain_file):
+        """Test updates read only new steps and match a single full pass"""
+        filename, sampler = chain_file
+        streaming = StreamingDiagnostics(filename, chunk_size=128)
+        first = streaming.update()
+        assert first.iteration == 600
+
+        sampler.run_mcmc(None, 400)
+        result = streaming.update()
+        full = StreamingDiagnostics(filename, chunk_size=1000).update()
+        assert result.iteration == full.iteration == 1000
+        for name in ('rhat', 'ess', 'tau', 'acceptance', 'mean', 'std'):
+            assert_allclose(getattr(result, name), getattr(full, name), rtol=1e-10)
+
+        assert_allclose(result.acceptance, sampler.acceptance_fraction, atol=2e-3)
+        assert np.all(result.rhat < 1.1)
+        assert_allclose(result.mean, sampler.get_chain(discard=500).mean(axis=(0, 1)))
+
+    def test_in_memory_backend(self):
+        np.random.seed(6)
+        sampler = emcee.EnsembleSampler(16, 2, log_prob, vectorize=True)
+        sampler.run_mcmc(np.random.randn(16, 2), 600)
+        result = StreamingDiagnostics(sampler.backend, chunk_size=128).update()
+        assert result.iteration == 600
+        assert_allclose(result.std, sampler.get_chain(discard=300).std(axis=(0, 1)), rtol=1e-6)
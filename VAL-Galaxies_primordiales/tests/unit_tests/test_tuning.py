@@ -0,0 +1,97 @@
+"""
+Unit tests for the parallel evaluation plans
+"""
+
+import time
+import pytest
+import numpy as np
+import emcee
+from numpy.testing import assert_array_equal
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from statistics.posterior import Posterior
+from statistics.tuning import ParallelPlan, plan_parallelism, measure_posterior_cost
+
+
+def cheap(theta):
+    return -0.5 * np.sum(theta**2)
+
+
+def cheap_batch(walkers):
+    return -0.5 * np.sum(np.atleast_2d(walkers)**2, axis=-1)
+
+
+def scaled(theta, scale):
+    return -0.5 * np.sum((theta / scale)**2)
+
+
+def slow(theta):
+    time.sleep(5e-3)
+    return -0.5 * np.sum(theta**2)
+
+
+@pytest.fixture
+def walkers():
+    return np.random.default_rng(0).normal(size=(16, 3))
+
+
+class TestPlanParallelism:
+    """Test the plan follows the measured costs"""
+
+    def test_cheap_posterior_is_serial(self, walkers):
+        plan = plan_parallelism(cheap, walkers, max_workers=4, min_time=0.05)
+        assert plan.mode == 'serial' and plan.n_workers == 1
+        assert plan.overhead > plan.eval_time
+        assert plan.make_pool() is None
+
+    def test_vectorized_serial(self, walkers):
+        plan = plan_parallelism(cheap_batch, walkers, max_workers=4, vectorize=True,
+                                min_time=0.05)
+        assert plan.mode == 'serial' and plan.vectorize
+        assert "serial vectorized" in plan.describe()
+
+    def test_slow_posterior_uses_pool(self, walkers):
+        """Test a posterior far above the IPC cost gets one chunk per worker"""
+        plan = plan_parallelism(slow, walkers, max_workers=4, min_time=0.05)
+        assert plan.mode == 'pool'
+        assert plan.n_workers == 4 and plan.chunksize == 2
+        assert plan.eval_time == pytest.approx(5e-3, rel=0.5)
+
+    def test_measure_vectorized_cost(self, walkers):
+        per_walker, per_call = measure_posterior_cost(cheap_batch, walkers, vectorize=True,
+                                                      min_time=0.05)
+        assert per_walker >= 0 and per_call >= 0
+
+    def test_fixed(self):
+        plan = ParallelPlan.fixed(8, 32)
+        assert (plan.mode, plan.n_workers, plan.chunksize) == ('pool', 8, 2)
+        assert ParallelPlan.fixed(1, 32).mode == 'serial'
+        assert plan.describe().endswith("(fixed)")
+
+    def test_planned_pool_runs_sampler(self, walkers):
+        """Test the planned pool, data installed in its workers, gives the serial chain"""
+        posterior = Posterior(scaled, np.array([1.0, 2.0, 0.5]))
+        chains = []
+        for plan in (ParallelPlan.fixed(1, 16), ParallelPlan.fixed(2, 16)):
+            pool = plan.make_pool([posterior])
+            sampler = emcee.EnsembleSampler(16, 3, plan.wrap(posterior, pool),
+                                            pool=plan.sampler_pool(pool))
+            sampler._random.seed(1)
+            sampler.run_mcmc(walkers, 20)
+            if pool is not None:
+                pool.close()
+            chains.append(sampler.get_chain())
+        posterior.close()
+        assert_array_equal(chains[0], chains[1])
+
+    def test_planned_vectorized_pool(self, walkers):
+        plan = ParallelPlan.fixed(2, 16, vectorize=True)
+        with plan.make_pool() as pool:
+            log_prob = plan.wrap(cheap_batch, pool)
+            assert plan.sampler_pool(pool) is None
+            assert_array_equal(log_prob(walkers), cheap_batch(walkers))
@@ -6,13 +6,16 @@ Conçu pour être lancé en background par Claude Code
 Usage:
     python run_mcmc_optimized.py --config config.json
     python run_mcmc_optimized.py --config config.json &  # Background
+    python run_mcmc_optimized.py --schedule configs/ --cores 10  # Plusieurs runs
 
 Optimisations:
     - Numba JIT compilation
-    - Parallélisation sur cœurs performance M4
+    - Parallélisation auto-réglée (coût du posterior mesuré au démarrage)
     - Checkpoints automatiques
     - Monitoring mémoire
     - Reprise automatique si interrompu
+    - Ordonnanceur multi-runs (cœurs répartis par priorité)
+    - Profil par étape du posterior (JANUS_PROFILE=1)
 """
 
 import argparse
@@ -23,19 +26,31 @@ import time
 import signal
 from pathlib import Path
 from datetime import datetime
-from multiprocessing import Pool, cpu_count
+from multiprocessing import Process, cpu_count
 
 import numpy as np
 import emcee
 import h5py
 import psutil
 
+# Bibliothèque statistique du projet (backends de samplers, evidence)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "VAL-Galaxies_primordiales" / "src"))
+from statistics.samplers import SAMPLERS, run_sampler
+from statistics.convergence import ConvergenceCriteria, ConvergenceController
+from statistics.streaming import iter_chunks
+from statistics.checkpoint import AsyncHDFBackend
+from statistics.posterior import Posterior
+from statistics.tuning import ParallelPlan, plan_parallelism
+from statistics.metrics import MetricsSeries, MetricsServer
+from utils.profiling import PROFILER, Profiled
+
 # =============================================================================
-# CONFIGURATION OPTIMALE POUR APPLE M4
+# CONFIGURATION
 # =============================================================================
 
-# Cœurs performance uniquement pour calculs intensifs
-N_PERFORMANCE_CORES = 4
+# Borne du nombre de workers; le nombre utilisé est choisi au démarrage
+# d'après le coût mesuré du posterior (config "auto_tune", défaut true)
+MAX_WORKERS = cpu_count()
 CHECKPOINT_INTERVAL = 500  # steps
 MEMORY_LIMIT_GB = 20  # Laisser 4GB pour le système
 
@@ -44,36 +59,93 @@ MEMORY_LIMIT_GB = 20  # Laisser 4GB pour le système
 # =============================================================================
 
 class MCMCMonitor:
-    """Monitore le calcul MCMC en temps réel."""
+    """
+    Monitore le calcul MCMC en temps réel.
+
+    Chaque checkpoint est journalisé, écrit dans le fichier status et gardé
+    en mémoire (série des derniers checkpoints, statistics.metrics). Avec
+    config "metrics", la série est servie en local pendant le run:
+    GET /metrics (format texte Prometheus) et GET /series (JSON).
 
-    def __init__(self, output_dir, run_name):
+    metrics : true (port TCP libre sur 127.0.0.1), {"port": 9464, "host": ...}
+        ou {"socket": "chemin.sock"}; "history": nombre de checkpoints gardés.
+        L'adresse effective est dans le fichier status ("metrics").
+    """
+
+    def __init__(self, output_dir, run_name, metrics=None):
         self.output_dir = Path(output_dir)
         self.run_name = run_name
         self.log_file = self.output_dir / f"{run_name}.log"
         self.status_file = self.output_dir / f"{run_name}_status.json"
         self.start_time = None
+        self.plan = None
+        self.nwalkers = None
+
+        options = {} if metrics in (None, False, True) else dict(metrics)
+        self.series = MetricsSeries(options.pop("history", 720))
+        self.metrics_server = None
+        if metrics:
+            self.metrics_server = MetricsServer(
+                self.series, host=options.get("host", "127.0.0.1"),
+                port=options.get("port", 0), socket_path=options.get("socket"),
+                labels={"run": run_name})
 
     def start(self):
         self.start_time = time.time()
         self._log("=" * 60)
         self._log(f"MCMC DÉMARRÉ: {self.run_name}")
         self._log(f"PID: {os.getpid()}")
+        if self.metrics_server is not None:
+            try:
+                self.metrics_server.start()
+                self._log(f"Métriques: {self.metrics_server.address}/metrics")
+            except OSError as e:
+                # Le run continue sans endpoint (port pris, socket impossible...)
+                self._log(f"⚠️ Endpoint métriques indisponible: {e}")
+                self.metrics_server = None
         self._log("=" * 60)
         self._update_status("running")
 
-    def checkpoint(self, iteration, total, tau=None, acceptance=None):
+    def close(self):
+        """Arrête l'endpoint métriques (le fichier status reste)."""
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+
+    def set_plan(self, plan, nwalkers, benchmark_seconds=None):
+        """Journalise le plan d'évaluation choisi (statistics.tuning.ParallelPlan)."""
+        self.plan = plan
+        self.nwalkers = nwalkers
+        msg = f"Plan d'évaluation: {plan.describe()}"
+        if benchmark_seconds is not None:
+            msg += f" [mesuré en {benchmark_seconds:.1f} s]"
+        self._log(msg)
+        self._update_status("running", {"plan": self._plan_data()})
+
+    def _plan_data(self):
+        if self.plan is None:
+            return None
+        return {k: (None if isinstance(v, float) and not np.isfinite(v) else v)
+                for k, v in self.plan._asdict().items()}
+
+    def checkpoint(self, iteration, total, tau=None, acceptance=None, steps_done=None):
         elapsed = time.time() - self.start_time
         progress = 100 * iteration / total
-        rate = iteration / elapsed if elapsed > 0 else 0
+        # Vitesse de ce run (les itérations reprises ne comptent pas)
+        rate = (steps_done if steps_done is not None else iteration) / elapsed if elapsed > 0 else 0
         eta = (total - iteration) / rate if rate > 0 else 0
+        evals_rate = rate * self.nwalkers if self.nwalkers else None
 
         # Mémoire
-        mem_gb = psutil.Process().memory_info().rss / 1e9
+        rss = psutil.Process().memory_info().rss
+        mem_gb = rss / 1e9
 
         msg = (f"[{progress:5.1f}%] Iter {iteration:,}/{total:,} | "
                f"Vitesse: {rate:.1f} it/s | ETA: {eta/60:.1f} min | "
                f"Mémoire: {mem_gb:.2f} GB")
 
+        if evals_rate is not None:
+            msg += f" | Évals: {evals_rate:.0f}/s"
         if tau is not None:
             msg += f" | τ_max: {tau:.1f}"
         if acceptance is not None:
@@ -81,6 +153,9 @@ class MCMCMonitor:
 
         self._log(msg)
 
+        self.series.record(iteration=iteration, progress=iteration / total, rate=rate,
+                           tau_max=tau, acceptance=acceptance, memory=rss, eta=eta,
+                           evals_per_s=evals_rate)
         self._update_status("running", {
             "iteration": iteration,
             "total": total,
@@ -89,6 +164,8 @@ class MCMCMonitor:
             "eta_seconds": eta,
             "memory_gb": mem_gb,
             "rate_its": rate,
+            "evals_per_s": evals_rate,
+            "plan": self._plan_data(),
             "tau_max": tau,
             "acceptance": acceptance
         })
@@ -103,11 +180,16 @@ class MCMCMonitor:
         self._log(f"MCMC TERMINÉ en {elapsed/3600:.2f} heures")
         if results:
             self._log(f"Samples effectifs: {results.get('n_effective', 'N/A')}")
+            if results.get("log_evidence") is not None:
+                self._log(f"ln Z = {results['log_evidence']:.3f} "
+                          f"± {results['log_evidence_err']:.3f}")
         self._log("=" * 60)
-        self._update_status("completed", {"elapsed_hours": elapsed/3600})
+        self.close()
+        self._update_status("completed", {"elapsed_hours": elapsed/3600, **(results or {})})
 
     def error(self, error_msg):
         self._log(f"❌ ERREUR: {error_msg}")
+        self.close()
         self._update_status("error", {"error": str(error_msg)})
 
     def _log(self, message):
@@ -118,11 +200,13 @@ class MCMCMonitor:
             f.write(line + "\n")
 
     def _update_status(self, status, data=None):
+        self.series.state = status
         status_data = {
             "status": status,
             "run_name": self.run_name,
             "pid": os.getpid(),
             "last_update": datetime.now().isoformat(),
+            "metrics": self.metrics_server.address if self.metrics_server else None,
             "data": data or {}
         }
         with open(self.status_file, 'w') as f:
@@ -133,6 +217,16 @@ class MCMCMonitor:
 # MCMC RUNNER OPTIMISÉ
 # =============================================================================
 
+def _test_log_prob(theta):
+    """Simple gaussienne pour test (niveau module: picklable pour le pool)."""
+    return -0.5 * np.sum(theta**2)
+
+
+def _without_data(theta, log_prob_fn):
+    """Posterior sans données: la fonction du modèle tient lieu de données."""
+    return log_prob_fn(theta)
+
+
 def run_optimized_mcmc(config):
     """
     Exécute un MCMC optimisé avec toutes les bonnes pratiques.
@@ -150,17 +244,37 @@ def run_optimized_mcmc(config):
     nwalkers = config.get("nwalkers", 32)
     nsteps = config.get("nsteps", 10000)
     ndim = config.get("ndim", 5)
-    n_workers = config.get("n_workers", N_PERFORMANCE_CORES)
+    n_workers = config.get("n_workers", MAX_WORKERS)
     checkpoint_interval = config.get("checkpoint_interval", CHECKPOINT_INTERVAL)
 
     # Initialiser monitoring
-    monitor = MCMCMonitor(output_dir, run_name)
+    monitor = MCMCMonitor(output_dir, run_name, metrics=config.get("metrics"))
 
     # Fichiers
     chain_file = output_dir / f"{run_name}.h5"
 
-    # Backend HDF5
-    backend = emcee.backends.HDFBackend(chain_file)
+    # Fonction log_prob (doit être définie dans le module importé)
+    log_prob_module = config.get("log_prob_module", "janus_model")
+    log_prob_name = config.get("log_prob_function", "log_probability")
+
+    # Import dynamique
+    mod = None
+    try:
+        import importlib
+        mod = importlib.import_module(log_prob_module)
+        log_prob_fn = getattr(mod, log_prob_name)
+    except (ImportError, AttributeError) as e:
+        # Fallback: fonction de test
+        monitor._log(f"⚠️ Module {log_prob_module} non trouvé, utilisation fonction test")
+        log_prob_fn = _test_log_prob
+
+    # Samplers avec evidence (nested, tempered): prior et vraisemblance séparés
+    sampler_name = config.get("sampler", "emcee")
+    if sampler_name != "emcee":
+        return run_evidence_sampler(config, sampler_name, mod, monitor, chain_file)
+
+    # Backend HDF5 emcee (écrit par un thread, au plus checkpoint_interval steps de retard)
+    backend = AsyncHDFBackend(chain_file, flush_interval=checkpoint_interval)
 
     # Vérifier reprise
     if backend.iteration > 0:
@@ -178,21 +292,19 @@ def run_optimized_mcmc(config):
             initial_pos = prior_center + prior_width * 0.1 * np.random.randn(nwalkers, ndim)
         nsteps_remaining = nsteps
 
-    # Fonction log_prob (doit être définie dans le module importé)
-    log_prob_module = config.get("log_prob_module", "janus_model")
-    log_prob_name = config.get("log_prob_function", "log_probability")
-
-    # Import dynamique
-    try:
-        import importlib
-        mod = importlib.import_module(log_prob_module)
-        log_prob_fn = getattr(mod, log_prob_name)
-    except (ImportError, AttributeError) as e:
-        # Fallback: fonction de test
-        monitor._log(f"⚠️ Module {log_prob_module} non trouvé, utilisation fonction test")
-        def log_prob_fn(theta):
-            # Simple gaussienne pour test
-            return -0.5 * np.sum(theta**2)
+    # Posterior picklable: les données ("log_prob_data", fonction du module qui
+    # les renvoie, log_prob(theta, data)) arrivent une fois par worker, à la
+    # création du pool, leurs tableaux en mémoire partagée; les tâches ne
+    # transportent que les walkers
+    vectorize = config.get("vectorize", False)
+    data_name = config.get("log_prob_data")
+    if mod is not None and data_name:
+        data = getattr(mod, data_name)
+        posterior = Posterior(log_prob_fn, data() if callable(data) else data,
+                              vectorize=vectorize)
+    else:
+        posterior = Posterior(_without_data, log_prob_fn, vectorize=vectorize)
+    log_prob_fn = posterior
 
     # Gestionnaire d'interruption
     interrupted = False
@@ -207,21 +319,48 @@ def run_optimized_mcmc(config):
     # Démarrer
     monitor.start()
 
+    pool = None
     try:
-        # Créer sampler avec pool
-        if n_workers > 1:
-            pool = Pool(n_workers)
-            sampler = emcee.EnsembleSampler(
-                nwalkers, ndim, log_prob_fn,
-                pool=pool,
-                backend=backend
-            )
+        # Plan d'évaluation: série (vectorisée si "vectorize") ou pool, avec au
+        # plus n_workers workers et des tâches de plusieurs walkers, d'après le
+        # coût mesuré du posterior et de l'IPC
+        if config.get("auto_tune", True):
+            walkers = (np.asarray(initial_pos, dtype=float) if initial_pos is not None
+                       else backend.get_last_sample().coords)
+            t0 = time.time()
+            plan = plan_parallelism(log_prob_fn, walkers, max_workers=n_workers,
+                                    vectorize=vectorize)
+            monitor.set_plan(plan, nwalkers, time.time() - t0)
         else:
-            pool = None
-            sampler = emcee.EnsembleSampler(
-                nwalkers, ndim, log_prob_fn,
-                backend=backend
-            )
+            plan = ParallelPlan.fixed(n_workers, nwalkers, vectorize)
+            monitor.set_plan(plan, nwalkers)
+
+        # Profil par étape (JANUS_PROFILE=1): temps cumulé et appels de chaque
+        # étape du posterior, écrits dans output_dir en fin de run
+        if PROFILER.enabled:
+            log_prob_fn = Profiled(log_prob_fn)
+            PROFILER.reset()
+            if plan.mode == "pool":
+                monitor._log("⚠️ Profil: les évaluations des workers du pool ne sont pas "
+                             "comptées (\"auto_tune\": false, \"n_workers\": 1 pour tout profiler)")
+
+        # Créer sampler (avec pool selon le plan, données installées par worker,
+        # tableaux numpy en mémoire partagée sauf "shared_memory": false)
+        pool = plan.make_pool([posterior], shared_memory=config.get("shared_memory", True))
+        sampler = emcee.EnsembleSampler(
+            nwalkers, ndim, plan.wrap(log_prob_fn, pool),
+            pool=plan.sampler_pool(pool),
+            backend=backend,
+            vectorize=plan.vectorize
+        )
+
+        # Convergence suivie bloc par bloc (τ sur le dernier bloc, R-hat incrémental)
+        controller = ConvergenceController(
+            ConvergenceCriteria(**config.get("convergence", {})),
+            block_size=checkpoint_interval
+        )
+        for chunk in iter_chunks(backend, chunk_size=checkpoint_interval):
+            controller.update(chunk)
 
         # Exécuter par blocs
         steps_done = 0
@@ -238,38 +377,39 @@ def run_optimized_mcmc(config):
             initial_pos = None
             steps_done += steps_this_round
 
-            # Calcul diagnostics
-            try:
-                tau = sampler.get_autocorr_time(tol=0)
-                tau_max = tau.max()
-            except:
-                tau_max = None
+            # Calcul diagnostics (nouveau bloc seulement)
+            status = controller.update(
+                backend.get_chain(discard=backend.iteration - steps_this_round))
+            tau_max = float(np.nanmax(status.tau)) if np.any(np.isfinite(status.tau)) else None
 
             acceptance = sampler.acceptance_fraction.mean()
 
             # Checkpoint
             monitor.checkpoint(
                 backend.iteration, nsteps,
-                tau=tau_max, acceptance=acceptance
+                tau=tau_max, acceptance=acceptance, steps_done=steps_done
             )
 
-            # Vérifier convergence
-            if tau_max is not None and backend.iteration > 50 * tau_max:
+            # Vérifier convergence (N > 50 τ, R-hat < 1.1, ESS)
+            if status.converged:
                 monitor._log("✅ CONVERGENCE ATTEINTE")
                 break
 
-        # Fermer pool
+        # Fermer pool, écrire les derniers steps
         if pool:
             pool.close()
             pool.join()
+            pool = None
+        backend.close()
 
         # Résultats finaux
         if not interrupted:
-            try:
-                tau = sampler.get_autocorr_time()
-                n_effective = backend.iteration / tau.mean()
-            except:
-                n_effective = None
+            # Plus petit ESS des paramètres; None (JSON null) tant que τ n'est
+            # pas estimable, plutôt que NaN (JSON invalide)
+            status = controller.status
+            n_effective = None
+            if status is not None and np.all(np.isfinite(status.ess)):
+                n_effective = float(np.min(status.ess))
 
             monitor.complete({"n_effective": n_effective})
         else:
@@ -280,9 +420,278 @@ def run_optimized_mcmc(config):
         monitor.error(str(e))
         raise
 
+    finally:
+        if pool:
+            pool.terminate()
+        posterior.close()
+        backend.close()
+        monitor.close()
+        if PROFILER.enabled:
+            summary_file, _ = PROFILER.dump(output_dir, f"{run_name}_profile")
+            monitor._log(f"Profil par étape: {summary_file}")
+
     return chain_file
 
 
+def run_evidence_sampler(config, sampler_name, mod, monitor, chain_file):
+    """
+    Exécute un backend de statistics.samplers ('tempered', 'nested').
+
+    Le module du modèle fournit log_prior et log_likelihood séparément
+    (config "log_prior_function", "log_likelihood_function"), et la config
+    les bornes du prior ("bounds"). Même checkpoint, même pool que emcee.
+    """
+    try:
+        if sampler_name not in SAMPLERS:
+            raise ValueError(f"Sampler inconnu: {sampler_name} (disponibles: {sorted(SAMPLERS)})")
+        if mod is None:
+            raise ImportError(f"Module {config.get('log_prob_module')} requis pour {sampler_name}")
+
+        log_prior = getattr(mod, config.get("log_prior_function", "log_prior"))
+        log_likelihood = getattr(mod, config.get("log_likelihood_function", "log_likelihood"))
+        suffix = ".save" if sampler_name == "nested" else ".h5"
+        checkpoint = chain_file.with_name(f"{chain_file.stem}_{sampler_name}{suffix}")
+
+        monitor.start()
+        monitor._log(f"Sampler: {sampler_name}")
+        try:
+            result = run_sampler(
+                sampler_name, log_likelihood, log_prior, config["bounds"],
+                initial=config.get("initial_pos"),
+                vectorize=config.get("vectorize", False),
+                nwalkers=config.get("nwalkers", 32),
+                nsteps=config.get("nsteps", 10000),
+                burn_in=config.get("burn_in", 500),
+                ntemps=config.get("ntemps", 16),
+                nlive=config.get("nlive", 500),
+                processes=config.get("n_workers", MAX_WORKERS),
+                checkpoint_file=str(checkpoint),
+                checkpoint_interval=config.get("checkpoint_interval", CHECKPOINT_INTERVAL),
+                progress=False,
+            )
+        except Exception as e:
+            monitor.error(str(e))
+            raise
+
+        np.save(chain_file.with_name(f"{chain_file.stem}_{sampler_name}_samples.npy"),
+                result.samples)
+        monitor.complete({
+            "n_samples": len(result.samples),
+            "log_evidence": float(result.log_evidence),
+            "log_evidence_err": float(result.log_evidence_err),
+        })
+        return checkpoint
+    finally:
+        monitor.close()
+
+
+# =============================================================================
+# ORDONNANCEUR MULTI-RUNS
+# =============================================================================
+
+def load_job_configs(paths):
+    """
+    Configs JSON des fichiers et répertoires donnés.
+
+    Un répertoire fournit tous ses *.json (ordre alphabétique). Un fichier
+    peut contenir une config ou une liste de configs.
+    """
+    configs = []
+    for path in map(Path, paths):
+        files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+        for file in files:
+            with open(file, 'r') as f:
+                content = json.load(f)
+            configs.extend(content if isinstance(content, list) else [content])
+    return configs
+
+
+def job_status_file(config):
+    """Fichier status écrit par MCMCMonitor pour ce run."""
+    output_dir = Path(config.get("output_dir", "./mcmc_outputs"))
+    return output_dir / f"{config.get('run_name', 'mcmc_run')}_status.json"
+
+
+def read_job_status(config):
+    """Dernier statut du run (None s'il n'a jamais été lancé)."""
+    try:
+        with open(job_status_file(config), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _run_job(config):
+    """Point d'entrée d'un processus job."""
+    run_optimized_mcmc(config)
+
+
+class MCMCScheduler:
+    """
+    Exécute plusieurs configs en parallèle sur un budget de cœurs.
+
+    Les jobs partent par priorité décroissante (config "priority", 0 par
+    défaut; à égalité, dans l'ordre donné). Chacun demande "n_workers" cœurs
+    (par défaut une part égale du budget) et démarre dès que "min_workers"
+    cœurs (1 par défaut) sont libres, avec autant de cœurs que possible
+    jusqu'à sa demande; les jobs moins prioritaires occupent les cœurs
+    restants. Les cœurs libérés par un job terminé vont au job suivant.
+
+    Les runs déjà terminés (status "completed") sont sautés; les runs
+    interrompus ou en erreur reprennent depuis leur backend HDF5. Un fichier
+    status agrégé décrit tous les jobs.
+
+    Parameters
+    ----------
+    configs : list of dict
+        Configurations de run_optimized_mcmc (run_name distincts)
+    n_cores : int, optional
+        Budget de cœurs. Défaut: cpu_count()
+    status_file : str or Path, optional
+        Fichier status agrégé. Défaut: ./mcmc_outputs/scheduler_status.json
+    poll_interval : float, optional
+        Secondes entre deux mises à jour. Défaut: 10
+    """
+
+    def __init__(self, configs, n_cores=None, status_file=None, poll_interval=10.0):
+        self.n_cores = n_cores or cpu_count()
+        self.status_file = Path(status_file or "./mcmc_outputs/scheduler_status.json")
+        self.poll_interval = poll_interval
+        self.stopping = False
+
+        names = [c.get("run_name", "mcmc_run") for c in configs]
+        duplicates = sorted({n for n in names if names.count(n) > 1})
+        if duplicates:
+            raise ValueError(f"run_name en double: {duplicates}")
+
+        share = max(1, self.n_cores // max(len(configs), 1))
+        self.jobs = []
+        for index, config in enumerate(configs):
+            requested = int(config.get("n_workers", share))
+            self.jobs.append({
+                "run_name": names[index],
+                "config": config,
+                "priority": config.get("priority", 0),
+                "requested": min(max(requested, 1), self.n_cores),
+                "min_workers": min(int(config.get("min_workers", 1)), self.n_cores),
+                "state": "pending",
+                "n_workers": None,
+                "process": None,
+                "started": None,
+                "finished": None,
+                "exitcode": None,
+            })
+        self.jobs.sort(key=lambda job: -job["priority"])    # Tri stable
+
+        for job in self.jobs:
+            previous = read_job_status(job["config"])
+            if previous is not None and previous.get("status") == "completed":
+                job["state"] = "skipped"
+
+    @property
+    def free_cores(self):
+        return self.n_cores - sum(job["n_workers"] for job in self.jobs
+                                  if job["state"] == "running")
+
+    def run(self):
+        """Exécute tous les jobs; retourne la liste des jobs (état final)."""
+        def signal_handler(signum, frame):
+            self.stopping = True
+
+        signal.signal(signal.SIGINT, signal_handler)
+        signal.signal(signal.SIGTERM, signal_handler)
+
+        while True:
+            self._reap()
+            if self.stopping:
+                self._stop()
+                break
+            self._launch()
+            self._write_status()
+            if not any(job["state"] in ("pending", "running") for job in self.jobs):
+                break
+            time.sleep(self.poll_interval)
+
+        self._write_status()
+        return self.jobs
+
+    def _launch(self):
+        """Démarre les jobs en attente, par priorité, tant que des cœurs sont libres."""
+        for job in self.jobs:
+            free = self.free_cores
+            if job["state"] != "pending" or free < job["min_workers"]:
+                continue
+            job["n_workers"] = min(job["requested"], free)
+            config = dict(job["config"], n_workers=job["n_workers"])
+            job["process"] = Process(target=_run_job, args=(config,), name=job["run_name"])
+            job["process"].start()
+            job["state"] = "running"
+            job["started"] = datetime.now().isoformat()
+
+    def _reap(self):
+        """Relève les jobs terminés."""
+        for job in self.jobs:
+            process = job["process"]
+            if job["state"] != "running" or process.is_alive():
+                continue
+            process.join()
+            job["exitcode"] = process.exitcode
+            job["finished"] = datetime.now().isoformat()
+            status = read_job_status(job["config"]) or {}
+            if process.exitcode == 0:
+                job["state"] = status.get("status", "completed")
+            else:
+                job["state"] = "error"
+
+    def _stop(self):
+        """Interrompt les jobs en cours (sauvegarde au prochain bloc) et les attend."""
+        for job in self.jobs:
+            if job["state"] == "running":
+                job["process"].terminate()
+        for job in self.jobs:
+            if job["state"] == "running":
+                job["process"].join()
+        self._reap()
+        for job in self.jobs:
+            if job["state"] == "pending":
+                job["state"] = "interrupted"
+
+    def _write_status(self):
+        """Fichier status agrégé: un résumé par job, avec sa progression."""
+        jobs = []
+        for job in self.jobs:
+            status = read_job_status(job["config"]) or {}
+            jobs.append({
+                "run_name": job["run_name"],
+                "state": job["state"],
+                "priority": job["priority"],
+                "n_workers": job["n_workers"],
+                "pid": job["process"].pid if job["process"] is not None else None,
+                "started": job["started"],
+                "finished": job["finished"],
+                "exitcode": job["exitcode"],
+                "progress": status.get("data", {}).get("progress"),
+                "metrics": status.get("metrics"),
+                "last_update": status.get("last_update"),
+            })
+        counts = {}
+        for job in jobs:
+            counts[job["state"]] = counts.get(job["state"], 0) + 1
+
+        self.status_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.status_file.with_suffix(".tmp")
+        with open(tmp, 'w') as f:
+            json.dump({
+                "pid": os.getpid(),
+                "last_update": datetime.now().isoformat(),
+                "n_cores": self.n_cores,
+                "cores_in_use": self.n_cores - self.free_cores,
+                "counts": counts,
+                "jobs": jobs,
+            }, f, indent=2)
+        os.replace(tmp, self.status_file)
+
+
 # =============================================================================
 # EXEMPLE DE CONFIGURATION
 # =============================================================================
@@ -296,15 +705,36 @@ EXAMPLE_CONFIG = {
     "nsteps": 50000,
     "ndim": 5,
 
-    # Parallélisation
-    "n_workers": 4,  # Cœurs performance M4
+    # Parallélisation: au plus n_workers, nombre choisi par mesure du coût
+    # du posterior ("auto_tune": false pour imposer n_workers)
+    "n_workers": 4,
+    "auto_tune": True,
+    "vectorize": False,  # log_probability prend la matrice des walkers
+    "priority": 0,   # Ordonnanceur (--schedule): les plus prioritaires d'abord
 
     # Checkpoints
     "checkpoint_interval": 500,
 
+    # Endpoint local des métriques (format Prometheus): {"port": 0} choisit
+    # un port libre, {"socket": "mcmc_outputs/run.sock"} un socket Unix
+    "metrics": {"port": 9464, "history": 720},
+
+    # Arrêt dès convergence (sinon jusqu'à nsteps)
+    "convergence": {"tau_factor": 50, "rhat_max": 1.1, "ess_min": 100},
+
     # Modèle (module Python contenant log_probability)
     "log_prob_module": "janus_model",
     "log_prob_function": "log_probability",
+    # Fonction du module renvoyant les données (log_probability(theta, data)),
+    # envoyées une fois à chaque worker; null: log_probability(theta)
+    "log_prob_data": None,
+    # Tableaux des données en mémoire partagée entre workers (une copie par
+    # machine au lieu d'une par worker)
+    "shared_memory": True,
+
+    # Sampler: "emcee", ou "tempered"/"nested" pour l'evidence (ln Z), avec
+    # "log_prior_function", "log_likelihood_function" et "bounds"
+    "sampler": "emcee",
 
     # Priors (pour initialisation)
     "prior_center": [70, 0.3, 0.5, 1.0, 0.1],  # H0, Om0, Om0_bar, chi, sigma
@@ -321,6 +751,12 @@ if __name__ == "__main__":
     parser.add_argument("--config", type=str, help="Fichier de configuration JSON")
     parser.add_argument("--example-config", action="store_true",
                         help="Afficher exemple de configuration")
+    parser.add_argument("--schedule", nargs="+", metavar="CONFIG",
+                        help="Configs JSON ou répertoires de configs à exécuter ensemble")
+    parser.add_argument("--cores", type=int, default=None,
+                        help="Cœurs répartis entre les runs (défaut: tous)")
+    parser.add_argument("--status-file", type=str, default=None,
+                        help="Fichier status agrégé (défaut: mcmc_outputs/scheduler_status.json)")
 
     args = parser.parse_args()
 
@@ -328,11 +764,20 @@ if __name__ == "__main__":
         print(json.dumps(EXAMPLE_CONFIG, indent=2))
         sys.exit(0)
 
+    if args.schedule:
+        scheduler = MCMCScheduler(load_job_configs(args.schedule), n_cores=args.cores,
+                                  status_file=args.status_file)
+        jobs = scheduler.run()
+        for job in jobs:
+            print(f"{job['run_name']}: {job['state']}")
+        sys.exit(0 if all(job["state"] in ("completed", "skipped") for job in jobs) else 1)
+
     if args.config:
         with open(args.config, 'r') as f:
             config = json.load(f)
     else:
         print("Usage: python run_mcmc_optimized.py --config config.json")
+        print("       python run_mcmc_optimized.py --schedule configs/ [--cores N]")
         print("       python run_mcmc_optimized.py --example-config")
         sys.exit(1)
 